@@ -0,0 +1,30 @@
+"""message_window_index
+
+Revision ID: 7d2f4a9c1e85
+Revises: 3bb6e1cf253c
+Create Date: 2025-07-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2f4a9c1e85'
+down_revision: Union[str, None] = '3bb6e1cf253c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index messages by conversation and time for the recent-messages window."""
+    op.create_index(
+        'ix_messages_conversation_id_created_at', 'messages', ['conversation_id', 'created_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Drop the recent-messages index."""
+    op.drop_index('ix_messages_conversation_id_created_at', table_name='messages')
@@ -72,6 +72,12 @@ class ChatResponseDTO(BaseModel):
     timestamp: datetime
 
 
+class ChatStreamEventDTO(BaseModel):
+    """DTO for one event of a streamed chat response."""
+    event: str = Field(..., pattern="^(start|token|done|error)$")
+    data: Dict[str, Any] = Field(default_factory=dict)
+
+
 class KnowledgeEntryCreateDTO(BaseModel):
     """DTO for creating knowledge entries."""
     title: str = Field(..., min_length=1, max_length=500)
@@ -220,4 +226,5 @@ class EnhancedChatRequestDTO(BaseModel):
     model_name: Optional[str] = None
     temperature: Optional[float] = Field(default=0.7, ge=0.0, le=2.0)
     max_tokens: Optional[int] = Field(default=1000, ge=1, le=4000)
+    use_cache: bool = Field(default=True)
     metadata: Optional[Dict[str, Any]] = None
@@ -3,9 +3,11 @@
 from .ai_provider_interface import AIProviderInterface
 from .vector_store_interface import VectorStoreInterface
 from .cache_interface import CacheInterface
+from .response_cache_interface import ResponseCacheInterface
 
 __all__ = [
     "AIProviderInterface",
     "VectorStoreInterface",
-    "CacheInterface"
+    "CacheInterface",
+    "ResponseCacheInterface"
 ]
@@ -0,0 +1,32 @@
+"""Response cache interface for reusing answers to repeated questions."""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple
+
+
+class ResponseCacheInterface(ABC):
+    """Abstract interface for caching chat answers by question."""
+
+    @abstractmethod
+    async def lookup(self, query: str, scope: str) -> Tuple[Optional[Dict[str, Any]], int]:
+        """Get a cached answer for the query (or a close rewording of it) within a scope.
+
+        Also returns the knowledge base version the lookup saw, to be passed
+        to store() for the answer generated after a miss.
+        """
+        pass
+
+    @abstractmethod
+    async def store(self, query: str, scope: str, answer: Dict[str, Any], version: int) -> None:
+        """Cache an answer generated at a knowledge base version; dropped if the version changed since."""
+        pass
+
+    @abstractmethod
+    async def invalidate(self) -> int:
+        """Drop every cached answer, returning the new knowledge base version."""
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Get hit-rate metrics."""
+        pass
@@ -29,6 +29,19 @@ class VectorStoreInterface(ABC):
         """Search for similar documents using embedding."""
         pass
     
+    async def search_similar_batch(
+        self,
+        query_embeddings: List[List[float]],
+        limit: int = 10,
+        similarity_threshold: float = 0.7,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Tuple[KnowledgeEntry, float]]]:
+        """Search for several embeddings at once, one result list per query."""
+        return [
+            await self.search_similar(query_embedding, limit, similarity_threshold, filters)
+            for query_embedding in query_embeddings
+        ]
+    
     @abstractmethod
     async def search_by_text(
         self,
@@ -5,15 +5,17 @@ Servicio de chat mejorado con integración completa a la base de conocimiento
 import asyncio
 import logging
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from uuid import UUID
 
+from app.application.interfaces.response_cache_interface import ResponseCacheInterface
 from app.infrastructure.integrations.kb_integration import KbServiceIntegration
 from app.application.dtos.ai_dtos import (
     EnhancedChatRequestDTO,
     ChatContext,
     KnowledgeSearchResult,
-    MessageDTO
+    MessageDTO,
+    ChatStreamEventDTO
 )
 from app.domain.exceptions.ai_exceptions import (
     KnowledgeBaseIntegrationError,
@@ -34,15 +36,20 @@ class EnhancedChatService:
     - Contexto de la conversación
     - Conocimiento relevante de la base de datos
     - Reglamento del Aprendiz SENA (documento principal)
+    
+    Con un caché de respuestas, las preguntas ya respondidas (o reformuladas
+    de forma muy parecida) se contestan sin llamar al modelo.
     """
     
     def __init__(
         self,
         kb_integration: KbServiceIntegration,
-        openai_client: SimpleOpenAIClient
+        openai_client: SimpleOpenAIClient,
+        response_cache: Optional[ResponseCacheInterface] = None
     ):
         self.kb_integration = kb_integration
         self.openai_client = openai_client
+        self.response_cache = response_cache
         self.regulatory_context_cache: Dict[str, List[KnowledgeSearchResult]] = {}
     
     async def generate_enhanced_response(
@@ -68,29 +75,35 @@ class EnhancedChatService:
         try:
             start_time = datetime.utcnow()
             
-            # 1. Obtener contexto enriquecido de la base de conocimiento
-            chat_context = None
-            if request.use_knowledge_base:
-                chat_context = await self._get_enhanced_context(
-                    request, conversation_history
+            # 0. Reutilizar la respuesta a la misma pregunta si está en caché
+            cache_scope = self._cache_scope(request, conversation_history)
+            cached, cache_version = await self._lookup_cached(request.message, cache_scope)
+            if cached:
+                processing_time = (datetime.utcnow() - start_time).total_seconds()
+                return MessageDTO(
+                    content=cached["content"],
+                    role="assistant",
+                    message_type="text",
+                    tokens=cached.get("tokens"),
+                    metadata={
+                        "model_used": cached.get("model_used"),
+                        "processing_time": processing_time,
+                        "knowledge_sources": cached.get("knowledge_sources", 0),
+                        "context_categories": cached.get("context_categories", []),
+                        "kb_integration_used": request.use_knowledge_base,
+                        "cache_hit": True,
+                        "cache_similarity": cached["cache_similarity"]
+                    },
+                    timestamp=datetime.utcnow(),
+                    model_used=cached.get("model_used"),
+                    processing_time=processing_time
                 )
             
-            # 2. Construir prompt contextualizado
-            system_prompt = self._build_contextual_system_prompt(
-                chat_context, request.search_categories
-            )
-            
-            # 3. Preparar historial de conversación
-            conversation_messages = self._prepare_conversation_messages(
-                conversation_history, system_prompt
+            # 1-4. Contexto de la base de conocimiento, prompt e historial
+            conversation_messages, chat_context = await self._build_request_messages(
+                request, conversation_history
             )
             
-            # 4. Agregar mensaje del usuario
-            conversation_messages.append({
-                "role": "user",
-                "content": request.message
-            })
-            
             # 5. Generar respuesta con OpenAI
             ai_response = await self.openai_client.chat_completion(
                 messages=conversation_messages,
@@ -112,25 +125,211 @@ class EnhancedChatService:
                     "processing_time": processing_time,
                     "knowledge_sources": len(chat_context.knowledge_results) if chat_context else 0,
                     "context_categories": chat_context.categories if chat_context else [],
-                    "kb_integration_used": request.use_knowledge_base
+                    "kb_integration_used": request.use_knowledge_base,
+                    "cache_hit": False
                 },
                 timestamp=datetime.utcnow(),
                 model_used=ai_response.get("model"),
                 processing_time=processing_time
             )
             
+            await self._store_cached(request.message, cache_scope, cache_version, {
+                "content": response_message.content,
+                "tokens": response_message.tokens,
+                "model_used": response_message.model_used,
+                "knowledge_sources": response_message.metadata["knowledge_sources"],
+                "context_categories": response_message.metadata["context_categories"]
+            })
+            
             return response_message
             
         except Exception as e:
             logger.error(f"Error generating enhanced response: {str(e)}")
-            if "knowledge" in str(e).lower():
-                raise KnowledgeBaseIntegrationError(f"KB integration failed: {str(e)}")
-            elif "context" in str(e).lower():
-                raise ContextGenerationError(f"Context generation failed: {str(e)}")
-            elif "model" in str(e).lower():
-                raise ModelNotAvailableError(f"AI model error: {str(e)}")
-            else:
-                raise
+            raise self._classify_error(e)
+    
+    async def stream_enhanced_response(
+        self,
+        request: EnhancedChatRequestDTO,
+        conversation_history: List[MessageDTO]
+    ) -> AsyncIterator[ChatStreamEventDTO]:
+        """
+        Generar respuesta mejorada entregando los tokens a medida que el modelo los produce.
+        
+        Emite un evento "start" con las fuentes usadas, un evento "token" por
+        fragmento y un evento "done" con el texto completo y sus métricas.
+        
+        Args:
+            request: Solicitud de chat mejorada
+            conversation_history: Historial de la conversación
+            
+        Yields:
+            Eventos de la respuesta en streaming
+        """
+        try:
+            start_time = datetime.utcnow()
+            cache_scope = self._cache_scope(request, conversation_history)
+            cached, cache_version = await self._lookup_cached(request.message, cache_scope)
+            if cached:
+                yield ChatStreamEventDTO(event="start", data={
+                    "conversation_id": str(request.conversation_id) if request.conversation_id else None,
+                    "model_used": cached.get("model_used"),
+                    "knowledge_sources": cached.get("knowledge_sources", 0),
+                    "context_categories": cached.get("context_categories", []),
+                    "cache_hit": True
+                })
+                yield ChatStreamEventDTO(event="token", data={"content": cached["content"]})
+                processing_time = (datetime.utcnow() - start_time).total_seconds()
+                yield ChatStreamEventDTO(event="done", data={
+                    "message": cached["content"],
+                    "model_used": cached.get("model_used"),
+                    "tokens_used": cached.get("tokens"),
+                    "time_to_first_token": processing_time,
+                    "processing_time": processing_time,
+                    "kb_integration_used": request.use_knowledge_base,
+                    "cache_hit": True,
+                    "cache_similarity": cached["cache_similarity"]
+                })
+                return
+            
+            conversation_messages, chat_context = await self._build_request_messages(
+                request, conversation_history
+            )
+            model_name = request.model_name or "gpt-4"
+            
+            yield ChatStreamEventDTO(event="start", data={
+                "conversation_id": str(request.conversation_id) if request.conversation_id else None,
+                "model_used": model_name,
+                "knowledge_sources": len(chat_context.knowledge_results) if chat_context else 0,
+                "context_categories": chat_context.categories if chat_context else []
+            })
+            
+            chunks: List[str] = []
+            first_token_time = None
+            async for chunk in self.openai_client.chat_completion_stream(
+                messages=conversation_messages,
+                model=model_name,
+                temperature=request.temperature or 0.7,
+                max_tokens=request.max_tokens or 1000
+            ):
+                if first_token_time is None:
+                    first_token_time = (datetime.utcnow() - start_time).total_seconds()
+                chunks.append(chunk)
+                yield ChatStreamEventDTO(event="token", data={"content": chunk})
+            
+            content = "".join(chunks)
+            knowledge_sources = len(chat_context.knowledge_results) if chat_context else 0
+            context_categories = chat_context.categories if chat_context else []
+            await self._store_cached(request.message, cache_scope, cache_version, {
+                "content": content,
+                "tokens": len(content.split()),
+                "model_used": model_name,
+                "knowledge_sources": knowledge_sources,
+                "context_categories": context_categories
+            })
+            yield ChatStreamEventDTO(event="done", data={
+                "message": content,
+                "model_used": model_name,
+                "tokens_used": len(content.split()),
+                "time_to_first_token": first_token_time,
+                "processing_time": (datetime.utcnow() - start_time).total_seconds(),
+                "kb_integration_used": request.use_knowledge_base,
+                "cache_hit": False
+            })
+            
+        except Exception as e:
+            logger.error(f"Error streaming enhanced response: {str(e)}")
+            raise self._classify_error(e)
+    
+    async def _build_request_messages(
+        self,
+        request: EnhancedChatRequestDTO,
+        conversation_history: List[MessageDTO]
+    ) -> Tuple[List[Dict[str, str]], Optional[ChatContext]]:
+        """Construir los mensajes para el modelo: prompt con contexto, historial y consulta."""
+        # 1. Obtener contexto enriquecido de la base de conocimiento
+        chat_context = None
+        if request.use_knowledge_base:
+            chat_context = await self._get_enhanced_context(
+                request, conversation_history
+            )
+        
+        # 2. Construir prompt contextualizado
+        system_prompt = self._build_contextual_system_prompt(
+            chat_context, request.search_categories
+        )
+        
+        # 3. Preparar historial de conversación
+        conversation_messages = self._prepare_conversation_messages(
+            conversation_history, system_prompt
+        )
+        
+        # 4. Agregar mensaje del usuario
+        conversation_messages.append({
+            "role": "user",
+            "content": request.message
+        })
+        
+        return conversation_messages, chat_context
+    
+    def _cache_scope(
+        self,
+        request: EnhancedChatRequestDTO,
+        conversation_history: List[MessageDTO]
+    ) -> Optional[str]:
+        """Ámbito en el que una respuesta en caché es válida, o None si la petición no usa caché.
+        
+        Solo se reutilizan respuestas a preguntas independientes: un mensaje con
+        historial puede depender de turnos anteriores ("¿y si llego tarde?").
+        """
+        if self.response_cache is None or not request.use_cache or conversation_history:
+            return None
+        categories = ",".join(sorted(request.search_categories or []))
+        return f"{request.model_name or 'gpt-4'}|kb={request.use_knowledge_base}|{categories}"
+    
+    async def _lookup_cached(
+        self,
+        message: str,
+        cache_scope: Optional[str]
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[int]]:
+        """Buscar una respuesta en caché; un fallo del caché nunca interrumpe el chat.
+        
+        Devuelve también la versión de la base de conocimiento vista, con la
+        que se guardará la respuesta generada si no hubo acierto.
+        """
+        if cache_scope is None:
+            return None, None
+        try:
+            return await self.response_cache.lookup(message, cache_scope)
+        except Exception as e:
+            logger.warning(f"Response cache lookup failed: {str(e)}")
+            return None, None
+    
+    async def _store_cached(
+        self,
+        message: str,
+        cache_scope: Optional[str],
+        cache_version: Optional[int],
+        answer: Dict[str, Any]
+    ) -> None:
+        """Guardar una respuesta en caché para reutilizarla en preguntas equivalentes."""
+        if cache_scope is None or cache_version is None:
+            return
+        try:
+            await self.response_cache.store(message, cache_scope, answer, cache_version)
+        except Exception as e:
+            logger.warning(f"Response cache store failed: {str(e)}")
+    
+    @staticmethod
+    def _classify_error(error: Exception) -> Exception:
+        """Traducir un error a la excepción de dominio correspondiente."""
+        message = str(error).lower()
+        if "knowledge" in message:
+            return KnowledgeBaseIntegrationError(f"KB integration failed: {str(error)}")
+        elif "context" in message:
+            return ContextGenerationError(f"Context generation failed: {str(error)}")
+        elif "model" in message:
+            return ModelNotAvailableError(f"AI model error: {str(error)}")
+        return error
     
     async def _get_enhanced_context(
         self,
@@ -312,7 +511,8 @@ IMPORTANTE:
                 "enhanced_chat_service": True,
                 "kb_integration": kb_healthy,
                 "openai_client": openai_healthy,
-                "cache_size": len(self.regulatory_context_cache)
+                "cache_size": len(self.regulatory_context_cache),
+                "response_cache": self.response_cache.stats() if self.response_cache else None
             }
         except Exception as e:
             logger.error(f"Health check failed: {str(e)}")
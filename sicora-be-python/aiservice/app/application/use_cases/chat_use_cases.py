@@ -1,9 +1,10 @@
 """Chat use cases for AI Service."""
 
+import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import List, Optional
-from uuid import UUID
+from typing import AsyncContextManager, AsyncIterator, Awaitable, Callable, List, Optional, Set, Tuple
+from uuid import UUID, uuid4
 
 from app.domain.entities.conversation import Conversation
 from app.domain.entities.ai_model import AIModel
@@ -24,12 +25,19 @@ from app.application.interfaces.cache_interface import CacheInterface
 from app.application.dtos.ai_dtos import (
     ChatRequestDTO,
     ChatResponseDTO,
+    ChatStreamEventDTO,
     ConversationCreateDTO,
     ConversationResponseDTO
 )
 
 logger = logging.getLogger(__name__)
 
+# Background writes of streamed replies; referenced so they are not garbage collected
+_background_tasks: Set[asyncio.Future] = set()
+
+# Opens a conversation repository on a session of its own, closed when the block exits
+ConversationRepositoryScope = Callable[[], AsyncContextManager[ConversationRepository]]
+
 
 class ChatUseCase:
     """Use case for chat interactions."""
@@ -41,7 +49,8 @@ class ChatUseCase:
         knowledge_repo: KnowledgeRepository,
         ai_provider: AIProviderInterface,
         vector_store: VectorStoreInterface,
-        cache: CacheInterface
+        cache: CacheInterface,
+        conversation_repo_scope: Optional[ConversationRepositoryScope] = None
     ):
         self.conversation_repo = conversation_repo
         self.ai_model_repo = ai_model_repo
@@ -49,42 +58,14 @@ class ChatUseCase:
         self.ai_provider = ai_provider
         self.vector_store = vector_store
         self.cache = cache
+        self.conversation_repo_scope = conversation_repo_scope
     
     async def send_message(self, request: ChatRequestDTO) -> ChatResponseDTO:
         """Send a message and get AI response."""
         start_time = datetime.utcnow()
         
         try:
-            # Get or create conversation
-            conversation = await self._get_or_create_conversation(
-                request.conversation_id, 
-                request.user_id
-            )
-            
-            # Get AI model
-            model = await self._get_ai_model(request.model_name)
-            
-            # Create user message
-            user_message = Message(
-                content=request.message,
-                role=MessageRole.USER,
-                message_type=MessageType.TEXT
-            )
-            
-            # Add user message to conversation
-            conversation.add_message(user_message)
-            
-            # Get conversation context
-            context_messages = conversation.get_context_window(
-                max_messages=model.context_window // 100  # Estimate based on tokens
-            )
-            
-            # Enhance with knowledge base if requested
-            if request.use_knowledge_base:
-                context_messages = await self._enhance_with_knowledge(
-                    request.message, 
-                    context_messages
-                )
+            conversation, model, user_message, context_messages = await self._prepare_turn(request)
             
             # Generate AI response
             ai_response = await self.ai_provider.generate_response(
@@ -97,8 +78,10 @@ class ChatUseCase:
             # Add AI response to conversation
             conversation.add_message(ai_response)
             
-            # Update conversation in repository
-            await self.conversation_repo.update(conversation)
+            # Persist only this turn's messages
+            await self.conversation_repo.append_messages(
+                conversation.conversation_id, [user_message, ai_response]
+            )
             
             # Calculate processing time
             processing_time = (datetime.utcnow() - start_time).total_seconds()
@@ -121,6 +104,66 @@ class ChatUseCase:
             logger.error(f"Error in send_message: {str(e)}", exc_info=True)
             raise
     
+    async def stream_message(self, request: ChatRequestDTO) -> AsyncIterator[ChatStreamEventDTO]:
+        """Send a message and stream the AI response as it is generated.
+        
+        Yields a "start" event, one "token" event per provider chunk and a
+        "done" event. The assembled reply is persisted in the background
+        once the stream ends, so the client never waits for the write; a
+        stream cut short by the client is kept with what was generated.
+        """
+        start_time = datetime.utcnow()
+        conversation, model, user_message, context_messages = await self._prepare_turn(request)
+        message_id = uuid4()
+        
+        yield ChatStreamEventDTO(event="start", data={
+            "conversation_id": str(conversation.conversation_id),
+            "message_id": str(message_id),
+            "model_used": model.name
+        })
+        
+        chunks: List[str] = []
+        ai_response: Optional[Message] = None
+        completed = False
+        try:
+            async for chunk in self.ai_provider.generate_streaming_response(
+                messages=context_messages,
+                model=model,
+                temperature=request.temperature or model.temperature,
+                max_tokens=request.max_tokens or model.max_tokens
+            ):
+                chunks.append(chunk)
+                yield ChatStreamEventDTO(event="token", data={"content": chunk})
+            completed = True
+        except Exception as e:
+            logger.error(f"Error in stream_message: {str(e)}", exc_info=True)
+            raise
+        finally:
+            content = "".join(chunks)
+            if content:
+                ai_response = Message(
+                    content=content,
+                    role=MessageRole.ASSISTANT,
+                    message_id=message_id,
+                    message_type=MessageType.TEXT,
+                    tokens=len(content.split()),
+                    model_used=model.name,
+                    processing_time=(datetime.utcnow() - start_time).total_seconds(),
+                    metadata={} if completed else {"incomplete": True}
+                )
+                conversation.add_message(ai_response)
+                self._schedule(self._save_turn(conversation, [user_message, ai_response]))
+        
+        yield ChatStreamEventDTO(event="done", data={
+            "conversation_id": str(conversation.conversation_id),
+            "message_id": str(message_id),
+            "response": ai_response.content if ai_response else "",
+            "model_used": model.name,
+            "tokens_used": ai_response.tokens if ai_response else 0,
+            "processing_time": (datetime.utcnow() - start_time).total_seconds(),
+            "knowledge_sources": context_messages[-1].metadata.get("knowledge_sources", []) if context_messages else []
+        })
+    
     async def create_conversation(self, request: ConversationCreateDTO) -> ConversationResponseDTO:
         """Create a new conversation."""
         try:
@@ -221,14 +264,78 @@ class ChatUseCase:
         
         return result
     
+    async def _prepare_turn(
+        self,
+        request: ChatRequestDTO
+    ) -> Tuple[Conversation, AIModel, Message, List[Message]]:
+        """Add the user message to its conversation and build the model context."""
+        # Get AI model
+        model = await self._get_ai_model(request.model_name)
+        context_size = model.context_window // 100  # Estimate based on tokens
+        
+        # Get or create conversation, loading only the messages the prompt can hold
+        conversation = await self._get_or_create_conversation(
+            request.conversation_id, 
+            request.user_id,
+            max_messages=context_size
+        )
+        
+        # Create user message
+        user_message = Message(
+            content=request.message,
+            role=MessageRole.USER,
+            message_type=MessageType.TEXT
+        )
+        
+        # Add user message to conversation
+        conversation.add_message(user_message)
+        
+        # Get conversation context
+        context_messages = conversation.get_context_window(max_messages=context_size)
+        
+        # Enhance with knowledge base if requested
+        if request.use_knowledge_base:
+            context_messages = await self._enhance_with_knowledge(
+                request.message, 
+                context_messages
+            )
+        
+        return conversation, model, user_message, context_messages
+    
+    async def _save_turn(self, conversation: Conversation, messages: List[Message]) -> None:
+        """Persist a streamed turn and refresh the cached conversation.
+        
+        The request's session is already closed when a stream ends, so the
+        turn is written through a repository opened for this write alone.
+        """
+        try:
+            if self.conversation_repo_scope is None:
+                await self.conversation_repo.append_messages(conversation.conversation_id, messages)
+            else:
+                async with self.conversation_repo_scope() as conversation_repo:
+                    await conversation_repo.append_messages(conversation.conversation_id, messages)
+            await self._cache_conversation(conversation)
+        except Exception as e:
+            logger.error(f"Failed to save streamed conversation {conversation.conversation_id}: {str(e)}")
+    
+    @staticmethod
+    def _schedule(coroutine: Awaitable[None]) -> None:
+        """Run a coroutine in the background, keeping a reference until it finishes."""
+        task = asyncio.ensure_future(coroutine)
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+    
     async def _get_or_create_conversation(
         self, 
         conversation_id: Optional[UUID], 
-        user_id: UUID
+        user_id: UUID,
+        max_messages: int = 10
     ) -> Conversation:
-        """Get existing conversation or create new one."""
+        """Get existing conversation (with its latest messages) or create new one."""
         if conversation_id:
-            conversation = await self.conversation_repo.get_by_id(conversation_id)
+            conversation = await self.conversation_repo.get_with_recent_messages(
+                conversation_id, max_messages
+            )
             if not conversation or conversation.user_id != user_id:
                 raise ConversationNotFoundError(f"Conversation {conversation_id} not found")
             return conversation
@@ -1,5 +1,6 @@
 """Knowledge base use cases for AI Service."""
 
+import asyncio
 import logging
 from typing import List, Optional, Dict, Any
 from uuid import UUID
@@ -232,13 +233,32 @@ class KnowledgeManagementUseCase:
                 limit=batch_size
             )
             
-            processed = 0
-            for entry in entries:
-                try:
-                    await self._generate_and_save_embedding(entry)
-                    processed += 1
-                except Exception as e:
-                    logger.warning(f"Failed to generate embedding for entry {entry.entry_id}: {str(e)}")
+            if not entries:
+                return 0
+            
+            # Embed concurrently, then write the whole batch with one statement
+            results = await asyncio.gather(
+                *(self.ai_provider.generate_embedding(f"{entry.title}\n{entry.content}") for entry in entries),
+                return_exceptions=True
+            )
+            embedded = []
+            for entry, result in zip(entries, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"Failed to generate embedding for entry {entry.entry_id}: {str(result)}")
+                    continue
+                entry.update_embedding(result)
+                embedded.append(entry)
+            
+            if not embedded:
+                return 0
+            processed = await self.knowledge_repo.bulk_update_embeddings([
+                {"entry_id": entry.entry_id, "embedding": entry.embedding} for entry in embedded
+            ])
+            
+            try:
+                await self.vector_store.bulk_add_documents([(entry, entry.embedding) for entry in embedded])
+            except Exception as e:
+                logger.warning(f"Failed to index {len(embedded)} embeddings: {str(e)}")
             
             return processed
             
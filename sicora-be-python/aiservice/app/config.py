@@ -26,9 +26,17 @@ class Settings(BaseSettings):
     EMBEDDING_DIMENSION: int = 1536
     
     # Vector Store settings
-    VECTOR_STORE_TYPE: str = "chromadb"  # chromadb, pinecone, weaviate
+    VECTOR_STORE_TYPE: str = "chromadb"  # chromadb, local, pinecone, weaviate
     CHROMADB_PATH: str = "./chromadb"
     CHROMADB_COLLECTION: str = "ai_knowledge_base"
+    CHROMADB_MAX_WORKERS: int = 4  # Threads running blocking chromadb client calls
+    CHROMADB_BATCH_SIZE: int = 256  # Max documents per coalesced upsert
+    CHROMADB_BATCH_WAIT_MS: float = 10.0  # How long add_document waits for others to join a batch
+    LOCAL_VECTOR_STORE_PATH: str = "./vector_store"  # Directory of the embedded store (VECTOR_STORE_TYPE=local); one process per collection
+    LOCAL_VECTOR_STORE_HNSW_THRESHOLD: int = 20000  # Collections this large switch from exact search to HNSW
+    LOCAL_VECTOR_STORE_HNSW_M: int = 16
+    LOCAL_VECTOR_STORE_HNSW_EF_CONSTRUCTION: int = 200
+    LOCAL_VECTOR_STORE_HNSW_EF_SEARCH: int = 64
     
     # Pinecone settings (if using Pinecone)
     PINECONE_API_KEY: Optional[str] = None
@@ -40,6 +48,14 @@ class Settings(BaseSettings):
     REDIS_PASSWORD: Optional[str] = None
     CACHE_TTL_SECONDS: int = 3600
     
+    # Semantic response cache settings
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_SIMILARITY_THRESHOLD: float = 0.95  # Min cosine similarity to reuse the answer to a reworded question
+    SEMANTIC_CACHE_TTL_SECONDS: int = 21600
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 2000
+    SEMANTIC_CACHE_KB_VERSION_REDIS_URL: Optional[str] = None  # Redis where kbservice bumps kbservice:kb_version
+    SEMANTIC_CACHE_KB_VERSION_REFRESH_SECONDS: float = 1.0  # How often the KB version is re-read
+    
     # Rate limiting
     RATE_LIMIT_PER_MINUTE: int = 60
     RATE_LIMIT_PER_HOUR: int = 1000
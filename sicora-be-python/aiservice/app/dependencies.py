@@ -1,11 +1,12 @@
 """Dependency injection configuration for AI Service."""
 
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
 
 from app.config import get_settings
-from app.infrastructure.config.database import get_db_session
+from app.infrastructure.config.database import SessionLocal, get_db_session
 from app.infrastructure.repositories.conversation_repository_impl import SQLAlchemyConversationRepository
 from app.infrastructure.repositories.knowledge_repository_impl import SQLAlchemyKnowledgeRepository
 from app.infrastructure.repositories.ai_model_repository_impl import SQLAlchemyAIModelRepository
@@ -16,6 +17,7 @@ from app.domain.repositories.ai_model_repository import AIModelRepository
 from app.application.interfaces.ai_provider_interface import AIProviderInterface
 from app.application.interfaces.vector_store_interface import VectorStoreInterface
 from app.application.interfaces.cache_interface import CacheInterface
+from app.application.interfaces.response_cache_interface import ResponseCacheInterface
 
 from app.application.use_cases.chat_use_cases import ChatUseCase, ConversationManagementUseCase
 from app.application.use_cases.knowledge_use_cases import KnowledgeManagementUseCase
@@ -33,6 +35,14 @@ from app.infrastructure.adapters.factory import (
 from app.application.services.enhanced_chat_service import EnhancedChatService
 from app.infrastructure.integrations.kb_integration import KbServiceIntegration
 from app.infrastructure.external.simple_openai_client import SimpleOpenAIClient
+from app.infrastructure.adapters.semantic_response_cache import create_semantic_response_cache
+
+
+@asynccontextmanager
+async def open_conversation_repository() -> AsyncIterator[ConversationRepository]:
+    """Conversation repository on its own session, for writes that outlive the request."""
+    async with SessionLocal() as session:
+        yield SQLAlchemyConversationRepository(session)
 
 
 async def get_conversation_repository(
@@ -110,11 +120,25 @@ def get_vector_store() -> VectorStoreInterface:
         "host": getattr(settings, 'CHROMADB_HOST', 'localhost'),
         "port": getattr(settings, 'CHROMADB_PORT', 8000),
         "collection_name": getattr(settings, 'CHROMADB_COLLECTION', 'knowledge_base'),
-        "persist_directory": getattr(settings, 'CHROMADB_PATH', './chromadb')
+        "persist_directory": getattr(settings, 'CHROMADB_PATH', './chromadb'),
+        "max_workers": getattr(settings, 'CHROMADB_MAX_WORKERS', 4),
+        "batch_size": getattr(settings, 'CHROMADB_BATCH_SIZE', 256),
+        "batch_wait_ms": getattr(settings, 'CHROMADB_BATCH_WAIT_MS', 10.0)
     }
+    store_type = VectorStoreType(getattr(settings, 'VECTOR_STORE_TYPE', 'chromadb'))
+
+    if store_type == VectorStoreType.LOCAL:
+        config = {
+            "path": getattr(settings, 'LOCAL_VECTOR_STORE_PATH', './vector_store'),
+            "collection_name": getattr(settings, 'CHROMADB_COLLECTION', 'knowledge_base'),
+            "hnsw_threshold": getattr(settings, 'LOCAL_VECTOR_STORE_HNSW_THRESHOLD', 20000),
+            "hnsw_m": getattr(settings, 'LOCAL_VECTOR_STORE_HNSW_M', 16),
+            "hnsw_ef_construction": getattr(settings, 'LOCAL_VECTOR_STORE_HNSW_EF_CONSTRUCTION', 200),
+            "hnsw_ef_search": getattr(settings, 'LOCAL_VECTOR_STORE_HNSW_EF_SEARCH', 64)
+        }
 
     return ai_service_factory.create_vector_store(
-        VectorStoreType.CHROMADB,
+        store_type,
         config,
         "default"
     )
@@ -157,7 +181,8 @@ async def get_chat_use_case(
         knowledge_repo=knowledge_repo,
         ai_provider=ai_provider,
         vector_store=vector_store,
-        cache=cache
+        cache=cache,
+        conversation_repo_scope=open_conversation_repository
     )
 
 
@@ -237,10 +262,29 @@ async def get_enhanced_chat_service(
     """Get enhanced chat service dependency."""
     return EnhancedChatService(
         kb_integration=kb_integration,
-        openai_client=openai_client
+        openai_client=openai_client,
+        response_cache=get_response_cache()
     )
 
 
+_response_cache: Optional[ResponseCacheInterface] = None
+_response_cache_created = False
+
+
+def get_response_cache() -> Optional[ResponseCacheInterface]:
+    """Get the process-wide semantic response cache (None when disabled)."""
+    global _response_cache, _response_cache_created
+    if not _response_cache_created:
+        settings = get_settings()
+        embedding_client = SimpleOpenAIClient(
+            api_key=getattr(settings, 'OPENAI_API_KEY', None),
+            organization=getattr(settings, 'OPENAI_ORGANIZATION', None)
+        )
+        _response_cache = create_semantic_response_cache(embedding_client.create_embedding, settings)
+        _response_cache_created = True
+    return _response_cache
+
+
 async def get_current_user():
     """Get current user dependency - mock implementation."""
     # TODO: Implement proper authentication
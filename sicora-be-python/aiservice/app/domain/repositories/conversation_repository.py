@@ -5,6 +5,7 @@ from typing import List, Optional
 from uuid import UUID
 
 from app.domain.entities.conversation import Conversation
+from app.domain.value_objects.message import Message
 
 
 class ConversationRepository(ABC):
@@ -36,6 +37,20 @@ class ConversationRepository(ABC):
         """Update an existing conversation."""
         pass
     
+    @abstractmethod
+    async def append_messages(self, conversation_id: UUID, messages: List[Message]) -> None:
+        """Insert new messages and add them to the conversation's counters."""
+        pass
+    
+    @abstractmethod
+    async def get_with_recent_messages(
+        self,
+        conversation_id: UUID,
+        max_messages: int
+    ) -> Optional[Conversation]:
+        """Get a conversation with only its latest messages loaded."""
+        pass
+    
     @abstractmethod
     async def delete(self, conversation_id: UUID) -> bool:
         """Delete a conversation."""
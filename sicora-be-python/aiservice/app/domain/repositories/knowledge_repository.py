@@ -81,8 +81,12 @@ class KnowledgeRepository(ABC):
         pass
     
     @abstractmethod
-    async def get_entries_without_embeddings(self, limit: int = 100) -> List[KnowledgeEntry]:
-        """Get entries that don't have embeddings yet."""
+    async def get_entries_without_embeddings(
+        self,
+        limit: int = 100,
+        after_id: Optional[UUID] = None
+    ) -> List[KnowledgeEntry]:
+        """Get entries that don't have embeddings yet, in ID order after after_id."""
         pass
     
     @abstractmethod
@@ -3,6 +3,7 @@
 from .message import Message, MessageRole, MessageType
 from .conversation_metadata import ConversationMetadata
 from .ai_prompt import AIPrompt, PromptType, PromptTemplate
+from .embedding_matrix import EmbeddingMatrix
 
 __all__ = [
     "Message",
@@ -11,5 +12,6 @@ __all__ = [
     "ConversationMetadata",
     "AIPrompt",
     "PromptType",
-    "PromptTemplate"
+    "PromptTemplate",
+    "EmbeddingMatrix"
 ]
@@ -0,0 +1,52 @@
+"""Embedding matrix value object."""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+class EmbeddingMatrix:
+    """Value object for a batch of pre-normalized float32 embeddings."""
+
+    def __init__(self, embeddings: Sequence[Sequence[float]], dimension: Optional[int] = None):
+        if len(embeddings) == 0:
+            self._matrix = np.zeros((0, dimension or 0), dtype=np.float32)
+        else:
+            matrix = np.asarray(embeddings, dtype=np.float32)
+            if matrix.ndim != 2:
+                raise ValueError("All embeddings must have the same dimension")
+            self._matrix = self.normalize(matrix)
+        self._matrix.setflags(write=False)
+
+    @staticmethod
+    def normalize(array: np.ndarray) -> np.ndarray:
+        """L2-normalize a vector or each row of a matrix (zero rows stay zero)."""
+        array = np.asarray(array, dtype=np.float32)
+        norms = np.linalg.norm(array, axis=-1, keepdims=True)
+        return np.divide(array, norms, out=np.zeros_like(array), where=norms > 0)
+
+    @property
+    def dimension(self) -> int:
+        """Get the embedding dimension."""
+        return self._matrix.shape[1]
+
+    def __len__(self) -> int:
+        return self._matrix.shape[0]
+
+    def similarities(self, query: Sequence[float]) -> np.ndarray:
+        """Cosine similarity of one query against every row, as a float32 array."""
+        if len(self) == 0:
+            return np.zeros(0, dtype=np.float32)
+        unit = self.normalize(query)
+        if unit.shape[-1] != self.dimension:
+            raise ValueError("Embedding dimensions do not match")
+        return self._matrix @ unit
+
+    def top_k(self, query: Sequence[float], k: int, threshold: float = 0.0) -> List[tuple]:
+        """Return (row index, similarity) pairs above threshold, best first."""
+        scores = self.similarities(query)
+        candidates = np.flatnonzero(scores >= threshold)
+        if candidates.size > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(i), float(scores[i])) for i in candidates]
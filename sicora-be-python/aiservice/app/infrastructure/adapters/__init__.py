@@ -5,6 +5,7 @@ from .anthropic_adapter import AnthropicAdapter
 # from .chromadb_adapter import ChromaDBAdapter  # Temporarily disabled
 from .redis_adapter import RedisAdapter
 from .huggingface_adapter import HuggingFaceAdapter
+from .local_vector_store import LocalVectorStoreAdapter
 from .factory import (
     AIServiceFactory,
     AIProviderType,
@@ -19,6 +20,7 @@ __all__ = [
     # "ChromaDBAdapter",  # Temporarily disabled
     "RedisAdapter",
     "HuggingFaceAdapter",
+    "LocalVectorStoreAdapter",
     "AIServiceFactory",
     "AIProviderType",
     "VectorStoreType", 
@@ -1,7 +1,14 @@
 """ChromaDB adapter implementation for vector store operations."""
 
+import asyncio
+import functools
+import json
+import logging
 import uuid
-from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
 import chromadb
 from chromadb.config import Settings
 
@@ -9,16 +16,31 @@ from app.application.interfaces.vector_store_interface import VectorStoreInterfa
 from app.domain.entities.knowledge_entry import KnowledgeEntry
 from app.domain.exceptions.ai_exceptions import VectorStoreError
 
+logger = logging.getLogger(__name__)
+
+# (id, embedding, document, metadata, future resolved once written)
+PendingDocument = Tuple[str, List[float], str, Dict[str, Any], asyncio.Future]
+
 
 class ChromaDBAdapter(VectorStoreInterface):
-    """ChromaDB vector store adapter implementation."""
-    
+    """ChromaDB vector store adapter implementation.
+
+    The chromadb client is synchronous, so every call runs on a bounded
+    thread pool instead of the event loop. Concurrent add_document calls
+    are coalesced: they wait at most ``batch_wait_ms`` (or until
+    ``batch_size`` documents are queued) and are written with a single
+    upsert, each caller resuming once its batch is stored.
+    """
+
     def __init__(
         self,
         host: str = "localhost",
         port: int = 8000,
         collection_name: str = "knowledge_base",
-        persist_directory: Optional[str] = None
+        persist_directory: Optional[str] = None,
+        max_workers: int = 4,
+        batch_size: int = 256,
+        batch_wait_ms: float = 10.0
     ):
         """Initialize ChromaDB adapter."""
         try:
@@ -35,56 +57,88 @@ class ChromaDBAdapter(VectorStoreInterface):
                     port=port,
                     settings=Settings(anonymized_telemetry=False)
                 )
-            
+
             self.collection_name = collection_name
             self._collection = None
-            
+
         except Exception as e:
             raise VectorStoreError(f"Failed to initialize ChromaDB: {str(e)}")
-    
+
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait_ms / 1000
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chromadb")
+        self._collection_lock = asyncio.Lock()
+        self._pending: List[PendingDocument] = []
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._write_tasks: Set[asyncio.Task] = set()
+        self.batches_written = 0
+        self.documents_written = 0
+
+    async def _run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking client call on the adapter's thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
     async def _get_collection(self):
         """Get or create the collection."""
         if self._collection is None:
-            try:
-                self._collection = self.client.get_or_create_collection(
-                    name=self.collection_name,
-                    metadata={"description": "AI Service Knowledge Base"}
-                )
-            except Exception as e:
-                raise VectorStoreError(f"Failed to get collection: {str(e)}")
+            async with self._collection_lock:
+                if self._collection is None:
+                    try:
+                        self._collection = await self._run(
+                            self.client.get_or_create_collection,
+                            name=self.collection_name,
+                            metadata={"description": "AI Service Knowledge Base"}
+                        )
+                    except Exception as e:
+                        raise VectorStoreError(f"Failed to get collection: {str(e)}")
         return self._collection
-    
+
     async def add_document(
         self,
         entry: KnowledgeEntry,
         embedding: List[float]
     ) -> str:
-        """Add a document with its embedding to ChromaDB."""
+        """Add a document with its embedding to ChromaDB, batched with concurrent calls."""
+        loop = asyncio.get_running_loop()
+        document_id = str(entry.entry_id)
+        future = loop.create_future()
+        self._pending.append((document_id, embedding, entry.content, self._entry_metadata(entry), future))
+
+        if len(self._pending) >= self.batch_size:
+            self._flush_pending()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self.batch_wait, self._flush_pending)
+
+        await future
+        return document_id
+
+    async def bulk_add_documents(
+        self,
+        entries: List[Tuple[KnowledgeEntry, List[float]]]
+    ) -> List[str]:
+        """Bulk add multiple documents with one upsert per batch."""
         try:
             collection = await self._get_collection()
-            
-            document_id = str(entry.id)
-            metadata = {
-                "title": entry.title,
-                "category": entry.category,
-                "tags": ",".join(entry.tags) if entry.tags else "",
-                "source": entry.source or "",
-                "created_at": entry.created_at.isoformat() if entry.created_at else "",
-                "updated_at": entry.updated_at.isoformat() if entry.updated_at else ""
-            }
-            
-            collection.add(
-                ids=[document_id],
-                embeddings=[embedding],
-                documents=[entry.content],
-                metadatas=[metadata]
-            )
-            
-            return document_id
-            
+            ids = []
+            for start in range(0, len(entries), self.batch_size):
+                batch = self._unique_by_id([
+                    (str(entry.entry_id), embedding, entry.content, self._entry_metadata(entry))
+                    for entry, embedding in entries[start:start + self.batch_size]
+                ])
+                await self._upsert(collection, batch)
+                ids.extend(document[0] for document in batch)
+            return ids
+
         except Exception as e:
-            raise VectorStoreError(f"Failed to add document to ChromaDB: {str(e)}")
-    
+            raise VectorStoreError(f"Failed to bulk add documents to ChromaDB: {str(e)}")
+
+    async def flush(self) -> None:
+        """Write queued documents now and wait for every pending write."""
+        self._flush_pending()
+        if self._write_tasks:
+            await asyncio.gather(*self._write_tasks, return_exceptions=True)
+
     async def search_similar(
         self,
         query_embedding: List[float],
@@ -93,46 +147,43 @@ class ChromaDBAdapter(VectorStoreInterface):
         filters: Optional[Dict[str, Any]] = None
     ) -> List[Tuple[KnowledgeEntry, float]]:
         """Search for similar documents using embedding."""
+        results = await self.search_similar_batch(
+            [query_embedding], limit, similarity_threshold, filters
+        )
+        return results[0]
+
+    async def search_similar_batch(
+        self,
+        query_embeddings: List[List[float]],
+        limit: int = 10,
+        similarity_threshold: float = 0.7,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Tuple[KnowledgeEntry, float]]]:
+        """Search for several embeddings with a single ChromaDB query."""
+        if not query_embeddings:
+            return []
         try:
             collection = await self._get_collection()
-            
-            # Build where clause for filters
-            where_clause = None
-            if filters:
-                where_clause = {}
-                for key, value in filters.items():
-                    if isinstance(value, list):
-                        where_clause[key] = {"$in": value}
-                    else:
-                        where_clause[key] = {"$eq": value}
-            
-            results = collection.query(
-                query_embeddings=[query_embedding],
+            results = await self._run(
+                collection.query,
+                query_embeddings=query_embeddings,
                 n_results=limit,
-                where=where_clause,
+                where=self._where_clause(filters),
                 include=["documents", "metadatas", "distances"]
             )
-            
-            entries = []
-            if results["ids"] and results["ids"][0]:
-                for i, doc_id in enumerate(results["ids"][0]):
-                    distance = results["distances"][0][i] if results["distances"] else 0
-                    similarity = 1 - distance  # Convert distance to similarity
-                    
-                    if similarity >= similarity_threshold:
-                        metadata = results["metadatas"][0][i] if results["metadatas"] else {}
-                        content = results["documents"][0][i] if results["documents"] else ""
-                        
-                        entry = self._metadata_to_knowledge_entry(
-                            doc_id, content, metadata
-                        )
-                        entries.append((entry, similarity))
-            
-            return entries
-            
+
+            return [
+                [
+                    (entry, similarity)
+                    for entry, similarity in self._query_results(results, i)
+                    if similarity >= similarity_threshold
+                ]
+                for i in range(len(query_embeddings))
+            ]
+
         except Exception as e:
             raise VectorStoreError(f"Failed to search ChromaDB: {str(e)}")
-    
+
     async def search_by_text(
         self,
         query: str,
@@ -144,44 +195,21 @@ class ChromaDBAdapter(VectorStoreInterface):
         # For now, we'll implement a basic text search using ChromaDB's built-in functionality
         try:
             collection = await self._get_collection()
-            
-            # Build where clause for filters
-            where_clause = None
-            if filters:
-                where_clause = {}
-                for key, value in filters.items():
-                    if isinstance(value, list):
-                        where_clause[key] = {"$in": value}
-                    else:
-                        where_clause[key] = {"$eq": value}
-            
+
             # Use ChromaDB's query with text (it will generate embeddings internally if configured)
-            results = collection.query(
+            results = await self._run(
+                collection.query,
                 query_texts=[query],
                 n_results=limit,
-                where=where_clause,
+                where=self._where_clause(filters),
                 include=["documents", "metadatas", "distances"]
             )
-            
-            entries = []
-            if results["ids"] and results["ids"][0]:
-                for i, doc_id in enumerate(results["ids"][0]):
-                    distance = results["distances"][0][i] if results["distances"] else 0
-                    similarity = 1 - distance
-                    
-                    metadata = results["metadatas"][0][i] if results["metadatas"] else {}
-                    content = results["documents"][0][i] if results["documents"] else ""
-                    
-                    entry = self._metadata_to_knowledge_entry(
-                        doc_id, content, metadata
-                    )
-                    entries.append((entry, similarity))
-            
-            return entries
-            
+
+            return self._query_results(results, 0)
+
         except Exception as e:
             raise VectorStoreError(f"Failed to text search ChromaDB: {str(e)}")
-    
+
     async def update_document(
         self,
         entry_id: str,
@@ -190,79 +218,273 @@ class ChromaDBAdapter(VectorStoreInterface):
     ) -> bool:
         """Update a document and its embedding in ChromaDB."""
         try:
+            # A queued add of the same document must not land after this update
+            await self.flush()
             collection = await self._get_collection()
-            
-            metadata = {
-                "title": entry.title,
-                "category": entry.category,
-                "tags": ",".join(entry.tags) if entry.tags else "",
-                "source": entry.source or "",
-                "created_at": entry.created_at.isoformat() if entry.created_at else "",
-                "updated_at": entry.updated_at.isoformat() if entry.updated_at else ""
-            }
-            
-            collection.update(
+
+            await self._run(
+                collection.update,
                 ids=[entry_id],
                 embeddings=[embedding],
                 documents=[entry.content],
-                metadatas=[metadata]
+                metadatas=[self._entry_metadata(entry)]
             )
-            
+
             return True
-            
+
         except Exception as e:
             raise VectorStoreError(f"Failed to update document in ChromaDB: {str(e)}")
-    
+
     async def delete_document(self, entry_id: str) -> bool:
         """Delete a document from ChromaDB."""
         try:
+            await self.flush()
             collection = await self._get_collection()
-            
-            collection.delete(ids=[entry_id])
+
+            await self._run(collection.delete, ids=[entry_id])
             return True
-            
+
         except Exception as e:
             raise VectorStoreError(f"Failed to delete document from ChromaDB: {str(e)}")
-    
+
+    async def get_document(self, entry_id: str) -> Optional[KnowledgeEntry]:
+        """Get a document by ID."""
+        try:
+            collection = await self._get_collection()
+            results = await self._run(collection.get, ids=[entry_id], include=["documents", "metadatas"])
+
+            if not results["ids"]:
+                return None
+            return self._metadata_to_knowledge_entry(
+                results["ids"][0], results["documents"][0], results["metadatas"][0] or {}
+            )
+
+        except Exception as e:
+            raise VectorStoreError(f"Failed to get document from ChromaDB: {str(e)}")
+
+    async def get_documents_by_category(
+        self,
+        category: str,
+        limit: int = 100
+    ) -> List[KnowledgeEntry]:
+        """Get documents by category."""
+        try:
+            collection = await self._get_collection()
+            results = await self._run(
+                collection.get,
+                where={"category": {"$eq": category}},
+                limit=limit,
+                include=["documents", "metadatas"]
+            )
+
+            return [
+                self._metadata_to_knowledge_entry(doc_id, results["documents"][i], results["metadatas"][i] or {})
+                for i, doc_id in enumerate(results["ids"])
+            ]
+
+        except Exception as e:
+            raise VectorStoreError(f"Failed to get documents by category: {str(e)}")
+
     async def get_document_count(self) -> int:
         """Get the total number of documents in the collection."""
         try:
             collection = await self._get_collection()
-            return collection.count()
-            
+            return await self._run(collection.count)
+
         except Exception as e:
             raise VectorStoreError(f"Failed to get document count: {str(e)}")
-    
+
+    async def get_collection_stats(self) -> Dict[str, Any]:
+        """Get statistics about the vector store collection."""
+        return {
+            "collection": self.collection_name,
+            "document_count": await self.get_document_count(),
+            "pending_documents": len(self._pending),
+            "batches_written": self.batches_written,
+            "documents_written": self.documents_written
+        }
+
     async def list_collections(self) -> List[str]:
         """List all collections in ChromaDB."""
         try:
-            collections = self.client.list_collections()
+            collections = await self._run(self.client.list_collections)
             return [col.name for col in collections]
-            
+
         except Exception as e:
             raise VectorStoreError(f"Failed to list collections: {str(e)}")
-    
-    async def create_collection(self, name: str, metadata: Optional[Dict[str, Any]] = None) -> bool:
+
+    async def create_collection(self, collection_name: str) -> bool:
         """Create a new collection."""
         try:
-            self.client.create_collection(
-                name=name,
-                metadata=metadata or {}
-            )
+            await self._run(self.client.create_collection, name=collection_name)
             return True
-            
+
         except Exception as e:
             raise VectorStoreError(f"Failed to create collection: {str(e)}")
-    
-    async def delete_collection(self, name: str) -> bool:
+
+    async def delete_collection(self, collection_name: str) -> bool:
         """Delete a collection."""
         try:
-            self.client.delete_collection(name=name)
+            await self._run(self.client.delete_collection, name=collection_name)
+            if collection_name == self.collection_name:
+                self._collection = None
             return True
-            
+
         except Exception as e:
             raise VectorStoreError(f"Failed to delete collection: {str(e)}")
-    
+
+    async def backup_collection(self, backup_path: str) -> bool:
+        """Backup the collection to a JSON file."""
+        try:
+            await self.flush()
+            collection = await self._get_collection()
+            results = await self._run(collection.get, include=["embeddings", "documents", "metadatas"])
+            backup = {
+                "collection": self.collection_name,
+                "ids": results["ids"],
+                "embeddings": [list(map(float, embedding)) for embedding in results["embeddings"]],
+                "documents": results["documents"],
+                "metadatas": results["metadatas"]
+            }
+            await self._run(self._write_json, backup_path, backup)
+            return True
+
+        except Exception as e:
+            raise VectorStoreError(f"Failed to backup collection: {str(e)}")
+
+    async def restore_collection(self, backup_path: str) -> bool:
+        """Restore the collection from a JSON backup."""
+        try:
+            backup = await self._run(self._read_json, backup_path)
+            collection = await self._get_collection()
+            documents = list(zip(backup["ids"], backup["embeddings"], backup["documents"], backup["metadatas"]))
+            for start in range(0, len(documents), self.batch_size):
+                await self._upsert(collection, documents[start:start + self.batch_size])
+            return True
+
+        except Exception as e:
+            raise VectorStoreError(f"Failed to restore collection: {str(e)}")
+
+    async def close(self) -> None:
+        """Write queued documents and release the thread pool."""
+        await self.flush()
+        self._executor.shutdown(wait=True)
+
+    def _flush_pending(self) -> None:
+        """Start writing the queued documents as one batch."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.get_running_loop().create_task(self._write_batch(batch))
+        self._write_tasks.add(task)
+        task.add_done_callback(self._write_tasks.discard)
+        # A task cancelled before its first step never runs _write_batch's finally
+        task.add_done_callback(lambda _: self._resolve_batch(batch, self._cancelled_error()))
+
+    async def _write_batch(self, batch: List[PendingDocument]) -> None:
+        """Upsert a coalesced batch and resolve its callers.
+
+        Callers are resolved in ``finally`` so that a write cancelled by
+        close() or loop shutdown fails them instead of leaving them waiting.
+        """
+        error: Optional[VectorStoreError] = self._cancelled_error()
+        try:
+            collection = await self._get_collection()
+            await self._upsert(collection, self._unique_by_id([document[:4] for document in batch]))
+            error = None
+        except Exception as e:
+            error = VectorStoreError(f"Failed to add documents to ChromaDB: {str(e)}")
+        finally:
+            self._resolve_batch(batch, error)
+
+    @staticmethod
+    def _cancelled_error() -> VectorStoreError:
+        """Error for callers whose batch write was cancelled."""
+        return VectorStoreError("Failed to add documents to ChromaDB: write was cancelled")
+
+    @staticmethod
+    def _resolve_batch(batch: List[PendingDocument], error: Optional[Exception]) -> None:
+        """Resolve the callers of a batch that are still waiting."""
+        for *_, future in batch:
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+    async def _upsert(self, collection, documents: List[Tuple[str, List[float], str, Dict[str, Any]]]) -> None:
+        """Write documents with a single upsert call."""
+        if not documents:
+            return
+        ids, embeddings, contents, metadatas = (list(column) for column in zip(*documents))
+        await self._run(
+            collection.upsert,
+            ids=ids,
+            embeddings=embeddings,
+            documents=contents,
+            metadatas=metadatas
+        )
+        self.batches_written += 1
+        self.documents_written += len(ids)
+
+    @staticmethod
+    def _unique_by_id(documents: List[Tuple]) -> List[Tuple]:
+        """Keep the last version of each document; ChromaDB rejects duplicate ids in one call."""
+        return list({document[0]: document for document in documents}.values())
+
+    @staticmethod
+    def _where_clause(filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Build a ChromaDB where clause from equality/membership filters."""
+        if not filters:
+            return None
+        clauses = [
+            {key: {"$in": value} if isinstance(value, list) else {"$eq": value}}
+            for key, value in filters.items()
+        ]
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+    def _query_results(self, results: Dict[str, Any], index: int) -> List[Tuple[KnowledgeEntry, float]]:
+        """Turn the results of one query of a (multi-)query call into scored entries."""
+        entries = []
+        if results["ids"] and results["ids"][index]:
+            for i, doc_id in enumerate(results["ids"][index]):
+                distance = results["distances"][index][i] if results["distances"] else 0
+                similarity = 1 - distance  # Convert distance to similarity
+                metadata = results["metadatas"][index][i] if results["metadatas"] else {}
+                content = results["documents"][index][i] if results["documents"] else ""
+
+                entry = self._metadata_to_knowledge_entry(doc_id, content, metadata or {})
+                entries.append((entry, similarity))
+        return entries
+
+    @staticmethod
+    def _entry_metadata(entry: KnowledgeEntry) -> Dict[str, Any]:
+        """Flatten an entry into ChromaDB metadata."""
+        return {
+            "title": entry.title,
+            "category": entry.category,
+            "tags": ",".join(entry.tags) if entry.tags else "",
+            "source": entry.source or "",
+            "created_at": entry.created_at.isoformat() if entry.created_at else "",
+            "updated_at": entry.updated_at.isoformat() if entry.updated_at else ""
+        }
+
+    @staticmethod
+    def _write_json(path: str, data: Dict[str, Any]) -> None:
+        """Write a JSON file."""
+        with open(path, "w", encoding="utf-8") as backup_file:
+            json.dump(data, backup_file)
+
+    @staticmethod
+    def _read_json(path: str) -> Dict[str, Any]:
+        """Read a JSON file."""
+        with open(path, "r", encoding="utf-8") as backup_file:
+            return json.load(backup_file)
+
     def _metadata_to_knowledge_entry(
         self,
         doc_id: str,
@@ -270,34 +492,32 @@ class ChromaDBAdapter(VectorStoreInterface):
         metadata: Dict[str, Any]
     ) -> KnowledgeEntry:
         """Convert ChromaDB metadata back to KnowledgeEntry."""
-        from datetime import datetime
-        
         tags = []
         if metadata.get("tags"):
             tags = metadata["tags"].split(",")
-        
+
         created_at = None
         updated_at = None
-        
+
         if metadata.get("created_at"):
             try:
                 created_at = datetime.fromisoformat(metadata["created_at"])
-            except:
+            except ValueError:
                 pass
-                
+
         if metadata.get("updated_at"):
             try:
                 updated_at = datetime.fromisoformat(metadata["updated_at"])
-            except:
+            except ValueError:
                 pass
-        
+
         return KnowledgeEntry(
-            id=uuid.UUID(doc_id),
+            entry_id=uuid.UUID(doc_id),
             title=metadata.get("title", ""),
             content=content,
             category=metadata.get("category", ""),
             tags=tags,
-            source=metadata.get("source"),
+            source=metadata.get("source") or None,
             created_at=created_at,
             updated_at=updated_at
         )
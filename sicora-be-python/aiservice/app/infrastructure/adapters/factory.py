@@ -9,7 +9,7 @@ from app.application.interfaces.cache_interface import CacheInterface
 from app.infrastructure.adapters.openai_adapter import OpenAIAdapter
 from app.infrastructure.adapters.anthropic_adapter import AnthropicAdapter
 from app.infrastructure.adapters.huggingface_adapter import HuggingFaceAdapter
-# from app.infrastructure.adapters.chromadb_adapter import ChromaDBAdapter  # Temporarily disabled
+from app.infrastructure.adapters.local_vector_store import LocalVectorStoreAdapter
 from app.infrastructure.adapters.redis_adapter import RedisAdapter
 from app.domain.exceptions.ai_exceptions import AIProviderError
 
@@ -23,8 +23,8 @@ class AIProviderType(Enum):
 
 class VectorStoreType(Enum):
     """Available vector store types."""
-    # CHROMADB = "chromadb"  # Temporarily disabled
-    pass  # Placeholder until we add other vector stores
+    CHROMADB = "chromadb"
+    LOCAL = "local"
 
 
 class CacheType(Enum):
@@ -90,16 +90,27 @@ class AIServiceFactory:
             return self._vector_stores[cache_key]
         
         try:
-            # if store_type == VectorStoreType.CHROMADB:
-            #     adapter = ChromaDBAdapter(
-            #         host=config.get("host", "localhost"),
-            #         port=config.get("port", 8000),
-            #         collection_name=config.get("collection_name", "knowledge_base"),
-            #         persist_directory=config.get("persist_directory")
-            #     )
-            # else:
-            if True:  # Temporary: no vector stores available
-                raise ValueError(f"Unsupported vector store type: {store_type}")
+            if store_type == VectorStoreType.CHROMADB:
+                # Imported lazily: chromadb is an optional dependency
+                from app.infrastructure.adapters.chromadb_adapter import ChromaDBAdapter
+                adapter = ChromaDBAdapter(
+                    host=config.get("host", "localhost"),
+                    port=config.get("port", 8000),
+                    collection_name=config.get("collection_name", "knowledge_base"),
+                    persist_directory=config.get("persist_directory"),
+                    max_workers=config.get("max_workers", 4),
+                    batch_size=config.get("batch_size", 256),
+                    batch_wait_ms=config.get("batch_wait_ms", 10.0)
+                )
+            elif store_type == VectorStoreType.LOCAL:
+                adapter = LocalVectorStoreAdapter(
+                    path=config.get("path", "./vector_store"),
+                    collection_name=config.get("collection_name", "knowledge_base"),
+                    hnsw_threshold=config.get("hnsw_threshold", 20000),
+                    hnsw_m=config.get("hnsw_m", 16),
+                    hnsw_ef_construction=config.get("hnsw_ef_construction", 200),
+                    hnsw_ef_search=config.get("hnsw_ef_search", 64)
+                )
             else:
                 raise AIProviderError(f"Unsupported vector store type: {store_type}")
             
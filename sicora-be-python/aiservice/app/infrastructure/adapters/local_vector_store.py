@@ -0,0 +1,633 @@
+"""Embedded vector store adapter: memory-mapped vectors with SQLite metadata."""
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.application.interfaces.vector_store_interface import VectorStoreInterface
+from app.domain.entities.knowledge_entry import KnowledgeEntry
+from app.domain.exceptions.ai_exceptions import VectorStoreError
+
+try:
+    import hnswlib
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    HNSWLIB_AVAILABLE = False
+
+try:
+    import fcntl
+except ImportError:  # Windows: collections are not locked
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = "vectors.f32"
+METADATA_FILE = "metadata.db"
+INDEX_FILE = "index.hnsw"
+LOCK_FILE = "LOCK"
+INITIAL_CAPACITY = 1024
+
+METADATA_COLUMNS = ("title", "category", "tags", "source", "created_at", "updated_at")
+DOCUMENT_COLUMNS = ("entry_id", "content") + METADATA_COLUMNS
+# Metadata keys that can be used as search filters
+FILTER_COLUMNS = {"title", "category", "source"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    row INTEGER PRIMARY KEY,
+    entry_id TEXT NOT NULL UNIQUE,
+    content TEXT NOT NULL,
+    title TEXT,
+    category TEXT,
+    tags TEXT,
+    source TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_documents_category ON documents (category);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# (entry_id, embedding, content, metadata)
+StoredDocument = Tuple[str, Sequence[float], str, Dict[str, Any]]
+
+
+class LocalVectorStoreAdapter(VectorStoreInterface):
+    """Self-contained vector store that needs no external service.
+
+    Each collection is a directory holding a float32 matrix file that is
+    memory-mapped (one L2-normalised row per document) and a SQLite table
+    with the document text and metadata keyed by row. Collections smaller
+    than ``hnsw_threshold`` are searched exactly with one matrix product;
+    larger ones use an HNSW graph when hnswlib is installed. Opening a
+    collection only reads the id/row map, so cold start is immediate.
+
+    The id/row map and free rows are kept in memory, so a collection has a
+    single writer: the adapter holds an exclusive lock on the collection
+    directory until close(), and opening it from a second adapter or
+    process raises VectorStoreError.
+    """
+
+    def __init__(
+        self,
+        path: str = "./vector_store",
+        collection_name: str = "knowledge_base",
+        hnsw_threshold: int = 20000,
+        hnsw_m: int = 16,
+        hnsw_ef_construction: int = 200,
+        hnsw_ef_search: int = 64
+    ):
+        """Initialize the local vector store."""
+        self.path = path
+        self.hnsw_threshold = hnsw_threshold
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef_search = hnsw_ef_search
+        # Numpy and hnswlib release the GIL, so searches run in worker threads;
+        # the lock serialises them with writes that may remap the matrix.
+        self._lock = threading.RLock()
+
+        try:
+            self._open(collection_name)
+        except Exception as e:
+            raise VectorStoreError(f"Failed to open local vector store: {str(e)}")
+
+    async def add_document(
+        self,
+        entry: KnowledgeEntry,
+        embedding: List[float]
+    ) -> str:
+        """Add a document with its embedding to the vector store."""
+        document_id = str(entry.entry_id)
+        await self._run(self._write, [self._to_stored(entry, embedding)], "add document")
+        return document_id
+
+    async def bulk_add_documents(
+        self,
+        entries: List[Tuple[KnowledgeEntry, List[float]]]
+    ) -> List[str]:
+        """Bulk add multiple documents in a single write."""
+        documents = [self._to_stored(entry, embedding) for entry, embedding in entries]
+        await self._run(self._write, documents, "bulk add documents")
+        return [document[0] for document in documents]
+
+    async def search_similar(
+        self,
+        query_embedding: List[float],
+        limit: int = 10,
+        similarity_threshold: float = 0.7,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[KnowledgeEntry, float]]:
+        """Search for similar documents using embedding."""
+        results = await self.search_similar_batch(
+            [query_embedding], limit, similarity_threshold, filters
+        )
+        return results[0]
+
+    async def search_similar_batch(
+        self,
+        query_embeddings: List[List[float]],
+        limit: int = 10,
+        similarity_threshold: float = 0.7,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Tuple[KnowledgeEntry, float]]]:
+        """Search for several embeddings with one matrix product or HNSW query."""
+        if not query_embeddings:
+            return []
+        return await self._run(
+            self._search, query_embeddings, limit, similarity_threshold, filters, "search"
+        )
+
+    async def search_by_text(
+        self,
+        query: str,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[KnowledgeEntry, float]]:
+        """Search for documents containing the query terms, scored by the share of terms matched."""
+        return await self._run(self._search_text, query, limit, filters, "text search")
+
+    async def update_document(
+        self,
+        entry_id: str,
+        entry: KnowledgeEntry,
+        embedding: List[float]
+    ) -> bool:
+        """Update a document and its embedding."""
+        document = (entry_id,) + self._to_stored(entry, embedding)[1:]
+        await self._run(self._write, [document], "update document")
+        return True
+
+    async def delete_document(self, entry_id: str) -> bool:
+        """Delete a document from the vector store."""
+        return await self._run(self._delete, entry_id, "delete document")
+
+    async def get_document(self, entry_id: str) -> Optional[KnowledgeEntry]:
+        """Get a document by ID."""
+        entries = await self._run(self._fetch, "entry_id = ?", [entry_id], "get document")
+        return entries[0] if entries else None
+
+    async def get_documents_by_category(
+        self,
+        category: str,
+        limit: int = 100
+    ) -> List[KnowledgeEntry]:
+        """Get documents by category."""
+        return await self._run(
+            self._fetch, "category = ? ORDER BY row LIMIT ?", [category, limit], "get documents by category"
+        )
+
+    async def get_collection_stats(self) -> Dict[str, Any]:
+        """Get statistics about the vector store collection."""
+        with self._lock:
+            return {
+                "collection": self.collection_name,
+                "document_count": len(self._rows),
+                "dimension": self._dimension,
+                "capacity": self._capacity,
+                "index": "hnsw" if self._hnsw is not None else "brute_force",
+                "hnsw_available": HNSWLIB_AVAILABLE,
+                "hnsw_threshold": self.hnsw_threshold
+            }
+
+    async def create_collection(self, collection_name: str) -> bool:
+        """Create a new collection."""
+        try:
+            os.makedirs(os.path.join(self.path, collection_name), exist_ok=True)
+            connection = sqlite3.connect(os.path.join(self.path, collection_name, METADATA_FILE))
+            try:
+                connection.executescript(SCHEMA)
+            finally:
+                connection.close()
+            return True
+
+        except Exception as e:
+            raise VectorStoreError(f"Failed to create collection: {str(e)}")
+
+    async def delete_collection(self, collection_name: str) -> bool:
+        """Delete a collection."""
+        try:
+            with self._lock:
+                is_current = collection_name == self.collection_name
+                if is_current:
+                    self._close()
+                shutil.rmtree(os.path.join(self.path, collection_name), ignore_errors=True)
+                if is_current:
+                    self._open(collection_name)
+            return True
+
+        except Exception as e:
+            raise VectorStoreError(f"Failed to delete collection: {str(e)}")
+
+    async def list_collections(self) -> List[str]:
+        """List all collections in the store directory."""
+        return sorted(
+            name for name in os.listdir(self.path)
+            if os.path.isfile(os.path.join(self.path, name, METADATA_FILE))
+        )
+
+    async def backup_collection(self, backup_path: str) -> bool:
+        """Backup the collection to a JSON file (same layout as the ChromaDB adapter's backups)."""
+        await self._run(self._backup, backup_path, "backup collection")
+        return True
+
+    async def restore_collection(self, backup_path: str) -> bool:
+        """Restore the collection from a JSON backup."""
+        await self._run(self._restore, backup_path, "restore collection")
+        return True
+
+    async def close(self) -> None:
+        """Flush the vectors and persist the HNSW graph."""
+        with self._lock:
+            self._close()
+
+    async def _run(self, func: Callable, *args) -> Any:
+        """Run a store operation in a worker thread under the store lock."""
+        *args, action = args
+
+        def locked():
+            with self._lock:
+                return func(*args)
+
+        try:
+            return await asyncio.to_thread(locked)
+        except VectorStoreError:
+            raise
+        except Exception as e:
+            raise VectorStoreError(f"Failed to {action} in local vector store: {str(e)}")
+
+    def _open(self, collection_name: str) -> None:
+        """Open a collection, loading only the id/row map."""
+        self.collection_name = collection_name
+        self._directory = os.path.join(self.path, collection_name)
+        os.makedirs(self._directory, exist_ok=True)
+        self._lock_file = self._acquire_lock()
+
+        self._db = sqlite3.connect(os.path.join(self._directory, METADATA_FILE), check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._rows: Dict[str, int] = dict(self._db.execute("SELECT entry_id, row FROM documents"))
+        meta = dict(self._db.execute("SELECT key, value FROM store_meta"))
+        self._dimension: Optional[int] = int(meta["dimension"]) if "dimension" in meta else None
+        self._generation = int(meta.get("generation", 0))
+        self._index_generation = int(meta.get("index_generation", -1))
+
+        self._high_water = max(self._rows.values(), default=-1) + 1
+        self._free = sorted(set(range(self._high_water)) - set(self._rows.values()), reverse=True)
+        self._matrix: Optional[np.memmap] = None
+        self._capacity = 0
+        self._alive = np.zeros(0, dtype=bool)
+        self._hnsw = None
+
+        vectors_path = os.path.join(self._directory, VECTORS_FILE)
+        if self._dimension and os.path.exists(vectors_path):
+            self._map(os.path.getsize(vectors_path) // (self._dimension * 4))
+            self._alive[list(self._rows.values())] = True
+
+    def _close(self) -> None:
+        """Release the memory map and SQLite connection, saving the HNSW graph first."""
+        if self._matrix is not None:
+            self._matrix.flush()
+        if self._hnsw is not None and self._index_generation != self._generation:
+            self._save_index()
+        self._matrix = None
+        self._hnsw = None
+        self._db.close()
+        # Closing the file releases the lock
+        self._lock_file.close()
+
+    def _acquire_lock(self):
+        """Lock the collection directory for this adapter; the row allocator is not shared."""
+        lock_file = open(os.path.join(self._directory, LOCK_FILE), "a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                raise VectorStoreError(
+                    f"Collection {self.collection_name} is already open by another vector store "
+                    f"(only one process may write to {self._directory})"
+                )
+        return lock_file
+
+    def _map(self, capacity: int) -> None:
+        """Memory-map the vectors file with room for ``capacity`` rows."""
+        if self._matrix is not None:
+            self._matrix.flush()
+        with open(os.path.join(self._directory, VECTORS_FILE), "a+b") as vectors_file:
+            vectors_file.truncate(capacity * self._dimension * 4)
+        self._matrix = np.memmap(
+            os.path.join(self._directory, VECTORS_FILE),
+            dtype=np.float32,
+            mode="r+",
+            shape=(capacity, self._dimension)
+        )
+        self._alive = np.concatenate([self._alive, np.zeros(capacity - self._alive.size, dtype=bool)])
+        self._capacity = capacity
+        if self._hnsw is not None:
+            self._hnsw.resize_index(capacity)
+
+    def _reserve(self, rows_needed: int) -> None:
+        """Grow the vectors file geometrically so appends stay amortised O(1)."""
+        if rows_needed > self._capacity:
+            self._map(max(self._capacity * 2, rows_needed, INITIAL_CAPACITY))
+
+    def _normalize(self, embeddings: Sequence[Sequence[float]]) -> np.ndarray:
+        """Convert embeddings to unit-length float32 rows so a dot product is the cosine similarity."""
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2 or (self._dimension and vectors.shape[1] != self._dimension):
+            raise VectorStoreError(
+                f"Embedding dimension {vectors.shape[-1]} does not match the store dimension {self._dimension}"
+            )
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def _write(self, documents: List[StoredDocument]) -> None:
+        """Insert or replace documents: vectors into their rows, metadata into SQLite."""
+        # The last version of a document wins within one write
+        documents = list({document[0]: document for document in documents}.values())
+        if not documents:
+            return
+        vectors = self._normalize([document[1] for document in documents])
+        if self._dimension is None:
+            self._dimension = vectors.shape[1]
+            self._db.execute(
+                "INSERT INTO store_meta (key, value) VALUES ('dimension', ?)", (str(self._dimension),)
+            )
+
+        rows = []
+        for entry_id, *_ in documents:
+            row = self._rows.get(entry_id)
+            if row is None:
+                if self._free:
+                    row = self._free.pop()
+                else:
+                    row = self._high_water
+                    self._high_water += 1
+            rows.append(row)
+
+        self._reserve(self._high_water)
+        self._matrix[rows] = vectors
+        self._generation += 1
+        with self._db:
+            self._db.executemany(
+                f"INSERT INTO documents (row, {', '.join(DOCUMENT_COLUMNS)}) "
+                f"VALUES (?, {', '.join('?' for _ in DOCUMENT_COLUMNS)}) "
+                f"ON CONFLICT (entry_id) DO UPDATE SET "
+                f"{', '.join(f'{column} = excluded.{column}' for column in DOCUMENT_COLUMNS[1:])}",
+                [
+                    (row, entry_id, content) + tuple(metadata.get(column, "") for column in METADATA_COLUMNS)
+                    for row, (entry_id, _, content, metadata) in zip(rows, documents)
+                ]
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('generation', ?)", (str(self._generation),)
+            )
+
+        for row, (entry_id, *_) in zip(rows, documents):
+            self._rows[entry_id] = row
+        self._alive[rows] = True
+        if self._hnsw is not None:
+            self._hnsw.add_items(vectors, rows)
+
+    def _delete(self, entry_id: str) -> bool:
+        """Remove a document and free its row for reuse."""
+        row = self._rows.pop(entry_id, None)
+        if row is None:
+            return False
+        self._generation += 1
+        with self._db:
+            self._db.execute("DELETE FROM documents WHERE row = ?", (row,))
+            self._db.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('generation', ?)", (str(self._generation),)
+            )
+        self._alive[row] = False
+        self._matrix[row] = 0
+        self._free.append(row)
+        if self._hnsw is not None:
+            self._hnsw.mark_deleted(row)
+        return True
+
+    def _ensure_index(self) -> None:
+        """Load or build the HNSW graph once the collection crosses the threshold."""
+        if self._hnsw is not None or not HNSWLIB_AVAILABLE or len(self._rows) < self.hnsw_threshold:
+            return
+        index = hnswlib.Index(space="ip", dim=self._dimension)
+        index_path = os.path.join(self._directory, INDEX_FILE)
+        if self._index_generation == self._generation and os.path.exists(index_path):
+            index.load_index(index_path, max_elements=self._capacity)
+        else:
+            logger.info(f"Building HNSW index for {len(self._rows)} vectors in {self.collection_name}")
+            index.init_index(max_elements=self._capacity, ef_construction=self.hnsw_ef_construction, M=self.hnsw_m)
+            rows = np.flatnonzero(self._alive)
+            index.add_items(self._matrix[rows], rows)
+            self._hnsw = index
+            self._save_index()
+        self._hnsw = index
+
+    def _save_index(self) -> None:
+        """Persist the HNSW graph and record which write generation it reflects."""
+        self._hnsw.save_index(os.path.join(self._directory, INDEX_FILE))
+        self._index_generation = self._generation
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('index_generation', ?)",
+                (str(self._index_generation),)
+            )
+
+    def _search(
+        self,
+        query_embeddings: List[List[float]],
+        limit: int,
+        similarity_threshold: float,
+        filters: Optional[Dict[str, Any]]
+    ) -> List[List[Tuple[KnowledgeEntry, float]]]:
+        """Score the queries and resolve the best rows to entries."""
+        if not self._rows or limit <= 0:
+            return [[] for _ in query_embeddings]
+        queries = self._normalize(query_embeddings)
+
+        if filters:
+            # Filtered searches score the matching rows exactly
+            where, params = self._where_clause(filters)
+            candidates = np.fromiter(
+                (row for row, in self._db.execute(f"SELECT row FROM documents WHERE {where}", params)), dtype=np.int64
+            )
+            hits = self._exact_search(queries, candidates, limit)
+        else:
+            self._ensure_index()
+            hits = self._index_search(queries, limit) if self._hnsw is not None else None
+            if hits is None:
+                hits = self._exact_search(queries, None, limit)
+
+        hits = [[(row, score) for row, score in query_hits if score >= similarity_threshold] for query_hits in hits]
+        entries = self._entries_by_row(sorted({row for query_hits in hits for row, _ in query_hits}))
+        return [[(entries[row], score) for row, score in query_hits] for query_hits in hits]
+
+    def _exact_search(
+        self,
+        queries: np.ndarray,
+        candidates: Optional[np.ndarray],
+        limit: int
+    ) -> List[List[Tuple[int, float]]]:
+        """Brute-force cosine search with a single BLAS matrix product."""
+        if candidates is None:
+            scores = queries @ self._matrix[:self._high_water].T
+            scores[:, ~self._alive[:self._high_water]] = -np.inf
+            rows = np.arange(self._high_water)
+        else:
+            if candidates.size == 0:
+                return [[] for _ in queries]
+            scores = queries @ self._matrix[candidates].T
+            rows = candidates
+
+        k = min(limit, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for query_scores, query_top in zip(scores, top):
+            ordered = query_top[np.argsort(-query_scores[query_top])]
+            results.append([
+                (int(rows[i]), float(query_scores[i])) for i in ordered if np.isfinite(query_scores[i])
+            ])
+        return results
+
+    def _index_search(self, queries: np.ndarray, limit: int) -> Optional[List[List[Tuple[int, float]]]]:
+        """Approximate search on the HNSW graph; None when the graph cannot answer."""
+        k = min(limit, len(self._rows))
+        self._hnsw.set_ef(max(self.hnsw_ef_search, k))
+        try:
+            labels, distances = self._hnsw.knn_query(queries, k=k)
+        except RuntimeError as e:
+            logger.warning(f"HNSW query failed, falling back to exact search: {str(e)}")
+            return None
+        # Inner-product distance is 1 - cosine similarity for unit vectors
+        return [
+            [(int(row), 1 - float(distance)) for row, distance in zip(query_labels, query_distances)]
+            for query_labels, query_distances in zip(labels, distances)
+        ]
+
+    def _search_text(
+        self,
+        query: str,
+        limit: int,
+        filters: Optional[Dict[str, Any]]
+    ) -> List[Tuple[KnowledgeEntry, float]]:
+        """Rank documents by how many of the query terms they contain."""
+        terms = list(dict.fromkeys(query.lower().split()))
+        if not terms:
+            return []
+        matches = " + ".join("(instr(lower(title || ' ' || content), ?) > 0)" for _ in terms)
+        where, params = self._where_clause(filters) if filters else ("1 = 1", [])
+        cursor = self._db.execute(
+            f"SELECT {', '.join(DOCUMENT_COLUMNS)}, matches FROM ("
+            f"SELECT *, {matches} AS matches FROM documents WHERE {where}"
+            f") WHERE matches > 0 ORDER BY matches DESC, row LIMIT ?",
+            terms + params + [limit]
+        )
+        return [(self._row_to_entry(record[:-1]), record[-1] / len(terms)) for record in cursor]
+
+    def _fetch(self, where: str, params: List[Any]) -> List[KnowledgeEntry]:
+        """Load entries matching a WHERE clause."""
+        cursor = self._db.execute(f"SELECT {', '.join(DOCUMENT_COLUMNS)} FROM documents WHERE {where}", params)
+        return [self._row_to_entry(record) for record in cursor]
+
+    def _entries_by_row(self, rows: List[int]) -> Dict[int, KnowledgeEntry]:
+        """Load the entries stored in the given matrix rows with one query."""
+        if not rows:
+            return {}
+        cursor = self._db.execute(
+            f"SELECT row, {', '.join(DOCUMENT_COLUMNS)} FROM documents WHERE row IN ({', '.join('?' for _ in rows)})",
+            rows
+        )
+        return {record[0]: self._row_to_entry(record[1:]) for record in cursor}
+
+    @staticmethod
+    def _where_clause(filters: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        """Build a SQL condition from equality/membership filters on metadata."""
+        clauses, params = [], []
+        for key, value in filters.items():
+            values = value if isinstance(value, list) else [value]
+            if key == "tags":
+                clauses.append(
+                    "(" + " OR ".join("(',' || tags || ',') LIKE ?" for _ in values) + ")"
+                )
+                params.extend(f"%,{tag},%" for tag in values)
+            elif key in FILTER_COLUMNS:
+                clauses.append(f"{key} IN ({', '.join('?' for _ in values)})")
+                params.extend(values)
+            else:
+                raise VectorStoreError(f"Unsupported filter for local vector store: {key}")
+        return " AND ".join(clauses), params
+
+    def _backup(self, backup_path: str) -> None:
+        """Write every document with its vector to a JSON file."""
+        ids, embeddings, documents, metadatas = [], [], [], []
+        for record in self._db.execute(f"SELECT row, {', '.join(DOCUMENT_COLUMNS)} FROM documents ORDER BY row"):
+            row, entry_id, content, *metadata = record
+            ids.append(entry_id)
+            embeddings.append(self._matrix[row].tolist())
+            documents.append(content)
+            metadatas.append(dict(zip(METADATA_COLUMNS, metadata)))
+        with open(backup_path, "w", encoding="utf-8") as backup_file:
+            json.dump({
+                "collection": self.collection_name,
+                "ids": ids,
+                "embeddings": embeddings,
+                "documents": documents,
+                "metadatas": metadatas
+            }, backup_file)
+
+    def _restore(self, backup_path: str) -> None:
+        """Load documents from a JSON backup written by this or the ChromaDB adapter."""
+        with open(backup_path, "r", encoding="utf-8") as backup_file:
+            backup = json.load(backup_file)
+        self._write(list(zip(backup["ids"], backup["embeddings"], backup["documents"], backup["metadatas"])))
+
+    @staticmethod
+    def _to_stored(entry: KnowledgeEntry, embedding: List[float]) -> StoredDocument:
+        """Flatten an entry into the stored document layout."""
+        return (
+            str(entry.entry_id),
+            embedding,
+            entry.content,
+            {
+                "title": entry.title,
+                "category": entry.category,
+                "tags": ",".join(entry.tags) if entry.tags else "",
+                "source": entry.source or "",
+                "created_at": entry.created_at.isoformat() if entry.created_at else "",
+                "updated_at": entry.updated_at.isoformat() if entry.updated_at else ""
+            }
+        )
+
+    @staticmethod
+    def _row_to_entry(record: Tuple[Any, ...]) -> KnowledgeEntry:
+        """Convert a documents row back to a KnowledgeEntry."""
+        values = dict(zip(DOCUMENT_COLUMNS, record))
+        timestamps = {}
+        for key in ("created_at", "updated_at"):
+            try:
+                timestamps[key] = datetime.fromisoformat(values[key]) if values[key] else None
+            except ValueError:
+                timestamps[key] = None
+
+        return KnowledgeEntry(
+            entry_id=uuid.UUID(values["entry_id"]),
+            title=values["title"] or "",
+            content=values["content"],
+            category=values["category"] or "",
+            tags=values["tags"].split(",") if values["tags"] else [],
+            source=values["source"] or None,
+            **timestamps
+        )
@@ -0,0 +1,299 @@
+"""Semantic cache of chat answers, invalidated when the knowledge base changes."""
+
+import logging
+import re
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.application.interfaces.response_cache_interface import ResponseCacheInterface
+
+logger = logging.getLogger(__name__)
+
+Embedder = Callable[[str], Awaitable[List[float]]]
+
+# Recent query embeddings kept so storing an answer after a miss does not embed twice
+EMBEDDING_MEMO_SIZE = 256
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, strip accents and punctuation and collapse whitespace."""
+    text = unicodedata.normalize("NFKD", query.lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(re.sub(r"[^\w\s]", " ", text).split())
+
+
+class KnowledgeBaseVersion(ABC):
+    """Monotonic counter bumped on every knowledge base write."""
+
+    @abstractmethod
+    async def current(self) -> int:
+        """Get the current version."""
+        pass
+
+    @abstractmethod
+    async def bump(self) -> int:
+        """Increment and return the version."""
+        pass
+
+
+class LocalKnowledgeBaseVersion(KnowledgeBaseVersion):
+    """Version counter for a single process, bumped only through invalidate()."""
+
+    def __init__(self):
+        self._version = 0
+        self._lock = threading.Lock()
+
+    async def current(self) -> int:
+        return self._version
+
+    async def bump(self) -> int:
+        with self._lock:
+            self._version += 1
+            return self._version
+
+
+class RedisKnowledgeBaseVersion(KnowledgeBaseVersion):
+    """The version kbservice increments in Redis on every knowledge base write.
+
+    It is re-read at most every ``refresh_seconds``, so KB changes reach
+    the cache within that interval. If Redis is unreachable, the last known
+    version is kept.
+    """
+
+    KEY = "kbservice:kb_version"
+
+    def __init__(self, url: str, refresh_seconds: float):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url)
+        self.refresh_seconds = refresh_seconds
+        self._version = 0
+        self._checked_at: Optional[float] = None
+
+    async def current(self) -> int:
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.refresh_seconds:
+            try:
+                self._version = int(await self.client.get(self.KEY) or 0)
+            except Exception as e:
+                logger.warning(f"Could not read knowledge base version: {e}")
+            self._checked_at = now
+        return self._version
+
+    async def bump(self) -> int:
+        try:
+            self._version = int(await self.client.incr(self.KEY))
+        except Exception as e:
+            logger.warning(f"Could not bump knowledge base version: {e}")
+            self._version += 1
+        self._checked_at = time.monotonic()
+        return self._version
+
+
+class SemanticResponseCache(ResponseCacheInterface):
+    """In-process cache of answers keyed by question meaning.
+
+    A normalised question that was already answered in the same scope is a
+    hit without any embedding call. Otherwise the question is embedded and
+    compared with every cached question of the scope in one matrix-vector
+    product; the closest one is reused when its cosine similarity reaches
+    ``similarity_threshold``. Entries expire after ``ttl_seconds``, the
+    least recently used is evicted beyond ``max_entries``, and the whole
+    cache is dropped when the knowledge base version changes.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        version: Optional[KnowledgeBaseVersion] = None,
+        similarity_threshold: float = 0.95,
+        ttl_seconds: float = 21600,
+        max_entries: int = 2000
+    ):
+        self.embedder = embedder
+        self.version = version or LocalKnowledgeBaseVersion()
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._version_seen: Optional[int] = None
+        self._reset(dimension=None)
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+
+    async def lookup(self, query: str, scope: str) -> Tuple[Optional[Dict[str, Any]], int]:
+        """Get a cached answer for the query (or a close rewording of it) within a scope.
+
+        Also returns the knowledge base version seen, which store() needs.
+        """
+        version = await self._sync_version()
+        normalized = normalize_query(query)
+        if not normalized:
+            return None, version
+
+        with self._lock:
+            slot = self._exact.get((scope, normalized))
+            if slot is not None and self._expires[slot] > time.monotonic():
+                self.exact_hits += 1
+                return self._hit(slot, 1.0), version
+
+        embedding = await self._embed(normalized)
+        with self._lock:
+            slot, similarity = self._nearest(embedding, scope)
+            if slot is not None and similarity >= self.similarity_threshold:
+                self.semantic_hits += 1
+                return self._hit(slot, similarity), version
+            self.misses += 1
+            return None, version
+
+    async def store(self, query: str, scope: str, answer: Dict[str, Any], version: int) -> None:
+        """Cache an answer generated at the version a lookup returned.
+
+        The answer is dropped if the knowledge base changed since that
+        lookup, as it may rely on content that no longer exists.
+        """
+        normalized = normalize_query(query)
+        if not normalized or not answer.get("content"):
+            return
+        if await self._sync_version() != version:
+            return
+        embedding = await self._embed(normalized)
+
+        with self._lock:
+            if self._version_seen != version:
+                return  # Invalidated while embedding
+            if self._matrix is None or self._matrix.shape[1] != embedding.size:
+                # First answer, or the embedding model changed
+                self._reset(dimension=embedding.size)
+            key = (scope, normalized)
+            slot = self._exact.get(key)
+            if slot is None:
+                slot = self._free.pop() if self._free else self._evict_oldest()
+            self._matrix[slot] = embedding
+            self._slot_scopes[slot] = self._scope_ids.setdefault(scope, len(self._scope_ids))
+            self._expires[slot] = time.monotonic() + self.ttl_seconds
+            self._exact[key] = slot
+            self._slots[slot] = (key, dict(answer))
+            self._slots.move_to_end(slot)
+
+    async def invalidate(self) -> int:
+        """Drop every cached answer, returning the new knowledge base version."""
+        version = await self.version.bump()
+        with self._lock:
+            self._clear()
+            self._version_seen = version
+        return version
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit-rate metrics."""
+        hits = self.exact_hits + self.semantic_hits
+        lookups = hits + self.misses
+        return {
+            "entries": len(self._slots),
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "tokens_saved": self.tokens_saved,
+            "kb_version": self._version_seen
+        }
+
+    async def _sync_version(self) -> int:
+        """Drop the cache when the knowledge base changed since it was filled; returns the version."""
+        version = await self.version.current()
+        with self._lock:
+            if version != self._version_seen:
+                if self._version_seen is not None:
+                    logger.info(f"Knowledge base version {version}, dropping {len(self._slots)} cached answers")
+                self._clear()
+                self._version_seen = version
+        return version
+
+    async def _embed(self, normalized: str) -> np.ndarray:
+        """Embed a normalised question as a unit float32 vector, memoising recent ones."""
+        with self._lock:
+            embedding = self._embeddings.get(normalized)
+            if embedding is not None:
+                self._embeddings.move_to_end(normalized)
+                return embedding
+
+        vector = np.asarray(await self.embedder(normalized), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        embedding = vector / norm if norm else vector
+        with self._lock:
+            self._embeddings[normalized] = embedding
+            while len(self._embeddings) > EMBEDDING_MEMO_SIZE:
+                self._embeddings.popitem(last=False)
+        return embedding
+
+    def _nearest(self, embedding: np.ndarray, scope: str) -> Tuple[Optional[int], float]:
+        """Find the most similar live question of the scope."""
+        scope_id = self._scope_ids.get(scope)
+        if scope_id is None or self._matrix is None or self._matrix.shape[1] != embedding.size:
+            return None, 0.0
+        scores = self._matrix @ embedding
+        scores[(self._slot_scopes != scope_id) | (self._expires <= time.monotonic())] = -np.inf
+        slot = int(np.argmax(scores))
+        if not np.isfinite(scores[slot]):
+            return None, 0.0
+        return slot, float(scores[slot])
+
+    def _hit(self, slot: int, similarity: float) -> Dict[str, Any]:
+        """Return a cached answer and mark it recently used."""
+        self._slots.move_to_end(slot)
+        answer = self._slots[slot][1]
+        self.tokens_saved += answer.get("tokens") or 0
+        return {**answer, "cache_similarity": similarity}
+
+    def _evict_oldest(self) -> int:
+        """Free the least recently used slot."""
+        slot, (key, _) = self._slots.popitem(last=False)
+        del self._exact[key]
+        return slot
+
+    def _clear(self) -> None:
+        """Drop every entry, keeping the allocated matrix."""
+        self._reset(dimension=self._matrix.shape[1] if self._matrix is not None else None)
+
+    def _reset(self, dimension: Optional[int]) -> None:
+        """Allocate empty slots for embeddings of the given dimension."""
+        self._matrix = np.zeros((self.max_entries, dimension), dtype=np.float32) if dimension else None
+        self._slot_scopes = np.full(self.max_entries, -1, dtype=np.int32)
+        self._expires = np.zeros(self.max_entries)
+        self._scope_ids: Dict[str, int] = {}
+        self._exact: Dict[Tuple[str, str], int] = {}
+        self._slots: "OrderedDict[int, Tuple[Tuple[str, str], Dict[str, Any]]]" = OrderedDict()
+        self._free = list(range(self.max_entries - 1, -1, -1))
+
+
+def create_semantic_response_cache(embedder: Embedder, settings) -> Optional[SemanticResponseCache]:
+    """Create the semantic response cache from settings (None when disabled)."""
+    if not settings.SEMANTIC_CACHE_ENABLED:
+        return None
+
+    version: KnowledgeBaseVersion = LocalKnowledgeBaseVersion()
+    if settings.SEMANTIC_CACHE_KB_VERSION_REDIS_URL:
+        try:
+            version = RedisKnowledgeBaseVersion(
+                settings.SEMANTIC_CACHE_KB_VERSION_REDIS_URL,
+                settings.SEMANTIC_CACHE_KB_VERSION_REFRESH_SECONDS
+            )
+        except Exception as e:
+            logger.warning(f"Shared knowledge base version unavailable, using local counter: {e}")
+
+    return SemanticResponseCache(
+        embedder,
+        version,
+        similarity_threshold=settings.SEMANTIC_CACHE_SIMILARITY_THRESHOLD,
+        ttl_seconds=settings.SEMANTIC_CACHE_TTL_SECONDS,
+        max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES
+    )
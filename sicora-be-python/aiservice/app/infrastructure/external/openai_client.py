@@ -4,7 +4,7 @@ Cliente simplificado de OpenAI para el servicio de chat mejorado
 """
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
 from datetime import datetime
 
 from app.infrastructure.adapters.openai_adapter import OpenAIAdapter
@@ -122,6 +122,53 @@ class OpenAIClient:
             else:
                 raise AIProviderError(f"OpenAI API error: {str(e)}")
     
+    async def chat_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "gpt-4",
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Realizar completación de chat con OpenAI entregando el texto a medida que se genera.
+        
+        Args:
+            messages: Lista de mensajes en formato OpenAI
+            model: Nombre del modelo a usar
+            temperature: Temperatura para creatividad
+            max_tokens: Máximo número de tokens
+            **kwargs: Parámetros adicionales
+            
+        Yields:
+            Fragmentos de texto de la respuesta
+            
+        Raises:
+            ModelNotAvailableError: Modelo no disponible
+            AIProviderError: Error del proveedor de IA
+        """
+        if model not in self.default_models:
+            raise ModelNotAvailableError(f"Model {model} not available")
+        
+        message_objects = [
+            Message(
+                content=msg["content"],
+                role=msg["role"],
+                message_type=MessageType.TEXT,
+                timestamp=datetime.utcnow()
+            )
+            for msg in messages
+        ]
+        
+        async for chunk in self.adapter.generate_streaming_response(
+            messages=message_objects,
+            model=self.default_models[model],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        ):
+            yield chunk
+    
     async def create_embeddings(
         self,
         texts: List[str],
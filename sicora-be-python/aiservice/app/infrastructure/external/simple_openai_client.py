@@ -4,7 +4,8 @@ Cliente simulado de OpenAI para probar la integración sin dependencias externas
 """
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+import re
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +37,55 @@ class SimpleOpenAIClient:
         # Simular delay de API
         await asyncio.sleep(0.1)
         
+        user_message, response_content = self._mock_reply(messages)
+        
+        return {
+            "id": f"chatcmpl-mock-{hash(user_message) % 100000}",
+            "object": "chat.completion",
+            "created": int(asyncio.get_event_loop().time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {
+                        "role": "assistant",
+                        "content": response_content
+                    },
+                    "finish_reason": "stop"
+                }
+            ],
+            "usage": {
+                "prompt_tokens": sum(len(msg.get("content", "").split()) for msg in messages),
+                "completion_tokens": len(response_content.split()),
+                "total_tokens": sum(len(msg.get("content", "").split()) for msg in messages) + len(response_content.split())
+            }
+        }
+    
+    async def chat_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "gpt-4",
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Simula una respuesta de chat completion en streaming, fragmento a fragmento.
+        """
+        logger.info(f"Mock streaming ChatCompletion request with {len(messages)} messages")
+        
+        # Simular latencia hasta el primer token
+        await asyncio.sleep(0.05)
+        
+        _, response_content = self._mock_reply(messages)
+        for chunk in re.findall(r"\S+\s*|\s+", response_content):
+            await asyncio.sleep(0.01)
+            yield chunk
+    
+    def _mock_reply(self, messages: List[Dict[str, str]]) -> Tuple[str, str]:
+        """
+        Elige la respuesta simulada para el último mensaje del usuario.
+        """
         # Obtener el último mensaje del usuario
         user_message = ""
         for msg in reversed(messages):
@@ -64,27 +114,7 @@ Como asistente del sistema SICORA, estoy aquí para ayudarte con información so
 
 ¿Podrías ser más específico sobre lo que necesitas saber?"""
         
-        return {
-            "id": f"chatcmpl-mock-{hash(user_message) % 100000}",
-            "object": "chat.completion",
-            "created": int(asyncio.get_event_loop().time()),
-            "model": model,
-            "choices": [
-                {
-                    "index": 0,
-                    "message": {
-                        "role": "assistant",
-                        "content": response_content
-                    },
-                    "finish_reason": "stop"
-                }
-            ],
-            "usage": {
-                "prompt_tokens": sum(len(msg.get("content", "").split()) for msg in messages),
-                "completion_tokens": len(response_content.split()),
-                "total_tokens": sum(len(msg.get("content", "").split()) for msg in messages) + len(response_content.split())
-            }
-        }
+        return user_message, response_content
     
     async def create_embedding(self, text: str, model: str = "text-embedding-ada-002") -> List[float]:
         """
@@ -1,6 +1,6 @@
 """Conversation SQLAlchemy model."""
 
-from sqlalchemy import Column, String, Text, JSON, Integer, Float
+from sqlalchemy import Column, String, Text, JSON, Integer, Float, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy import ForeignKey
@@ -40,5 +40,10 @@ class MessageModel(BaseModel):
     # Relationship to conversation
     conversation = relationship("ConversationModel", back_populates="messages")
     
+    # Serves the latest-messages window of a conversation without a sort
+    __table_args__ = (
+        Index("ix_messages_conversation_id_created_at", "conversation_id", "created_at"),
+    )
+    
     def __repr__(self):
         return f"<Message(id={self.id}, role='{self.role}', content_preview='{self.content[:50]}...')>"
@@ -5,7 +5,7 @@ from typing import List, Optional
 from uuid import UUID
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, update, func, and_, or_
+from sqlalchemy import select, insert, delete, update, func, and_, or_
 from sqlalchemy.orm import selectinload
 
 from app.domain.entities.conversation import Conversation
@@ -178,6 +178,88 @@ class SQLAlchemyConversationRepository(ConversationRepository):
             logger.error(f"Error updating conversation: {str(e)}", exc_info=True)
             raise
     
+    async def append_messages(self, conversation_id: UUID, messages: List[Message]) -> None:
+        """Insert new messages and add them to the conversation's counters.
+        
+        Unlike update(), this neither reads the existing messages nor rewrites
+        the conversation row, so a chat turn costs the same however long the
+        conversation is. Counters move by atomic increments, so concurrent
+        turns do not overwrite each other.
+        """
+        if not messages:
+            return
+        try:
+            await self.session.execute(insert(MessageModel), [
+                {
+                    "id": message.message_id,
+                    "conversation_id": conversation_id,
+                    "content": message.content,
+                    "role": message.role.value,
+                    "message_type": message.message_type.value,
+                    "tokens": message.tokens,
+                    "model_used": message.model_used,
+                    "processing_time": message.processing_time,
+                    "message_metadata": message.metadata,
+                    "created_at": message.timestamp,
+                    "updated_at": message.timestamp,
+                    "is_active": True
+                }
+                for message in messages
+            ])
+            await self.session.execute(
+                update(ConversationModel).where(
+                    ConversationModel.id == conversation_id
+                ).values(
+                    message_count=ConversationModel.message_count + len(messages),
+                    total_tokens=ConversationModel.total_tokens + sum(message.tokens or 0 for message in messages),
+                    updated_at=max(message.timestamp for message in messages)
+                )
+            )
+            await self.session.commit()
+            
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error appending messages to conversation {conversation_id}: {str(e)}", exc_info=True)
+            raise
+    
+    async def get_with_recent_messages(
+        self,
+        conversation_id: UUID,
+        max_messages: int
+    ) -> Optional[Conversation]:
+        """Get a conversation with only its latest messages loaded, oldest first."""
+        try:
+            conversation_model = await self.session.get(ConversationModel, conversation_id)
+            if not conversation_model:
+                return None
+            
+            stmt = select(MessageModel).where(
+                MessageModel.conversation_id == conversation_id
+            ).order_by(
+                MessageModel.created_at.desc()
+            ).limit(max_messages)
+            result = await self.session.execute(stmt)
+            message_models = list(reversed(result.scalars().all()))
+            
+            return Conversation(
+                conversation_id=conversation_model.id,
+                user_id=conversation_model.user_id,
+                title=conversation_model.title,
+                messages=[self._message_to_entity(message_model) for message_model in message_models],
+                metadata=ConversationMetadata(
+                    message_count=conversation_model.message_count,
+                    total_tokens=conversation_model.total_tokens,
+                    last_activity=conversation_model.updated_at
+                ),
+                created_at=conversation_model.created_at,
+                updated_at=conversation_model.updated_at,
+                is_active=conversation_model.is_active
+            )
+            
+        except Exception as e:
+            logger.error(f"Error getting recent messages of conversation {conversation_id}: {str(e)}", exc_info=True)
+            return None
+    
     async def delete(self, conversation_id: UUID) -> bool:
         """Delete a conversation."""
         try:
@@ -303,20 +385,7 @@ class SQLAlchemyConversationRepository(ConversationRepository):
         """Convert SQLAlchemy model to domain entity."""
         try:
             # Convert messages
-            messages = []
-            for msg_model in model.messages:
-                message = Message(
-                    message_id=msg_model.id,
-                    content=msg_model.content,
-                    role=MessageRole(msg_model.role),
-                    message_type=MessageType(msg_model.message_type),
-                    tokens=msg_model.tokens,
-                    metadata=msg_model.metadata or {},
-                    timestamp=msg_model.created_at,
-                    model_used=msg_model.model_used,
-                    processing_time=msg_model.processing_time
-                )
-                messages.append(message)
+            messages = [self._message_to_entity(msg_model) for msg_model in model.messages]
             
             # Convert metadata
             metadata = ConversationMetadata(
@@ -343,3 +412,18 @@ class SQLAlchemyConversationRepository(ConversationRepository):
         except Exception as e:
             logger.error(f"Error converting model to entity: {str(e)}", exc_info=True)
             raise
+    
+    @staticmethod
+    def _message_to_entity(msg_model: MessageModel) -> Message:
+        """Convert a message row to its value object."""
+        return Message(
+            message_id=msg_model.id,
+            content=msg_model.content,
+            role=MessageRole(msg_model.role),
+            message_type=MessageType(msg_model.message_type),
+            tokens=msg_model.tokens,
+            metadata=msg_model.message_metadata or {},
+            timestamp=msg_model.created_at,
+            model_used=msg_model.model_used,
+            processing_time=msg_model.processing_time
+        )
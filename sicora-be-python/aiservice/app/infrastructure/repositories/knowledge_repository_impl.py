@@ -4,11 +4,12 @@ import logging
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, update, func, and_, or_
+from sqlalchemy import select, delete, update, func, and_, or_, values, column, bindparam
 from sqlalchemy.dialects.postgresql import insert
 
 from app.domain.entities.knowledge_entry import KnowledgeEntry
 from app.domain.repositories.knowledge_repository import KnowledgeRepository
+from app.domain.value_objects.embedding_matrix import EmbeddingMatrix
 from app.infrastructure.models.knowledge_model import KnowledgeEntryModel
 
 logger = logging.getLogger(__name__)
@@ -142,10 +143,6 @@ class SQLAlchemyKnowledgeRepository(KnowledgeRepository):
     ) -> List[KnowledgeEntry]:
         """Search knowledge entries by embedding similarity."""
         try:
-            # Note: This is a simplified implementation
-            # In production, you'd want to use vector similarity functions
-            # or integrate with a proper vector database
-            
             conditions = [
                 KnowledgeEntryModel.is_active == True,
                 KnowledgeEntryModel.embedding.is_not(None)
@@ -154,26 +151,36 @@ class SQLAlchemyKnowledgeRepository(KnowledgeRepository):
             if category:
                 conditions.append(KnowledgeEntryModel.category == category)
             
-            stmt = select(KnowledgeEntryModel).where(
+            # Load only ids and embeddings, score them in one matrix product
+            stmt = select(KnowledgeEntryModel.id, KnowledgeEntryModel.embedding).where(
                 and_(*conditions)
-            ).limit(limit * 2)  # Get more to filter by similarity
+            )
             
             result = await self.session.execute(stmt)
-            models = result.scalars().all()
+            rows = [row for row in result if row.embedding and len(row.embedding) == len(embedding)]
+            if not rows:
+                return []
+            
+            matrix = EmbeddingMatrix([row.embedding for row in rows])
+            hits = matrix.top_k(embedding, limit, threshold=similarity_threshold)
+            if not hits:
+                return []
+            
+            # Fetch full entries for the hits only
+            hit_ids = [rows[index].id for index, _ in hits]
+            models_stmt = select(KnowledgeEntryModel).where(KnowledgeEntryModel.id.in_(hit_ids))
+            models_result = await self.session.execute(models_stmt)
+            models = {model.id: model for model in models_result.scalars().all()}
             
-            # Calculate similarity and filter
             similar_entries = []
-            for model in models:
-                if model.embedding:
-                    similarity = self._calculate_cosine_similarity(embedding, model.embedding)
-                    if similarity >= similarity_threshold:
-                        entry = self._model_to_entity(model)
-                        entry.set_relevance_score(similarity)
-                        similar_entries.append(entry)
-            
-            # Sort by similarity and limit
-            similar_entries.sort(key=lambda x: x.relevance_score or 0, reverse=True)
-            return similar_entries[:limit]
+            for index, similarity in hits:
+                model = models.get(rows[index].id)
+                if model:
+                    entry = self._model_to_entity(model)
+                    entry.set_relevance_score(similarity)
+                    similar_entries.append(entry)
+            
+            return similar_entries
             
         except Exception as e:
             logger.error(f"Error searching knowledge entries by embedding: {str(e)}", exc_info=True)
@@ -307,8 +314,12 @@ class SQLAlchemyKnowledgeRepository(KnowledgeRepository):
             logger.error(f"Error getting tags: {str(e)}", exc_info=True)
             return []
     
-    async def get_entries_without_embeddings(self, limit: int = 100) -> List[KnowledgeEntry]:
-        """Get entries that don't have embeddings yet."""
+    async def get_entries_without_embeddings(
+        self,
+        limit: int = 100,
+        after_id: Optional[UUID] = None
+    ) -> List[KnowledgeEntry]:
+        """Get entries that don't have embeddings yet, in ID order after after_id (keyset pagination)."""
         try:
             stmt = select(KnowledgeEntryModel).where(
                 and_(
@@ -318,9 +329,10 @@ class SQLAlchemyKnowledgeRepository(KnowledgeRepository):
                         func.json_array_length(KnowledgeEntryModel.embedding) == 0
                     )
                 )
-            ).order_by(
-                KnowledgeEntryModel.created_at.asc()
-            ).limit(limit)
+            )
+            if after_id is not None:
+                stmt = stmt.where(KnowledgeEntryModel.id > after_id)
+            stmt = stmt.order_by(KnowledgeEntryModel.id).limit(limit)
             
             result = await self.session.execute(stmt)
             models = result.scalars().all()
@@ -335,27 +347,41 @@ class SQLAlchemyKnowledgeRepository(KnowledgeRepository):
         self, 
         updates: List[Dict[str, Any]]
     ) -> int:
-        """Bulk update embeddings for multiple entries."""
+        """Bulk update embeddings for multiple entries with a single statement."""
         try:
-            updated_count = 0
-            
-            for update_data in updates:
-                entry_id = update_data.get("entry_id")
-                embedding = update_data.get("embedding")
-                
-                if not entry_id or not embedding:
-                    continue
-                
+            rows = [
+                (update_data["entry_id"], update_data["embedding"])
+                for update_data in updates
+                if update_data.get("entry_id") and update_data.get("embedding")
+            ]
+            if not rows:
+                return 0
+            
+            if self.session.bind.dialect.name == "postgresql":
+                new_embeddings = values(
+                    column("id", KnowledgeEntryModel.id.type),
+                    column("embedding", KnowledgeEntryModel.embedding.type),
+                    name="new_embeddings"
+                ).data(rows)
                 stmt = update(KnowledgeEntryModel).where(
-                    KnowledgeEntryModel.id == entry_id
+                    KnowledgeEntryModel.id == new_embeddings.c.id
+                ).values(
+                    embedding=new_embeddings.c.embedding,
+                    updated_at=func.now()
+                ).execution_options(synchronize_session=False)
+                updated_count = (await self.session.execute(stmt)).rowcount
+            else:
+                # No column aliases on VALUES elsewhere (SQLite): one executemany UPDATE
+                stmt = update(KnowledgeEntryModel.__table__).where(
+                    KnowledgeEntryModel.id == bindparam("entry_id")
                 ).values(
-                    embedding=embedding,
+                    embedding=bindparam("new_embedding"),
                     updated_at=func.now()
                 )
-                
-                result = await self.session.execute(stmt)
-                if result.rowcount > 0:
-                    updated_count += 1
+                result = await self.session.execute(stmt, [
+                    {"entry_id": entry_id, "new_embedding": embedding} for entry_id, embedding in rows
+                ])
+                updated_count = result.rowcount if result.rowcount >= 0 else len(rows)
             
             await self.session.commit()
             return updated_count
@@ -419,23 +445,3 @@ class SQLAlchemyKnowledgeRepository(KnowledgeRepository):
             is_active=model.is_active,
             relevance_score=model.relevance_score
         )
-    
-    def _calculate_cosine_similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
-        """Calculate cosine similarity between two embeddings."""
-        try:
-            import math
-            
-            if len(embedding1) != len(embedding2):
-                return 0.0
-            
-            dot_product = sum(a * b for a, b in zip(embedding1, embedding2))
-            magnitude1 = math.sqrt(sum(a * a for a in embedding1))
-            magnitude2 = math.sqrt(sum(a * a for a in embedding2))
-            
-            if magnitude1 == 0 or magnitude2 == 0:
-                return 0.0
-            
-            return dot_product / (magnitude1 * magnitude2)
-            
-        except Exception:
-            return 0.0
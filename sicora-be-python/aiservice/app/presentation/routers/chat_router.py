@@ -24,6 +24,7 @@ from app.presentation.schemas.chat_schemas import (
     MessageCreate,
     MessageResponse
 )
+from app.presentation.streaming import sse_response
 
 router = APIRouter()
 
@@ -195,7 +196,10 @@ async def delete_conversation(
     response_model=ChatResponse,
     status_code=status.HTTP_200_OK,
     summary="Enviar mensaje",
-    description="Envía un mensaje y obtiene una respuesta del asistente IA."
+    description=(
+        "Envía un mensaje y obtiene una respuesta del asistente IA. "
+        "Con stream=true la respuesta llega como Server-Sent Events a medida que se genera."
+    )
 )
 async def send_message(
     chat_request: ChatRequest,
@@ -215,6 +219,10 @@ async def send_message(
             include_context=chat_request.include_context
         )
 
+        # Entregar los tokens a medida que se generan
+        if chat_request.stream:
+            return await sse_response(chat_use_case.stream_message(request_dto))
+
         # Enviar mensaje
         response = await chat_use_case.send_message(request_dto)
 
@@ -2,13 +2,16 @@
 Enhanced Chat Router - Simplificado
 Router para el servicio de chat mejorado con integración KBService
 """
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, Depends, status, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from typing import Dict, Any, Optional
 import logging
 from datetime import datetime
 from uuid import UUID
 
-from app.dependencies import get_enhanced_chat_service, get_current_user
+from app.dependencies import get_enhanced_chat_service, get_current_user, get_response_cache
+from app.application.interfaces.response_cache_interface import ResponseCacheInterface
 from app.application.services.enhanced_chat_service import EnhancedChatService
 from app.application.dtos.ai_dtos import EnhancedChatRequestDTO
 
@@ -19,11 +22,29 @@ from app.presentation.schemas.chat_schemas import (
     KnowledgeSearchRequest,
     HealthCheckResponse
 )
+from app.presentation.streaming import sse_response, send_events
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+def _to_request_dto(request: EnhancedChatRequest, user_id: UUID) -> EnhancedChatRequestDTO:
+    """Convertir el schema de la petición al DTO del servicio."""
+    return EnhancedChatRequestDTO(
+        message=request.message,
+        conversation_id=request.conversation_id,
+        user_id=user_id,
+        use_knowledge_base=request.use_knowledge_base,
+        search_categories=request.search_categories,
+        context_limit=request.context_limit,
+        model_name=request.model_name,
+        temperature=request.temperature,
+        max_tokens=request.max_tokens,
+        use_cache=request.use_cache,
+        metadata=request.metadata
+    )
+
+
 @router.post(
     "/enhanced",
     response_model=EnhancedChatResponse,
@@ -45,18 +66,7 @@ async def enhanced_chat(
         logger.info(f"Enhanced chat request: {request.message[:50]}...")
         
         # Convertir schema a DTO
-        dto_request = EnhancedChatRequestDTO(
-            message=request.message,
-            conversation_id=request.conversation_id,
-            user_id=UUID(current_user["user_id"]),
-            use_knowledge_base=request.use_knowledge_base,
-            search_categories=request.search_categories,
-            context_limit=request.context_limit,
-            model_name=request.model_name,
-            temperature=request.temperature,
-            max_tokens=request.max_tokens,
-            metadata=request.metadata
-        )
+        dto_request = _to_request_dto(request, UUID(current_user["user_id"]))
         
         # Generar respuesta usando el servicio mejorado
         response_message = await (
@@ -89,6 +99,70 @@ async def enhanced_chat(
         )
 
 
+@router.post(
+    "/enhanced/stream",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Chat Mejorado en Streaming",
+    description=(
+        "Igual que /enhanced, pero entrega la respuesta como Server-Sent Events: "
+        "start, un evento token por fragmento y done con las métricas."
+    )
+)
+async def enhanced_chat_stream(
+    request: EnhancedChatRequest,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    enhanced_chat_service: EnhancedChatService = Depends(
+        get_enhanced_chat_service
+    )
+) -> StreamingResponse:
+    """
+    Chat mejorado con contexto de KB, enviando los tokens a medida que se generan.
+    """
+    try:
+        logger.info(f"Enhanced chat stream request: {request.message[:50]}...")
+        dto_request = _to_request_dto(request, UUID(current_user["user_id"]))
+        return await sse_response(
+            enhanced_chat_service.stream_enhanced_response(dto_request, [])
+        )
+    except Exception as e:
+        logger.error(f"Error in enhanced chat stream: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error generating enhanced response: {str(e)}"
+        )
+
+
+@router.websocket("/enhanced/ws")
+async def enhanced_chat_websocket(
+    websocket: WebSocket,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    enhanced_chat_service: EnhancedChatService = Depends(
+        get_enhanced_chat_service
+    )
+) -> None:
+    """
+    Chat mejorado por WebSocket: cada mensaje JSON recibido es una petición
+    y su respuesta llega como una secuencia de eventos JSON.
+    """
+    await websocket.accept()
+    user_id = UUID(current_user["user_id"])
+    try:
+        while True:
+            payload = await websocket.receive_json()
+            try:
+                dto_request = _to_request_dto(EnhancedChatRequest(**payload), user_id)
+            except ValidationError as e:
+                await websocket.send_json({"event": "error", "data": {"detail": e.errors(include_url=False)}})
+                continue
+            await send_events(
+                websocket,
+                enhanced_chat_service.stream_enhanced_response(dto_request, [])
+            )
+    except WebSocketDisconnect:
+        logger.info("Enhanced chat websocket disconnected")
+
+
 @router.post(
     "/quick-answer",
     response_model=Dict[str, Any],
@@ -199,6 +273,43 @@ async def knowledge_search(
         )
 
 
+@router.get(
+    "/enhanced/cache/stats",
+    response_model=Dict[str, Any],
+    summary="Métricas del Caché de Respuestas",
+    description="Aciertos exactos y semánticos, fallos, tasa de acierto y tokens ahorrados."
+)
+async def response_cache_stats(
+    response_cache: Optional[ResponseCacheInterface] = Depends(get_response_cache)
+) -> Dict[str, Any]:
+    """
+    Métricas del caché semántico de respuestas.
+    """
+    if response_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **response_cache.stats()}
+
+
+@router.post(
+    "/enhanced/cache/invalidate",
+    response_model=Dict[str, Any],
+    summary="Invalidar Caché de Respuestas",
+    description="Descartar todas las respuestas en caché, p. ej. tras cambios en la base de conocimiento."
+)
+async def invalidate_response_cache(
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    response_cache: Optional[ResponseCacheInterface] = Depends(get_response_cache)
+) -> Dict[str, Any]:
+    """
+    Invalidar el caché semántico de respuestas.
+    """
+    if response_cache is None:
+        return {"enabled": False}
+    kb_version = await response_cache.invalidate()
+    logger.info(f"Response cache invalidated by {current_user['user_id']}, KB version {kb_version}")
+    return {"enabled": True, "kb_version": kb_version}
+
+
 @router.get(
     "/health",
     response_model=HealthCheckResponse,
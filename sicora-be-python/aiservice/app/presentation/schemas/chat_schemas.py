@@ -211,6 +211,7 @@ class EnhancedChatRequest(BaseModel):
     model_name: Optional[str] = Field(None, description="AI model to use")
     temperature: Optional[float] = Field(default=0.7, ge=0.0, le=2.0, description="Response creativity")
     max_tokens: Optional[int] = Field(default=1000, ge=1, le=4000, description="Max tokens in response")
+    use_cache: bool = Field(default=True, description="Allow reusing a cached answer to the same question; false opts the user out")
     metadata: Optional[Dict[str, Any]] = Field(None, description="Additional request metadata")
 
     model_config = ConfigDict(
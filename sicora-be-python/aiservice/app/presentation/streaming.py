@@ -0,0 +1,59 @@
+"""
+Streaming helpers
+Utilidades para entregar respuestas de chat como Server-Sent Events o por WebSocket
+"""
+import json
+import logging
+from typing import AsyncIterator
+
+from fastapi import WebSocket
+from fastapi.responses import StreamingResponse
+
+from app.application.dtos.ai_dtos import ChatStreamEventDTO
+
+logger = logging.getLogger(__name__)
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    # Evita que nginx acumule la respuesta antes de enviarla
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse(event: ChatStreamEventDTO) -> str:
+    """Serializar un evento en el formato de Server-Sent Events."""
+    return f"event: {event.event}\ndata: {json.dumps(event.data, ensure_ascii=False, default=str)}\n\n"
+
+
+async def _guarded(events: AsyncIterator[ChatStreamEventDTO]) -> AsyncIterator[ChatStreamEventDTO]:
+    """Convertir un error a mitad del stream en un evento "error" en lugar de cortar la conexión."""
+    try:
+        async for event in events:
+            yield event
+    except Exception as e:
+        logger.error(f"Error while streaming chat response: {str(e)}")
+        yield ChatStreamEventDTO(event="error", data={"detail": str(e)})
+
+
+async def sse_response(events: AsyncIterator[ChatStreamEventDTO]) -> StreamingResponse:
+    """Respuesta HTTP que envía cada evento en cuanto se produce.
+
+    El primer evento se obtiene antes de responder, así los errores de
+    preparación (conversación inexistente, modelo no disponible) siguen
+    llegando como errores HTTP en lugar de dentro de un stream con estado 200.
+    """
+    first_event = await events.__anext__()
+
+    async def body() -> AsyncIterator[str]:
+        yield format_sse(first_event)
+        async for event in _guarded(events):
+            yield format_sse(event)
+
+    return StreamingResponse(body(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+async def send_events(websocket: WebSocket, events: AsyncIterator[ChatStreamEventDTO]) -> None:
+    """Enviar cada evento como un mensaje JSON por el WebSocket."""
+    async for event in _guarded(events):
+        await websocket.send_json(event.model_dump(mode="json"))
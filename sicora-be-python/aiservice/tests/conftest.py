@@ -0,0 +1,22 @@
+"""Pytest configuration for AIService tests."""
+
+from typing import AsyncGenerator
+
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+from app.infrastructure.models import Base
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path) -> AsyncGenerator[async_sessionmaker, None]:
+    """Session factory over a fresh database file with every table created.
+
+    Unlike an in-memory database, every session gets its own connection, as
+    in production, so work done on a closed or separate session is visible.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ai.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
@@ -0,0 +1,88 @@
+"""Tests for persisting streamed chat turns."""
+
+import asyncio
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+from sqlalchemy import event
+
+from app.application.dtos.ai_dtos import ChatRequestDTO
+from app.application.use_cases.chat_use_cases import ChatUseCase
+from app.domain.entities.ai_model import AIModel
+from app.infrastructure.models.conversation_model import ConversationModel
+from app.infrastructure.repositories.conversation_repository_impl import SQLAlchemyConversationRepository
+
+
+class StreamingProvider:
+    """AI provider that streams a fixed reply."""
+
+    async def generate_streaming_response(self, messages, model, **kwargs):
+        for chunk in ("El aprendiz ", "debe justificar ", "la falta."):
+            yield chunk
+
+
+class TestChatUseCaseStreaming:
+    """Test cases for ChatUseCase.stream_message."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.user_id = uuid4()
+        self.ai_model_repo = MagicMock()
+        self.ai_model_repo.get_default_model = AsyncMock(return_value=AIModel(name="gpt-test"))
+
+    @pytest.mark.asyncio
+    async def test_streamed_turn_is_stored_after_the_request_session_closes(self, session_factory):
+        """Test that a turn streamed after the request's session closed is still persisted."""
+        # Arrange
+        @asynccontextmanager
+        async def open_conversation_repository():
+            async with session_factory() as session:
+                yield SQLAlchemyConversationRepository(session)
+
+        conversation_id = uuid4()
+        async with session_factory() as session:
+            session.add(ConversationModel(id=conversation_id, user_id=self.user_id))
+            await session.commit()
+
+        request_session = session_factory()
+        use_case = ChatUseCase(
+            conversation_repo=SQLAlchemyConversationRepository(request_session),
+            ai_model_repo=self.ai_model_repo,
+            knowledge_repo=MagicMock(),
+            ai_provider=StreamingProvider(),
+            vector_store=MagicMock(),
+            cache=AsyncMock(),
+            conversation_repo_scope=open_conversation_repository
+        )
+        events = use_case.stream_message(ChatRequestDTO(
+            conversation_id=conversation_id,
+            user_id=self.user_id,
+            message="¿Qué hago si falto?",
+            use_knowledge_base=False
+        ))
+
+        # Act
+        await events.__anext__()
+        # The request's dependencies are torn down before the body streams
+        await request_session.close()
+        reopened = []
+        event.listen(request_session.sync_session, "after_begin", lambda *args: reopened.append(args))
+        rest = [event async for event in events]
+        conversation = None
+        for _ in range(100):
+            async with session_factory() as session:
+                conversation = await SQLAlchemyConversationRepository(session).get_with_recent_messages(
+                    conversation_id, 10
+                )
+            if len(conversation.messages) == 2:
+                break
+            await asyncio.sleep(0.01)
+
+        # Assert
+        assert rest[-1].event == "done"
+        assert [message.content for message in conversation.messages] == [
+            "¿Qué hago si falto?", "El aprendiz debe justificar la falta."
+        ]
+        assert conversation.metadata.message_count == 2
+        assert reopened == []
@@ -0,0 +1,220 @@
+"""Tests for batching writes and queries in the ChromaDB adapter."""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.domain.entities.knowledge_entry import KnowledgeEntry
+from app.domain.exceptions.ai_exceptions import VectorStoreError
+from app.infrastructure.adapters import chromadb_adapter
+from app.infrastructure.adapters.chromadb_adapter import ChromaDBAdapter
+
+
+class FakeCollection:
+    """In-memory stand-in for a ChromaDB collection that records every call."""
+
+    def __init__(self):
+        self.calls = []
+        self.query_results = None
+        # Cleared to hold an upsert on the adapter's thread pool
+        self.upsert_allowed = threading.Event()
+        self.upsert_allowed.set()
+
+    def upsert(self, ids, embeddings, documents, metadatas):
+        self.upsert_allowed.wait(timeout=5)
+        self.calls.append(("upsert", ids, documents))
+
+    def update(self, ids, embeddings, documents, metadatas):
+        self.calls.append(("update", ids, documents))
+
+    def delete(self, ids):
+        self.calls.append(("delete", ids))
+
+    def query(self, query_embeddings, n_results, where, include):
+        self.calls.append(("query", query_embeddings, where))
+        return self.query_results
+
+
+@pytest.fixture
+def collection(monkeypatch) -> FakeCollection:
+    """Point new adapters at a fake client serving one fake collection."""
+    collection = FakeCollection()
+    client = SimpleNamespace(get_or_create_collection=lambda **kwargs: collection)
+    monkeypatch.setattr(chromadb_adapter, "chromadb", SimpleNamespace(HttpClient=lambda **kwargs: client))
+    monkeypatch.setattr(chromadb_adapter, "Settings", dict)
+    return collection
+
+
+class TestChromaDBAdapterBatching:
+    """Test cases for coalescing add_document calls into upserts."""
+
+    @pytest.fixture(autouse=True)
+    def adapters(self, collection):
+        """Track the adapters a test creates and release their thread pools."""
+        self.collection = collection
+        self.adapters = []
+        yield self.adapters
+        # Let a held upsert finish so the pools can shut down
+        collection.upsert_allowed.set()
+        for adapter in self.adapters:
+            adapter._executor.shutdown(wait=True)
+
+    def create_adapter(self, batch_size: int = 100, batch_wait_ms: float = 10_000) -> ChromaDBAdapter:
+        """Create an adapter whose batches only flush on size unless a short wait is given."""
+        adapter = ChromaDBAdapter(batch_size=batch_size, batch_wait_ms=batch_wait_ms)
+        self.adapters.append(adapter)
+        return adapter
+
+    def create_entry(self, content: str, entry_id=None) -> KnowledgeEntry:
+        """Create a knowledge entry for testing."""
+        return KnowledgeEntry(entry_id=entry_id, title="Reglamento", content=content, category="asistencia")
+
+    @pytest.mark.asyncio
+    async def test_full_batch_is_written_with_one_upsert(self):
+        """Test that reaching batch_size writes the queued documents without waiting for the timer."""
+        # Arrange
+        adapter = self.create_adapter(batch_size=3)
+        entries = [self.create_entry(f"Artículo {number}") for number in range(3)]
+
+        # Act
+        ids = await asyncio.wait_for(
+            asyncio.gather(*(adapter.add_document(entry, [0.1, 0.2]) for entry in entries)), 2
+        )
+
+        # Assert
+        assert ids == [str(entry.entry_id) for entry in entries]
+        assert self.collection.calls == [("upsert", ids, ["Artículo 0", "Artículo 1", "Artículo 2"])]
+        assert (adapter.batches_written, adapter.documents_written) == (1, 3)
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_is_written_when_the_timer_fires(self):
+        """Test that documents below batch_size are written once batch_wait_ms elapses."""
+        # Arrange
+        adapter = self.create_adapter(batch_wait_ms=5)
+        entries = [self.create_entry("Horario"), self.create_entry("Permisos")]
+
+        # Act
+        ids = await asyncio.wait_for(
+            asyncio.gather(*(adapter.add_document(entry, [0.1, 0.2]) for entry in entries)), 2
+        )
+
+        # Assert
+        assert self.collection.calls == [("upsert", ids, ["Horario", "Permisos"])]
+        assert adapter._flush_timer is None
+
+    @pytest.mark.asyncio
+    async def test_duplicate_ids_keep_the_last_version(self):
+        """Test that one batch never sends the same id twice and keeps the latest content."""
+        # Arrange
+        adapter = self.create_adapter(batch_size=3)
+        entry_id = uuid4()
+
+        # Act
+        ids = await asyncio.wait_for(asyncio.gather(
+            adapter.add_document(self.create_entry("Versión 1", entry_id), [0.1, 0.2]),
+            adapter.add_document(self.create_entry("Otro", None), [0.3, 0.4]),
+            adapter.add_document(self.create_entry("Versión 2", entry_id), [0.5, 0.6])
+        ), 2)
+
+        # Assert
+        assert ids[0] == ids[2] == str(entry_id)
+        assert self.collection.calls == [("upsert", [str(entry_id), ids[1]], ["Versión 2", "Otro"])]
+
+    @pytest.mark.asyncio
+    async def test_queued_add_is_written_before_update_and_delete(self):
+        """Test that an update or delete never lands before a queued add of the same document."""
+        # Arrange
+        adapter = self.create_adapter()
+        entry = self.create_entry("Versión 1")
+        document_id = str(entry.entry_id)
+        add = asyncio.create_task(adapter.add_document(entry, [0.1, 0.2]))
+        await asyncio.sleep(0)
+
+        # Act
+        await adapter.update_document(document_id, self.create_entry("Versión 2", entry.entry_id), [0.3, 0.4])
+        await adapter.delete_document(document_id)
+
+        # Assert
+        assert add.done()
+        assert self.collection.calls == [
+            ("upsert", [document_id], ["Versión 1"]),
+            ("update", [document_id], ["Versión 2"]),
+            ("delete", [document_id])
+        ]
+
+    @pytest.mark.asyncio
+    async def test_write_cancelled_by_close_fails_its_callers(self):
+        """Test that callers of an in-flight batch get an error when close() is cancelled."""
+        # Arrange
+        adapter = self.create_adapter(batch_size=1)
+        self.collection.upsert_allowed.clear()
+        add = asyncio.create_task(adapter.add_document(self.create_entry("Horario"), [0.1, 0.2]))
+        await asyncio.sleep(0.05)
+        close = asyncio.create_task(adapter.close())
+        await asyncio.sleep(0)
+
+        # Act
+        close.cancel()
+
+        # Assert
+        with pytest.raises(VectorStoreError, match="cancelled"):
+            await asyncio.wait_for(add, 2)
+
+    @pytest.mark.asyncio
+    async def test_write_cancelled_before_it_starts_fails_its_callers(self):
+        """Test that callers do not hang when their batch task is cancelled before running."""
+        # Arrange
+        adapter = self.create_adapter(batch_size=1)
+        add = asyncio.create_task(adapter.add_document(self.create_entry("Horario"), [0.1, 0.2]))
+        await asyncio.sleep(0)
+
+        # Act
+        for task in list(adapter._write_tasks):
+            task.cancel()
+
+        # Assert
+        with pytest.raises(VectorStoreError, match="cancelled"):
+            await asyncio.wait_for(add, 2)
+        assert self.collection.calls == []
+
+
+class TestChromaDBAdapterSearchBatch:
+    """Test cases for answering several queries with one ChromaDB call."""
+
+    @pytest.fixture(autouse=True)
+    def adapter(self, collection):
+        """Create an adapter over the fake collection."""
+        self.collection = collection
+        self.adapter = ChromaDBAdapter()
+        yield self.adapter
+        self.adapter._executor.shutdown(wait=True)
+
+    @pytest.mark.asyncio
+    async def test_results_are_split_per_query_and_thresholded(self):
+        """Test that each query gets its own hits above the similarity threshold."""
+        # Arrange
+        first, second, third = (str(uuid4()) for _ in range(3))
+        self.collection.query_results = {
+            "ids": [[first, second], [third]],
+            "distances": [[0.1, 0.6], [0.2]],
+            "documents": [["Excusa firmada", "Horario"], ["Permisos"]],
+            "metadatas": [[{"title": "Faltas"}, {"title": "Horario"}], [{"title": "Permisos"}]]
+        }
+
+        # Act
+        results = await self.adapter.search_similar_batch(
+            [[1.0, 0.0], [0.0, 1.0]], limit=2, similarity_threshold=0.7, filters={"category": "asistencia"}
+        )
+
+        # Assert
+        assert [[(str(entry.entry_id), entry.content) for entry, _ in hits] for hits in results] == [
+            [(first, "Excusa firmada")],
+            [(third, "Permisos")]
+        ]
+        assert [similarity for hits in results for _, similarity in hits] == pytest.approx([0.9, 0.8])
+        assert self.collection.calls == [
+            ("query", [[1.0, 0.0], [0.0, 1.0]], {"category": {"$eq": "asistencia"}})
+        ]
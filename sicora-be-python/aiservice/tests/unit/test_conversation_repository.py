@@ -0,0 +1,173 @@
+"""Tests for appending chat turns to stored conversations."""
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+from sqlalchemy import select
+
+from app.application.dtos.ai_dtos import ChatRequestDTO
+from app.application.use_cases.chat_use_cases import ChatUseCase
+from app.domain.entities.ai_model import AIModel
+from app.domain.value_objects.message import Message, MessageRole
+from app.infrastructure.models.conversation_model import ConversationModel, MessageModel
+from app.infrastructure.repositories.conversation_repository_impl import SQLAlchemyConversationRepository
+
+START = datetime(2025, 7, 1, 8, 0, 0)
+
+
+class TestSQLAlchemyConversationRepository:
+    """Test cases for append_messages and get_with_recent_messages."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.user_id = uuid4()
+
+    async def create_conversation(self, session_factory, message_count: int = 0, total_tokens: int = 0):
+        """Store an empty conversation row with the given counters."""
+        conversation_id = uuid4()
+        async with session_factory() as session:
+            session.add(ConversationModel(
+                id=conversation_id,
+                user_id=self.user_id,
+                message_count=message_count,
+                total_tokens=total_tokens
+            ))
+            await session.commit()
+        return conversation_id
+
+    def create_message(self, number: int, role: MessageRole = MessageRole.USER, **fields) -> Message:
+        """Create a message sent `number` minutes after START."""
+        return Message(
+            content=f"Mensaje {number}",
+            role=role,
+            timestamp=START + timedelta(minutes=number),
+            **fields
+        )
+
+    @pytest.mark.asyncio
+    async def test_append_messages_increments_counters(self, session_factory):
+        """Test that each append adds to the stored counters instead of overwriting them."""
+        # Arrange
+        conversation_id = await self.create_conversation(session_factory, message_count=4, total_tokens=30)
+
+        # Act
+        async with session_factory() as session:
+            await SQLAlchemyConversationRepository(session).append_messages(conversation_id, [
+                self.create_message(1, tokens=5),
+                self.create_message(2, MessageRole.ASSISTANT, tokens=None)
+            ])
+        async with session_factory() as session:
+            await SQLAlchemyConversationRepository(session).append_messages(conversation_id, [
+                self.create_message(3, tokens=7)
+            ])
+        async with session_factory() as session:
+            stored = await session.get(ConversationModel, conversation_id)
+
+        # Assert
+        assert (stored.message_count, stored.total_tokens) == (7, 42)
+        assert stored.updated_at == START + timedelta(minutes=3)
+
+    @pytest.mark.asyncio
+    async def test_recent_messages_are_the_newest_oldest_first(self, session_factory):
+        """Test that the window keeps the latest messages in conversation order."""
+        # Arrange
+        conversation_id = await self.create_conversation(session_factory)
+        async with session_factory() as session:
+            # Inserted out of order: the window follows the timestamps
+            await SQLAlchemyConversationRepository(session).append_messages(
+                conversation_id, [self.create_message(number) for number in (3, 1, 5, 2, 4)]
+            )
+
+        # Act
+        async with session_factory() as session:
+            repo = SQLAlchemyConversationRepository(session)
+            conversation = await repo.get_with_recent_messages(conversation_id, 3)
+            missing = await repo.get_with_recent_messages(uuid4(), 3)
+
+        # Assert
+        assert [message.content for message in conversation.messages] == ["Mensaje 3", "Mensaje 4", "Mensaje 5"]
+        assert conversation.metadata.message_count == 5
+        assert conversation.user_id == self.user_id
+        assert missing is None
+
+    @pytest.mark.asyncio
+    async def test_message_metadata_round_trips(self, session_factory):
+        """Test that message metadata and generation details are read back as written."""
+        # Arrange
+        conversation_id = await self.create_conversation(session_factory)
+        metadata = {"knowledge_sources": [{"id": "reglamento", "score": 0.91}], "incomplete": True}
+        message = self.create_message(
+            1, MessageRole.ASSISTANT, tokens=12, model_used="gpt-test", processing_time=0.5, metadata=metadata
+        )
+
+        # Act
+        async with session_factory() as session:
+            await SQLAlchemyConversationRepository(session).append_messages(conversation_id, [message])
+        async with session_factory() as session:
+            conversation = await SQLAlchemyConversationRepository(session).get_with_recent_messages(
+                conversation_id, 10
+            )
+
+        # Assert
+        stored = conversation.messages[0]
+        assert stored.message_id == message.message_id
+        assert stored.role == MessageRole.ASSISTANT
+        assert stored.metadata == metadata
+        assert (stored.tokens, stored.model_used, stored.processing_time) == (12, "gpt-test", 0.5)
+
+
+class TestChatUseCaseSendMessage:
+    """Test cases for persisting non-streamed chat turns."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.user_id = uuid4()
+        self.ai_model_repo = MagicMock()
+        self.ai_model_repo.get_default_model = AsyncMock(return_value=AIModel(name="gpt-test"))
+        self.ai_provider = MagicMock()
+        # Built on each call so the reply is timestamped after the user message
+        self.ai_provider.generate_response = AsyncMock(side_effect=lambda **kwargs: Message(
+            content="Presenta la excusa firmada.", role=MessageRole.ASSISTANT, tokens=4, model_used="gpt-test"
+        ))
+
+    @pytest.mark.asyncio
+    async def test_send_message_persists_only_the_turn(self, session_factory):
+        """Test that a turn adds its two messages and leaves earlier ones untouched."""
+        # Arrange
+        conversation_id = uuid4()
+        async with session_factory() as session:
+            session.add(ConversationModel(id=conversation_id, user_id=self.user_id))
+            await session.commit()
+            await SQLAlchemyConversationRepository(session).append_messages(conversation_id, [
+                Message(content="Hola", role=MessageRole.USER, timestamp=START),
+                Message(content="¿Qué necesitas?", role=MessageRole.ASSISTANT, timestamp=START + timedelta(minutes=1))
+            ])
+
+        # Act
+        async with session_factory() as session:
+            use_case = ChatUseCase(
+                conversation_repo=SQLAlchemyConversationRepository(session),
+                ai_model_repo=self.ai_model_repo,
+                knowledge_repo=MagicMock(),
+                ai_provider=self.ai_provider,
+                vector_store=MagicMock(),
+                cache=AsyncMock()
+            )
+            response = await use_case.send_message(ChatRequestDTO(
+                conversation_id=conversation_id,
+                user_id=self.user_id,
+                message="¿Cómo justifico una falta?",
+                use_knowledge_base=False
+            ))
+        async with session_factory() as session:
+            contents = (await session.execute(
+                select(MessageModel.content).where(MessageModel.conversation_id == conversation_id)
+                .order_by(MessageModel.created_at)
+            )).scalars().all()
+            stored = await session.get(ConversationModel, conversation_id)
+
+        # Assert
+        assert response.response == "Presenta la excusa firmada."
+        assert contents == ["Hola", "¿Qué necesitas?", "¿Cómo justifico una falta?", "Presenta la excusa firmada."]
+        assert (stored.message_count, stored.total_tokens) == (4, 4)
@@ -0,0 +1,257 @@
+"""Tests for the embedded vector store adapter."""
+
+import json
+import os
+
+import pytest
+
+from app.domain.entities.knowledge_entry import KnowledgeEntry
+from app.domain.exceptions.ai_exceptions import VectorStoreError
+from app.infrastructure.adapters.local_vector_store import INDEX_FILE, LocalVectorStoreAdapter
+
+# Titles and embeddings; "Permisos" has cosine 0.8 with "Faltas" and 0.6 with "Horario"
+DOCUMENTS = {
+    "Faltas": ([1.0, 0.0, 0.0], "asistencia", ["excusa"]),
+    "Horario": ([0.0, 2.0, 0.0], "formacion", ["jornada"]),
+    "Permisos": ([0.8, 0.6, 0.0], "asistencia", ["excusa", "permiso"]),
+}
+
+
+class LocalVectorStoreTestCase:
+    """Shared fixtures for tests over a store in a temporary directory."""
+
+    store_options = {}
+
+    @pytest.fixture(autouse=True)
+    def store(self, tmp_path):
+        """Open a store in a fresh directory and close every store opened by the test."""
+        self.path = str(tmp_path / "store")
+        self.stores = []
+        self.store = self.open_store()
+        yield self.store
+        for store in self.stores:
+            store._close()
+
+    def open_store(self, path: str = None) -> LocalVectorStoreAdapter:
+        """Open a store on the test directory (or another one)."""
+        store = LocalVectorStoreAdapter(path=path or self.path, **self.store_options)
+        self.stores.append(store)
+        return store
+
+    async def add_documents(self, titles=tuple(DOCUMENTS)) -> dict:
+        """Add known documents, returning their entries by title."""
+        entries = {}
+        for title in titles:
+            embedding, category, tags = DOCUMENTS[title]
+            entries[title] = KnowledgeEntry(
+                title=title, content=f"Contenido sobre {title.lower()}", category=category, tags=tags
+            )
+            await self.store.add_document(entries[title], embedding)
+        return entries
+
+    @staticmethod
+    def titles(results) -> list:
+        """Get the titles of scored search results."""
+        return [entry.title for entry, _ in results]
+
+
+class TestLocalVectorStoreAdapter(LocalVectorStoreTestCase):
+    """Test cases for exact search, writes and persistence."""
+
+    @pytest.mark.asyncio
+    async def test_exact_search_ranks_by_cosine_similarity(self):
+        """Test that results are ordered by cosine similarity and cut at the threshold."""
+        # Arrange
+        await self.add_documents()
+
+        # Act
+        results = await self.store.search_similar([2.0, 0.0, 0.0], limit=5, similarity_threshold=0.5)
+        batch = await self.store.search_similar_batch(
+            [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]], limit=1, similarity_threshold=0.0
+        )
+
+        # Assert
+        assert self.titles(results) == ["Faltas", "Permisos"]
+        assert [score for _, score in results] == pytest.approx([1.0, 0.8])
+        assert [self.titles(hits) for hits in batch] == [["Faltas"], ["Horario"]]
+        assert results[0][0].tags == ["excusa"]
+
+    @pytest.mark.asyncio
+    async def test_filters_restrict_the_candidates(self):
+        """Test that metadata and tag filters are applied before scoring."""
+        # Arrange
+        await self.add_documents()
+
+        # Act
+        by_category = await self.store.search_similar(
+            [0.0, 1.0, 0.0], similarity_threshold=0.0, filters={"category": "asistencia"}
+        )
+        by_tag = await self.store.search_similar([1.0, 0.0, 0.0], similarity_threshold=0.0, filters={"tags": "permiso"})
+        by_categories = await self.store.search_similar(
+            [0.0, 1.0, 0.0], similarity_threshold=0.0, filters={"category": ["asistencia", "formacion"]}
+        )
+
+        # Assert
+        assert self.titles(by_category) == ["Permisos", "Faltas"]
+        assert self.titles(by_tag) == ["Permisos"]
+        assert self.titles(by_categories) == ["Horario", "Permisos", "Faltas"]
+        with pytest.raises(VectorStoreError, match="Unsupported filter"):
+            await self.store.search_similar([1.0, 0.0, 0.0], filters={"author": "instructor"})
+
+    @pytest.mark.asyncio
+    async def test_deleted_row_is_reused_by_the_next_document(self):
+        """Test that a deleted document disappears and its matrix row is given to a new one."""
+        # Arrange
+        entries = await self.add_documents(titles=("Faltas", "Horario"))
+        deleted_id = str(entries["Faltas"].entry_id)
+        freed_row = self.store._rows[deleted_id]
+
+        # Act
+        deleted = await self.store.delete_document(deleted_id)
+        deleted_again = await self.store.delete_document(deleted_id)
+        added = await self.add_documents(titles=("Permisos",))
+        results = await self.store.search_similar([1.0, 0.0, 0.0], similarity_threshold=0.0)
+
+        # Assert
+        assert (deleted, deleted_again) == (True, False)
+        assert self.store._rows[str(added["Permisos"].entry_id)] == freed_row
+        assert self.titles(results) == ["Permisos", "Horario"]
+        assert await self.store.get_document(deleted_id) is None
+        assert (await self.store.get_collection_stats())["document_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_reopened_store_keeps_documents_and_free_rows(self):
+        """Test that a closed store is read back with its updates, deletions and free rows."""
+        # Arrange
+        entries = await self.add_documents()
+        faltas = entries["Faltas"]
+        faltas.content = "Se presenta la excusa firmada"
+        await self.store.update_document(str(faltas.entry_id), faltas, [0.0, 0.0, 1.0])
+        freed_row = self.store._rows[str(entries["Horario"].entry_id)]
+        await self.store.delete_document(str(entries["Horario"].entry_id))
+        await self.store.close()
+
+        # Act
+        reopened = self.open_store()
+        results = await reopened.search_similar([0.0, 0.0, 1.0], limit=1, similarity_threshold=0.9)
+        stored = await reopened.get_document(str(faltas.entry_id))
+
+        # Assert
+        assert self.titles(results) == ["Faltas"]
+        assert stored.content == "Se presenta la excusa firmada"
+        assert await reopened.get_document(str(entries["Horario"].entry_id)) is None
+        assert reopened._free == [freed_row]
+        assert (await reopened.get_collection_stats())["document_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_backup_restores_into_an_empty_store(self, tmp_path):
+        """Test that a backup round-trips documents, metadata and normalised vectors."""
+        # Arrange
+        entries = await self.add_documents()
+        backup_path = str(tmp_path / "backup.json")
+
+        # Act
+        await self.store.backup_collection(backup_path)
+        restored = self.open_store(str(tmp_path / "restored"))
+        await restored.restore_collection(backup_path)
+        results = await restored.search_similar([0.0, 1.0, 0.0], limit=1, similarity_threshold=0.9)
+        stored = await restored.get_document(str(entries["Permisos"].entry_id))
+
+        # Assert
+        with open(backup_path, encoding="utf-8") as backup_file:
+            backup = json.load(backup_file)
+        assert backup["embeddings"][1] == pytest.approx([0.0, 1.0, 0.0])
+        assert self.titles(results) == ["Horario"]
+        assert (stored.category, stored.tags) == ("asistencia", ["excusa", "permiso"])
+
+    @pytest.mark.asyncio
+    async def test_embedding_of_another_dimension_is_rejected(self):
+        """Test that the first write fixes the dimension of the store."""
+        # Arrange
+        await self.add_documents(titles=("Faltas",))
+
+        # Act & Assert
+        with pytest.raises(VectorStoreError, match="dimension"):
+            await self.store.add_document(KnowledgeEntry(title="Otro", content="Texto"), [1.0, 0.0])
+
+    def test_collection_has_a_single_writer(self):
+        """Test that an open collection cannot be opened again until it is closed."""
+        # Act & Assert
+        with pytest.raises(VectorStoreError, match="already open"):
+            self.open_store()
+        self.store._close()
+        assert self.open_store().collection_name == self.store.collection_name
+
+
+class TestLocalVectorStoreHNSW(LocalVectorStoreTestCase):
+    """Test cases for searching through the HNSW graph."""
+
+    store_options = {"hnsw_threshold": 2, "hnsw_ef_search": 10}
+
+    @pytest.fixture(autouse=True)
+    def hnswlib(self):
+        """Skip when hnswlib is not installed."""
+        return pytest.importorskip("hnswlib")
+
+    @pytest.mark.asyncio
+    async def test_index_is_built_past_the_threshold_and_matches_exact_search(self):
+        """Test that crossing the threshold builds the graph and it ranks like exact search."""
+        # Arrange
+        await self.add_documents()
+        queries = self.store._normalize([[1.0, 0.1, 0.0], [0.0, 1.0, 0.2]])
+
+        # Act
+        results = await self.store.search_similar([1.0, 0.1, 0.0], limit=3, similarity_threshold=0.0)
+        indexed = self.store._index_search(queries, 3)
+        exact = self.store._exact_search(queries, None, 3)
+
+        # Assert
+        assert (await self.store.get_collection_stats())["index"] == "hnsw"
+        assert self.titles(results) == ["Faltas", "Permisos", "Horario"]
+        assert [[row for row, _ in hits] for hits in indexed] == [[row for row, _ in hits] for hits in exact]
+        assert [score for hits in indexed for _, score in hits] == pytest.approx(
+            [score for hits in exact for _, score in hits], abs=1e-5
+        )
+
+    @pytest.mark.asyncio
+    async def test_saved_index_is_loaded_on_reopen(self, caplog):
+        """Test that a graph saved at the current write generation is loaded instead of rebuilt."""
+        # Arrange
+        await self.add_documents()
+        await self.store.search_similar([1.0, 0.0, 0.0])
+        await self.store.close()
+        caplog.clear()
+
+        # Act
+        reopened = self.open_store()
+        with caplog.at_level("INFO"):
+            reopened._ensure_index()
+        results = await reopened.search_similar([0.0, 1.0, 0.0], limit=1, similarity_threshold=0.9)
+
+        # Assert
+        assert os.path.exists(os.path.join(reopened._directory, INDEX_FILE))
+        assert "Building HNSW index" not in caplog.text
+        assert reopened._index_generation == reopened._generation
+        assert reopened._hnsw.get_current_count() == 3
+        assert self.titles(results) == ["Horario"]
+
+    @pytest.mark.asyncio
+    async def test_row_reused_after_delete_is_searchable_again(self):
+        """Test that re-adding a label removed with mark_deleted serves the new vector."""
+        # Arrange
+        entries = await self.add_documents()
+        await self.store.search_similar([1.0, 0.0, 0.0])
+        freed_row = self.store._rows[str(entries["Faltas"].entry_id)]
+        await self.store.delete_document(str(entries["Faltas"].entry_id))
+
+        # Act
+        replacement = KnowledgeEntry(title="Certificados", content="Contenido sobre certificados")
+        await self.store.add_document(replacement, [0.0, 0.0, 1.0])
+        near_new = await self.store.search_similar([0.0, 0.0, 1.0], limit=1, similarity_threshold=0.9)
+        near_old = await self.store.search_similar([1.0, 0.0, 0.0], limit=3, similarity_threshold=0.0)
+
+        # Assert
+        assert self.store._rows[str(replacement.entry_id)] == freed_row
+        assert self.titles(near_new) == ["Certificados"]
+        assert "Faltas" not in self.titles(near_old)
+        assert self.titles(near_old)[0] == "Permisos"
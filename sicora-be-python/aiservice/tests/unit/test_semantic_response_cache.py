@@ -0,0 +1,191 @@
+"""Tests for the semantic cache of chat answers."""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from app.application.dtos.ai_dtos import EnhancedChatRequestDTO
+from app.application.services.enhanced_chat_service import EnhancedChatService
+from app.infrastructure.adapters import semantic_response_cache
+from app.infrastructure.adapters.semantic_response_cache import SemanticResponseCache, normalize_query
+
+SCOPE = "gpt-4|kb=True|"
+
+# Normalised questions and their embeddings; rewordings point almost the same way
+EMBEDDINGS = {
+    "como justifico una falta": [1.0, 0.0, 0.0],
+    "como puedo justificar una falta": [0.99, 0.1, 0.0],
+    "cual es el horario de formacion": [0.0, 1.0, 0.0],
+    "donde registro la asistencia": [0.0, 0.0, 1.0],
+}
+
+
+class TestSemanticResponseCache:
+    """Test cases for SemanticResponseCache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.embedded = []
+        self.cache = SemanticResponseCache(self.embed, ttl_seconds=60, max_entries=10)
+
+    async def embed(self, text: str):
+        """Embed a known question, recording the call."""
+        self.embedded.append(text)
+        return EMBEDDINGS[text]
+
+    def create_answer(self, content: str) -> dict:
+        """Create a cached answer for testing."""
+        return {"content": content, "tokens": 12, "model_used": "gpt-4"}
+
+    async def store_after_miss(self, query: str, content: str, scope: str = SCOPE) -> None:
+        """Look a question up and store the answer at the version the lookup saw."""
+        cached, version = await self.cache.lookup(query, scope)
+        assert cached is None
+        await self.cache.store(query, scope, self.create_answer(content), version)
+
+    def test_normalize_query_ignores_case_accents_and_punctuation(self):
+        """Test that trivially different spellings share a key."""
+        # Act & Assert
+        assert normalize_query("  ¿Cómo JUSTIFICO una falta? ") == "como justifico una falta"
+
+    @pytest.mark.asyncio
+    async def test_reworded_question_is_a_semantic_hit(self):
+        """Test that a close rewording reuses the answer and an exact repeat skips embedding."""
+        # Arrange
+        await self.store_after_miss("¿Cómo justifico una falta?", "Con la excusa firmada.")
+        self.embedded.clear()
+
+        # Act
+        exact, _ = await self.cache.lookup("como justifico una falta", SCOPE)
+        reworded, _ = await self.cache.lookup("¿Cómo puedo justificar una falta?", SCOPE)
+
+        # Assert
+        assert exact["cache_similarity"] == 1.0
+        assert reworded["content"] == "Con la excusa firmada."
+        assert reworded["cache_similarity"] >= self.cache.similarity_threshold
+        assert self.embedded == ["como puedo justificar una falta"]
+        assert self.cache.stats()["tokens_saved"] == 24
+
+    @pytest.mark.asyncio
+    async def test_answer_generated_while_the_knowledge_base_changed_is_dropped(self):
+        """Test that an answer is not cached under a version newer than the one it was generated at."""
+        # Arrange
+        cached, version = await self.cache.lookup("¿Cómo justifico una falta?", SCOPE)
+
+        # Act
+        await self.cache.invalidate()
+        await self.cache.store("¿Cómo justifico una falta?", SCOPE, self.create_answer("Respuesta antigua"), version)
+        after, _ = await self.cache.lookup("¿Cómo justifico una falta?", SCOPE)
+
+        # Assert
+        assert cached is None
+        assert after is None
+        assert self.cache.stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_after_ttl(self, monkeypatch):
+        """Test that an answer older than the TTL is neither an exact nor a semantic hit."""
+        # Arrange
+        now = [1000.0]
+        monkeypatch.setattr(semantic_response_cache, "time", SimpleNamespace(monotonic=lambda: now[0]))
+        await self.store_after_miss("¿Cómo justifico una falta?", "Con la excusa firmada.")
+
+        # Act
+        now[0] += 59
+        fresh, _ = await self.cache.lookup("¿Cómo justifico una falta?", SCOPE)
+        now[0] += 2
+        expired, _ = await self.cache.lookup("¿Cómo justifico una falta?", SCOPE)
+        reworded, _ = await self.cache.lookup("¿Cómo puedo justificar una falta?", SCOPE)
+
+        # Assert
+        assert fresh is not None
+        assert expired is None
+        assert reworded is None
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_answer_is_evicted(self):
+        """Test that a full cache drops the answer used longest ago."""
+        # Arrange
+        self.cache = SemanticResponseCache(self.embed, ttl_seconds=60, max_entries=2)
+        await self.store_after_miss("¿Cómo justifico una falta?", "Con la excusa firmada.")
+        await self.store_after_miss("¿Cuál es el horario de formación?", "De 7:00 a 13:00.")
+        await self.cache.lookup("¿Cómo justifico una falta?", SCOPE)
+
+        # Act
+        await self.store_after_miss("¿Dónde registro la asistencia?", "En el código QR del aula.")
+
+        # Assert
+        assert (await self.cache.lookup("¿Cómo justifico una falta?", SCOPE))[0] is not None
+        assert (await self.cache.lookup("¿Cuál es el horario de formación?", SCOPE))[0] is None
+        assert (await self.cache.lookup("¿Dónde registro la asistencia?", SCOPE))[0] is not None
+        assert self.cache.stats()["entries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_answers_are_isolated_by_scope(self):
+        """Test that an answer cached for one model or category set is not reused in another."""
+        # Arrange
+        await self.store_after_miss("¿Cómo justifico una falta?", "Con la excusa firmada.")
+
+        # Act
+        same_scope, _ = await self.cache.lookup("¿Cómo justifico una falta?", SCOPE)
+        other_model, _ = await self.cache.lookup("¿Cómo justifico una falta?", "gpt-3.5-turbo|kb=True|")
+        other_categories, _ = await self.cache.lookup("¿Cómo puedo justificar una falta?", f"{SCOPE}reglamento")
+
+        # Assert
+        assert same_scope is not None
+        assert other_model is None
+        assert other_categories is None
+
+
+class TestEnhancedChatServiceResponseCache:
+    """Test cases for the response cache in EnhancedChatService."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.response_cache = MagicMock()
+        self.response_cache.lookup = AsyncMock(return_value=(None, 3))
+        self.response_cache.store = AsyncMock()
+        self.openai_client = MagicMock()
+        self.openai_client.chat_completion = AsyncMock(return_value={
+            "choices": [{"message": {"content": "Con la excusa firmada."}}],
+            "usage": {"total_tokens": 12},
+            "model": "gpt-4"
+        })
+        self.service = EnhancedChatService(
+            kb_integration=MagicMock(), openai_client=self.openai_client, response_cache=self.response_cache
+        )
+
+    def create_request(self, use_cache: bool = True) -> EnhancedChatRequestDTO:
+        """Create a chat request for testing."""
+        return EnhancedChatRequestDTO(
+            message="¿Cómo justifico una falta?",
+            user_id=uuid4(),
+            use_knowledge_base=False,
+            use_cache=use_cache
+        )
+
+    @pytest.mark.asyncio
+    async def test_miss_is_stored_at_the_version_of_the_lookup(self):
+        """Test that a generated answer is stored with the version its lookup returned."""
+        # Act
+        response = await self.service.generate_enhanced_response(self.create_request(), [])
+
+        # Assert
+        assert response.metadata["cache_hit"] is False
+        query, scope, answer, version = self.response_cache.store.await_args.args
+        assert (query, answer["content"], version) == ("¿Cómo justifico una falta?", "Con la excusa firmada.", 3)
+
+    @pytest.mark.asyncio
+    async def test_use_cache_false_neither_reads_nor_writes_the_cache(self):
+        """Test that a user opting out always gets a fresh answer that is not cached."""
+        # Arrange
+        self.response_cache.lookup = AsyncMock(return_value=({"content": "En caché", "cache_similarity": 1.0}, 3))
+
+        # Act
+        response = await self.service.generate_enhanced_response(self.create_request(use_cache=False), [])
+
+        # Assert
+        assert response.content == "Con la excusa firmada."
+        self.response_cache.lookup.assert_not_awaited()
+        self.response_cache.store.assert_not_awaited()
@@ -0,0 +1,80 @@
+"""Store knowledge item embeddings as packed float32 bytes
+
+Revision ID: binary_embeddings
+Revises: embedding_model
+Create Date: 2025-07-18 10:00:00.000000
+
+"""
+import json
+
+from alembic import op
+import numpy as np
+import sqlalchemy as sa
+
+from app.infrastructure.models.kb_models import restore_sqlite_fts
+
+# revision identifiers, used by Alembic.
+revision = 'binary_embeddings'
+down_revision = 'embedding_model'
+branch_labels = None
+depends_on = None
+
+# Rows converted per round trip
+BATCH_SIZE = 500
+# Format read by EmbeddingArray: 4-byte dtype header + little-endian values
+FLOAT32_HEADER = b'EMB4'
+DTYPES = {b'EMB4': '<f4', b'EMB2': '<f2'}
+
+
+def _convert(source: str, target: sa.Column, convert) -> None:
+    """Fill target from the source expression through convert, one batch of unconverted rows at a time."""
+    bind = op.get_bind()
+    read = sa.text(
+        f"SELECT id, {source} AS value FROM knowledge_items "
+        f"WHERE embedding IS NOT NULL AND {target.name} IS NULL LIMIT :limit"
+    )
+    write = sa.text(f"UPDATE knowledge_items SET {target.name} = :value WHERE id = :id").bindparams(
+        sa.bindparam('value', type_=target.type)
+    )
+    while True:
+        rows = bind.execute(read, {'limit': BATCH_SIZE}).all()
+        if not rows:
+            break
+        bind.execute(write, [{'id': row.id, 'value': convert(row.value)} for row in rows])
+
+
+def _pack(text) -> bytes:
+    """JSON list -> header + float32 bytes."""
+    values = json.loads(text) if isinstance(text, str) else text
+    return FLOAT32_HEADER + np.asarray(values, dtype='<f4').tobytes()
+
+
+def _unpack(blob) -> list:
+    """Header + float bytes -> list of floats."""
+    blob = bytes(blob)
+    return np.frombuffer(blob, dtype=DTYPES[blob[:4]], offset=4).tolist()
+
+
+def upgrade() -> None:
+    """Convert the JSON (or pgvector) embedding column to packed bytes."""
+    packed = sa.Column('embedding_packed', sa.LargeBinary(), nullable=True)
+    op.add_column('knowledge_items', packed)
+    op.execute(sa.text("UPDATE knowledge_items SET embedding = NULL WHERE CAST(embedding AS TEXT) IN ('null', '[]')"))
+    # JSON text on SQLite, json or pgvector text ("[0.1, ...]") on PostgreSQL
+    _convert('CAST(embedding AS TEXT)', packed, _pack)
+    # Also drops the pgvector HNSW index: similarity is computed by the in-process vector index
+    with op.batch_alter_table('knowledge_items') as batch_op:
+        batch_op.drop_column('embedding')
+        batch_op.alter_column('embedding_packed', new_column_name='embedding')
+    restore_sqlite_fts(op.get_bind())
+
+
+def downgrade() -> None:
+    """Convert packed embeddings back to JSON lists."""
+    unpacked = sa.Column('embedding_json', sa.JSON(), nullable=True)
+    op.add_column('knowledge_items', unpacked)
+    _convert('embedding', unpacked, _unpack)
+    with op.batch_alter_table('knowledge_items') as batch_op:
+        batch_op.drop_column('embedding')
+        batch_op.alter_column('embedding_json', new_column_name='embedding')
+    restore_sqlite_fts(op.get_bind())
@@ -0,0 +1,36 @@
+"""Record the model that produced each knowledge item embedding
+
+Revision ID: embedding_model
+Revises: knowledge_documents
+Create Date: 2025-07-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.infrastructure.models.kb_models import restore_sqlite_fts
+
+# revision identifiers, used by Alembic.
+revision = 'embedding_model'
+down_revision = 'knowledge_documents'
+branch_labels = None
+depends_on = None
+
+# Model every existing embedding was generated with
+PREVIOUS_EMBEDDING_MODEL = 'text-embedding-ada-002'
+
+
+def upgrade() -> None:
+    """Add the embedding model column and attribute existing embeddings to the previous default model."""
+    op.add_column('knowledge_items', sa.Column('embedding_model', sa.String(length=100), nullable=True))
+    op.execute(
+        sa.text("UPDATE knowledge_items SET embedding_model = :model WHERE embedding IS NOT NULL")
+        .bindparams(model=PREVIOUS_EMBEDDING_MODEL)
+    )
+
+
+def downgrade() -> None:
+    """Drop the embedding model column."""
+    with op.batch_alter_table('knowledge_items') as batch_op:
+        batch_op.drop_column('embedding_model')
+    restore_sqlite_fts(op.get_bind())
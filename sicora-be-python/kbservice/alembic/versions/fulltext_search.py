@@ -0,0 +1,77 @@
+"""Full-text search: tsvector + GIN on PostgreSQL, FTS5 mirror on SQLite
+
+Revision ID: fulltext_search
+Revises: pgvector_setup
+Create Date: 2025-07-02 10:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+from app.infrastructure.models.kb_models import SQLITE_FTS_TRIGGERS
+
+# revision identifiers, used by Alembic.
+revision = 'fulltext_search'
+down_revision = 'pgvector_setup'
+branch_labels = None
+depends_on = None
+
+TEXT_SEARCH_LANGUAGE = 'spanish'
+
+
+def dialect_name():
+    """Get the name of the current database dialect."""
+    return op.get_bind().dialect.name
+
+
+def upgrade() -> None:
+    """Replace the B-tree text indexes with real full-text indexes."""
+    # The old "_gin" indexes are plain B-trees on title/content and cannot serve text search
+    op.drop_index('idx_knowledge_items_content_gin', table_name='knowledge_items')
+    op.drop_index('idx_knowledge_items_title_gin', table_name='knowledge_items')
+
+    if dialect_name() == 'postgresql':
+        op.execute(text(f"""
+            ALTER TABLE knowledge_items
+            ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('{TEXT_SEARCH_LANGUAGE}', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('{TEXT_SEARCH_LANGUAGE}', coalesce(content, '')), 'B')
+            ) STORED
+        """))
+        op.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_knowledge_items_search_vector
+            ON knowledge_items USING GIN (search_vector)
+        """))
+        print("✅ Full-text search column and GIN index created")
+
+    elif dialect_name() == 'sqlite':
+        try:
+            op.execute(text("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS knowledge_items_fts USING fts5(
+                    title, content,
+                    content='knowledge_items', content_rowid='rowid',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            """))
+            for trigger in SQLITE_FTS_TRIGGERS:
+                op.execute(text(trigger))
+            op.execute(text("INSERT INTO knowledge_items_fts(knowledge_items_fts) VALUES ('rebuild')"))
+            print("✅ FTS5 full-text table created")
+        except Exception as e:
+            print(f"⚠️ Could not create FTS5 table (text search falls back to LIKE): {e}")
+
+
+def downgrade() -> None:
+    """Remove full-text indexes and restore the B-tree text indexes."""
+    if dialect_name() == 'postgresql':
+        op.execute(text("DROP INDEX IF EXISTS idx_knowledge_items_search_vector"))
+        op.execute(text("ALTER TABLE knowledge_items DROP COLUMN IF EXISTS search_vector"))
+
+    elif dialect_name() == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            op.execute(text(f"DROP TRIGGER IF EXISTS knowledge_items_fts_{suffix}"))
+        op.execute(text("DROP TABLE IF EXISTS knowledge_items_fts"))
+
+    op.create_index('idx_knowledge_items_title_gin', 'knowledge_items', ['title'], unique=False)
+    op.create_index('idx_knowledge_items_content_gin', 'knowledge_items', ['content'], unique=False)
@@ -0,0 +1,49 @@
+"""Background ingestion jobs table
+
+Revision ID: ingestion_jobs
+Revises: fulltext_search
+Create Date: 2025-07-09 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'ingestion_jobs'
+down_revision = 'fulltext_search'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the table that persists PDF/batch ingestion jobs."""
+    op.create_table(
+        'ingestion_jobs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('job_type', sa.String(length=50), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('submitted_by', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('options', sa.JSON(), nullable=True),
+        sa.Column('files', sa.JSON(), nullable=False),
+        sa.Column('total_files', sa.Integer(), nullable=False),
+        sa.Column('processed_files', sa.Integer(), nullable=False),
+        sa.Column('progress', sa.Float(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('cancel_requested', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_ingestion_jobs_status'), 'ingestion_jobs', ['status'], unique=False)
+    op.create_index(op.f('ix_ingestion_jobs_submitted_by'), 'ingestion_jobs', ['submitted_by'], unique=False)
+    op.create_index(op.f('ix_ingestion_jobs_created_at'), 'ingestion_jobs', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the ingestion jobs table."""
+    op.drop_index(op.f('ix_ingestion_jobs_created_at'), table_name='ingestion_jobs')
+    op.drop_index(op.f('ix_ingestion_jobs_submitted_by'), table_name='ingestion_jobs')
+    op.drop_index(op.f('ix_ingestion_jobs_status'), table_name='ingestion_jobs')
+    op.drop_table('ingestion_jobs')
@@ -0,0 +1,37 @@
+"""Content-hash ingestion ledger table
+
+Revision ID: ingestion_ledger
+Revises: ingestion_jobs
+Create Date: 2025-07-10 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'ingestion_ledger'
+down_revision = 'ingestion_jobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the table that records file and chunk hashes of ingested sources."""
+    op.create_table(
+        'ingestion_ledger',
+        sa.Column('source_key', sa.String(length=500), nullable=False),
+        sa.Column('file_hash', sa.String(length=64), nullable=False),
+        sa.Column('chunk_hashes', sa.JSON(), nullable=False),
+        sa.Column('item_ids', sa.JSON(), nullable=False),
+        sa.Column('attributes', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.PrimaryKeyConstraint('source_key')
+    )
+    op.create_index(op.f('ix_ingestion_ledger_file_hash'), 'ingestion_ledger', ['file_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the ingestion ledger table."""
+    op.drop_index(op.f('ix_ingestion_ledger_file_hash'), table_name='ingestion_ledger')
+    op.drop_table('ingestion_ledger')
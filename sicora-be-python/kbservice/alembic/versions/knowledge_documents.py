@@ -0,0 +1,62 @@
+"""Parent documents of chunked knowledge items
+
+Revision ID: knowledge_documents
+Revises: ingestion_ledger
+Create Date: 2025-07-14 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.infrastructure.models.kb_models import restore_sqlite_fts
+
+# revision identifiers, used by Alembic.
+revision = 'knowledge_documents'
+down_revision = 'ingestion_ledger'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the documents table and link knowledge items to their document and chunk position."""
+    op.create_table(
+        'knowledge_documents',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('source_key', sa.String(length=500), nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('content_type', sa.String(length=50), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('target_audience', sa.String(length=50), nullable=False),
+        sa.Column('author_id', sa.UUID(), nullable=False),
+        sa.Column('file_hash', sa.String(length=64), nullable=False),
+        sa.Column('chunk_count', sa.Integer(), nullable=False),
+        sa.Column('metadata', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('source_key')
+    )
+    op.create_index(op.f('ix_knowledge_documents_author_id'), 'knowledge_documents', ['author_id'], unique=False)
+
+    with op.batch_alter_table('knowledge_items') as batch_op:
+        batch_op.add_column(sa.Column('document_id', sa.UUID(), nullable=True))
+        batch_op.add_column(sa.Column('chunk_index', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_knowledge_items_document_id', 'knowledge_documents', ['document_id'], ['id'], ondelete='CASCADE'
+        )
+        batch_op.create_index(op.f('ix_knowledge_items_document_id'), ['document_id'], unique=False)
+    # Adding the foreign key copies the table on SQLite
+    restore_sqlite_fts(op.get_bind())
+
+
+def downgrade() -> None:
+    """Unlink knowledge items and drop the documents table."""
+    with op.batch_alter_table('knowledge_items') as batch_op:
+        batch_op.drop_index(op.f('ix_knowledge_items_document_id'))
+        batch_op.drop_constraint('fk_knowledge_items_document_id', type_='foreignkey')
+        batch_op.drop_column('chunk_index')
+        batch_op.drop_column('document_id')
+    restore_sqlite_fts(op.get_bind())
+
+    op.drop_index(op.f('ix_knowledge_documents_author_id'), table_name='knowledge_documents')
+    op.drop_table('knowledge_documents')
@@ -0,0 +1,88 @@
+"""Scope PDF ingestion source keys to their uploader
+
+Revision ID: pdf_source_key_author
+Revises: related_items
+Create Date: 2025-07-28 10:00:00.000000
+
+"""
+import re
+from uuid import UUID
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'pdf_source_key_author'
+down_revision = 'related_items'
+branch_labels = None
+depends_on = None
+
+SCOPED_KEY = re.compile(r'^pdf:[0-9a-fA-F-]{36}:')
+
+documents = sa.table(
+    'knowledge_documents',
+    sa.column('source_key', sa.String),
+    sa.column('author_id', sa.UUID)
+)
+ledger = sa.table(
+    'ingestion_ledger',
+    sa.column('source_key', sa.String),
+    sa.column('item_ids', sa.JSON)
+)
+items = sa.table(
+    'knowledge_items',
+    sa.column('id', sa.UUID),
+    sa.column('author_id', sa.UUID)
+)
+
+
+def _authors_by_key(connection) -> dict:
+    """Map every unscoped PDF key to the author of its document (or of its first chunk)."""
+    authors = {
+        source_key: author_id
+        for source_key, author_id in connection.execute(
+            sa.select(documents.c.source_key, documents.c.author_id).where(documents.c.source_key.like('pdf:%'))
+        )
+        if not SCOPED_KEY.match(source_key)
+    }
+    for source_key, item_ids in connection.execute(
+        sa.select(ledger.c.source_key, ledger.c.item_ids).where(ledger.c.source_key.like('pdf:%'))
+    ):
+        if SCOPED_KEY.match(source_key) or source_key in authors or not item_ids:
+            continue
+        author_id = connection.execute(
+            sa.select(items.c.author_id).where(items.c.id == UUID(item_ids[0]))
+        ).scalar()
+        if author_id is not None:
+            authors[source_key] = author_id
+    return authors
+
+
+def upgrade() -> None:
+    """Rewrite ``pdf:<name>`` keys as ``pdf:<author_id>:<name>``."""
+    connection = op.get_bind()
+    for source_key, author_id in _authors_by_key(connection).items():
+        scoped_key = f"pdf:{author_id}:{source_key[len('pdf:'):]}"
+        for table in (documents, ledger):
+            connection.execute(
+                table.update().where(table.c.source_key == source_key).values(source_key=scoped_key)
+            )
+
+
+def downgrade() -> None:
+    """Drop the author from PDF keys (several authors' versions of a name collapse into one key)."""
+    connection = op.get_bind()
+    for table in (documents, ledger):
+        taken = set()
+        for (source_key,) in connection.execute(
+            sa.select(table.c.source_key).where(table.c.source_key.like('pdf:%'))
+        ):
+            if not SCOPED_KEY.match(source_key):
+                continue
+            unscoped_key = 'pdf:' + SCOPED_KEY.sub('', source_key)
+            if unscoped_key in taken:
+                continue  # Unique key: keep the author-scoped row as is
+            taken.add(unscoped_key)
+            connection.execute(
+                table.update().where(table.c.source_key == source_key).values(source_key=unscoped_key)
+            )
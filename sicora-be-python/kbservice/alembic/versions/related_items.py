@@ -0,0 +1,49 @@
+"""Precomputed related items of each knowledge item
+
+Revision ID: related_items
+Revises: binary_embeddings
+Create Date: 2025-07-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.infrastructure.models.kb_models import restore_sqlite_fts
+
+# revision identifiers, used by Alembic.
+revision = 'related_items'
+down_revision = 'binary_embeddings'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the neighbours table and the refresh marker; every item starts queued for a refresh."""
+    op.create_table(
+        'knowledge_item_neighbors',
+        sa.Column('item_id', sa.UUID(), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('neighbor_id', sa.UUID(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['item_id'], ['knowledge_items.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['neighbor_id'], ['knowledge_items.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('item_id', 'rank')
+    )
+    op.create_index(
+        op.f('ix_knowledge_item_neighbors_neighbor_id'), 'knowledge_item_neighbors', ['neighbor_id'], unique=False
+    )
+
+    with op.batch_alter_table('knowledge_items') as batch_op:
+        batch_op.add_column(sa.Column('related_computed_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.create_index(op.f('ix_knowledge_items_related_computed_at'), ['related_computed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the neighbours table and the refresh marker."""
+    with op.batch_alter_table('knowledge_items') as batch_op:
+        batch_op.drop_index(op.f('ix_knowledge_items_related_computed_at'))
+        batch_op.drop_column('related_computed_at')
+    restore_sqlite_fts(op.get_bind())
+
+    op.drop_index(op.f('ix_knowledge_item_neighbors_neighbor_id'), table_name='knowledge_item_neighbors')
+    op.drop_table('knowledge_item_neighbors')
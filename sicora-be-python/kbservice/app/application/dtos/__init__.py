@@ -5,6 +5,10 @@ from .kb_dtos import (
     KnowledgeItemUpdateDTO,
     KnowledgeItemResponseDTO,
     KnowledgeItemListDTO,
+    DocumentIngestionDTO,
+    DocumentIngestionResultDTO,
+    EmbeddingBackfillResultDTO,
+    RelatedItemsRefreshResultDTO,
     CategoryCreateDTO,
     CategoryResponseDTO,
     SearchRequestDTO,
@@ -22,6 +26,10 @@ __all__ = [
     "KnowledgeItemUpdateDTO",
     "KnowledgeItemResponseDTO",
     "KnowledgeItemListDTO",
+    "DocumentIngestionDTO",
+    "DocumentIngestionResultDTO",
+    "EmbeddingBackfillResultDTO",
+    "RelatedItemsRefreshResultDTO",
     "CategoryCreateDTO",
     "CategoryResponseDTO",
     "SearchRequestDTO",
@@ -67,6 +67,8 @@ class KnowledgeItemResponseDTO(BaseModel):
     helpful_count: int
     unhelpful_count: int
     version: int
+    document_id: Optional[UUID] = None
+    chunk_index: Optional[int] = None
     
     class Config:
         from_attributes = True
@@ -86,11 +88,54 @@ class KnowledgeItemListDTO(BaseModel):
     updated_at: datetime
     view_count: int
     helpful_count: int
+    document_id: Optional[UUID] = None
+    chunk_index: Optional[int] = None
     
     class Config:
         from_attributes = True
 
 
+class DocumentIngestionDTO(BaseModel):
+    """DTO for ingesting a chunked document (one knowledge item per chunk)."""
+    source_key: str = Field(..., min_length=1, max_length=500, description="Stable identity of the source document")
+    file_hash: str = Field(..., min_length=1, max_length=64, description="SHA-256 of the source file")
+    title: str = Field(..., min_length=1, max_length=200, description="Document title")
+    chunks: List[str] = Field(..., min_length=1, description="Document text chunks, in order")
+    content_type: ContentType = Field(..., description="Type of content")
+    category: str = Field(..., min_length=1, max_length=100, description="Category name")
+    target_audience: TargetAudience = Field(default=TargetAudience.ALL, description="Target audience")
+    tags: List[str] = Field(default=[], description="List of tags")
+    status: ContentStatus = Field(default=ContentStatus.PUBLISHED, description="Content status")
+    chunking: Optional[str] = Field(None, description="Chunker signature; changing it re-chunks the document")
+    metadata: Dict[str, Any] = Field(default={}, description="Source document metadata")
+
+
+class DocumentIngestionResultDTO(BaseModel):
+    """DTO for the outcome of a document ingestion."""
+    source_key: str
+    status: str = Field(..., description="'unchanged' when nothing had to be written, else 'ingested'")
+    created: int = Field(default=0, description="Chunks embedded and stored as new items")
+    reused: int = Field(default=0, description="Chunks whose existing item and embedding were kept")
+    removed: int = Field(default=0, description="Items deleted because their chunk disappeared")
+    item_ids: List[UUID] = Field(default=[], description="Item of each chunk, in order")
+    document_id: Optional[UUID] = Field(None, description="Parent document of the chunk items")
+
+
+class EmbeddingBackfillResultDTO(BaseModel):
+    """DTO for the outcome of an embedding backfill run."""
+    model: str = Field(..., description="Embedding model the items were brought up to")
+    processed: int = Field(default=0, description="Items read as missing or stale")
+    updated: int = Field(default=0, description="Items whose embedding was written")
+    failed: int = Field(default=0, description="Items of batches that kept failing; retried on the next run")
+    checkpoint: Optional[UUID] = Field(None, description="Every candidate up to this ID was written")
+
+
+class RelatedItemsRefreshResultDTO(BaseModel):
+    """DTO for the outcome of a related-items refresh run."""
+    refreshed: int = Field(default=0, description="Items whose related-items list was recomputed")
+    requeued: int = Field(default=0, description="Items queued because a refreshed item now ranks among their neighbours")
+
+
 class CategoryCreateDTO(BaseModel):
     """DTO for creating a category."""
     name: str = Field(..., min_length=1, max_length=100, description="Category name")
@@ -145,6 +190,8 @@ class SearchResponseDTO(BaseModel):
     query: str
     filters: Dict[str, Any]
     suggestions: List[str] = Field(default=[], description="Query suggestions")
+    timings_ms: Dict[str, float] = Field(default={}, description="Per-stage search latency in milliseconds")
+    degraded_stages: List[str] = Field(default=[], description="Stages skipped after exceeding their time budget")
     
     class Config:
         from_attributes = True
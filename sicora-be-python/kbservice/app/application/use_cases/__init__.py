@@ -5,7 +5,10 @@ from .kb_use_cases import (
     GetKnowledgeItemUseCase,
     UpdateKnowledgeItemUseCase,
     SearchKnowledgeUseCase,
-    ListKnowledgeItemsUseCase
+    ListKnowledgeItemsUseCase,
+    IngestDocumentUseCase,
+    BackfillEmbeddingsUseCase,
+    RefreshRelatedItemsUseCase
 )
 
 __all__ = [
@@ -13,5 +16,8 @@ __all__ = [
     "GetKnowledgeItemUseCase", 
     "UpdateKnowledgeItemUseCase",
     "SearchKnowledgeUseCase",
-    "ListKnowledgeItemsUseCase"
+    "ListKnowledgeItemsUseCase",
+    "IngestDocumentUseCase",
+    "BackfillEmbeddingsUseCase",
+    "RefreshRelatedItemsUseCase"
 ]
@@ -1,28 +1,39 @@
 """Use cases for Knowledge Base Service."""
 
-from typing import List, Optional, Dict, Any
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, List, Optional, Dict, Any, Tuple
 from uuid import UUID
 
 from app.domain.entities.kb_entities import (
-    KnowledgeItem, Category, SearchQuery, UserRole, ContentType, ContentStatus, TargetAudience
+    KnowledgeItem, KnowledgeDocument, Category, SearchQuery, UserRole, ContentType, ContentStatus, TargetAudience
 )
 from app.domain.value_objects.kb_value_objects import (
-    KnowledgeItemId, Title, Content, CategoryName, TagName
+    KnowledgeItemId, Title, Content, CategoryName, TagName, Vector
 )
 from app.domain.repositories.kb_repositories import (
-    KnowledgeItemRepository, CategoryRepository, SearchQueryRepository
+    KnowledgeItemRepository, CategoryRepository, SearchQueryRepository, IngestionLedgerRepository,
+    KnowledgeDocumentRepository
 )
 from app.domain.services.kb_domain_services import (
-    EmbeddingService, SearchService, ContentValidationService, PersonalizationService
+    EmbeddingService, SearchService, ContentValidationService, PersonalizationService,
+    SearchResultCache, SearchQueryLogger, PopularityCounter
 )
+from app.domain.services.ingestion_ledger import hash_text, is_source_unchanged, plan_ingestion
 from app.domain.exceptions.kb_exceptions import (
-    KnowledgeItemNotFoundError, InvalidContentError, UnauthorizedAccessError
+    KnowledgeItemNotFoundError, InvalidContentError, UnauthorizedAccessError, EmbeddingError
 )
 from app.application.dtos.kb_dtos import (
     KnowledgeItemCreateDTO, KnowledgeItemUpdateDTO, KnowledgeItemResponseDTO,
-    KnowledgeItemListDTO, SearchRequestDTO, SearchResponseDTO, QueryRequestDTO, QueryResponseDTO
+    KnowledgeItemListDTO, DocumentIngestionDTO, DocumentIngestionResultDTO, EmbeddingBackfillResultDTO,
+    RelatedItemsRefreshResultDTO, SearchRequestDTO, SearchResponseDTO, QueryRequestDTO, QueryResponseDTO
 )
 
+logger = logging.getLogger(__name__)
+
 
 class CreateKnowledgeItemUseCase:
     """Use case for creating a knowledge item."""
@@ -31,11 +42,13 @@ class CreateKnowledgeItemUseCase:
         self,
         knowledge_item_repo: KnowledgeItemRepository,
         embedding_service: EmbeddingService,
-        validation_service: ContentValidationService
+        validation_service: ContentValidationService,
+        result_cache: Optional[SearchResultCache] = None
     ):
         self.knowledge_item_repo = knowledge_item_repo
         self.embedding_service = embedding_service
         self.validation_service = validation_service
+        self.result_cache = result_cache
 
     async def execute(
         self, 
@@ -75,6 +88,10 @@ class CreateKnowledgeItemUseCase:
         # Save to repository
         created_item = await self.knowledge_item_repo.create(knowledge_item)
 
+        # Cached search results no longer reflect the knowledge base once this commits
+        if self.result_cache:
+            self.knowledge_item_repo.after_commit(self.result_cache.invalidate)
+
         # Return DTO
         return self._to_response_dto(created_item)
 
@@ -96,15 +113,22 @@ class CreateKnowledgeItemUseCase:
             view_count=item.view_count,
             helpful_count=item.helpful_count,
             unhelpful_count=item.unhelpful_count,
-            version=item.version
+            version=item.version,
+            document_id=item.document_id,
+            chunk_index=item.chunk_index
         )
 
 
 class GetKnowledgeItemUseCase:
     """Use case for getting a knowledge item."""
 
-    def __init__(self, knowledge_item_repo: KnowledgeItemRepository):
+    def __init__(
+        self,
+        knowledge_item_repo: KnowledgeItemRepository,
+        popularity_counter: Optional[PopularityCounter] = None
+    ):
         self.knowledge_item_repo = knowledge_item_repo
+        self.popularity_counter = popularity_counter
 
     async def execute(
         self, 
@@ -130,7 +154,10 @@ class GetKnowledgeItemUseCase:
         # Increment view count if requested
         if increment_view:
             item.increment_view_count()
-            await self.knowledge_item_repo.update(item)
+            if self.popularity_counter is not None:
+                await self.popularity_counter.record(item.id.value, views=1)
+            else:
+                await self.knowledge_item_repo.update(item)
 
         # Return DTO
         return self._to_response_dto(item)
@@ -153,7 +180,9 @@ class GetKnowledgeItemUseCase:
             view_count=item.view_count,
             helpful_count=item.helpful_count,
             unhelpful_count=item.unhelpful_count,
-            version=item.version
+            version=item.version,
+            document_id=item.document_id,
+            chunk_index=item.chunk_index
         )
 
 
@@ -164,11 +193,13 @@ class UpdateKnowledgeItemUseCase:
         self,
         knowledge_item_repo: KnowledgeItemRepository,
         embedding_service: EmbeddingService,
-        validation_service: ContentValidationService
+        validation_service: ContentValidationService,
+        result_cache: Optional[SearchResultCache] = None
     ):
         self.knowledge_item_repo = knowledge_item_repo
         self.embedding_service = embedding_service
         self.validation_service = validation_service
+        self.result_cache = result_cache
 
     async def execute(
         self, 
@@ -228,6 +259,10 @@ class UpdateKnowledgeItemUseCase:
         # Save to repository
         updated_item = await self.knowledge_item_repo.update(item)
 
+        # Cached search results no longer reflect the knowledge base once this commits
+        if self.result_cache:
+            self.knowledge_item_repo.after_commit(self.result_cache.invalidate)
+
         # Return DTO
         return self._to_response_dto(updated_item)
 
@@ -249,7 +284,9 @@ class UpdateKnowledgeItemUseCase:
             view_count=item.view_count,
             helpful_count=item.helpful_count,
             unhelpful_count=item.unhelpful_count,
-            version=item.version
+            version=item.version,
+            document_id=item.document_id,
+            chunk_index=item.chunk_index
         )
 
 
@@ -261,12 +298,16 @@ class SearchKnowledgeUseCase:
         knowledge_item_repo: KnowledgeItemRepository,
         search_query_repo: SearchQueryRepository,
         search_service: SearchService,
-        personalization_service: PersonalizationService
+        personalization_service: PersonalizationService,
+        result_cache: Optional[SearchResultCache] = None,
+        search_query_logger: Optional[SearchQueryLogger] = None
     ):
         self.knowledge_item_repo = knowledge_item_repo
         self.search_query_repo = search_query_repo
         self.search_service = search_service
         self.personalization_service = personalization_service
+        self.result_cache = result_cache
+        self.search_query_logger = search_query_logger
 
     async def execute(
         self, 
@@ -282,7 +323,25 @@ class SearchKnowledgeUseCase:
             user_role=user_role,
             filters=dto.filters
         )
-        await self.search_query_repo.create(search_query)
+        if self.search_query_logger:
+            self.search_query_logger.log(search_query)
+        else:
+            await self.search_query_repo.create(search_query)
+
+        # Serve repeated queries from the cache (keyed before filters are enriched)
+        cache_key = None
+        if self.result_cache:
+            started = time.perf_counter()
+            cache_key = SearchResultCache.make_key(dto.query, user_role, dto.filters, dto.limit)
+            # Read before searching: the response is only cached if no write committed meanwhile
+            cache_version = await self.result_cache.current_version()
+            cached = await self.result_cache.get(cache_key)
+            if cached is not None:
+                elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+                return cached.model_copy(update={
+                    "timings_ms": {"cache": elapsed_ms, "total": elapsed_ms},
+                    "degraded_stages": []
+                })
 
         # Perform search based on query type and filters
         search_results = []
@@ -314,7 +373,7 @@ class SearchKnowledgeUseCase:
             {
                 "item": self._to_list_dto(item),
                 "score": float(score.value),
-                "snippet": item.content.get_snippet(200)
+                "snippet": self.search_service.get_snippet(item, 200)
             }
             for item, score in results
         ]
@@ -324,14 +383,21 @@ class SearchKnowledgeUseCase:
             dto.query, user_role
         )
 
-        return SearchResponseDTO(
+        response = SearchResponseDTO(
             results=search_results,
             total_count=len(search_results),
             query=dto.query,
             filters=dto.filters,
-            suggestions=suggestions
+            suggestions=suggestions,
+            **self.search_service.get_search_report()
         )
 
+        # Degraded (text-only) responses are not cached
+        if cache_key is not None and not response.degraded_stages:
+            await self.result_cache.set(cache_key, response, cache_version)
+
+        return response
+
     def _to_list_dto(self, item: KnowledgeItem) -> KnowledgeItemListDTO:
         """Convert domain entity to list DTO."""
         return KnowledgeItemListDTO(
@@ -346,7 +412,9 @@ class SearchKnowledgeUseCase:
             created_at=item.created_at,
             updated_at=item.updated_at,
             view_count=item.view_count,
-            helpful_count=item.helpful_count
+            helpful_count=item.helpful_count,
+            document_id=item.document_id,
+            chunk_index=item.chunk_index
         )
 
 
@@ -372,39 +440,21 @@ class ListKnowledgeItemsUseCase:
         if user_role != UserRole.ADMIN:
             filters["status"] = ContentStatus.PUBLISHED
 
-        # Get items from repository
-        items = await self.knowledge_item_repo.list_all(
+        # Get lightweight summaries from repository
+        summaries = await self.knowledge_item_repo.list_summaries(
             skip=skip,
             limit=limit,
-            filters=filters
+            filters=filters,
+            snippet_length=200
         )
 
-        # Filter by accessibility
-        accessible_items = [
-            item for item in items 
-            if item.is_accessible_by(user_role)
+        # Filter by accessibility and convert to DTOs
+        return [
+            KnowledgeItemListDTO.model_validate(summary)
+            for summary in summaries
+            if summary.is_accessible_by(user_role)
         ]
 
-        # Convert to DTOs
-        return [self._to_list_dto(item) for item in accessible_items]
-
-    def _to_list_dto(self, item: KnowledgeItem) -> KnowledgeItemListDTO:
-        """Convert domain entity to list DTO."""
-        return KnowledgeItemListDTO(
-            id=item.id.value,
-            title=item.title.value,
-            content_snippet=item.content.get_snippet(200),
-            content_type=item.content_type,
-            category=item.category.value,
-            target_audience=item.target_audience,
-            status=item.status,
-            tags=[tag.value for tag in item.tags],
-            created_at=item.created_at,
-            updated_at=item.updated_at,
-            view_count=item.view_count,
-            helpful_count=item.helpful_count
-        )
-
 
 class CreateFeedbackUseCase:
     """Use case for creating user feedback on knowledge items."""
@@ -412,10 +462,12 @@ class CreateFeedbackUseCase:
     def __init__(
         self,
         knowledge_item_repo: KnowledgeItemRepository,
-        feedback_repo: "FeedbackRepository"
+        feedback_repo: "FeedbackRepository",
+        popularity_counter: Optional[PopularityCounter] = None
     ):
         self.knowledge_item_repo = knowledge_item_repo
         self.feedback_repo = feedback_repo
+        self.popularity_counter = popularity_counter
 
     async def execute(
         self, 
@@ -443,12 +495,14 @@ class CreateFeedbackUseCase:
         created_feedback = await self.feedback_repo.create(feedback)
 
         # Update knowledge item counters
-        if dto.feedback_type == "helpful":
-            item.helpful_count += 1
-        elif dto.feedback_type == "unhelpful":
-            item.unhelpful_count += 1
-
-        await self.knowledge_item_repo.update(item)
+        helpful = 1 if dto.feedback_type == "helpful" else 0
+        unhelpful = 1 if dto.feedback_type == "unhelpful" else 0
+        if self.popularity_counter is not None:
+            if helpful or unhelpful:
+                await self.popularity_counter.record(item.id.value, helpful=helpful, unhelpful=unhelpful)
+        else:
+            item.add_counts(helpful=helpful, unhelpful=unhelpful)
+            await self.knowledge_item_repo.update(item)
 
         # Return DTO
         return self._to_response_dto(created_feedback)
@@ -469,8 +523,13 @@ class CreateFeedbackUseCase:
 class DeleteKnowledgeItemUseCase:
     """Use case for deleting a knowledge item."""
 
-    def __init__(self, knowledge_item_repo: KnowledgeItemRepository):
+    def __init__(
+        self,
+        knowledge_item_repo: KnowledgeItemRepository,
+        result_cache: Optional[SearchResultCache] = None
+    ):
         self.knowledge_item_repo = knowledge_item_repo
+        self.result_cache = result_cache
 
     async def execute(self, item_id: UUID, user_id: UUID) -> bool:
         """Execute the delete knowledge item use case."""
@@ -483,9 +542,414 @@ class DeleteKnowledgeItemUseCase:
         # Delete knowledge item
         result = await self.knowledge_item_repo.delete(KnowledgeItemId(item_id))
 
+        # Cached search results no longer reflect the knowledge base once this commits
+        if result and self.result_cache:
+            self.knowledge_item_repo.after_commit(self.result_cache.invalidate)
+
         return result
 
 
+class IngestDocumentUseCase:
+    """Use case for (re-)ingesting a chunked document through the ingestion ledger.
+
+    Each chunk is stored as its own knowledge item linked to the parent
+    document. On re-ingestion, chunks whose hash is already in the ledger keep
+    their item and embedding, only new or changed chunks are embedded, and
+    items of removed chunks are deleted.
+    """
+
+    def __init__(
+        self,
+        knowledge_item_repo: KnowledgeItemRepository,
+        ledger_repo: IngestionLedgerRepository,
+        document_repo: KnowledgeDocumentRepository,
+        embedding_service: EmbeddingService,
+        result_cache: Optional[SearchResultCache] = None
+    ):
+        self.knowledge_item_repo = knowledge_item_repo
+        self.ledger_repo = ledger_repo
+        self.document_repo = document_repo
+        self.embedding_service = embedding_service
+        self.result_cache = result_cache
+
+    async def is_unchanged(self, source_key: str, file_hash: str, attributes: Dict[str, Any]) -> bool:
+        """Check before extraction whether the same file was already ingested with the same attributes."""
+        previous = await self.ledger_repo.get(source_key)
+        return is_source_unchanged(previous, file_hash, attributes)
+
+    async def execute(self, dto: DocumentIngestionDTO, author_id: UUID) -> DocumentIngestionResultDTO:
+        """Execute the ingest document use case."""
+        attributes = self.attributes_of(dto)
+        previous = await self.ledger_repo.get(dto.source_key)
+        chunk_hashes = [hash_text(self._embedding_input(dto.title, chunk)) for chunk in dto.chunks]
+        plan = plan_ingestion(dto.source_key, dto.file_hash, chunk_hashes, previous, attributes)
+
+        document = await self.document_repo.get_by_source_key(dto.source_key)
+        # Chunks ingested before their document was recorded get linked to it
+        link_chunks = document is None
+        if link_chunks or not plan.unchanged or document.file_hash != dto.file_hash:
+            document = await self.document_repo.save(self._to_document(dto, author_id, document))
+
+        item_ids: List[Optional[str]] = [None] * len(dto.chunks)
+        to_embed = list(plan.to_embed)
+        for position, item_id in plan.reused.items():
+            item = await self.knowledge_item_repo.get_by_id(KnowledgeItemId(UUID(item_id)))
+            if item is None or item.author_id != author_id:
+                to_embed.append(position)  # Deleted outside the ledger or not ours: embed it again
+                continue
+            item_ids[position] = item_id
+            if not plan.unchanged or link_chunks:
+                await self._relabel(item, dto, document.id, position)
+
+        if plan.unchanged and not to_embed:
+            if previous.file_hash != dto.file_hash:
+                await self.ledger_repo.save(plan.to_entry(item_ids, attributes))
+            return self._to_result_dto(dto.source_key, "unchanged", item_ids, document.id, reused=len(item_ids))
+
+        to_embed.sort()
+        embeddings = await self.embedding_service.generate_embeddings_batch([
+            self._embedding_input(dto.title, dto.chunks[position]) for position in to_embed
+        ]) if to_embed else []
+        for position, embedding in zip(to_embed, embeddings):
+            created_item = await self.knowledge_item_repo.create(KnowledgeItem(
+                title=Title(self._chunk_title(dto.title, position, len(dto.chunks))),
+                content=Content(dto.chunks[position]),
+                content_type=dto.content_type,
+                category=CategoryName(dto.category),
+                target_audience=dto.target_audience,
+                author_id=author_id,
+                status=dto.status,
+                tags=[TagName(tag) for tag in dto.tags],
+                embedding=embedding,
+                document_id=document.id,
+                chunk_index=position
+            ))
+            item_ids[position] = str(created_item.id.value)
+
+        removed = 0
+        for item_id in plan.stale_item_ids:
+            item = await self.knowledge_item_repo.get_by_id(KnowledgeItemId(UUID(item_id)))
+            if item is None or item.author_id != author_id:
+                continue  # Items of another author are never removed by this upload
+            if await self.knowledge_item_repo.delete(item.id):
+                removed += 1
+
+        await self.ledger_repo.save(plan.to_entry(item_ids, attributes))
+
+        # Cached search results no longer reflect the knowledge base once this commits
+        if self.result_cache:
+            self.knowledge_item_repo.after_commit(self.result_cache.invalidate)
+
+        return self._to_result_dto(
+            dto.source_key,
+            "ingested",
+            item_ids,
+            document.id,
+            created=len(to_embed),
+            reused=len(dto.chunks) - len(to_embed),
+            removed=removed
+        )
+
+    @staticmethod
+    def attributes_of(dto: DocumentIngestionDTO) -> Dict[str, Any]:
+        """Classification recorded in the ledger; changing it relabels items without re-embedding."""
+        attributes = {
+            "content_type": dto.content_type.value,
+            "category": dto.category,
+            "target_audience": dto.target_audience.value,
+            "status": dto.status.value,
+            "tags": sorted(dto.tags)
+        }
+        if dto.chunking:
+            attributes["chunking"] = dto.chunking
+        return attributes
+
+    @staticmethod
+    def _embedding_input(title: str, chunk: str) -> str:
+        """Text embedded for a chunk; its hash decides whether the chunk changed."""
+        return f"{title} {chunk}"
+
+    @staticmethod
+    def _chunk_title(title: str, position: int, total: int) -> str:
+        """Title of the item holding one chunk of a document."""
+        if total == 1:
+            return title
+        suffix = f" ({position + 1}/{total})"
+        return title[:200 - len(suffix)].rstrip() + suffix
+
+    @staticmethod
+    def _to_document(
+        dto: DocumentIngestionDTO, author_id: UUID, existing: Optional[KnowledgeDocument]
+    ) -> KnowledgeDocument:
+        """Build the parent document record, keeping the ID of an existing one."""
+        document = KnowledgeDocument(
+            source_key=dto.source_key,
+            title=dto.title,
+            content_type=dto.content_type,
+            category=dto.category,
+            target_audience=dto.target_audience,
+            author_id=author_id,
+            file_hash=dto.file_hash,
+            chunk_count=len(dto.chunks),
+            metadata=dict(dto.metadata)
+        )
+        if existing is not None:
+            document.id = existing.id
+            document.created_at = existing.created_at
+        return document
+
+    async def _relabel(self, item: KnowledgeItem, dto: DocumentIngestionDTO, document_id: UUID, position: int) -> None:
+        """Update the title, classification and position of a reused item, keeping its embedding."""
+        title = self._chunk_title(dto.title, position, len(dto.chunks))
+        tags = [TagName(tag) for tag in dto.tags]
+        if (
+            item.document_id == document_id
+            and item.chunk_index == position
+            and item.title.value == title
+            and item.content_type == dto.content_type
+            and item.category.value == dto.category
+            and item.target_audience == dto.target_audience
+            and item.status == dto.status
+            and [tag.value for tag in item.tags] == [tag.value for tag in tags]
+        ):
+            return
+
+        await self.knowledge_item_repo.update(KnowledgeItem(
+            id=item.id,
+            title=Title(title),
+            content=item.content,
+            content_type=dto.content_type,
+            category=CategoryName(dto.category),
+            target_audience=dto.target_audience,
+            author_id=item.author_id,
+            status=dto.status,
+            tags=tags,
+            embedding=item.embedding,
+            embedding_model=item.embedding_model,
+            created_at=item.created_at,
+            published_at=item.published_at,
+            view_count=item.view_count,
+            helpful_count=item.helpful_count,
+            unhelpful_count=item.unhelpful_count,
+            version=item.version + 1,
+            document_id=document_id,
+            chunk_index=position
+        ))
+
+    def _to_result_dto(
+        self,
+        source_key: str,
+        status: str,
+        item_ids: List[Optional[str]],
+        document_id: UUID,
+        created: int = 0,
+        reused: int = 0,
+        removed: int = 0
+    ) -> DocumentIngestionResultDTO:
+        """Build the ingestion result DTO."""
+        return DocumentIngestionResultDTO(
+            source_key=source_key,
+            status=status,
+            created=created,
+            reused=reused,
+            removed=removed,
+            item_ids=[UUID(item_id) for item_id in item_ids],
+            document_id=document_id
+        )
+
+
+class BackfillEmbeddingsUseCase:
+    """Use case for (re)computing embeddings of items that lack one from the current model.
+
+    Candidates are read page by page in ID order while several batches are
+    embedded in parallel; each batch is written with one bulk update. A
+    failing batch backs off exponentially and pauses the other batches too,
+    so a rate limit is not hammered. The checkpoint is the last ID up to
+    which every batch was written, so an interrupted run can resume there.
+    """
+
+    def __init__(
+        self,
+        knowledge_item_repo: KnowledgeItemRepository,
+        embedding_service: EmbeddingService,
+        model_name: str,
+        result_cache: Optional[SearchResultCache] = None,
+        batch_size: int = 100,
+        concurrency: int = 4,
+        max_retries: int = 5,
+        backoff_seconds: float = 2.0
+    ):
+        self.knowledge_item_repo = knowledge_item_repo
+        self.embedding_service = embedding_service
+        self.model_name = model_name
+        self.result_cache = result_cache
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        # The repository's session is not safe for concurrent use
+        self._repo_lock = asyncio.Lock()
+        self._resume_at = 0.0
+
+    async def execute(
+        self,
+        after_id: Optional[UUID] = None,
+        max_items: Optional[int] = None,
+        on_batch_written: Optional[Callable[[Optional[UUID]], Awaitable[None]]] = None
+    ) -> EmbeddingBackfillResultDTO:
+        """Execute the backfill; on_batch_written receives the checkpoint after each write."""
+        result = EmbeddingBackfillResultDTO(model=self.model_name, checkpoint=after_id)
+        # Batches in read order as [last_id, written]; the checkpoint advances over written ones
+        batches: Deque[List[Any]] = deque()
+        slots = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+        cursor = after_id
+
+        try:
+            while max_items is None or result.processed < max_items:
+                limit = self.batch_size if max_items is None else min(self.batch_size, max_items - result.processed)
+                await slots.acquire()
+                async with self._repo_lock:
+                    candidates = await self.knowledge_item_repo.list_embedding_backfill_candidates(
+                        self.model_name, cursor, limit
+                    )
+                if not candidates:
+                    slots.release()
+                    break
+
+                cursor = candidates[-1][0]
+                result.processed += len(candidates)
+                batch = [cursor, False]
+                batches.append(batch)
+                task = asyncio.create_task(self._run_batch(candidates, batch, batches, result, on_batch_written))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                task.add_done_callback(lambda _: slots.release())
+
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        return result
+
+    async def _run_batch(
+        self,
+        candidates: List[Tuple[UUID, str, str]],
+        batch: List[Any],
+        batches: Deque[List[Any]],
+        result: EmbeddingBackfillResultDTO,
+        on_batch_written: Optional[Callable[[Optional[UUID]], Awaitable[None]]]
+    ) -> None:
+        """Embed one batch and write it in bulk."""
+        embeddings = await self._embed_with_backoff([f"{title} {content}" for _, title, content in candidates])
+        if embeddings is None:
+            result.failed += len(candidates)
+            return
+
+        async with self._repo_lock:
+            result.updated += await self.knowledge_item_repo.bulk_update_embeddings(
+                {item_id: embedding for (item_id, _, _), embedding in zip(candidates, embeddings)},
+                self.model_name
+            )
+            if self.result_cache:
+                # Cached search results no longer reflect the knowledge base once the batch commits
+                self.knowledge_item_repo.after_commit(self.result_cache.invalidate)
+            batch[1] = True
+            while batches and batches[0][1]:
+                result.checkpoint = batches.popleft()[0]
+            if on_batch_written:
+                await on_batch_written(result.checkpoint)
+
+    async def _embed_with_backoff(self, texts: List[str]) -> Optional[List[Vector]]:
+        """Embed texts, retrying with exponential backoff and jitter; None once retries run out."""
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_retries + 1):
+            delay = self._resume_at - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                return await self.embedding_service.generate_embeddings_batch(texts)
+            except EmbeddingError as e:
+                if attempt == self.max_retries:
+                    logger.warning(f"Embedding batch failed after {attempt + 1} attempts, left for the next run: {e}")
+                    return None
+                backoff = self.backoff_seconds * (2 ** attempt) * random.uniform(0.5, 1.0)
+                self._resume_at = max(self._resume_at, loop.time() + backoff)
+        return None
+
+
+class RefreshRelatedItemsUseCase:
+    """Use case for precomputing the top-k related items of every published item.
+
+    Only items queued by a write (new, re-embedded, republished, or listing
+    such an item) are recomputed. Similarity is symmetric, so after an item
+    gets its list, every item it is close to and would now rank among the
+    top k of is queued too; those lists are stable, so this never cascades.
+    """
+
+    def __init__(
+        self,
+        knowledge_item_repo: KnowledgeItemRepository,
+        top_k: int = 10,
+        threshold: float = 0.6,
+        reverse_candidates: int = 200,
+        batch_size: int = 100
+    ):
+        self.knowledge_item_repo = knowledge_item_repo
+        self.top_k = top_k
+        self.threshold = threshold
+        self.reverse_candidates = reverse_candidates
+        self.batch_size = batch_size
+
+    async def execute(
+        self,
+        full: bool = False,
+        max_items: Optional[int] = None,
+        on_batch_done: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> RelatedItemsRefreshResultDTO:
+        """Execute the refresh (full recomputes every list); on_batch_done runs after each batch."""
+        result = RelatedItemsRefreshResultDTO()
+        if full:
+            await self.knowledge_item_repo.mark_related_items_stale()
+
+        while max_items is None or result.refreshed < max_items:
+            limit = self.batch_size if max_items is None else min(self.batch_size, max_items - result.refreshed)
+            candidates = await self.knowledge_item_repo.list_related_items_refresh_candidates(limit)
+            if not candidates:
+                break
+            for item_id, embedding in candidates:
+                result.requeued += await self._refresh_item(item_id, embedding)
+                result.refreshed += 1
+            if on_batch_done:
+                await on_batch_done()
+
+        return result
+
+    async def _refresh_item(self, item_id: UUID, embedding: Vector) -> int:
+        """Store an item's neighbours and queue the items it should now appear in; returns how many."""
+        hits = await self.knowledge_item_repo.find_similar_item_ids(
+            embedding,
+            threshold=self.threshold,
+            limit=max(self.reverse_candidates, self.top_k) + 1,
+            filters={"status": ContentStatus.PUBLISHED.value}
+        )
+        hits = [(neighbor_id, score) for neighbor_id, score in hits if neighbor_id != item_id]
+        await self.knowledge_item_repo.save_related_items(item_id, hits[:self.top_k])
+
+        stored = await self.knowledge_item_repo.get_stored_neighbors([neighbor_id for neighbor_id, _ in hits])
+        gained = []
+        for neighbor_id, score in hits:
+            neighbors = stored.get(neighbor_id, [])
+            if any(listed_id == item_id for listed_id, _ in neighbors):
+                continue
+            if len(neighbors) < self.top_k or score > neighbors[-1][1]:
+                gained.append(neighbor_id)
+        if gained:
+            await self.knowledge_item_repo.mark_related_items_stale(gained, include_referrers=False)
+        return len(gained)
+
+
 class IntelligentQueryUseCase:
     """Use case for intelligent query processing with NLP and routing."""
 
@@ -24,14 +24,80 @@ class Settings(BaseSettings):
     OPENAI_BATCH_SIZE: int = 100  # Batch size for OpenAI embedding requests
     OPENAI_REQUEST_TIMEOUT: int = 60  # Timeout in seconds for OpenAI requests
     OPENAI_MAX_RETRIES: int = 3  # Maximum retries for failed requests
+    EMBEDDING_PROVIDER: str = "openai"  # openai, or local (offline; EMBEDDING_MODEL is "hashed-tfidf" or a sentence-transformers model)
+    LOCAL_EMBEDDING_DEVICE: str = "cpu"  # torch device for sentence-transformers models
+    LOCAL_EMBEDDING_BATCH_SIZE: int = 64  # Texts per forward pass of the local model
+    LOCAL_EMBEDDING_BATCH_WAIT_MS: float = 5.0  # How long the worker waits to fill a batch
     
     # Vector search settings
     VECTOR_SIMILARITY_THRESHOLD: float = 0.7
     MAX_SEARCH_RESULTS: int = 20
+    VECTOR_INDEX_BACKEND: str = "ivf"  # ivf, flat or none (scan the database)
+    VECTOR_INDEX_IVF_MIN_ITEMS: int = 2000  # Below this size the IVF index scans exactly
+    VECTOR_INDEX_IVF_NPROBE: int = 8  # Inverted lists probed per query
+    VECTOR_INDEX_REFRESH_SECONDS: int = 300  # Reload from DB to pick up other workers' writes
+    EMBEDDING_STORAGE_DTYPE: str = "float32"  # float32, or float16 (half the bytes; ample precision for cosine ranking)
     
     # Cache settings
     REDIS_URL: Optional[str] = None
     CACHE_TTL_SECONDS: int = 3600  # 1 hour
+    EMBEDDING_CACHE_BACKEND: str = "auto"  # auto (redis if REDIS_URL else sqlite), redis, sqlite, memory, none
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 10000  # In-process LRU size
+    EMBEDDING_CACHE_TTL_SECONDS: int = 2592000  # 30 days; keys include the model name
+    EMBEDDING_CACHE_SQLITE_PATH: str = "./embedding_cache.db"
+    SEARCH_CACHE_ENABLED: bool = True
+    SEARCH_CACHE_MAX_ENTRIES: int = 2000
+    SEARCH_CACHE_TTL_SECONDS: int = 600  # Upper bound on staleness of view counts in cached results
+    SEARCH_CACHE_VERSION_REFRESH_SECONDS: float = 1.0  # How often workers re-read the shared KB version
+    
+    # Search analytics logging
+    SEARCH_LOG_BATCH_SIZE: int = 200  # Rows per bulk INSERT
+    SEARCH_LOG_FLUSH_INTERVAL_MS: int = 500  # Maximum delay before buffered queries are written
+    SEARCH_LOG_MAX_BACKLOG: int = 10000  # Queries beyond this are dropped (and counted)
+    
+    # Popularity counter settings
+    POPULARITY_COUNTER_BACKEND: str = "auto"  # auto (redis if REDIS_URL else memory), redis, memory, none (write on every view)
+    POPULARITY_FLUSH_INTERVAL_MS: int = 2000  # Maximum delay before counted views and feedback are written
+    POPULARITY_FLUSH_BATCH_SIZE: int = 500  # Items per batched UPDATE
+    
+    # PDF ingestion settings
+    PDF_INGESTION_WORKERS: int = 0  # Extraction processes; 0 uses the CPU count
+    PDF_PARALLEL_PAGE_THRESHOLD: int = 20  # Documents with more pages are split across processes
+    PDF_PAGES_PER_TASK: int = 10  # Pages per extraction task
+    PDF_MIN_CHARS_PER_PAGE: int = 80  # Quality heuristic: below this, try the next extractor
+    PDF_JOB_WORKERS: int = 2  # Background jobs processed concurrently
+    PDF_JOB_DIR: str = "./pdf_jobs"  # Uploaded files kept here until their job finishes
+    PDF_JOB_MAX_FILES: int = 10  # Files per batch job
+    PDF_JOB_FILES_CONCURRENCY: int = 4  # Files of one job processed concurrently
+    PDF_OCR_LANGUAGE: str = "spa"  # Tesseract language(s), e.g. "spa+eng"
+    PDF_OCR_PAGES_PER_TASK: int = 2  # Pages per OCR task (OCR is far slower than text extraction)
+    PDF_OCR_MIN_DPI: int = 150  # Scans below this are upsampled for legibility
+    PDF_OCR_MAX_DPI: int = 300  # Scans above this are downsampled to bound OCR time
+    PDF_OCR_DEFAULT_DPI: int = 200  # Pages without an embedded image
+    PDF_OCR_CACHE_DIR: str = "./pdf_ocr_cache"  # Per-page OCR text by page hash; empty disables
+    
+    # Document chunking settings
+    CHUNK_MAX_TOKENS: int = 350  # Tokens per chunk (each chunk is its own embedded item)
+    CHUNK_OVERLAP_TOKENS: int = 50  # Tokens repeated from the end of the previous chunk
+    CHUNK_TOKENIZER: str = "cl100k_base"  # tiktoken encoding; falls back to word/punctuation counting
+    
+    # Embedding backfill settings
+    EMBEDDING_BACKFILL_BATCH_SIZE: int = 100  # Items per embedding request and per bulk UPDATE
+    EMBEDDING_BACKFILL_CONCURRENCY: int = 4  # Batches embedded in parallel
+    EMBEDDING_BACKFILL_MAX_RETRIES: int = 5  # Retries per batch before it is left for the next run
+    EMBEDDING_BACKFILL_BACKOFF_SECONDS: float = 2.0  # First retry delay; doubles per attempt, with jitter
+    EMBEDDING_BACKFILL_CHECKPOINT_PATH: str = "./embedding_backfill_checkpoint.json"
+    
+    # Related items settings
+    RELATED_ITEMS_TOP_K: int = 10  # Neighbours stored per item; larger requests fall back to a live search
+    RELATED_ITEMS_THRESHOLD: float = 0.6  # Minimum cosine similarity of a related item
+    RELATED_ITEMS_REVERSE_CANDIDATES: int = 200  # Closest items checked for gaining a refreshed item as neighbour
+    RELATED_ITEMS_REFRESH_SECONDS: int = 60  # Background refresh interval; 0 disables it
+    RELATED_ITEMS_BATCH_SIZE: int = 100  # Items refreshed per transaction
+    
+    # Backup settings
+    BACKUP_DIR: str = "./backups"
+    BACKUP_BATCH_SIZE: int = 500  # Rows per streamed read and per restore upsert
     
     # Integration settings
     USERSERVICE_URL: str = "http://localhost:8001"
@@ -50,6 +116,14 @@ class Settings(BaseSettings):
     SEARCH_RESULT_SNIPPET_LENGTH: int = 200
     SEARCH_HIGHLIGHT_PRE_TAG: str = "<mark>"
     SEARCH_HIGHLIGHT_POST_TAG: str = "</mark>"
+    TEXT_SEARCH_LANGUAGE: str = "spanish"  # PostgreSQL text search configuration
+    SEARCH_TEXT_TIMEOUT_SECONDS: float = 2.0  # Hybrid search fails if the text stage exceeds this
+    SEARCH_EMBEDDING_TIMEOUT_SECONDS: float = 1.5  # Hybrid search falls back to text-only results
+    SEARCH_VECTOR_TIMEOUT_SECONDS: float = 1.0  # Hybrid search falls back to text-only results
+    SEARCH_FUSION_STRATEGY: str = "rrf"  # rrf (reciprocal rank fusion) or weighted (score sum)
+    SEARCH_RRF_K: int = 60  # Larger k flattens the advantage of top ranks
+    SEARCH_FUSION_TEXT_WEIGHT: float = 0.4
+    SEARCH_FUSION_SEMANTIC_WEIGHT: float = 0.6
     
     class Config:
         env_file = ".env"
@@ -9,6 +9,11 @@ from datetime import datetime
 
 from app.config import settings
 from app.infrastructure.config.database import get_db_session
+from app.infrastructure.adapters.vector_index import get_vector_index
+from app.infrastructure.adapters.embedding_cache import get_embedding_cache
+from app.infrastructure.adapters.search_cache import get_search_result_cache
+from app.infrastructure.adapters.search_query_writer import get_search_query_writer
+from app.infrastructure.adapters.popularity_counters import get_popularity_counter
 from app.infrastructure.repositories.kb_repositories_impl import (
     SQLAlchemyKnowledgeItemRepository,
     SQLAlchemyCategoryRepository,
@@ -16,12 +21,13 @@ from app.infrastructure.repositories.kb_repositories_impl import (
     SQLAlchemyFeedbackRepository
 )
 from app.infrastructure.services.kb_services_impl import (
-    OpenAIEmbeddingService,
+    create_embedding_service,
     HybridSearchService,
     HTTPChatbotIntegrationService,
     QueryAnalyticsService
 )
 from app.domain.services.kb_domain_services import (
+    EmbeddingService,
     ContentValidationService,
     PersonalizationService
 )
@@ -132,7 +138,10 @@ def get_knowledge_item_repository(
     session: AsyncSession = Depends(get_db_session)
 ) -> SQLAlchemyKnowledgeItemRepository:
     """Get knowledge item repository."""
-    return SQLAlchemyKnowledgeItemRepository(session)
+    return SQLAlchemyKnowledgeItemRepository(
+        session, get_vector_index(), popularity_counter=get_popularity_counter(),
+        result_cache=get_search_result_cache()
+    )
 
 
 def get_category_repository(
@@ -146,7 +155,7 @@ def get_search_query_repository(
     session: AsyncSession = Depends(get_db_session)
 ) -> SQLAlchemySearchQueryRepository:
     """Get search query repository."""
-    return SQLAlchemySearchQueryRepository(session)
+    return SQLAlchemySearchQueryRepository(session, get_search_query_writer())
 
 
 def get_feedback_repository(
@@ -157,9 +166,9 @@ def get_feedback_repository(
 
 
 # Service Dependencies
-def get_embedding_service() -> OpenAIEmbeddingService:
+def get_embedding_service() -> EmbeddingService:
     """Get embedding service."""
-    return OpenAIEmbeddingService()
+    return create_embedding_service(get_embedding_cache())
 
 
 def get_content_validation_service() -> ContentValidationService:
@@ -179,7 +188,7 @@ def get_chatbot_integration_service() -> HTTPChatbotIntegrationService:
 
 def get_search_service(
     knowledge_item_repo: SQLAlchemyKnowledgeItemRepository = Depends(get_knowledge_item_repository),
-    embedding_service: OpenAIEmbeddingService = Depends(get_embedding_service)
+    embedding_service: EmbeddingService = Depends(get_embedding_service)
 ) -> HybridSearchService:
     """Get search service."""
     return HybridSearchService(knowledge_item_repo, embedding_service)
@@ -188,27 +197,31 @@ def get_search_service(
 # Use Case Dependencies
 def get_create_knowledge_item_use_case(
     knowledge_item_repo: SQLAlchemyKnowledgeItemRepository = Depends(get_knowledge_item_repository),
-    embedding_service: OpenAIEmbeddingService = Depends(get_embedding_service),
+    embedding_service: EmbeddingService = Depends(get_embedding_service),
     validation_service: ContentValidationService = Depends(get_content_validation_service)
 ) -> CreateKnowledgeItemUseCase:
     """Get create knowledge item use case."""
-    return CreateKnowledgeItemUseCase(knowledge_item_repo, embedding_service, validation_service)
+    return CreateKnowledgeItemUseCase(
+        knowledge_item_repo, embedding_service, validation_service, get_search_result_cache()
+    )
 
 
 def get_get_knowledge_item_use_case(
     knowledge_item_repo: SQLAlchemyKnowledgeItemRepository = Depends(get_knowledge_item_repository)
 ) -> GetKnowledgeItemUseCase:
     """Get knowledge item use case."""
-    return GetKnowledgeItemUseCase(knowledge_item_repo)
+    return GetKnowledgeItemUseCase(knowledge_item_repo, get_popularity_counter())
 
 
 def get_update_knowledge_item_use_case(
     knowledge_item_repo: SQLAlchemyKnowledgeItemRepository = Depends(get_knowledge_item_repository),
-    embedding_service: OpenAIEmbeddingService = Depends(get_embedding_service),
+    embedding_service: EmbeddingService = Depends(get_embedding_service),
     validation_service: ContentValidationService = Depends(get_content_validation_service)
 ) -> UpdateKnowledgeItemUseCase:
     """Get update knowledge item use case."""
-    return UpdateKnowledgeItemUseCase(knowledge_item_repo, embedding_service, validation_service)
+    return UpdateKnowledgeItemUseCase(
+        knowledge_item_repo, embedding_service, validation_service, get_search_result_cache()
+    )
 
 
 def get_search_knowledge_use_case(
@@ -219,7 +232,8 @@ def get_search_knowledge_use_case(
 ) -> SearchKnowledgeUseCase:
     """Get search knowledge use case."""
     return SearchKnowledgeUseCase(
-        knowledge_item_repo, search_query_repo, search_service, personalization_service
+        knowledge_item_repo, search_query_repo, search_service, personalization_service,
+        get_search_result_cache(), get_search_query_writer()
     )
 
 
@@ -235,27 +249,30 @@ def get_create_feedback_use_case(
     feedback_repo: SQLAlchemyFeedbackRepository = Depends(get_feedback_repository)
 ) -> CreateFeedbackUseCase:
     """Get create feedback use case."""
-    return CreateFeedbackUseCase(knowledge_item_repo, feedback_repo)
+    return CreateFeedbackUseCase(knowledge_item_repo, feedback_repo, get_popularity_counter())
 
 
 def get_delete_knowledge_item_use_case(
     knowledge_item_repo: SQLAlchemyKnowledgeItemRepository = Depends(get_knowledge_item_repository)
 ) -> DeleteKnowledgeItemUseCase:
     """Get delete knowledge item use case."""
-    return DeleteKnowledgeItemUseCase(knowledge_item_repo)
+    return DeleteKnowledgeItemUseCase(knowledge_item_repo, get_search_result_cache())
 
 
 # Additional Service Dependencies for Admin
-def get_embeddings_service() -> OpenAIEmbeddingService:
+def get_embeddings_service() -> EmbeddingService:
     """Get embeddings service (alias for get_embedding_service)."""
-    return OpenAIEmbeddingService()
+    return create_embedding_service(get_embedding_cache())
 
 
 def get_kb_repository(
     session: AsyncSession = Depends(get_db_session)
 ) -> SQLAlchemyKnowledgeItemRepository:
     """Get KB repository (alias for get_knowledge_item_repository)."""
-    return SQLAlchemyKnowledgeItemRepository(session)
+    return SQLAlchemyKnowledgeItemRepository(
+        session, get_vector_index(), popularity_counter=get_popularity_counter(),
+        result_cache=get_search_result_cache()
+    )
 
 
 def get_query_analytics_service(
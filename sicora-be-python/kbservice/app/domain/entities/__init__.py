@@ -2,6 +2,9 @@
 
 from .kb_entities import (
     KnowledgeItem,
+    KnowledgeItemSummary,
+    IngestionLedgerEntry,
+    KnowledgeDocument,
     Category,
     SearchQuery,
     UserRole,
@@ -12,6 +15,9 @@ from .kb_entities import (
 
 __all__ = [
     "KnowledgeItem",
+    "KnowledgeItemSummary",
+    "IngestionLedgerEntry",
+    "KnowledgeDocument",
     "Category", 
     "SearchQuery",
     "UserRole",
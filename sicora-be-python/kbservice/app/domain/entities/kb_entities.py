@@ -1,8 +1,9 @@
 """Domain entities for Knowledge Base Service."""
 
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from uuid import UUID, uuid4
 
 from app.domain.value_objects.kb_value_objects import (
@@ -49,6 +50,21 @@ class TargetAudience(str, Enum):
     ADMIN_INSTRUCTOR = "admin_instructor"
 
 
+AUDIENCE_ROLES = {
+    TargetAudience.ADMIN: [UserRole.ADMIN],
+    TargetAudience.INSTRUCTOR: [UserRole.INSTRUCTOR],
+    TargetAudience.STUDENT: [UserRole.STUDENT],
+    TargetAudience.ADMIN_INSTRUCTOR: [UserRole.ADMIN, UserRole.INSTRUCTOR]
+}
+
+
+def is_audience_accessible_by(target_audience: TargetAudience, user_role: UserRole) -> bool:
+    """Check if content for the given audience is accessible by a user role."""
+    if target_audience == TargetAudience.ALL:
+        return True
+    return user_role in AUDIENCE_ROLES.get(target_audience, [])
+
+
 class KnowledgeItem:
     """Knowledge base item entity."""
     
@@ -70,7 +86,10 @@ class KnowledgeItem:
         view_count: int = 0,
         helpful_count: int = 0,
         unhelpful_count: int = 0,
-        version: int = 1
+        version: int = 1,
+        document_id: Optional[UUID] = None,
+        chunk_index: Optional[int] = None,
+        embedding_model: Optional[str] = None
     ):
         """Initialize a knowledge item."""
         self._id = id or KnowledgeItemId(uuid4())
@@ -90,6 +109,9 @@ class KnowledgeItem:
         self._helpful_count = helpful_count
         self._unhelpful_count = unhelpful_count
         self._version = version
+        self._document_id = document_id
+        self._chunk_index = chunk_index
+        self._embedding_model = embedding_model
     
     @property
     def id(self) -> KnowledgeItemId:
@@ -176,6 +198,21 @@ class KnowledgeItem:
         """Get the version number."""
         return self._version
     
+    @property
+    def embedding_model(self) -> Optional[str]:
+        """Get the model that produced the embedding (None: the configured model)."""
+        return self._embedding_model
+    
+    @property
+    def document_id(self) -> Optional[UUID]:
+        """Get the source document this item is a chunk of, if any."""
+        return self._document_id
+    
+    @property
+    def chunk_index(self) -> Optional[int]:
+        """Get the position of this chunk within its source document."""
+        return self._chunk_index
+    
     def update_content(self, title: Title, content: Content, tags: Optional[List[TagName]] = None) -> None:
         """Update the content of the knowledge item."""
         self._title = title
@@ -202,9 +239,10 @@ class KnowledgeItem:
         self._status = ContentStatus.UNDER_REVIEW
         self._updated_at = datetime.utcnow()
     
-    def update_embedding(self, embedding: Vector) -> None:
+    def update_embedding(self, embedding: Vector, model: Optional[str] = None) -> None:
         """Update the embedding vector."""
         self._embedding = embedding
+        self._embedding_model = model
         self._updated_at = datetime.utcnow()
     
     def increment_view_count(self) -> None:
@@ -219,26 +257,78 @@ class KnowledgeItem:
         """Add unhelpful feedback."""
         self._unhelpful_count += 1
     
+    def add_counts(self, views: int = 0, helpful: int = 0, unhelpful: int = 0) -> None:
+        """Add counter increments recorded elsewhere (e.g. not yet persisted)."""
+        self._view_count += views
+        self._helpful_count += helpful
+        self._unhelpful_count += unhelpful
+    
     def is_accessible_by(self, user_role: UserRole) -> bool:
         """Check if the content is accessible by the given user role."""
-        if self._target_audience == TargetAudience.ALL:
-            return True
-        
-        role_mapping = {
-            TargetAudience.ADMIN: [UserRole.ADMIN],
-            TargetAudience.INSTRUCTOR: [UserRole.INSTRUCTOR],
-            TargetAudience.STUDENT: [UserRole.STUDENT],
-            TargetAudience.ADMIN_INSTRUCTOR: [UserRole.ADMIN, UserRole.INSTRUCTOR]
-        }
-        
-        allowed_roles = role_mapping.get(self._target_audience, [])
-        return user_role in allowed_roles
+        return is_audience_accessible_by(self._target_audience, user_role)
     
     def is_published(self) -> bool:
         """Check if the knowledge item is published."""
         return self._status == ContentStatus.PUBLISHED
 
 
+@dataclass(frozen=True)
+class KnowledgeItemSummary:
+    """Read model of a knowledge item for listings: no embedding, truncated content."""
+    id: UUID
+    title: str
+    content_snippet: str
+    content_type: ContentType
+    category: str
+    target_audience: TargetAudience
+    status: ContentStatus
+    tags: List[str]
+    created_at: datetime
+    updated_at: datetime
+    view_count: int
+    helpful_count: int
+    document_id: Optional[UUID] = None
+    chunk_index: Optional[int] = None
+
+    def is_accessible_by(self, user_role: UserRole) -> bool:
+        """Check if the content is accessible by the given user role."""
+        return is_audience_accessible_by(self.target_audience, user_role)
+
+
+@dataclass
+class KnowledgeDocument:
+    """Source document (e.g. an uploaded PDF) whose chunks are stored as knowledge items."""
+    source_key: str
+    title: str
+    content_type: ContentType
+    category: str
+    target_audience: TargetAudience
+    author_id: UUID
+    file_hash: str
+    chunk_count: int = 0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    id: UUID = field(default_factory=uuid4)
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+
+@dataclass
+class IngestionLedgerEntry:
+    """What was last ingested from a source: its file hash and one hash per chunk.
+
+    ``item_ids[i]`` is the knowledge item created from the chunk whose hash is
+    ``chunk_hashes[i]``; ``attributes`` holds the classification the items were
+    created with (content type, category, audience, tags).
+    """
+    source_key: str
+    file_hash: str
+    chunk_hashes: List[str] = field(default_factory=list)
+    item_ids: List[str] = field(default_factory=list)
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    updated_at: Optional[datetime] = None
+
+
 class Category:
     """Knowledge base category entity."""
     
@@ -11,7 +11,8 @@ from .kb_exceptions import (
     DuplicateContentError,
     InvalidSearchQueryError,
     VectorDimensionMismatchError,
-    ContentTooLongError
+    ContentTooLongError,
+    BackupError
 )
 
 __all__ = [
@@ -25,5 +26,6 @@ __all__ = [
     "DuplicateContentError",
     "InvalidSearchQueryError",
     "VectorDimensionMismatchError",
-    "ContentTooLongError"
+    "ContentTooLongError",
+    "BackupError"
 ]
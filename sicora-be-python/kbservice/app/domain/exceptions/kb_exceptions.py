@@ -90,3 +90,11 @@ class ContentTooLongError(KbDomainException):
         super().__init__(f"Content too long: maximum {max_length} characters, got {actual_length}")
         self.max_length = max_length
         self.actual_length = actual_length
+
+
+class BackupError(KbDomainException):
+    """Exception raised when a backup cannot be written or read."""
+    
+    def __init__(self, message: str = "Backup operation failed"):
+        """Initialize the exception."""
+        super().__init__(message)
@@ -3,11 +3,15 @@
 from .kb_repositories import (
     KnowledgeItemRepository,
     CategoryRepository,
-    SearchQueryRepository
+    SearchQueryRepository,
+    IngestionLedgerRepository,
+    KnowledgeDocumentRepository
 )
 
 __all__ = [
     "KnowledgeItemRepository",
     "CategoryRepository",
-    "SearchQueryRepository"
+    "SearchQueryRepository",
+    "IngestionLedgerRepository",
+    "KnowledgeDocumentRepository"
 ]
@@ -1,11 +1,14 @@
 """Repository interfaces for Knowledge Base Service."""
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from app.domain.entities.kb_entities import (
     KnowledgeItem,
+    KnowledgeItemSummary,
+    IngestionLedgerEntry,
+    KnowledgeDocument,
     Category,
     SearchQuery,
     UserRole,
@@ -54,6 +57,17 @@ class KnowledgeItemRepository(ABC):
         """List all knowledge items with optional filters."""
         pass
     
+    @abstractmethod
+    async def list_summaries(
+        self, 
+        skip: int = 0, 
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        snippet_length: int = 200
+    ) -> List[KnowledgeItemSummary]:
+        """List knowledge item summaries (listing columns and a content snippet only)."""
+        pass
+    
     @abstractmethod
     async def list_by_category(
         self, 
@@ -95,6 +109,17 @@ class KnowledgeItemRepository(ABC):
         """Search knowledge items by text content."""
         pass
     
+    @abstractmethod
+    async def search_by_text_ranked(
+        self, 
+        query: str, 
+        skip: int = 0, 
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[tuple[KnowledgeItem, SearchScore, Optional[str]]]:
+        """Search knowledge items by text, returning relevance scores and highlighted snippets."""
+        pass
+    
     @abstractmethod
     async def search_by_vector(
         self, 
@@ -106,6 +131,65 @@ class KnowledgeItemRepository(ABC):
         """Search knowledge items by vector similarity."""
         pass
     
+    @abstractmethod
+    async def find_similar_item_ids(
+        self,
+        vector: Vector,
+        threshold: float = 0.7,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[UUID, float]]:
+        """Find (id, cosine similarity) pairs of the most similar items, best first, without loading them."""
+        pass
+    
+    @abstractmethod
+    async def get_related_items(
+        self,
+        item_id: KnowledgeItemId,
+        limit: int = 5
+    ) -> Optional[List[tuple[KnowledgeItem, SearchScore]]]:
+        """Get the precomputed published neighbours of an item (None if never computed)."""
+        pass
+    
+    @abstractmethod
+    async def list_related_items_refresh_candidates(self, limit: int = 100) -> List[Tuple[UUID, Vector]]:
+        """List (id, embedding) of published items whose related-items list needs computing."""
+        pass
+    
+    @abstractmethod
+    async def get_stored_neighbors(self, item_ids: List[UUID]) -> Dict[UUID, List[Tuple[UUID, float]]]:
+        """Get the stored (neighbour id, score) lists of items that have any."""
+        pass
+    
+    @abstractmethod
+    async def save_related_items(self, item_id: UUID, neighbors: List[Tuple[UUID, float]]) -> None:
+        """Replace an item's related-items list (best first) and mark it fresh."""
+        pass
+    
+    @abstractmethod
+    async def mark_related_items_stale(
+        self,
+        item_ids: Optional[List[UUID]] = None,
+        include_referrers: bool = True
+    ) -> int:
+        """Queue items (all if None) for a related-items refresh, optionally with the items listing them."""
+        pass
+    
+    @abstractmethod
+    async def list_embedding_backfill_candidates(
+        self,
+        model_name: str,
+        after_id: Optional[UUID] = None,
+        limit: int = 100
+    ) -> List[Tuple[UUID, str, str]]:
+        """List (id, title, content) of items without an embedding from model_name, in ID order after after_id."""
+        pass
+    
+    @abstractmethod
+    async def bulk_update_embeddings(self, embeddings: Dict[UUID, Vector], model_name: str) -> int:
+        """Write many embeddings with one statement; returns the rows updated."""
+        pass
+    
     @abstractmethod
     async def count_total(self, filters: Optional[Dict[str, Any]] = None) -> int:
         """Count total number of knowledge items."""
@@ -134,6 +218,11 @@ class KnowledgeItemRepository(ABC):
     ) -> Dict[str, Any]:
         """Restore knowledge base from backup."""
         pass
+    
+    @abstractmethod
+    def after_commit(self, callback: Callable[[], Awaitable[Any]]) -> None:
+        """Run callback once the current unit of work commits; it is dropped on rollback."""
+        pass
 
 
 class CategoryRepository(ABC):
@@ -222,6 +311,49 @@ class SearchQueryRepository(ABC):
         pass
 
 
+class IngestionLedgerRepository(ABC):
+    """Repository interface for the content-hash ingestion ledger."""
+    
+    @abstractmethod
+    async def get(self, source_key: str) -> Optional[IngestionLedgerEntry]:
+        """Get the last ingestion recorded for a source."""
+        pass
+    
+    @abstractmethod
+    async def save(self, entry: IngestionLedgerEntry) -> IngestionLedgerEntry:
+        """Record (insert or replace) the ingestion of a source."""
+        pass
+    
+    @abstractmethod
+    async def delete(self, source_key: str) -> bool:
+        """Forget a source so its next ingestion starts from scratch."""
+        pass
+
+
+class KnowledgeDocumentRepository(ABC):
+    """Repository interface for source documents of chunked knowledge items."""
+    
+    @abstractmethod
+    async def get_by_id(self, document_id: UUID) -> Optional[KnowledgeDocument]:
+        """Get a document by ID."""
+        pass
+    
+    @abstractmethod
+    async def get_by_source_key(self, source_key: str) -> Optional[KnowledgeDocument]:
+        """Get the document ingested from a source."""
+        pass
+    
+    @abstractmethod
+    async def save(self, document: KnowledgeDocument) -> KnowledgeDocument:
+        """Insert or update a document by its source key."""
+        pass
+    
+    @abstractmethod
+    async def delete(self, document_id: UUID) -> bool:
+        """Delete a document together with its chunks."""
+        pass
+
+
 class QueryAnalyticsRepository(ABC):
     """Repository interface for query analytics."""
     
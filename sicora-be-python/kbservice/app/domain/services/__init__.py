@@ -3,15 +3,43 @@
 from .kb_domain_services import (
     EmbeddingService,
     SearchService,
+    SearchResultCache,
+    SearchQueryLogger,
+    PopularityCounter,
     ContentValidationService,
     ChatbotIntegrationService,
     PersonalizationService
 )
+from .search_fusion import (
+    FusionRanker,
+    ReciprocalRankFusionRanker,
+    WeightedScoreFusionRanker,
+    create_fusion_ranker
+)
+from .ingestion_ledger import (
+    IngestionPlan,
+    hash_text,
+    hash_record,
+    is_source_unchanged,
+    plan_ingestion
+)
 
 __all__ = [
     "EmbeddingService",
     "SearchService",
+    "SearchResultCache",
+    "SearchQueryLogger",
+    "PopularityCounter",
     "ContentValidationService",
     "ChatbotIntegrationService",
-    "PersonalizationService"
+    "PersonalizationService",
+    "FusionRanker",
+    "ReciprocalRankFusionRanker",
+    "WeightedScoreFusionRanker",
+    "create_fusion_ranker",
+    "IngestionPlan",
+    "hash_text",
+    "hash_record",
+    "is_source_unchanged",
+    "plan_ingestion"
 ]
@@ -0,0 +1,99 @@
+"""Content-hash planning for incremental knowledge base ingestion."""
+
+import hashlib
+import json
+import unicodedata
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+from app.domain.entities.kb_entities import IngestionLedgerEntry
+
+
+def hash_text(text: str) -> str:
+    """SHA-256 of text with Unicode and whitespace normalized (case is kept)."""
+    normalized = " ".join(unicodedata.normalize("NFC", text).split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def hash_record(record: Dict[str, Any]) -> str:
+    """SHA-256 of a JSON-serializable record, independent of key order."""
+    payload = json.dumps(record, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class IngestionPlan:
+    """What to do with a source given what the ledger recorded for it last time."""
+    source_key: str
+    file_hash: str
+    chunk_hashes: List[str]
+    unchanged: bool = False
+    reused: Dict[int, str] = field(default_factory=dict)  # chunk position -> existing item ID
+    to_embed: List[int] = field(default_factory=list)  # chunk positions that need a new item
+    stale_item_ids: List[str] = field(default_factory=list)  # items whose chunk disappeared
+
+    def to_entry(self, item_ids: List[str], attributes: Optional[Dict[str, Any]] = None) -> IngestionLedgerEntry:
+        """Build the ledger entry that records this ingestion."""
+        return IngestionLedgerEntry(
+            source_key=self.source_key,
+            file_hash=self.file_hash,
+            chunk_hashes=list(self.chunk_hashes),
+            item_ids=list(item_ids),
+            attributes=dict(attributes or {})
+        )
+
+
+def is_source_unchanged(
+    previous: Optional[IngestionLedgerEntry],
+    file_hash: str,
+    attributes: Optional[Dict[str, Any]] = None
+) -> bool:
+    """Check whether a source can be skipped before extracting or chunking it.
+
+    ``attributes`` are the explicitly requested ones; attributes left to
+    auto-detection are omitted, since the same file yields the same values.
+    """
+    return (
+        previous is not None
+        and previous.file_hash == file_hash
+        and all(previous.attributes.get(key) == value for key, value in (attributes or {}).items())
+    )
+
+
+def plan_ingestion(
+    source_key: str,
+    file_hash: str,
+    chunk_hashes: List[str],
+    previous: Optional[IngestionLedgerEntry] = None,
+    attributes: Optional[Dict[str, Any]] = None
+) -> IngestionPlan:
+    """Match new chunk hashes against the previous ingestion of the same source.
+
+    Chunks whose hash was already ingested keep their item (and embedding),
+    even if they moved; only unmatched chunks are embedded, and previous
+    items left without a matching chunk are reported as stale.
+    """
+    plan = IngestionPlan(source_key=source_key, file_hash=file_hash, chunk_hashes=list(chunk_hashes))
+    if previous is None:
+        plan.to_embed = list(range(len(chunk_hashes)))
+        return plan
+
+    available: Dict[str, Deque[str]] = defaultdict(deque)
+    for chunk_hash, item_id in zip(previous.chunk_hashes, previous.item_ids):
+        available[chunk_hash].append(item_id)
+
+    for position, chunk_hash in enumerate(chunk_hashes):
+        if available[chunk_hash]:
+            plan.reused[position] = available[chunk_hash].popleft()
+        else:
+            plan.to_embed.append(position)
+
+    plan.stale_item_ids = [item_id for item_ids in available.values() for item_id in item_ids]
+    plan.unchanged = (
+        not plan.to_embed
+        and not plan.stale_item_ids
+        and previous.chunk_hashes == plan.chunk_hashes
+        and previous.attributes == (attributes or {})
+    )
+    return plan
@@ -1,10 +1,12 @@
 """Domain services for Knowledge Base Service."""
 
+import json
+import unicodedata
 from abc import ABC, abstractmethod
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 
-from app.domain.entities.kb_entities import KnowledgeItem, UserRole
+from app.domain.entities.kb_entities import KnowledgeItem, SearchQuery, UserRole
 from app.domain.value_objects.kb_value_objects import Vector, SearchScore
 
 
@@ -66,6 +68,79 @@ class SearchService(ABC):
     ) -> List[KnowledgeItem]:
         """Get related knowledge items."""
         pass
+    
+    def get_snippet(self, item: KnowledgeItem, length: int = 200) -> str:
+        """Get the result snippet for an item (highlighted when the engine provides one)."""
+        return item.content.get_snippet(length)
+    
+    def get_search_report(self) -> Dict[str, Any]:
+        """Get per-stage latency (ms) and degraded stages of the last search."""
+        return {"timings_ms": {}, "degraded_stages": []}
+
+
+class SearchResultCache(ABC):
+    """Cache of search responses, invalidated whenever the knowledge base changes."""
+    
+    @abstractmethod
+    async def current_version(self) -> int:
+        """Get the current knowledge base version."""
+        pass
+    
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a cached response for the current knowledge base version."""
+        pass
+    
+    @abstractmethod
+    async def set(self, key: str, value: Any, version: Optional[int] = None) -> None:
+        """Cache a response computed at ``version`` (default: current), unless the knowledge base moved on since."""
+        pass
+    
+    @abstractmethod
+    async def invalidate(self) -> int:
+        """Bump the knowledge base version, dropping every cached response."""
+        pass
+    
+    @staticmethod
+    def make_key(
+        query: str,
+        user_role: UserRole,
+        filters: Optional[Dict[str, Any]],
+        limit: int
+    ) -> str:
+        """Build a key from the normalized query, role, filters and limit."""
+        normalized_query = " ".join(unicodedata.normalize("NFC", query).casefold().split())
+        normalized_filters = json.dumps(filters or {}, sort_keys=True, default=str)
+        role = getattr(user_role, "value", user_role)
+        return f"{role}|{limit}|{normalized_filters}|{normalized_query}"
+
+
+class SearchQueryLogger(ABC):
+    """Records search queries for analytics without blocking the search path."""
+    
+    @abstractmethod
+    def log(self, search_query: SearchQuery) -> bool:
+        """Queue a search query for persistence; returns False if it was dropped."""
+        pass
+
+
+class PopularityCounter(ABC):
+    """Accumulates view and feedback counts of knowledge items and persists them in batches."""
+    
+    @abstractmethod
+    async def record(self, item_id: UUID, views: int = 0, helpful: int = 0, unhelpful: int = 0) -> None:
+        """Add to an item's counters without touching the database."""
+        pass
+    
+    @abstractmethod
+    async def pending(self, item_ids: List[UUID]) -> Dict[UUID, Dict[str, int]]:
+        """Get the increments not yet persisted for the given items."""
+        pass
+    
+    @abstractmethod
+    async def most_viewed_pending(self, limit: int) -> List[UUID]:
+        """Get the items with the most views not yet persisted."""
+        pass
 
 
 class ContentValidationService:
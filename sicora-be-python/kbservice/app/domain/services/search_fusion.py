@@ -0,0 +1,90 @@
+"""Rank fusion strategies for hybrid (text + semantic) search."""
+
+from abc import ABC, abstractmethod
+from typing import List, Dict
+from uuid import UUID
+
+from app.domain.entities.kb_entities import KnowledgeItem
+from app.domain.value_objects.kb_value_objects import SearchScore
+
+
+class FusionRanker(ABC):
+    """Merges ranked text and semantic results into a single ranking."""
+
+    def __init__(self, text_weight: float = 0.4, semantic_weight: float = 0.6):
+        if text_weight < 0 or semantic_weight < 0 or text_weight + semantic_weight == 0:
+            raise ValueError("Fusion weights must be non-negative and not both zero")
+        self.text_weight = text_weight
+        self.semantic_weight = semantic_weight
+
+    def fuse(
+        self,
+        text_results: List[tuple[KnowledgeItem, SearchScore]],
+        semantic_results: List[tuple[KnowledgeItem, SearchScore]]
+    ) -> List[tuple[KnowledgeItem, SearchScore]]:
+        """Fuse two best-first result lists; ties keep first-seen order."""
+        items: Dict[UUID, KnowledgeItem] = {}
+        scores: Dict[UUID, float] = {}
+        for weight, results in (
+            (self.text_weight, text_results),
+            (self.semantic_weight, semantic_results)
+        ):
+            for rank, (item, score) in enumerate(results, start=1):
+                key = item.id.value
+                items.setdefault(key, item)
+                scores[key] = scores.get(key, 0.0) + weight * self._contribution(rank, score)
+
+        scale = self._max_score()
+        ranked = sorted(scores.items(), key=lambda entry: entry[1], reverse=True)
+        return [
+            (items[key], SearchScore(min(1.0, max(0.0, score / scale))))
+            for key, score in ranked
+        ]
+
+    @abstractmethod
+    def _contribution(self, rank: int, score: SearchScore) -> float:
+        """Unweighted contribution of a result at a 1-based rank."""
+        pass
+
+    def _max_score(self) -> float:
+        """Largest possible fused score, used to normalize into [0, 1]."""
+        return (self.text_weight + self.semantic_weight) * self._contribution(1, SearchScore(1.0))
+
+
+class ReciprocalRankFusionRanker(FusionRanker):
+    """Reciprocal rank fusion: each list contributes weight / (k + rank).
+
+    Only ranks are used, so text and vector scores on different scales
+    need no calibration.
+    """
+
+    def __init__(self, k: int = 60, text_weight: float = 0.4, semantic_weight: float = 0.6):
+        super().__init__(text_weight, semantic_weight)
+        if k < 0:
+            raise ValueError("RRF k must be non-negative")
+        self.k = k
+
+    def _contribution(self, rank: int, score: SearchScore) -> float:
+        return 1.0 / (self.k + rank)
+
+
+class WeightedScoreFusionRanker(FusionRanker):
+    """Weighted sum of the precomputed [0, 1] scores of each list."""
+
+    def _contribution(self, rank: int, score: SearchScore) -> float:
+        return score.value
+
+
+def create_fusion_ranker(
+    strategy: str = "rrf",
+    rrf_k: int = 60,
+    text_weight: float = 0.4,
+    semantic_weight: float = 0.6
+) -> FusionRanker:
+    """Create a fusion ranker by strategy name ("rrf" or "weighted")."""
+    strategy = strategy.lower()
+    if strategy == "rrf":
+        return ReciprocalRankFusionRanker(rrf_k, text_weight, semantic_weight)
+    if strategy == "weighted":
+        return WeightedScoreFusionRanker(text_weight, semantic_weight)
+    raise ValueError(f"Unknown fusion strategy: {strategy}")
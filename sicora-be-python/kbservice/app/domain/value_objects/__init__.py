@@ -7,6 +7,7 @@ from .kb_value_objects import (
     CategoryName,
     TagName,
     Vector,
+    VectorMatrix,
     SearchScore
 )
 
@@ -17,5 +18,6 @@ __all__ = [
     "CategoryName",
     "TagName",
     "Vector",
+    "VectorMatrix",
     "SearchScore"
 ]
@@ -1,8 +1,10 @@
 """Value objects for Knowledge Base Service."""
 
-from typing import List, Union
+from typing import List, Optional, Sequence, Union
 from uuid import UUID
 
+import numpy as np
+
 
 class KnowledgeItemId:
     """Value object for knowledge item identifier."""
@@ -174,49 +176,121 @@ class TagName:
 class Vector:
     """Value object for embedding vector."""
     
-    def __init__(self, values: List[float]):
-        """Initialize vector."""
-        if not values:
-            raise ValueError("Vector cannot be empty")
-        if not all(isinstance(v, (int, float)) for v in values):
-            raise ValueError("Vector must contain only numeric values")
-        if len(values) > 2000:  # Reasonable limit for embedding dimensions
+    def __init__(self, values: Union[List[float], np.ndarray]):
+        """Initialize vector (float arrays, e.g. decoded from storage, are kept without copying)."""
+        if isinstance(values, np.ndarray):
+            if values.ndim != 1 or values.size == 0:
+                raise ValueError("Vector cannot be empty")
+            if not np.issubdtype(values.dtype, np.floating):
+                raise ValueError("Vector must contain only numeric values")
+            array = values.view()
+        else:
+            if not values:
+                raise ValueError("Vector cannot be empty")
+            if not all(isinstance(v, (int, float)) for v in values):
+                raise ValueError("Vector must contain only numeric values")
+            array = np.asarray(values, dtype=np.float64)
+        if array.shape[0] > 2000:  # Reasonable limit for embedding dimensions
             raise ValueError("Vector dimension too large")
-        self._values = [float(v) for v in values]
+        array.setflags(write=False)
+        self._array = array
+        self._unit: Optional[np.ndarray] = None
     
     @property
     def values(self) -> List[float]:
         """Get the vector values."""
-        return self._values.copy()
+        return self._array.tolist()
+    
+    @property
+    def array(self) -> np.ndarray:
+        """Get the values as a read-only array (no copy)."""
+        return self._array
     
     @property
     def dimension(self) -> int:
         """Get the vector dimension."""
-        return len(self._values)
+        return self._array.shape[0]
     
     def __eq__(self, other) -> bool:
         """Check equality."""
         if not isinstance(other, Vector):
             return False
-        return self._values == other._values
+        return bool(np.array_equal(self._array, other._array))
     
     def __hash__(self) -> int:
         """Hash function."""
-        return hash(tuple(self._values))
+        return hash(tuple(self._array.tolist()))
+    
+    def unit_array(self) -> np.ndarray:
+        """Get the L2-normalized float32 array (computed once)."""
+        if self._unit is None:
+            unit = VectorMatrix.normalize_rows(self._array)
+            unit.setflags(write=False)
+            self._unit = unit
+        return self._unit
     
     def cosine_similarity(self, other: 'Vector') -> float:
         """Calculate cosine similarity with another vector."""
         if self.dimension != other.dimension:
             raise ValueError("Vectors must have the same dimension")
         
-        dot_product = sum(a * b for a, b in zip(self._values, other._values))
-        magnitude_a = sum(a * a for a in self._values) ** 0.5
-        magnitude_b = sum(b * b for b in other._values) ** 0.5
-        
-        if magnitude_a == 0 or magnitude_b == 0:
-            return 0.0
-        
-        return dot_product / (magnitude_a * magnitude_b)
+        return float(np.dot(self.unit_array(), other.unit_array()))
+    
+    def cosine_similarities(self, candidates: 'VectorMatrix') -> np.ndarray:
+        """Calculate cosine similarity against every row of a matrix."""
+        return candidates.similarities(self)
+
+
+class VectorMatrix:
+    """Value object for a batch of pre-normalized float32 embedding vectors."""
+    
+    def __init__(self, rows: Sequence[Union[Vector, Sequence[float]]], dimension: Optional[int] = None):
+        """Initialize the matrix from vectors or raw float sequences."""
+        if len(rows) == 0:
+            self._matrix = np.zeros((0, dimension or 0), dtype=np.float32)
+        else:
+            matrix = np.asarray(
+                [row.array if isinstance(row, Vector) else row for row in rows],
+                dtype=np.float32
+            )
+            if matrix.ndim != 2:
+                raise ValueError("All vectors must have the same dimension")
+            self._matrix = self.normalize_rows(matrix)
+        self._matrix.setflags(write=False)
+    
+    @staticmethod
+    def normalize_rows(array: np.ndarray) -> np.ndarray:
+        """L2-normalize a vector or each row of a matrix (zero rows stay zero)."""
+        array = np.asarray(array, dtype=np.float32)
+        norms = np.linalg.norm(array, axis=-1, keepdims=True)
+        return np.divide(array, norms, out=np.zeros_like(array), where=norms > 0)
+    
+    @property
+    def dimension(self) -> int:
+        """Get the vector dimension."""
+        return self._matrix.shape[1]
+    
+    def __len__(self) -> int:
+        """Number of vectors."""
+        return self._matrix.shape[0]
+    
+    def similarities(self, query: Union[Vector, Sequence[float]]) -> np.ndarray:
+        """Cosine similarity of one query against every row, as a float32 array."""
+        if len(self) == 0:
+            return np.zeros(0, dtype=np.float32)
+        unit = query.unit_array() if isinstance(query, Vector) else self.normalize_rows(query)
+        if unit.shape[-1] != self.dimension:
+            raise ValueError("Vectors must have the same dimension")
+        return self._matrix @ unit
+    
+    def top_k(self, query: Union[Vector, Sequence[float]], k: int, threshold: float = 0.0) -> List[tuple]:
+        """Return (row index, similarity) pairs above threshold, best first."""
+        scores = self.similarities(query)
+        candidates = np.flatnonzero(scores >= threshold)
+        if candidates.size > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(i), float(scores[i])) for i in candidates]
 
 
 class SearchScore:
@@ -29,6 +29,8 @@ __all__ = [
     
     # Services
     "OpenAIEmbeddingService",
+    "LocalEmbeddingService",
+    "create_embedding_service",
     "HybridSearchService", 
     "HTTPChatbotIntegrationService"
 ]
@@ -0,0 +1,133 @@
+"""Infrastructure adapters package."""
+
+from .vector_index import (
+    VectorIndex,
+    FlatVectorIndex,
+    IVFVectorIndex,
+    create_vector_index,
+    get_vector_index
+)
+from .text_search import (
+    TextSearchHit,
+    TextSearchEngine,
+    PostgresFullTextSearchEngine,
+    SQLiteFTS5SearchEngine,
+    LikeTextSearchEngine,
+    create_text_search_engine
+)
+from .embedding_cache import (
+    EmbeddingStore,
+    RedisEmbeddingStore,
+    SQLiteEmbeddingStore,
+    EmbeddingCache,
+    create_embedding_cache,
+    get_embedding_cache
+)
+from .search_cache import (
+    KnowledgeBaseVersion,
+    LocalKnowledgeBaseVersion,
+    RedisKnowledgeBaseVersion,
+    VersionedSearchResultCache,
+    create_search_result_cache,
+    get_search_result_cache
+)
+from .kb_backup import (
+    NDJSONBackupWriter,
+    NDJSONBackupReader,
+    backup_path
+)
+from .ingestion_jobs import (
+    IngestionJobQueue,
+    JobStatus
+)
+from .ingestion_ledger import (
+    SQLiteIngestionLedger,
+    hash_file
+)
+from .backfill_checkpoint import JSONCheckpointStore
+from .local_embeddings import (
+    LocalEncoder,
+    HashedTfidfEncoder,
+    EmbeddingBatcher,
+    create_local_encoder,
+    get_local_embedding_batcher
+)
+from .ocr_cache import (
+    OCRPageCache,
+    choose_ocr_dpi,
+    ocr_cache_key
+)
+from .text_chunker import (
+    TokenCounter,
+    RegexTokenCounter,
+    TextChunker,
+    create_token_counter,
+    get_text_chunker
+)
+from .search_query_writer import (
+    BufferedSearchQueryWriter,
+    get_search_query_writer
+)
+from .popularity_counters import (
+    CounterStore,
+    MemoryCounterStore,
+    RedisCounterStore,
+    WriteBehindPopularityCounter,
+    create_popularity_counter,
+    get_popularity_counter
+)
+
+__all__ = [
+    "VectorIndex",
+    "FlatVectorIndex",
+    "IVFVectorIndex",
+    "create_vector_index",
+    "get_vector_index",
+    "TextSearchHit",
+    "TextSearchEngine",
+    "PostgresFullTextSearchEngine",
+    "SQLiteFTS5SearchEngine",
+    "LikeTextSearchEngine",
+    "create_text_search_engine",
+    "EmbeddingStore",
+    "RedisEmbeddingStore",
+    "SQLiteEmbeddingStore",
+    "EmbeddingCache",
+    "create_embedding_cache",
+    "get_embedding_cache",
+    "KnowledgeBaseVersion",
+    "LocalKnowledgeBaseVersion",
+    "RedisKnowledgeBaseVersion",
+    "VersionedSearchResultCache",
+    "create_search_result_cache",
+    "get_search_result_cache",
+    "NDJSONBackupWriter",
+    "NDJSONBackupReader",
+    "backup_path",
+    "IngestionJobQueue",
+    "JobStatus",
+    "SQLiteIngestionLedger",
+    "hash_file",
+    "JSONCheckpointStore",
+    "LocalEncoder",
+    "HashedTfidfEncoder",
+    "EmbeddingBatcher",
+    "create_local_encoder",
+    "get_local_embedding_batcher",
+    "OCRPageCache",
+    "choose_ocr_dpi",
+    "ocr_cache_key",
+    "TokenCounter",
+    "RegexTokenCounter",
+    "TextChunker",
+    "create_token_counter",
+    "get_text_chunker",
+    "BufferedSearchQueryWriter",
+    "get_search_query_writer",
+    "CounterStore",
+    "MemoryCounterStore",
+    "RedisCounterStore",
+    "WriteBehindPopularityCounter",
+    "create_popularity_counter",
+    "get_popularity_counter"
+]
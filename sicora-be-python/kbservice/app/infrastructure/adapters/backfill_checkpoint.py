@@ -0,0 +1,47 @@
+"""Resumable checkpoints for long-running maintenance jobs."""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class JSONCheckpointStore:
+    """Small JSON file of named checkpoints, replaced atomically on every save."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def load(self, name: str) -> Optional[str]:
+        """Get a checkpoint."""
+        return self._read().get(name)
+
+    def save(self, name: str, value: str) -> None:
+        """Record a checkpoint."""
+        checkpoints = self._read()
+        checkpoints[name] = value
+        self._write(checkpoints)
+
+    def clear(self, name: str) -> None:
+        """Forget a checkpoint, e.g. once its job completed."""
+        checkpoints = self._read()
+        if checkpoints.pop(name, None) is not None:
+            self._write(checkpoints)
+
+    def _read(self) -> Dict[str, str]:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, checkpoints: Dict[str, str]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                json.dump(checkpoints, file)
+            os.replace(temporary, self.path)
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
@@ -0,0 +1,244 @@
+"""Two-tier cache for text embeddings (in-process LRU over a persistent store)."""
+
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Optional, Dict
+
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingStore(ABC):
+    """Interface for the persistent (second) tier of the embedding cache."""
+
+    @abstractmethod
+    async def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Get the stored embeddings for the keys that exist."""
+        pass
+
+    @abstractmethod
+    async def set_many(self, embeddings: Dict[str, np.ndarray]) -> None:
+        """Store embeddings by key."""
+        pass
+
+
+class RedisEmbeddingStore(EmbeddingStore):
+    """Embedding store backed by Redis, values kept as raw float32 bytes."""
+
+    def __init__(self, url: str, ttl_seconds: int):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+
+    async def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Get the stored embeddings for the keys that exist."""
+        values = await self.client.mget(keys)
+        return {
+            key: np.frombuffer(value, dtype=np.float32)
+            for key, value in zip(keys, values)
+            if value is not None
+        }
+
+    async def set_many(self, embeddings: Dict[str, np.ndarray]) -> None:
+        """Store embeddings by key."""
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, values in embeddings.items():
+                pipe.set(key, values.astype(np.float32).tobytes(), ex=self.ttl_seconds)
+            await pipe.execute()
+
+
+class SQLiteEmbeddingStore(EmbeddingStore):
+    """Embedding store backed by a local SQLite file (used when Redis is not configured)."""
+
+    def __init__(self, path: str, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_cache ("
+            "key TEXT PRIMARY KEY, embedding BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._connection.commit()
+
+    async def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Get the stored embeddings for the keys that exist."""
+        return await asyncio.to_thread(self._get_many, keys)
+
+    async def set_many(self, embeddings: Dict[str, np.ndarray]) -> None:
+        """Store embeddings by key."""
+        await asyncio.to_thread(self._set_many, embeddings)
+
+    def _get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT key, embedding FROM embedding_cache "
+                f"WHERE key IN ({placeholders}) AND expires_at > ?",
+                [*keys, time.time()]
+            ).fetchall()
+        return {key: np.frombuffer(blob, dtype=np.float32) for key, blob in rows}
+
+    def _set_many(self, embeddings: Dict[str, np.ndarray]) -> None:
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embedding_cache (key, embedding, expires_at) VALUES (?, ?, ?)",
+                [
+                    (key, values.astype(np.float32).tobytes(), expires_at)
+                    for key, values in embeddings.items()
+                ]
+            )
+            self._connection.commit()
+
+
+class EmbeddingCache:
+    """LRU of embeddings in front of an optional persistent store, with hit/miss metrics.
+
+    Keys combine the embedding model name with a SHA-256 of the normalized text,
+    so changing the model never returns stale vectors. Store failures are logged
+    and treated as misses: the cache must never make embedding fail.
+    """
+
+    def __init__(self, store: Optional[EmbeddingStore] = None, max_entries: int = 10000):
+        self.store = store
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.store_errors = 0
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Normalize text so trivially different inputs share an entry."""
+        return " ".join(unicodedata.normalize("NFC", text).casefold().split())
+
+    @classmethod
+    def make_key(cls, model: str, text: str) -> str:
+        """Build the cache key for a model and text."""
+        digest = hashlib.sha256(cls.normalize_text(text).encode("utf-8")).hexdigest()
+        return f"emb:{model}:{digest}"
+
+    async def get_many(self, model: str, texts: List[str]) -> List[Optional[List[float]]]:
+        """Look up embeddings for texts (None for misses), checking memory then the store."""
+        keys = [self.make_key(model, text) for text in texts]
+        found: Dict[str, np.ndarray] = {}
+
+        with self._lock:
+            for key in keys:
+                values = self._memory.get(key)
+                if values is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = values
+            self.memory_hits += sum(1 for key in keys if key in found)
+
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        if missing and self.store is not None:
+            try:
+                stored = await self.store.get_many(missing)
+            except Exception as e:
+                self.store_errors += 1
+                logger.warning(f"Embedding cache store lookup failed: {e}")
+                stored = {}
+            with self._lock:
+                for key, values in stored.items():
+                    self._remember(key, values)
+                self.store_hits += sum(1 for key in keys if key in stored)
+            found.update(stored)
+
+        self.misses += sum(1 for key in keys if key not in found)
+        return [
+            found[key].tolist() if key in found else None
+            for key in keys
+        ]
+
+    async def set_many(self, model: str, texts: List[str], embeddings: List[List[float]]) -> None:
+        """Store embeddings for texts in both tiers."""
+        entries = {
+            self.make_key(model, text): np.asarray(values, dtype=np.float32)
+            for text, values in zip(texts, embeddings)
+        }
+        with self._lock:
+            for key, values in entries.items():
+                self._remember(key, values)
+
+        if self.store is not None and entries:
+            try:
+                await self.store.set_many(entries)
+            except Exception as e:
+                self.store_errors += 1
+                logger.warning(f"Embedding cache store write failed: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        """Get hit/miss metrics."""
+        lookups = self.memory_hits + self.store_hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "store_hits": self.store_hits,
+            "misses": self.misses,
+            "store_errors": self.store_errors,
+            "hit_rate": (self.memory_hits + self.store_hits) / lookups if lookups else 0.0
+        }
+
+    def clear(self) -> None:
+        """Clear the in-memory tier and reset metrics."""
+        with self._lock:
+            self._memory.clear()
+            self.memory_hits = self.store_hits = self.misses = self.store_errors = 0
+
+    def _remember(self, key: str, values: np.ndarray) -> None:
+        """Insert into the LRU, evicting the least recently used entries."""
+        values.setflags(write=False)
+        self._memory[key] = values
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+
+def create_embedding_cache(backend: str = None) -> Optional[EmbeddingCache]:
+    """Create the embedding cache for the configured backend ("redis", "sqlite", "memory" or "none")."""
+    backend = (backend or settings.EMBEDDING_CACHE_BACKEND).lower()
+    if backend == "auto":
+        backend = "redis" if settings.REDIS_URL else "sqlite"
+    if backend == "none":
+        return None
+
+    store: Optional[EmbeddingStore] = None
+    try:
+        if backend == "redis":
+            store = RedisEmbeddingStore(settings.REDIS_URL, settings.EMBEDDING_CACHE_TTL_SECONDS)
+        elif backend == "sqlite":
+            store = SQLiteEmbeddingStore(
+                settings.EMBEDDING_CACHE_SQLITE_PATH, settings.EMBEDDING_CACHE_TTL_SECONDS
+            )
+    except Exception as e:
+        logger.warning(f"Embedding cache store unavailable, using memory only: {e}")
+
+    return EmbeddingCache(store, max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES)
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_created = False
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Get the process-wide embedding cache (None when disabled)."""
+    global _embedding_cache, _embedding_cache_created
+    if not _embedding_cache_created:
+        _embedding_cache = create_embedding_cache()
+        _embedding_cache_created = True
+    return _embedding_cache
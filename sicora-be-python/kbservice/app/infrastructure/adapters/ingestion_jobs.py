@@ -0,0 +1,331 @@
+"""Background ingestion jobs persisted in the database."""
+
+import asyncio
+import logging
+import shutil
+from datetime import datetime, timezone
+from enum import Enum
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+from uuid import UUID, uuid4
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.infrastructure.models.kb_models import IngestionJobModel
+
+logger = logging.getLogger(__name__)
+
+# Reports the fraction (0-1) of the current file that has been processed
+ProgressCallback = Callable[[float], Awaitable[None]]
+
+# Processes one stored file with the job options and returns its result
+JobFileHandler = Callable[[str, Dict[str, Any], ProgressCallback], Awaitable[Dict[str, Any]]]
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of an ingestion job and of each of its files."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINISHED_STATUSES = {JobStatus.COMPLETED.value, JobStatus.FAILED.value, JobStatus.CANCELLED.value}
+
+
+class IngestionJobQueue:
+    """Queue of ingestion jobs drained by a pool of asyncio workers.
+
+    Each worker runs one job at a time, processing up to ``files_per_job``
+    of its files concurrently. Uploaded files are stored under ``job_dir``
+    and every state change is committed to the ``ingestion_jobs`` table, so
+    jobs that were queued or running when the process stopped are resumed
+    by ``start()``; files that had already finished are not processed again.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        handler: JobFileHandler,
+        job_dir: str,
+        workers: int = 2,
+        files_per_job: int = 4
+    ):
+        self.session_factory = session_factory
+        self.handler = handler
+        self.job_dir = Path(job_dir)
+        self.workers = workers
+        self.files_per_job = files_per_job
+        self._queue: "asyncio.Queue[UUID]" = asyncio.Queue()
+        self._worker_tasks: List[asyncio.Task] = []
+        self._file_tasks: Dict[UUID, Set[asyncio.Task]] = {}
+        self._cancelled_jobs: Set[UUID] = set()
+        self._update_lock = asyncio.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the worker pool has been started."""
+        return bool(self._worker_tasks)
+
+    async def start(self) -> int:
+        """Start the workers and re-queue unfinished jobs; returns how many were resumed."""
+        if self.is_running:
+            return 0
+
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(IngestionJobModel)
+                .where(IngestionJobModel.status.in_([JobStatus.QUEUED.value, JobStatus.RUNNING.value]))
+                .order_by(IngestionJobModel.created_at)
+            )
+            jobs = result.scalars().all()
+            for job in jobs:
+                job.status = JobStatus.QUEUED.value
+            await session.commit()
+
+        for job in jobs:
+            self._queue.put_nowait(job.id)
+
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        if jobs:
+            logger.info(f"Resumed {len(jobs)} ingestion jobs")
+        return len(jobs)
+
+    async def stop(self) -> None:
+        """Stop the workers; interrupted jobs stay persisted and resume on the next start."""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    async def submit(
+        self,
+        files: List[tuple[str, bytes]],
+        options: Dict[str, Any],
+        submitted_by: UUID,
+        job_type: str = "pdf_batch"
+    ) -> UUID:
+        """Store the files, persist a queued job and enqueue it; returns the job ID."""
+        job_id = uuid4()
+        directory = self.job_dir / str(job_id)
+        stored = await asyncio.to_thread(self._store_files, directory, files)
+
+        async with self.session_factory() as session:
+            session.add(IngestionJobModel(
+                id=job_id,
+                job_type=job_type,
+                status=JobStatus.QUEUED.value,
+                submitted_by=submitted_by,
+                options=options,
+                files=stored,
+                total_files=len(stored)
+            ))
+            await session.commit()
+
+        await self._queue.put(job_id)
+        return job_id
+
+    async def get(self, job_id: UUID) -> Optional[Dict[str, Any]]:
+        """Get the persisted state of a job."""
+        async with self.session_factory() as session:
+            job = await session.get(IngestionJobModel, job_id)
+            return self._to_dict(job) if job else None
+
+    async def cancel(self, job_id: UUID) -> Optional[Dict[str, Any]]:
+        """Request cancellation; queued jobs stop at once, running files are interrupted."""
+        def request_cancel(job: IngestionJobModel) -> None:
+            if job.status not in FINISHED_STATUSES:
+                job.cancel_requested = True
+                if job.status == JobStatus.QUEUED.value:
+                    self._finish(job, JobStatus.CANCELLED)
+
+        state = await self._update(job_id, request_cancel)
+        if state is None:
+            return None
+
+        tasks = self._file_tasks.get(job_id)
+        if tasks is not None:
+            self._cancelled_jobs.add(job_id)
+            for task in tasks:
+                task.cancel()
+        if state["status"] in FINISHED_STATUSES:
+            await asyncio.to_thread(shutil.rmtree, self.job_dir / str(job_id), True)
+        return state
+
+    def stats(self) -> Dict[str, int]:
+        """Get queue counters."""
+        return {
+            "workers": len(self._worker_tasks),
+            "queued": self._queue.qsize(),
+            "running_files": sum(len(tasks) for tasks in self._file_tasks.values())
+        }
+
+    async def _worker(self) -> None:
+        """Drain the queue one job at a time."""
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._process_job(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Ingestion job {job_id} failed: {e}")
+                await self._update(job_id, lambda job: self._fail(job, str(e)))
+            finally:
+                self._queue.task_done()
+
+    async def _process_job(self, job_id: UUID) -> None:
+        """Process the unfinished files of a job concurrently, persisting progress as it goes."""
+        def begin(job: IngestionJobModel) -> None:
+            if job.status == JobStatus.QUEUED.value:
+                job.status = JobStatus.RUNNING.value
+                job.started_at = job.started_at or datetime.now(timezone.utc)
+
+        job = await self._update(job_id, begin)
+        if job is None or job["status"] != JobStatus.RUNNING.value:
+            return
+
+        options = job["options"] or {}
+        semaphore = asyncio.Semaphore(self.files_per_job)
+        self._file_tasks[job_id] = set()
+        try:
+            await asyncio.gather(*(
+                self._process_file(job_id, index, file["path"], options, semaphore)
+                for index, file in enumerate(job["files"])
+                if file["status"] not in FINISHED_STATUSES
+            ))
+        finally:
+            self._file_tasks.pop(job_id, None)
+            self._cancelled_jobs.discard(job_id)
+
+        await self._update(job_id, self._complete)
+        await asyncio.to_thread(shutil.rmtree, self.job_dir / str(job_id), True)
+
+    async def _process_file(
+        self,
+        job_id: UUID,
+        index: int,
+        path: str,
+        options: Dict[str, Any],
+        semaphore: asyncio.Semaphore
+    ) -> None:
+        """Run the handler on one file and record its outcome."""
+        async with semaphore:
+            if job_id in self._cancelled_jobs:
+                return
+            state = await self._update(job_id, lambda job: self._set_file(job, index, status=JobStatus.RUNNING.value))
+            # cancel() may have run while the update was awaited
+            if state is None or state["cancel_requested"] or job_id in self._cancelled_jobs:
+                return
+
+            async def report_progress(fraction: float) -> None:
+                await self._update(job_id, lambda job: self._set_file(job, index, progress=min(1.0, max(0.0, fraction))))
+
+            task = asyncio.create_task(self.handler(path, options, report_progress))
+            self._file_tasks[job_id].add(task)
+            try:
+                result = await task
+                changes = {"status": JobStatus.COMPLETED.value, "progress": 1.0, "result": result}
+            except asyncio.CancelledError:
+                if job_id not in self._cancelled_jobs:
+                    raise  # The worker itself is being stopped
+                changes = {"status": JobStatus.CANCELLED.value}
+            except Exception as e:
+                changes = {"status": JobStatus.FAILED.value, "progress": 1.0, "error": str(e)}
+            finally:
+                self._file_tasks[job_id].discard(task)
+
+            await self._update(job_id, lambda job: self._set_file(job, index, **changes))
+
+    async def _update(
+        self,
+        job_id: UUID,
+        mutate: Callable[[IngestionJobModel], None]
+    ) -> Optional[Dict[str, Any]]:
+        """Apply a change to a job in its own transaction and return the new state."""
+        # Serialized: concurrent read-modify-write of the files column would lose updates
+        async with self._update_lock:
+            async with self.session_factory() as session:
+                job = await session.get(IngestionJobModel, job_id)
+                if job is None:
+                    return None
+                mutate(job)
+                await session.commit()
+                return self._to_dict(job)
+
+    def _set_file(self, job: IngestionJobModel, index: int, **changes: Any) -> None:
+        """Update one file entry and the job-level progress."""
+        files = [dict(file) for file in job.files]  # Reassign so the JSON column is flagged dirty
+        files[index].update(changes)
+        job.files = files
+        job.processed_files = sum(1 for file in files if file["status"] in FINISHED_STATUSES)
+        job.progress = round(
+            sum(1.0 if file["status"] in FINISHED_STATUSES else file.get("progress", 0.0) for file in files)
+            / max(len(files), 1),
+            4
+        )
+
+    def _complete(self, job: IngestionJobModel) -> None:
+        """Set the final job status from its files."""
+        if job.cancel_requested:
+            files = [
+                {**file, "status": JobStatus.CANCELLED.value} if file["status"] not in FINISHED_STATUSES else file
+                for file in job.files
+            ]
+            job.files = files
+            self._finish(job, JobStatus.CANCELLED)
+        elif job.files and all(file["status"] == JobStatus.FAILED.value for file in job.files):
+            self._finish(job, JobStatus.FAILED)
+        else:
+            self._finish(job, JobStatus.COMPLETED)
+
+    def _fail(self, job: IngestionJobModel, error: str) -> None:
+        job.error = error
+        self._finish(job, JobStatus.FAILED)
+
+    @staticmethod
+    def _finish(job: IngestionJobModel, status: JobStatus) -> None:
+        job.status = status.value
+        job.finished_at = datetime.now(timezone.utc)
+        if status == JobStatus.COMPLETED:
+            job.progress = 1.0
+
+    @staticmethod
+    def _store_files(directory: Path, files: List[tuple[str, bytes]]) -> List[Dict[str, Any]]:
+        """Write uploaded files to the job directory, one subdirectory each so names are kept."""
+        stored = []
+        for position, (filename, content) in enumerate(files):
+            name = Path(filename or "documento.pdf").name
+            path = directory / f"{position:03d}" / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(content)
+            stored.append({
+                "filename": name,
+                "path": str(path),
+                "status": JobStatus.QUEUED.value,
+                "progress": 0.0,
+                "result": None,
+                "error": None
+            })
+        return stored
+
+    @staticmethod
+    def _to_dict(job: IngestionJobModel) -> Dict[str, Any]:
+        return {
+            "id": job.id,
+            "job_type": job.job_type,
+            "status": job.status,
+            "submitted_by": job.submitted_by,
+            "options": job.options,
+            "files": [dict(file) for file in job.files],
+            "total_files": job.total_files,
+            "processed_files": job.processed_files,
+            "progress": job.progress,
+            "error": job.error,
+            "cancel_requested": job.cancel_requested,
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at
+        }
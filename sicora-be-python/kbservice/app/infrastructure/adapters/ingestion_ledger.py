@@ -0,0 +1,90 @@
+"""File hashing and a standalone SQLite store for the ingestion ledger."""
+
+import hashlib
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Union
+
+from app.domain.entities.kb_entities import IngestionLedgerEntry
+
+
+def hash_file(file_path: Union[str, Path], block_size: int = 1 << 20) -> str:
+    """SHA-256 of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class SQLiteIngestionLedger:
+    """Synchronous ledger store for the standalone import scripts.
+
+    The service uses ``SQLAlchemyIngestionLedgerRepository``; scripts that
+    write to their own SQLite database keep the ledger in that same database
+    (and transaction), in a table with the same columns.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS ingestion_ledger ("
+            "source_key TEXT PRIMARY KEY, file_hash TEXT NOT NULL, chunk_hashes TEXT NOT NULL, "
+            "item_ids TEXT NOT NULL, attributes TEXT, updated_at TEXT NOT NULL)"
+        )
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> "SQLiteIngestionLedger":
+        """Open (or create) a ledger in its own SQLite file."""
+        return cls(sqlite3.connect(str(path)))
+
+    def get(self, source_key: str) -> Optional[IngestionLedgerEntry]:
+        """Get the last ingestion recorded for a source."""
+        row = self.connection.execute(
+            "SELECT source_key, file_hash, chunk_hashes, item_ids, attributes, updated_at "
+            "FROM ingestion_ledger WHERE source_key = ?",
+            (source_key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return IngestionLedgerEntry(
+            source_key=row[0],
+            file_hash=row[1],
+            chunk_hashes=json.loads(row[2]),
+            item_ids=json.loads(row[3]),
+            attributes=json.loads(row[4]) if row[4] else {},
+            updated_at=datetime.fromisoformat(row[5])
+        )
+
+    def save(self, entry: IngestionLedgerEntry) -> IngestionLedgerEntry:
+        """Record (insert or replace) the ingestion of a source; the caller commits."""
+        entry.updated_at = datetime.utcnow()
+        self.connection.execute(
+            "INSERT OR REPLACE INTO ingestion_ledger "
+            "(source_key, file_hash, chunk_hashes, item_ids, attributes, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                entry.source_key,
+                entry.file_hash,
+                json.dumps(entry.chunk_hashes),
+                json.dumps([str(item_id) for item_id in entry.item_ids]),
+                json.dumps(entry.attributes, ensure_ascii=False, default=str),
+                entry.updated_at.isoformat()
+            )
+        )
+        return entry
+
+    def delete(self, source_key: str) -> bool:
+        """Forget a source so its next ingestion starts from scratch."""
+        cursor = self.connection.execute("DELETE FROM ingestion_ledger WHERE source_key = ?", (source_key,))
+        return cursor.rowcount > 0
+
+    def commit(self) -> None:
+        """Commit the ledger changes."""
+        self.connection.commit()
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        self.connection.close()
@@ -0,0 +1,179 @@
+"""Streaming, gzip-compressed NDJSON knowledge base backups.
+
+A backup file holds one JSON record per line: a header, one ``item`` record
+per knowledge item and a footer with the item count, which is checked on
+restore to detect truncated files. Embeddings, when included, are stored as
+base64-encoded little-endian float32 blocks instead of JSON number lists.
+"""
+
+import base64
+import gzip
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from uuid import UUID
+
+import numpy as np
+
+from app.config import settings
+from app.domain.exceptions.kb_exceptions import BackupError
+
+BACKUP_FORMAT = "kbservice-ndjson"
+BACKUP_FORMAT_VERSION = 1
+EMBEDDING_FORMAT = "float32-le-base64"
+
+_BACKUP_ID_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+def backup_path(backup_id: str, backup_dir: Optional[str] = None) -> Path:
+    """Get the file path of a backup, rejecting IDs that could escape the backup directory."""
+    if not _BACKUP_ID_PATTERN.match(backup_id) or backup_id.startswith("."):
+        raise BackupError(f"Invalid backup ID: {backup_id}")
+    return Path(backup_dir or settings.BACKUP_DIR) / f"{backup_id}.ndjson.gz"
+
+
+def encode_embedding(values: Any) -> str:
+    """Encode an embedding as base64 float32 bytes."""
+    return base64.b64encode(np.asarray(values, dtype="<f4").tobytes()).decode("ascii")
+
+
+def decode_embedding(block: str) -> List[float]:
+    """Decode a base64 float32 embedding block."""
+    return np.frombuffer(base64.b64decode(block), dtype="<f4").tolist()
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize values the json module does not handle."""
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+class NDJSONBackupWriter:
+    """Writes a backup record by record to a temporary file, published on close."""
+
+    def __init__(self, path: Path, backup_id: str, include_embeddings: bool, compresslevel: int = 6):
+        self.path = path
+        self.include_embeddings = include_embeddings
+        self.items_count = 0
+        self._partial_path = path.with_name(path.name + ".partial")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            raise BackupError(f"Backup {backup_id} already exists")
+        self._file = gzip.open(self._partial_path, "wt", encoding="utf-8", compresslevel=compresslevel)
+        self._write({
+            "type": "header",
+            "format": BACKUP_FORMAT,
+            "format_version": BACKUP_FORMAT_VERSION,
+            "backup_id": backup_id,
+            "created_at": datetime.utcnow(),
+            "include_embeddings": include_embeddings,
+            "embedding_format": EMBEDDING_FORMAT if include_embeddings else None
+        })
+
+    def write_items(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Append item rows (column name to value); returns how many were written."""
+        written = 0
+        for row in rows:
+            record = {"type": "item"}
+            for key, value in row.items():
+                if key == "embedding":
+                    if self.include_embeddings and value is not None and len(value):
+                        record[key] = encode_embedding(value)
+                    continue
+                record[key] = value
+            self._write(record)
+            written += 1
+        self.items_count += written
+        return written
+
+    def close(self) -> Path:
+        """Write the footer and atomically publish the backup file."""
+        self._write({"type": "footer", "items_count": self.items_count})
+        self._file.close()
+        os.replace(self._partial_path, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        """Discard a partially written backup."""
+        self._file.close()
+        self._partial_path.unlink(missing_ok=True)
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, default=_json_default, ensure_ascii=False))
+        self._file.write("\n")
+
+
+class NDJSONBackupReader:
+    """Reads a backup back in batches of item records."""
+
+    def __init__(self, path: Path):
+        if not path.exists():
+            raise BackupError(f"Backup {path.name} not found")
+        self.path = path
+        self._file = gzip.open(path, "rt", encoding="utf-8")
+        try:
+            self.header = self._read_header()
+        except BaseException:
+            self._file.close()
+            raise
+
+    def iter_batches(self, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """Yield item records with decoded embeddings; validates the footer at the end."""
+        batch: List[Dict[str, Any]] = []
+        items_count = 0
+        footer = None
+        for line_number, line in enumerate(self._file, start=2):
+            if not line.strip():
+                continue
+            record = self._parse(line, line_number)
+            record_type = record.pop("type", None)
+            if record_type == "footer":
+                footer = record
+                break
+            if record_type != "item":
+                raise BackupError(f"Unexpected record type {record_type!r} at line {line_number}")
+            if record.get("embedding") is not None:
+                record["embedding"] = decode_embedding(record["embedding"])
+            batch.append(record)
+            items_count += 1
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+
+        if footer is None:
+            raise BackupError(f"Backup {self.path.name} is truncated (no footer)")
+        if footer.get("items_count") != items_count:
+            raise BackupError(
+                f"Backup {self.path.name} is corrupt: footer counts {footer.get('items_count')} "
+                f"items, found {items_count}"
+            )
+        if batch:
+            yield batch
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        self._file.close()
+
+    def _read_header(self) -> Dict[str, Any]:
+        try:
+            line = self._file.readline()
+        except (OSError, EOFError) as e:
+            raise BackupError(f"Cannot read backup {self.path.name}: {e}")
+        header = self._parse(line, 1)
+        if header.get("type") != "header" or header.get("format") != BACKUP_FORMAT:
+            raise BackupError(f"{self.path.name} is not a knowledge base backup")
+        if header.get("format_version", 0) > BACKUP_FORMAT_VERSION:
+            raise BackupError(f"Unsupported backup format version {header['format_version']}")
+        return header
+
+    def _parse(self, line: str, line_number: int) -> Dict[str, Any]:
+        try:
+            return json.loads(line)
+        except json.JSONDecodeError as e:
+            raise BackupError(f"Malformed backup record at line {line_number}: {e}")
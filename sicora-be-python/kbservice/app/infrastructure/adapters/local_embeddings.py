@@ -0,0 +1,231 @@
+"""Offline embedding models run on CPU, fed in batches from a worker thread."""
+
+import asyncio
+import hashlib
+import logging
+import math
+import queue
+import re
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.domain.value_objects.kb_value_objects import VectorMatrix
+
+logger = logging.getLogger(__name__)
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+HASHED_TFIDF_MODEL = "hashed-tfidf"
+
+_WORD = re.compile(r"\w+")
+# Function words carry no topic; dropping them stands in for IDF without corpus statistics
+_STOPWORDS = frozenset("""
+    a al ante bajo con contra de del desde durante e el ella ellas ellos en entre es esa ese eso esta
+    este esto fue ha han hasta la las le les lo los mas me mi muy ni no nos o os para pero por que
+    se ser si sin sobre son su sus te tu un una uno unos unas y ya
+    an and are as at be by for from has in is it its of on or that the this to was were will with
+""".split())
+
+
+def _fold(text: str) -> str:
+    """Lowercase and strip accents, so "Matrícula" and "matricula" share features."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+@lru_cache(maxsize=200_000)
+def _feature_hash(feature: str) -> int:
+    """Stable 64-bit hash of a feature (Python's hash() is salted per process)."""
+    return int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+
+
+class LocalEncoder(ABC):
+    """An embedding model that runs in-process."""
+
+    name: str
+    dimension: int
+
+    @abstractmethod
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Embed texts as a float32 matrix, one L2-normalized row per text."""
+        pass
+
+
+class HashedTfidfEncoder(LocalEncoder):
+    """Feature-hashed bag of words, word bigrams and character n-grams.
+
+    Needs no model download or training. Terms get sublinear (1 + log tf)
+    weights and a random sign per bucket, so hash collisions cancel out on
+    average instead of piling up. Character n-grams let inflected forms
+    ("matrícula", "matricularse") land near each other.
+    """
+
+    def __init__(self, dimension: int, char_ngram: int = 3, char_weight: float = 0.5):
+        self.dimension = dimension
+        self.char_ngram = char_ngram
+        self.char_weight = char_weight
+        self.name = f"{HASHED_TFIDF_MODEL}/{dimension}"
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Embed texts as a float32 matrix, one L2-normalized row per text."""
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, (count, weight) in self._features(text).items():
+                hashed = _feature_hash(feature)
+                sign = 1.0 if hashed >> 63 else -1.0
+                matrix[row, hashed % self.dimension] += sign * weight * (1.0 + math.log(count))
+        return VectorMatrix.normalize_rows(matrix)
+
+    def _features(self, text: str) -> dict:
+        """Feature -> (term frequency, weight)."""
+        words = [word for word in _WORD.findall(_fold(text)) if word not in _STOPWORDS]
+        counts = Counter(f"w:{word}" for word in words)
+        counts.update(f"b:{first} {second}" for first, second in zip(words, words[1:]))
+        features = {feature: (count, 1.0) for feature, count in counts.items()}
+
+        grams: Counter = Counter()
+        for word in words:
+            padded = f"#{word}#"
+            grams.update(
+                f"c:{padded[start:start + self.char_ngram]}"
+                for start in range(len(padded) - self.char_ngram + 1)
+            )
+        features.update((gram, (count, self.char_weight)) for gram, count in grams.items())
+        return features
+
+
+class SentenceTransformerEncoder(LocalEncoder):
+    """A sentence-transformers model, truncated to the configured dimension."""
+
+    def __init__(self, model_name: str, dimension: int, device: str = "cpu", batch_size: int = 64):
+        self.model = SentenceTransformer(model_name, device=device)
+        native = self.model.get_sentence_embedding_dimension()
+        if native < dimension:
+            raise ValueError(f"{model_name} produces {native}-dimensional embeddings, {dimension} configured")
+        self.dimension = dimension
+        self.batch_size = batch_size
+        self.name = f"{model_name}/{dimension}"
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Embed texts as a float32 matrix, one L2-normalized row per text."""
+        matrix = self.model.encode(
+            texts, batch_size=self.batch_size, convert_to_numpy=True, show_progress_bar=False
+        )
+        # Leading components carry most of the signal; renormalize after cutting
+        return VectorMatrix.normalize_rows(matrix[:, :self.dimension])
+
+
+def create_local_encoder(model_name: str = None, dimension: int = None) -> LocalEncoder:
+    """Create the encoder for a model name ("hashed-tfidf" or a sentence-transformers model)."""
+    model_name = model_name or settings.EMBEDDING_MODEL
+    dimension = dimension or settings.EMBEDDING_DIMENSION
+    if model_name == HASHED_TFIDF_MODEL:
+        return HashedTfidfEncoder(dimension)
+    if not SENTENCE_TRANSFORMERS_AVAILABLE:
+        # Falling back silently would store vectors labelled with the wrong model
+        raise RuntimeError(
+            f"sentence-transformers is not installed; install it or set EMBEDDING_MODEL={HASHED_TFIDF_MODEL}"
+        )
+    return SentenceTransformerEncoder(
+        model_name, dimension, device=settings.LOCAL_EMBEDDING_DEVICE,
+        batch_size=settings.LOCAL_EMBEDDING_BATCH_SIZE
+    )
+
+
+class EmbeddingBatcher:
+    """Runs a local encoder on one worker thread, coalescing concurrent requests into batches.
+
+    Encoding never blocks the event loop, and requests arriving within
+    max_wait_ms of each other share one forward pass.
+    """
+
+    def __init__(self, encoder: LocalEncoder, batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.encoder = encoder
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.requests = 0
+        self.batches = 0
+        self._queue: "queue.Queue[Tuple[List[str], Future]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, texts: List[str]) -> Future:
+        """Queue texts for encoding; the future resolves to their embedding matrix."""
+        future: Future = Future()
+        if not texts:
+            future.set_result(np.zeros((0, self.encoder.dimension), dtype=np.float32))
+            return future
+        self._ensure_started()
+        self._queue.put((list(texts), future))
+        return future
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        """Embed texts without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(texts))
+
+    def _ensure_started(self) -> None:
+        """Start the worker thread, if not running yet."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="local-embeddings", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Take requests until the batch is full or the wait window closes, then encode them together."""
+        while True:
+            pending = [self._queue.get()]
+            size = len(pending[0][0])
+            deadline = time.monotonic() + self.max_wait
+            while size < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    pending.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+                size += len(pending[-1][0])
+
+            pending = [(texts, future) for texts, future in pending if future.set_running_or_notify_cancel()]
+            if pending:
+                self._encode(pending)
+
+    def _encode(self, pending: List[Tuple[List[str], Future]]) -> None:
+        """Encode a batch and hand each request its rows."""
+        try:
+            matrix = self.encoder.encode([text for texts, _ in pending for text in texts])
+        except Exception as e:
+            logger.warning(f"Local embedding batch failed: {e}")
+            for _, future in pending:
+                future.set_exception(e)
+            return
+
+        self.requests += len(pending)
+        self.batches += 1
+        start = 0
+        for texts, future in pending:
+            future.set_result(matrix[start:start + len(texts)])
+            start += len(texts)
+
+
+@lru_cache(maxsize=1)
+def get_local_embedding_batcher() -> EmbeddingBatcher:
+    """Get the process-wide batcher of the configured local model (loaded on first use)."""
+    return EmbeddingBatcher(
+        create_local_encoder(),
+        batch_size=settings.LOCAL_EMBEDDING_BATCH_SIZE,
+        max_wait_ms=settings.LOCAL_EMBEDDING_BATCH_WAIT_MS
+    )
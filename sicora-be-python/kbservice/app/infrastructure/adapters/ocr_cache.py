@@ -0,0 +1,59 @@
+"""Per-page OCR result cache and OCR resolution selection."""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+# Bump when the OCR pipeline changes in a way that alters its output
+OCR_CACHE_VERSION = 1
+
+
+def ocr_cache_key(page_hash: str, dpi: int, language: str) -> str:
+    """Cache key of a page's OCR text: same page content, resolution and language give the same text."""
+    return hashlib.sha256(f"{OCR_CACHE_VERSION}:{page_hash}:{dpi}:{language}".encode()).hexdigest()
+
+
+def choose_ocr_dpi(native_dpi: Optional[float], min_dpi: int, max_dpi: int, default_dpi: int) -> int:
+    """Pick the rasterization resolution for a page.
+
+    Scanned pages are rendered at the resolution of their image (rendering
+    above it only adds pixels to OCR), clamped so small scans stay legible
+    for tesseract and huge ones do not blow up OCR time. Pages without an
+    image use the default.
+    """
+    if not native_dpi or native_dpi <= 0:
+        return default_dpi
+    return int(min(max(round(native_dpi), min_dpi), max_dpi))
+
+
+class OCRPageCache:
+    """File-per-page OCR text cache, safe to share between worker processes."""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def get(self, key: str) -> Optional[str]:
+        """Get the cached OCR text of a page."""
+        try:
+            return self._path(key).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, text: str) -> None:
+        """Store the OCR text of a page (atomically, so readers never see partial files)."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                file.write(text)
+            os.replace(temporary, path)
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
+
+    def _path(self, key: str) -> Path:
+        """Sharded file path of a key."""
+        return self.directory / key[:2] / f"{key}.txt"
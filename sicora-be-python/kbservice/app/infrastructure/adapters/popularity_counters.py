@@ -0,0 +1,277 @@
+"""Write-behind aggregation of knowledge item view and feedback counters."""
+
+import asyncio
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.domain.services.kb_domain_services import PopularityCounter
+from app.infrastructure.config.database import AsyncSessionLocal
+from app.infrastructure.models.kb_models import KnowledgeItemModel
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = ("views", "helpful", "unhelpful")
+
+Deltas = Dict[UUID, Dict[str, int]]
+
+
+class CounterStore(ABC):
+    """Where increments wait until they are written to the database."""
+
+    @abstractmethod
+    async def add(self, deltas: Deltas) -> None:
+        """Add increments."""
+        pass
+
+    @abstractmethod
+    async def take(self) -> Deltas:
+        """Remove and return every pending increment."""
+        pass
+
+    @abstractmethod
+    async def peek(self) -> Deltas:
+        """Get every pending increment without removing it."""
+        pass
+
+
+class MemoryCounterStore(CounterStore):
+    """Pending increments of a single process."""
+
+    def __init__(self):
+        self._deltas: Deltas = {}
+
+    async def add(self, deltas: Deltas) -> None:
+        for item_id, counts in deltas.items():
+            pending = self._deltas.setdefault(item_id, dict.fromkeys(COUNTER_FIELDS, 0))
+            for field, amount in counts.items():
+                pending[field] += amount
+
+    async def take(self) -> Deltas:
+        deltas, self._deltas = self._deltas, {}
+        return deltas
+
+    async def peek(self) -> Deltas:
+        return {item_id: dict(counts) for item_id, counts in self._deltas.items()}
+
+
+class RedisCounterStore(CounterStore):
+    """Pending increments shared by all workers in one Redis hash.
+
+    Increments are HINCRBYs on ``<item_id>|<field>`` fields. ``take`` renames
+    the hash away atomically, so increments arriving during a flush land in
+    a fresh hash and each one is written exactly once.
+    """
+
+    KEY = "kbservice:popularity"
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url)
+
+    async def add(self, deltas: Deltas) -> None:
+        pipeline = self.client.pipeline(transaction=False)
+        for item_id, counts in deltas.items():
+            for field, amount in counts.items():
+                if amount:
+                    pipeline.hincrby(self.KEY, f"{item_id}|{field}", amount)
+        await pipeline.execute()
+
+    async def take(self) -> Deltas:
+        draining_key = f"{self.KEY}:draining:{uuid.uuid4().hex}"
+        try:
+            await self.client.rename(self.KEY, draining_key)
+        except Exception as e:
+            if "no such key" in str(e).lower():
+                return {}
+            raise
+        raw = await self.client.hgetall(draining_key)
+        await self.client.delete(draining_key)
+        return self._decode(raw)
+
+    async def peek(self) -> Deltas:
+        return self._decode(await self.client.hgetall(self.KEY))
+
+    @staticmethod
+    def _decode(raw: Dict[bytes, bytes]) -> Deltas:
+        """Turn ``<item_id>|<field>`` hash fields back into per-item deltas."""
+        deltas: Deltas = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+        for key, value in raw.items():
+            item_id, field = (key.decode() if isinstance(key, bytes) else key).split("|", 1)
+            deltas[UUID(item_id)][field] += int(value)
+        return dict(deltas)
+
+
+class WriteBehindPopularityCounter(PopularityCounter):
+    """Counts views and feedback in a store and writes them with batched atomic UPDATEs.
+
+    A background task flushes every ``flush_interval_ms`` milliseconds with
+    ``SET view_count = view_count + :n`` per item, so a burst of views on a
+    hot item costs one row update instead of one per request, and
+    concurrent workers never overwrite each other's counts. Increments of
+    a failed flush go back to the store for the next one.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        store: Optional[CounterStore] = None,
+        flush_interval_ms: int = 2000,
+        batch_size: int = 500
+    ):
+        self.session_factory = session_factory
+        self.store = store or MemoryCounterStore()
+        self.flush_interval = flush_interval_ms / 1000
+        self.batch_size = batch_size
+        self._in_flight: Deltas = {}
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.recorded = 0
+        self.flushed_items = 0
+        self.flushes = 0
+        self.failed = 0
+
+    async def record(self, item_id: UUID, views: int = 0, helpful: int = 0, unhelpful: int = 0) -> None:
+        """Add to an item's counters without touching the database."""
+        await self.store.add({item_id: {"views": views, "helpful": helpful, "unhelpful": unhelpful}})
+        self.recorded += 1
+        self._ensure_started()
+
+    async def pending(self, item_ids: List[UUID]) -> Deltas:
+        """Get the increments not yet persisted for the given items."""
+        deltas = self._merge(await self.store.peek(), self._in_flight)
+        return {item_id: deltas[item_id] for item_id in item_ids if item_id in deltas}
+
+    async def most_viewed_pending(self, limit: int) -> List[UUID]:
+        """Get the items with the most views not yet persisted."""
+        deltas = self._merge(await self.store.peek(), self._in_flight)
+        ranked = sorted(deltas, key=lambda item_id: deltas[item_id]["views"], reverse=True)
+        return [item_id for item_id in ranked[:limit] if deltas[item_id]["views"] > 0]
+
+    async def flush(self) -> int:
+        """Write every pending increment; returns the number of items updated."""
+        async with self._flush_lock:
+            self._in_flight = await self.store.take()
+            if not self._in_flight:
+                return 0
+
+            table = KnowledgeItemModel.__table__
+            stmt = update(table).where(table.c.id == bindparam("item_id")).values(
+                view_count=table.c.view_count + bindparam("views"),
+                helpful_count=table.c.helpful_count + bindparam("helpful"),
+                unhelpful_count=table.c.unhelpful_count + bindparam("unhelpful"),
+                # Counters are not content changes
+                updated_at=table.c.updated_at
+            )
+            rows = [{"item_id": item_id, **counts} for item_id, counts in self._in_flight.items()]
+            try:
+                async with self.session_factory() as session:
+                    for start in range(0, len(rows), self.batch_size):
+                        await session.execute(stmt, rows[start:start + self.batch_size])
+                    await session.commit()
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Failed to write counters of {len(rows)} knowledge items: {e}")
+                await self.store.add(self._in_flight)
+                return 0
+            finally:
+                self._in_flight = {}
+
+            self.flushes += 1
+            self.flushed_items += len(rows)
+            return len(rows)
+
+    async def stop(self) -> None:
+        """Stop the background task and write what is pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        """Get flush counters."""
+        return {
+            "recorded": self.recorded,
+            "flushes": self.flushes,
+            "flushed_items": self.flushed_items,
+            "failed_flushes": self.failed
+        }
+
+    @staticmethod
+    def _merge(*sources: Deltas) -> Deltas:
+        """Sum several sets of per-item increments."""
+        merged: Deltas = {}
+        for source in sources:
+            for item_id, counts in source.items():
+                target = merged.setdefault(item_id, dict.fromkeys(COUNTER_FIELDS, 0))
+                for field, amount in counts.items():
+                    target[field] += amount
+        return merged
+
+    def _ensure_started(self) -> None:
+        """Start the flush loop on the running event loop, if not running yet."""
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        except RuntimeError:
+            # No running loop (e.g. scripts): counts wait for an explicit flush()
+            self._task = None
+
+    async def _run(self) -> None:
+        """Flush every interval."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                # Store unreachable: increments stay where they are until the next round
+                logger.warning(f"Popularity counter flush failed: {e}")
+
+
+def create_popularity_counter(backend: str = None) -> Optional[WriteBehindPopularityCounter]:
+    """Create the popularity counter for the configured backend ("redis", "memory" or "none")."""
+    backend = (backend or settings.POPULARITY_COUNTER_BACKEND).lower()
+    if backend == "auto":
+        backend = "redis" if settings.REDIS_URL else "memory"
+    if backend == "none":
+        return None
+
+    store: CounterStore = MemoryCounterStore()
+    if backend == "redis":
+        try:
+            store = RedisCounterStore(settings.REDIS_URL)
+        except Exception as e:
+            logger.warning(f"Shared popularity counters unavailable, counting in memory: {e}")
+
+    return WriteBehindPopularityCounter(
+        AsyncSessionLocal,
+        store,
+        flush_interval_ms=settings.POPULARITY_FLUSH_INTERVAL_MS,
+        batch_size=settings.POPULARITY_FLUSH_BATCH_SIZE
+    )
+
+
+_popularity_counter: Optional[WriteBehindPopularityCounter] = None
+_popularity_counter_created = False
+
+
+def get_popularity_counter() -> Optional[WriteBehindPopularityCounter]:
+    """Get the process-wide popularity counter (None when disabled)."""
+    global _popularity_counter, _popularity_counter_created
+    if not _popularity_counter_created:
+        _popularity_counter = create_popularity_counter()
+        _popularity_counter_created = True
+    return _popularity_counter
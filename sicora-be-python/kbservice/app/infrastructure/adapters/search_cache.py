@@ -0,0 +1,185 @@
+"""Versioned in-process cache of search responses."""
+
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import settings
+from app.domain.services.kb_domain_services import SearchResultCache
+
+logger = logging.getLogger(__name__)
+
+
+class KnowledgeBaseVersion(ABC):
+    """Monotonic counter bumped on every knowledge base write."""
+
+    @abstractmethod
+    async def current(self) -> int:
+        """Get the current version."""
+        pass
+
+    @abstractmethod
+    async def bump(self) -> int:
+        """Increment and return the version."""
+        pass
+
+
+class LocalKnowledgeBaseVersion(KnowledgeBaseVersion):
+    """Version counter for a single process."""
+
+    def __init__(self):
+        self._version = 0
+        self._lock = threading.Lock()
+
+    async def current(self) -> int:
+        return self._version
+
+    async def bump(self) -> int:
+        with self._lock:
+            self._version += 1
+            return self._version
+
+
+class RedisKnowledgeBaseVersion(KnowledgeBaseVersion):
+    """Version counter shared by all workers through Redis INCR.
+
+    The version is re-read at most every ``refresh_seconds`` so cache hits
+    do not pay a Redis round trip; writes in other workers become visible
+    within that interval. If Redis is unreachable, the last known version
+    is kept.
+    """
+
+    KEY = "kbservice:kb_version"
+
+    def __init__(self, url: str, refresh_seconds: float):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url)
+        self.refresh_seconds = refresh_seconds
+        self._version = 0
+        self._checked_at: Optional[float] = None
+
+    async def current(self) -> int:
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.refresh_seconds:
+            try:
+                self._version = int(await self.client.get(self.KEY) or 0)
+            except Exception as e:
+                logger.warning(f"Could not read knowledge base version: {e}")
+            self._checked_at = now
+        return self._version
+
+    async def bump(self) -> int:
+        try:
+            self._version = int(await self.client.incr(self.KEY))
+        except Exception as e:
+            logger.warning(f"Could not bump knowledge base version: {e}")
+            self._version += 1
+        self._checked_at = time.monotonic()
+        return self._version
+
+
+class VersionedSearchResultCache(SearchResultCache):
+    """LRU of search responses tagged with the knowledge base version they were computed at."""
+
+    def __init__(
+        self,
+        version: Optional[KnowledgeBaseVersion] = None,
+        max_entries: int = 1000,
+        ttl_seconds: float = 300
+    ):
+        self.version = version or LocalKnowledgeBaseVersion()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[int, float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    async def current_version(self) -> int:
+        """Get the current knowledge base version."""
+        return await self.version.current()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a cached response for the current knowledge base version."""
+        version = await self.version.current()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    async def set(self, key: str, value: Any, version: Optional[int] = None) -> None:
+        """Cache a response computed at ``version`` (default: current), unless the knowledge base moved on since.
+
+        Callers pass the version read before computing the response, so a
+        result built from data that was replaced meanwhile is not stored
+        under the new version.
+        """
+        current = await self.version.current()
+        if version is not None and version != current:
+            return
+        with self._lock:
+            self._entries[key] = (current, time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def invalidate(self) -> int:
+        """Bump the knowledge base version, dropping every cached response."""
+        version = await self.version.bump()
+        with self._lock:
+            self._entries.clear()
+        return version
+
+    def stats(self) -> Dict[str, float]:
+        """Get hit/miss metrics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+def create_search_result_cache() -> Optional[VersionedSearchResultCache]:
+    """Create the search result cache from settings (None when disabled)."""
+    if not settings.SEARCH_CACHE_ENABLED:
+        return None
+
+    version: KnowledgeBaseVersion = LocalKnowledgeBaseVersion()
+    if settings.REDIS_URL:
+        try:
+            version = RedisKnowledgeBaseVersion(
+                settings.REDIS_URL, settings.SEARCH_CACHE_VERSION_REFRESH_SECONDS
+            )
+        except Exception as e:
+            logger.warning(f"Shared knowledge base version unavailable, using local counter: {e}")
+
+    return VersionedSearchResultCache(
+        version,
+        max_entries=settings.SEARCH_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS
+    )
+
+
+_search_result_cache: Optional[VersionedSearchResultCache] = None
+_search_result_cache_created = False
+
+
+def get_search_result_cache() -> Optional[VersionedSearchResultCache]:
+    """Get the process-wide search result cache (None when disabled)."""
+    global _search_result_cache, _search_result_cache_created
+    if not _search_result_cache_created:
+        _search_result_cache = create_search_result_cache()
+        _search_result_cache_created = True
+    return _search_result_cache
@@ -0,0 +1,152 @@
+"""Buffered, batched persistence of search queries for analytics."""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.domain.entities.kb_entities import SearchQuery
+from app.domain.services.kb_domain_services import SearchQueryLogger
+from app.infrastructure.config.database import AsyncSessionLocal
+from app.infrastructure.models.kb_models import SearchQueryModel
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedSearchQueryWriter(SearchQueryLogger):
+    """In-process queue of search queries flushed with bulk INSERTs.
+
+    A background task writes the buffer every ``batch_size`` rows or
+    ``flush_interval_ms`` milliseconds, whichever comes first. When the
+    backlog reaches ``max_backlog`` new queries are dropped and counted,
+    so a slow database never grows memory or slows down searches.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        batch_size: int = 200,
+        flush_interval_ms: int = 500,
+        max_backlog: int = 10000
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_backlog = max_backlog
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._batch_ready = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def log(self, search_query: SearchQuery) -> bool:
+        """Queue a search query for persistence; returns False if it was dropped."""
+        if len(self._buffer) >= self.max_backlog:
+            self.dropped += 1
+            return False
+
+        # Snapshot now: the filters dict may be enriched later by the search
+        self._buffer.append({
+            "id": search_query.id,
+            "query_text": search_query.query_text,
+            "user_id": search_query.user_id,
+            "user_role": search_query.user_role.value,
+            "filters": dict(search_query.filters),
+            "created_at": search_query.created_at
+        })
+        self.enqueued += 1
+
+        self._ensure_started()
+        if len(self._buffer) >= self.batch_size:
+            self._batch_ready.set()
+        return True
+
+    async def flush(self) -> int:
+        """Write everything buffered so far; returns the number of rows written."""
+        written = 0
+        async with self._flush_lock:
+            while self._buffer:
+                batch: List[Dict[str, Any]] = []
+                while self._buffer and len(batch) < self.batch_size:
+                    batch.append(self._buffer.popleft())
+                try:
+                    async with self.session_factory() as session:
+                        await session.execute(insert(SearchQueryModel), batch)
+                        await session.commit()
+                    written += len(batch)
+                except Exception as e:
+                    self.failed += len(batch)
+                    logger.error(f"Failed to write {len(batch)} search queries: {e}")
+        self.written += written
+        return written
+
+    async def stop(self) -> None:
+        """Stop the background task and drain the buffer.
+
+        The loop is asked to exit rather than cancelled, so a batch it is
+        writing is committed (or counted as failed) instead of being lost.
+        """
+        if self._task is not None:
+            self._stopping = True
+            self._batch_ready.set()
+            try:
+                await self._task
+            finally:
+                self._task = None
+                self._stopping = False
+        await self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        """Get queue counters."""
+        return {
+            "backlog": len(self._buffer),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed
+        }
+
+    def _ensure_started(self) -> None:
+        """Start the flush loop on the running event loop, if not running yet."""
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        except RuntimeError:
+            # No running loop (e.g. scripts): rows wait for an explicit flush()
+            self._task = None
+
+    async def _run(self) -> None:
+        """Flush on batch size or interval, whichever comes first."""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            if self._buffer and not self._stopping:
+                await self.flush()
+
+
+_search_query_writer: Optional[BufferedSearchQueryWriter] = None
+
+
+def get_search_query_writer() -> BufferedSearchQueryWriter:
+    """Get the process-wide search query writer."""
+    global _search_query_writer
+    if _search_query_writer is None:
+        _search_query_writer = BufferedSearchQueryWriter(
+            AsyncSessionLocal,
+            batch_size=settings.SEARCH_LOG_BATCH_SIZE,
+            flush_interval_ms=settings.SEARCH_LOG_FLUSH_INTERVAL_MS,
+            max_backlog=settings.SEARCH_LOG_MAX_BACKLOG
+        )
+    return _search_query_writer
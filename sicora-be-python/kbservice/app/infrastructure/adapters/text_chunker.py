@@ -0,0 +1,209 @@
+"""Token-aware, streaming text chunker with overlap."""
+
+import logging
+import re
+from abc import ABC, abstractmethod
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Iterable, Iterator, List, NamedTuple, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Blank line(s) between paragraphs
+_PARAGRAPH_BREAK = re.compile(r"\n[^\S\n]*\n\s*")
+# A sentence runs up to terminal punctuation followed by whitespace (so "3.5" or "art.5" stay whole)
+_SENTENCE = re.compile(r"\S.*?(?:[.!?]+(?=\s)|\Z)", re.DOTALL)
+
+
+class TokenCounter(ABC):
+    """Counts tokens and cuts text into token-bounded pieces."""
+
+    name: str
+
+    @abstractmethod
+    def count(self, text: str) -> int:
+        """Number of tokens in text."""
+        pass
+
+    @abstractmethod
+    def split(self, text: str, max_tokens: int, overlap_tokens: int = 0) -> Iterator[str]:
+        """Cut text into pieces of at most max_tokens tokens, each repeating overlap_tokens of the last."""
+        pass
+
+
+class TiktokenCounter(TokenCounter):
+    """Exact counts with a tiktoken encoding (the tokenizer of OpenAI embedding models)."""
+
+    def __init__(self, encoding_name: str):
+        self.name = encoding_name
+        self.encoding = tiktoken.get_encoding(encoding_name)
+
+    def count(self, text: str) -> int:
+        """Number of tokens in text."""
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def split(self, text: str, max_tokens: int, overlap_tokens: int = 0) -> Iterator[str]:
+        """Cut text into pieces of at most max_tokens tokens, each repeating overlap_tokens of the last."""
+        tokens = self.encoding.encode(text, disallowed_special=())
+        stride = max_tokens - overlap_tokens
+        for start in range(0, max(len(tokens) - overlap_tokens, 1), stride):
+            piece = self.encoding.decode(tokens[start:start + max_tokens]).strip()
+            if piece:
+                yield piece
+
+
+class RegexTokenCounter(TokenCounter):
+    """Approximate counts: one token per word or punctuation mark (no extra dependency)."""
+
+    name = "words"
+    _TOKEN = re.compile(r"\w+|[^\w\s]")
+
+    def count(self, text: str) -> int:
+        """Number of tokens in text."""
+        return sum(1 for _ in self._TOKEN.finditer(text))
+
+    def split(self, text: str, max_tokens: int, overlap_tokens: int = 0) -> Iterator[str]:
+        """Cut text into pieces of at most max_tokens tokens, each repeating overlap_tokens of the last."""
+        starts = [match.start() for match in self._TOKEN.finditer(text)]
+        if not starts:
+            return
+        stride = max_tokens - overlap_tokens
+        for first in range(0, max(len(starts) - overlap_tokens, 1), stride):
+            last = first + max_tokens
+            piece = text[starts[first]:starts[last] if last < len(starts) else len(text)].strip()
+            if piece:
+                yield piece
+
+
+def create_token_counter(encoding_name: Optional[str] = None) -> TokenCounter:
+    """Create the token counter for an encoding, falling back to word counting."""
+    encoding_name = encoding_name if encoding_name is not None else settings.CHUNK_TOKENIZER
+    if encoding_name and TIKTOKEN_AVAILABLE:
+        try:
+            return TiktokenCounter(encoding_name)
+        except Exception as e:
+            logger.warning(f"tiktoken encoding {encoding_name} unavailable, counting words instead: {e}")
+    return RegexTokenCounter()
+
+
+class _Unit(NamedTuple):
+    """A sentence (or a piece of an over-long one) with its token count."""
+    text: str
+    tokens: int
+    starts_paragraph: bool
+
+
+class TextChunker:
+    """Packs sentences into chunks of at most ``max_tokens`` tokens.
+
+    Input is consumed lazily (any iterable of texts, e.g. pages) and chunks
+    are yielded as soon as they are full, so memory stays bounded by one
+    chunk and time is linear in the input. Each chunk after the first starts
+    with the last sentences of the previous one, up to ``overlap_tokens``.
+    Once a chunk is half full, a new paragraph starts a new chunk, which
+    keeps boundaries stable when an earlier part of the document is edited.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 350,
+        overlap_tokens: int = 50,
+        token_counter: Optional[TokenCounter] = None
+    ):
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        if not 0 <= overlap_tokens < max_tokens:
+            raise ValueError("overlap_tokens must be between 0 and max_tokens - 1")
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.min_tokens = max_tokens // 2
+        self.token_counter = token_counter or RegexTokenCounter()
+
+    @property
+    def signature(self) -> str:
+        """Identifies the chunking configuration (changing it changes every chunk)."""
+        return f"{self.token_counter.name}:{self.max_tokens}:{self.overlap_tokens}"
+
+    def chunk(self, text: str) -> List[str]:
+        """Chunk a single text."""
+        return list(self.iter_chunks([text]))
+
+    def iter_chunks(self, texts: Iterable[str]) -> Iterator[str]:
+        """Yield chunks from a stream of texts."""
+        window: Deque[_Unit] = deque()
+        window_tokens = 0
+        has_new_units = False
+
+        for unit in self._iter_units(texts):
+            paragraph_break = unit.starts_paragraph and window_tokens >= self.min_tokens
+            if has_new_units and (window_tokens + unit.tokens > self.max_tokens or paragraph_break):
+                yield self._join(window)
+                has_new_units = False
+                # Keep the tail as overlap, as long as the next unit still fits
+                while window and (
+                    window_tokens > self.overlap_tokens
+                    or window_tokens + unit.tokens > self.max_tokens
+                ):
+                    window_tokens -= window.popleft().tokens
+
+            window.append(unit)
+            window_tokens += unit.tokens
+            has_new_units = True
+
+        if has_new_units:
+            yield self._join(window)
+
+    def _iter_units(self, texts: Iterable[str]) -> Iterator[_Unit]:
+        """Split texts into sentences, cutting sentences longer than a chunk."""
+        for text in texts:
+            for paragraph in self._iter_paragraphs(text):
+                starts_paragraph = True
+                for match in _SENTENCE.finditer(paragraph):
+                    sentence = " ".join(match.group().split())
+                    if not sentence:
+                        continue
+                    tokens = self.token_counter.count(sentence)
+                    if tokens <= self.max_tokens:
+                        yield _Unit(sentence, tokens, starts_paragraph)
+                    else:
+                        for piece in self.token_counter.split(sentence, self.max_tokens, self.overlap_tokens):
+                            yield _Unit(piece, self.token_counter.count(piece), starts_paragraph)
+                            starts_paragraph = False
+                    starts_paragraph = False
+
+    @staticmethod
+    def _iter_paragraphs(text: str) -> Iterator[str]:
+        """Yield the paragraphs of a text without building a list."""
+        start = 0
+        for match in _PARAGRAPH_BREAK.finditer(text):
+            yield text[start:match.start()]
+            start = match.end()
+        yield text[start:]
+
+    @staticmethod
+    def _join(window: Iterable[_Unit]) -> str:
+        """Join units, keeping paragraph breaks."""
+        parts = []
+        for unit in window:
+            if parts:
+                parts.append("\n\n" if unit.starts_paragraph else " ")
+            parts.append(unit.text)
+        return "".join(parts)
+
+
+@lru_cache(maxsize=1)
+def get_text_chunker() -> TextChunker:
+    """Get the chunker configured by settings (one per process)."""
+    return TextChunker(
+        max_tokens=settings.CHUNK_MAX_TOKENS,
+        overlap_tokens=settings.CHUNK_OVERLAP_TOKENS,
+        token_counter=create_token_counter()
+    )
@@ -0,0 +1,190 @@
+"""Full-text search engines for Knowledge Base text search."""
+
+import re
+from abc import ABC, abstractmethod
+from typing import List, Optional, Dict, Any, NamedTuple
+from uuid import UUID
+
+from sqlalchemy import select, func, desc, or_, case, cast, literal, literal_column, table, column
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.infrastructure.models.kb_models import KnowledgeItemModel, FTS_TABLE
+
+# Words too common to be useful as OR terms in the FTS5 fallback
+STOP_WORDS = {
+    "el", "la", "los", "las", "un", "una", "unos", "unas", "de", "del", "al",
+    "en", "y", "o", "que", "es", "se", "por", "para", "con", "como", "lo",
+    "su", "sus", "me", "mi", "qué", "cómo", "cuál", "cuando", "cuándo",
+}
+
+
+class TextSearchHit(NamedTuple):
+    """A ranked full-text match."""
+
+    item_id: UUID
+    score: float  # Normalized to [0, 1]
+    snippet: Optional[str]
+
+
+class TextSearchEngine(ABC):
+    """Interface for dialect-specific full-text search over knowledge items."""
+
+    @abstractmethod
+    async def search(
+        self,
+        session: AsyncSession,
+        query: str,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[TextSearchHit]:
+        """Return hits ordered by relevance."""
+        pass
+
+    @staticmethod
+    def apply_filters(stmt, filters: Optional[Dict[str, Any]]):
+        """Apply status/category/target_audience filters to a statement."""
+        if filters:
+            if "status" in filters:
+                stmt = stmt.where(KnowledgeItemModel.status == filters["status"])
+            if "category" in filters:
+                stmt = stmt.where(KnowledgeItemModel.category == filters["category"])
+            if "target_audience" in filters:
+                stmt = stmt.where(KnowledgeItemModel.target_audience == filters["target_audience"])
+        return stmt
+
+
+class PostgresFullTextSearchEngine(TextSearchEngine):
+    """PostgreSQL search over the generated ``search_vector`` column (GIN indexed)."""
+
+    def __init__(self, language: str = None):
+        self.language = language or settings.TEXT_SEARCH_LANGUAGE
+
+    async def search(
+        self,
+        session: AsyncSession,
+        query: str,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[TextSearchHit]:
+        """Rank with ts_rank_cd and highlight only the returned page with ts_headline."""
+        config = cast(literal(self.language), REGCONFIG)
+        tsquery = func.websearch_to_tsquery(config, query)
+        search_vector = literal_column("knowledge_items.search_vector", type_=TSVECTOR)
+
+        # Normalization 32 maps the rank to rank / (rank + 1), i.e. into [0, 1)
+        rank = func.ts_rank_cd(search_vector, tsquery, 32).label("rank")
+        ranked = select(KnowledgeItemModel.id, rank).where(search_vector.op("@@")(tsquery))
+        ranked = self.apply_filters(ranked, filters)
+        ranked = ranked.order_by(desc("rank"), desc(KnowledgeItemModel.view_count))
+        ranked = ranked.offset(skip).limit(limit).subquery()
+
+        headline_options = (
+            f"StartSel={settings.SEARCH_HIGHLIGHT_PRE_TAG}, "
+            f"StopSel={settings.SEARCH_HIGHLIGHT_POST_TAG}, "
+            "MaxWords=35, MinWords=15, MaxFragments=2"
+        )
+        headline = func.ts_headline(config, KnowledgeItemModel.content, tsquery, headline_options)
+        stmt = select(ranked.c.id, ranked.c.rank, headline.label("snippet")).join(
+            KnowledgeItemModel, KnowledgeItemModel.id == ranked.c.id
+        ).order_by(desc(ranked.c.rank))
+
+        result = await session.execute(stmt)
+        return [TextSearchHit(row.id, float(row.rank), row.snippet) for row in result]
+
+
+class SQLiteFTS5SearchEngine(TextSearchEngine):
+    """SQLite FTS5 search over the ``knowledge_items_fts`` mirror table.
+
+    Terms are OR-ed (any matching word is a hit) and ranked with bm25, giving
+    title matches twice the weight of content matches.
+    """
+
+    async def search(
+        self,
+        session: AsyncSession,
+        query: str,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[TextSearchHit]:
+        """Rank with bm25 and highlight with FTS5 snippet()."""
+        match = self.build_match_expression(query)
+        if not match:
+            return []
+
+        # bm25() is negative (lower is better); x / (1 + x) maps it into [0, 1)
+        fts = table(FTS_TABLE, column("rowid"))
+        fts_ref = literal_column(FTS_TABLE)
+        bm25 = (-func.bm25(fts_ref, 2.0, 1.0)).label("bm25")
+        snippet = func.snippet(
+            fts_ref, 1,
+            settings.SEARCH_HIGHLIGHT_PRE_TAG, settings.SEARCH_HIGHLIGHT_POST_TAG, "...", 32
+        ).label("snippet")
+
+        stmt = select(KnowledgeItemModel.id, bm25, snippet).select_from(
+            fts.join(KnowledgeItemModel, literal_column("knowledge_items.rowid") == fts.c.rowid)
+        ).where(fts_ref.op("MATCH")(match))
+        stmt = self.apply_filters(stmt, filters)
+        stmt = stmt.order_by(desc("bm25"), desc(KnowledgeItemModel.view_count))
+        stmt = stmt.offset(skip).limit(limit)
+
+        result = await session.execute(stmt)
+        hits = []
+        for row in result:
+            score = max(0.0, float(row.bm25))
+            hits.append(TextSearchHit(row.id, score / (1.0 + score), row.snippet))
+        return hits
+
+    @staticmethod
+    def build_match_expression(query: str) -> str:
+        """Turn free text into an OR of quoted FTS5 terms."""
+        terms = [
+            term for term in re.findall(r"\w+", query.lower())
+            if len(term) > 1 and term not in STOP_WORDS
+        ]
+        return " OR ".join(f'"{term}"' for term in dict.fromkeys(terms))
+
+
+class LikeTextSearchEngine(TextSearchEngine):
+    """Portable LIKE-based search for databases without a full-text index."""
+
+    async def search(
+        self,
+        session: AsyncSession,
+        query: str,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[TextSearchHit]:
+        """Match the whole query as a substring; title matches rank first."""
+        search_term = f"%{query.lower()}%"
+        title_match = func.lower(KnowledgeItemModel.title).like(search_term)
+
+        stmt = select(
+            KnowledgeItemModel.id,
+            case((title_match, 1.0), else_=0.5).label("score")
+        ).where(
+            or_(title_match, func.lower(KnowledgeItemModel.content).like(search_term))
+        )
+        stmt = self.apply_filters(stmt, filters)
+        stmt = stmt.order_by(
+            title_match.desc(),
+            desc(KnowledgeItemModel.view_count)
+        ).offset(skip).limit(limit)
+
+        result = await session.execute(stmt)
+        return [TextSearchHit(row.id, float(row.score), None) for row in result]
+
+
+def create_text_search_engine(dialect_name: str) -> TextSearchEngine:
+    """Pick the full-text search engine for a database dialect."""
+    if dialect_name == "postgresql":
+        return PostgresFullTextSearchEngine()
+    if dialect_name == "sqlite":
+        return SQLiteFTS5SearchEngine()
+    return LikeTextSearchEngine()
+
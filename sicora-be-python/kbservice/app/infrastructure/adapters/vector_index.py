@@ -0,0 +1,369 @@
+"""In-process vector indexes for Knowledge Base semantic search."""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import List, Optional, Dict, Any, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from app.config import settings
+from app.domain.value_objects.kb_value_objects import VectorMatrix
+
+# Metadata fields that can be used to filter vector search results
+FILTERABLE_FIELDS = ("status", "category", "target_audience")
+
+
+class VectorIndex(ABC):
+    """Interface for in-memory approximate nearest neighbour indexes."""
+
+    @abstractmethod
+    def upsert(self, item_id: UUID, values: List[float], metadata: Dict[str, Any]) -> None:
+        """Insert or replace the vector of a knowledge item."""
+        pass
+
+    @abstractmethod
+    def remove(self, item_id: UUID) -> bool:
+        """Remove a knowledge item from the index."""
+        pass
+
+    @abstractmethod
+    def search(
+        self,
+        values: List[float],
+        threshold: float = 0.0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[UUID, float]]:
+        """Return (item_id, cosine similarity) pairs sorted by similarity."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every vector from the index."""
+        pass
+
+    @property
+    @abstractmethod
+    def is_loaded(self) -> bool:
+        """Whether the index has been populated and is still fresh."""
+        pass
+
+    @abstractmethod
+    def mark_loaded(self) -> None:
+        """Mark the index as fully populated from the database."""
+        pass
+
+
+class FlatVectorIndex(VectorIndex):
+    """Exact cosine search over a contiguous, pre-normalized float32 matrix."""
+
+    def __init__(self, dimension: int = None, refresh_seconds: float = None):
+        self.dimension = dimension or settings.EMBEDDING_DIMENSION
+        self.refresh_seconds = (
+            refresh_seconds if refresh_seconds is not None
+            else settings.VECTOR_INDEX_REFRESH_SECONDS
+        )
+        self._lock = threading.RLock()
+        self._loaded_at: Optional[float] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        """Reset internal storage."""
+        self._matrix = np.zeros((64, self.dimension), dtype=np.float32)
+        self._ids: List[UUID] = []
+        self._positions: Dict[UUID, int] = {}
+        self._codes = {field: np.zeros(64, dtype=np.int32) for field in FILTERABLE_FIELDS}
+        self._codebooks: Dict[str, Dict[str, int]] = {field: {} for field in FILTERABLE_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the index has been populated and is still fresh."""
+        if self._loaded_at is None:
+            return False
+        return (time.monotonic() - self._loaded_at) < self.refresh_seconds
+
+    def mark_loaded(self) -> None:
+        """Mark the index as fully populated from the database."""
+        self._loaded_at = time.monotonic()
+
+    def clear(self) -> None:
+        """Remove every vector from the index."""
+        with self._lock:
+            self._reset()
+            self._loaded_at = None
+
+    def upsert(self, item_id: UUID, values: List[float], metadata: Dict[str, Any]) -> None:
+        """Insert or replace the vector of a knowledge item."""
+        vector = self._normalize(values)
+        if vector is None:
+            self.remove(item_id)
+            return
+
+        with self._lock:
+            position = self._positions.get(item_id)
+            if position is None:
+                position = len(self._ids)
+                self._ensure_capacity(position + 1)
+                self._ids.append(item_id)
+                self._positions[item_id] = position
+
+            self._matrix[position] = vector
+            for field in FILTERABLE_FIELDS:
+                self._codes[field][position] = self._encode(field, metadata.get(field))
+            self._on_upsert(position)
+
+    def remove(self, item_id: UUID) -> bool:
+        """Remove a knowledge item from the index (swap with the last row)."""
+        with self._lock:
+            position = self._positions.pop(item_id, None)
+            if position is None:
+                return False
+
+            last = len(self._ids) - 1
+            if position != last:
+                moved_id = self._ids[last]
+                self._matrix[position] = self._matrix[last]
+                for field in FILTERABLE_FIELDS:
+                    self._codes[field][position] = self._codes[field][last]
+                self._ids[position] = moved_id
+                self._positions[moved_id] = position
+                self._on_move(last, position)
+
+            self._ids.pop()
+            return True
+
+    def search(
+        self,
+        values: List[float],
+        threshold: float = 0.0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[UUID, float]]:
+        """Return (item_id, cosine similarity) pairs sorted by similarity."""
+        query = self._normalize(values)
+        if query is None or limit <= 0:
+            return []
+
+        with self._lock:
+            size = len(self._ids)
+            if size == 0:
+                return []
+
+            mask = self._filter_mask(size, filters)
+            if mask is False:
+                return []
+            candidates = self._candidates(query, size, mask)
+            if candidates is not None and candidates.size == 0:
+                return []
+
+            if candidates is None:
+                scores = self._matrix[:size] @ query
+                positions = np.arange(size)
+            else:
+                scores = self._matrix[candidates] @ query
+                positions = candidates
+
+            keep = scores >= threshold
+            scores = scores[keep]
+            positions = positions[keep]
+            if scores.size == 0:
+                return []
+
+            if scores.size > limit:
+                top = np.argpartition(-scores, limit - 1)[:limit]
+                scores = scores[top]
+                positions = positions[top]
+
+            order = np.argsort(-scores, kind="stable")
+            return [
+                (self._ids[positions[i]], float(min(1.0, max(0.0, scores[i]))))
+                for i in order
+            ]
+
+    def _candidates(
+        self,
+        query: np.ndarray,
+        size: int,
+        mask: Optional[np.ndarray]
+    ) -> Optional[np.ndarray]:
+        """Positions to score, or None to score the whole matrix."""
+        if mask is None:
+            return None
+        return np.flatnonzero(mask)
+
+    def _filter_mask(self, size: int, filters: Optional[Dict[str, Any]]):
+        """Build a boolean mask of rows matching the filters (None = all rows)."""
+        if not filters:
+            return None
+
+        mask = None
+        for field in FILTERABLE_FIELDS:
+            if field not in filters or filters[field] is None:
+                continue
+            code = self._codebooks[field].get(self._normalize_key(filters[field]))
+            if code is None:
+                return False
+            field_mask = self._codes[field][:size] == code
+            mask = field_mask if mask is None else (mask & field_mask)
+        return mask
+
+    def _encode(self, field: str, value: Any) -> int:
+        """Map a categorical metadata value to an integer code."""
+        codebook = self._codebooks[field]
+        key = self._normalize_key(value)
+        if key not in codebook:
+            codebook[key] = len(codebook)
+        return codebook[key]
+
+    @staticmethod
+    def _normalize_key(value: Any) -> str:
+        """Normalize enum or string metadata values."""
+        return str(getattr(value, "value", value))
+
+    def _normalize(self, values: List[float]) -> Optional[np.ndarray]:
+        """Convert to a unit-length float32 array."""
+        if values is None:
+            return None
+        vector = np.asarray(values, dtype=np.float32)
+        if vector.ndim != 1 or vector.shape[0] != self.dimension or not vector.any():
+            return None
+        return VectorMatrix.normalize_rows(vector)
+
+    def _ensure_capacity(self, required: int) -> None:
+        """Grow contiguous storage geometrically."""
+        capacity = self._matrix.shape[0]
+        if required <= capacity:
+            return
+        new_capacity = max(required, capacity * 2)
+        matrix = np.zeros((new_capacity, self.dimension), dtype=np.float32)
+        matrix[:capacity] = self._matrix
+        self._matrix = matrix
+        for field in FILTERABLE_FIELDS:
+            codes = np.zeros(new_capacity, dtype=np.int32)
+            codes[:capacity] = self._codes[field]
+            self._codes[field] = codes
+        self._grow_extra(capacity, new_capacity)
+
+    def _grow_extra(self, old_capacity: int, new_capacity: int) -> None:
+        """Hook for subclasses keeping per-row arrays."""
+        pass
+
+    def _on_upsert(self, position: int) -> None:
+        """Hook called after a row is written."""
+        pass
+
+    def _on_move(self, source: int, target: int) -> None:
+        """Hook called when a row is moved during removal."""
+        pass
+
+
+class IVFVectorIndex(FlatVectorIndex):
+    """Inverted-file index: k-means coarse quantizer over the flat matrix.
+
+    Below ``min_train_size`` vectors the index behaves exactly like
+    ``FlatVectorIndex``. Above it, vectors are clustered into ``sqrt(n)``
+    lists and a query only scores the ``nprobe`` closest lists.
+    """
+
+    def __init__(
+        self,
+        dimension: int = None,
+        refresh_seconds: float = None,
+        min_train_size: int = None,
+        nprobe: int = None
+    ):
+        self.min_train_size = min_train_size or settings.VECTOR_INDEX_IVF_MIN_ITEMS
+        self.nprobe = nprobe or settings.VECTOR_INDEX_IVF_NPROBE
+        super().__init__(dimension, refresh_seconds)
+
+    def _reset(self) -> None:
+        """Reset internal storage."""
+        super()._reset()
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.full(self._matrix.shape[0], -1, dtype=np.int32)
+        self._trained_size = 0
+
+    def _grow_extra(self, old_capacity: int, new_capacity: int) -> None:
+        assignments = np.full(new_capacity, -1, dtype=np.int32)
+        assignments[:old_capacity] = self._assignments
+        self._assignments = assignments
+
+    def _on_upsert(self, position: int) -> None:
+        size = len(self._ids)
+        if self._centroids is None or size >= 2 * self._trained_size:
+            if size >= self.min_train_size:
+                self._train(size)
+            return
+        self._assignments[position] = int(np.argmax(self._centroids @ self._matrix[position]))
+
+    def _on_move(self, source: int, target: int) -> None:
+        self._assignments[target] = self._assignments[source]
+
+    def _train(self, size: int, iterations: int = 10) -> None:
+        """Run spherical k-means over the current vectors."""
+        data = self._matrix[:size]
+        nlist = max(1, int(np.sqrt(size)))
+        rng = np.random.default_rng(0)
+        centroids = data[rng.choice(size, nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            assignments = np.argmax(data @ centroids.T, axis=1)
+            for cluster in range(nlist):
+                members = data[assignments == cluster]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    if norm > 0:
+                        centroids[cluster] = centroid / norm
+
+        self._centroids = centroids
+        self._assignments[:size] = np.argmax(data @ centroids.T, axis=1)
+        self._trained_size = size
+
+    def _candidates(
+        self,
+        query: np.ndarray,
+        size: int,
+        mask: Optional[np.ndarray]
+    ) -> Optional[np.ndarray]:
+        if self._centroids is None:
+            return super()._candidates(query, size, mask)
+
+        # Selective filters leave few rows: scan them exactly instead of probing
+        if mask is not None and int(np.count_nonzero(mask)) < self.min_train_size:
+            return np.flatnonzero(mask)
+
+        nprobe = min(self.nprobe, len(self._centroids))
+        probe = np.argpartition(-(self._centroids @ query), nprobe - 1)[:nprobe]
+        list_mask = np.isin(self._assignments[:size], probe)
+        if mask is not None:
+            list_mask &= mask
+        return np.flatnonzero(list_mask)
+
+
+def create_vector_index(backend: str = None) -> Optional[VectorIndex]:
+    """Create a vector index for the configured backend ("flat", "ivf" or "none")."""
+    backend = (backend or settings.VECTOR_INDEX_BACKEND).lower()
+    if backend == "flat":
+        return FlatVectorIndex()
+    if backend == "ivf":
+        return IVFVectorIndex()
+    return None
+
+
+_vector_index: Optional[VectorIndex] = None
+_vector_index_created = False
+
+
+def get_vector_index() -> Optional[VectorIndex]:
+    """Get the process-wide vector index (None when disabled)."""
+    global _vector_index, _vector_index_created
+    if not _vector_index_created:
+        _vector_index = create_vector_index()
+        _vector_index_created = True
+    return _vector_index
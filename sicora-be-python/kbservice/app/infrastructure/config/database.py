@@ -1,10 +1,12 @@
 """Database configuration for Knowledge Base Service."""
 
+import asyncio
+import inspect
 import logging
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Callable, Set
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import text
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy import event, text
 
 from app.config import settings
 
@@ -44,6 +46,48 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+_AFTER_COMMIT = "after_commit_callbacks"
+_after_commit_tasks: Set[asyncio.Task] = set()
+
+
+def run_after_commit(session: AsyncSession, callback: Callable[[], Any]) -> None:
+    """Run callback once the session's transaction commits; drop it if the transaction rolls back.
+
+    Callbacks returning an awaitable are scheduled on the running event loop.
+    """
+    session.sync_session.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit_callbacks(session: Session) -> None:
+    for callback in session.info.pop(_AFTER_COMMIT, []):
+        try:
+            result = callback()
+            if inspect.isawaitable(result):
+                task = asyncio.ensure_future(result)
+                _after_commit_tasks.add(task)
+                task.add_done_callback(_after_commit_task_done)
+        except Exception as e:
+            logger.error(f"After-commit callback failed: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit_callbacks(session: Session) -> None:
+    session.info.pop(_AFTER_COMMIT, None)
+
+
+def _after_commit_task_done(task: asyncio.Task) -> None:
+    _after_commit_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"After-commit callback failed: {task.exception()}")
+
+
+async def wait_for_after_commit_tasks() -> None:
+    """Wait until every scheduled after-commit callback has finished."""
+    while _after_commit_tasks:
+        await asyncio.gather(*list(_after_commit_tasks), return_exceptions=True)
+
+
 async def check_database_health() -> bool:
     """Check database connection health."""
     try:
@@ -0,0 +1,93 @@
+"""Embedding backfill worker for knowledge items.
+
+Computes embeddings for items that have none, or whose embedding came from
+a model other than the configured one, and resumes from its checkpoint if a
+previous run was interrupted::
+
+    python -m app.infrastructure.embedding_backfill [--batch-size N] [--concurrency N] [--limit N] [--restart]
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import Optional
+from uuid import UUID
+
+from app.config import settings
+from app.infrastructure.config.database import AsyncSessionLocal
+from app.infrastructure.adapters.backfill_checkpoint import JSONCheckpointStore
+from app.infrastructure.adapters.embedding_cache import get_embedding_cache
+from app.infrastructure.adapters.search_cache import get_search_result_cache
+from app.infrastructure.adapters.vector_index import get_vector_index
+from app.infrastructure.repositories.kb_repositories_impl import SQLAlchemyKnowledgeItemRepository
+from app.infrastructure.services.kb_services_impl import create_embedding_service
+from app.application.use_cases.kb_use_cases import BackfillEmbeddingsUseCase
+from app.application.dtos.kb_dtos import EmbeddingBackfillResultDTO
+
+logger = logging.getLogger(__name__)
+
+
+async def run_embedding_backfill(
+    batch_size: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    max_items: Optional[int] = None,
+    restart: bool = False
+) -> EmbeddingBackfillResultDTO:
+    """Run the backfill, committing and checkpointing after every written batch."""
+    model_name = settings.EMBEDDING_MODEL
+    checkpoints = JSONCheckpointStore(settings.EMBEDDING_BACKFILL_CHECKPOINT_PATH)
+    checkpoint = None if restart else checkpoints.load(model_name)
+    if checkpoint:
+        logger.info(f"Resuming embedding backfill for {model_name} after {checkpoint}")
+
+    async with AsyncSessionLocal() as session:
+        use_case = BackfillEmbeddingsUseCase(
+            SQLAlchemyKnowledgeItemRepository(session, get_vector_index()),
+            create_embedding_service(get_embedding_cache()),
+            model_name,
+            get_search_result_cache(),
+            batch_size=batch_size or settings.EMBEDDING_BACKFILL_BATCH_SIZE,
+            concurrency=concurrency or settings.EMBEDDING_BACKFILL_CONCURRENCY,
+            max_retries=settings.EMBEDDING_BACKFILL_MAX_RETRIES,
+            backoff_seconds=settings.EMBEDDING_BACKFILL_BACKOFF_SECONDS
+        )
+
+        async def commit_batch(written_up_to: Optional[UUID]) -> None:
+            await session.commit()
+            if written_up_to is not None:
+                await asyncio.to_thread(checkpoints.save, model_name, str(written_up_to))
+
+        result = await use_case.execute(
+            after_id=UUID(checkpoint) if checkpoint else None,
+            max_items=max_items,
+            on_batch_written=commit_batch
+        )
+
+    # IDs are random: a finished run must not skip items created below its checkpoint next time
+    finished = max_items is None or result.processed < max_items
+    if finished and not result.failed:
+        await asyncio.to_thread(checkpoints.clear, model_name)
+
+    logger.info(
+        f"Embedding backfill for {model_name}: {result.updated} updated, "
+        f"{result.failed} failed of {result.processed} candidates"
+    )
+    return result
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Compute missing or stale knowledge item embeddings")
+    parser.add_argument("--batch-size", type=int, help="Items per embedding request and bulk update")
+    parser.add_argument("--concurrency", type=int, help="Batches embedded in parallel")
+    parser.add_argument("--limit", type=int, help="Stop after this many candidates")
+    parser.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=settings.LOG_LEVEL)
+    result = asyncio.run(run_embedding_backfill(args.batch_size, args.concurrency, args.limit, args.restart))
+    print(result.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,27 @@
 """Models package."""
 
 from .kb_models import (
+    KnowledgeDocumentModel,
     KnowledgeItemModel,
     CategoryModel,
     SearchQueryModel,
+    IngestionJobModel,
+    IngestionLedgerModel,
     FeedbackModel,
+    KnowledgeItemNeighborModel,
     KnowledgeItemVersionModel,
     QueryAnalyticsModel
 )
 
 __all__ = [
+    "KnowledgeDocumentModel",
     "KnowledgeItemModel",
     "CategoryModel",
     "SearchQueryModel", 
+    "IngestionJobModel",
+    "IngestionLedgerModel",
     "FeedbackModel",
+    "KnowledgeItemNeighborModel",
     "KnowledgeItemVersionModel",
     "QueryAnalyticsModel"
 ]
@@ -3,22 +3,88 @@
 from datetime import datetime
 from typing import List, Optional
 from uuid import uuid4
+
+import numpy as np
 from sqlalchemy import (
     String, Text, Integer, DateTime, Boolean, Float, 
-    ForeignKey, JSON, Index, UniqueConstraint
+    ForeignKey, JSON, Index, UniqueConstraint, DDL, event, LargeBinary, text
 )
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
+from app.config import settings
 from app.infrastructure.config.database import Base
 
-# Import pgvector for PostgreSQL vector operations
-try:
-    from pgvector.sqlalchemy import Vector
-    VECTOR_AVAILABLE = True
-except ImportError:
-    VECTOR_AVAILABLE = False
+# Stored embedding = 4-byte header naming the dtype + little-endian values
+_EMBEDDING_FORMATS = {"float32": (b"EMB4", np.dtype("<f4")), "float16": (b"EMB2", np.dtype("<f2"))}
+_EMBEDDING_DTYPES = {header: dtype for header, dtype in _EMBEDDING_FORMATS.values()}
+
+
+class EmbeddingArray(TypeDecorator):
+    """Embedding stored as raw float32 or float16 bytes (BYTEA / BLOB) and read back as a numpy array.
+
+    Decoding is a zero-copy ``np.frombuffer`` over the fetched bytes; the
+    header lets rows written with either precision coexist, so changing
+    EMBEDDING_STORAGE_DTYPE does not require rewriting existing rows.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, dtype: str = None):
+        super().__init__()
+        self.dtype = dtype or settings.EMBEDDING_STORAGE_DTYPE
+        if self.dtype not in _EMBEDDING_FORMATS:
+            raise ValueError(f"Unsupported embedding storage dtype: {self.dtype}")
+
+    def process_bind_param(self, value, dialect):
+        """Pack a float sequence or array into header + values."""
+        if value is None:
+            return None
+        header, dtype = _EMBEDDING_FORMATS[self.dtype]
+        return header + np.asarray(value, dtype=dtype).tobytes()
+
+    def process_result_value(self, value, dialect):
+        """View stored bytes as a read-only array without copying."""
+        if value is None:
+            return None
+        array = np.frombuffer(value, dtype=_EMBEDDING_DTYPES[bytes(value[:4])], offset=4)
+        array.setflags(write=False)
+        return array
+
+    def compare_values(self, x, y):
+        """Compare by value (arrays have no single truth value)."""
+        if x is None or y is None:
+            return x is y
+        return np.array_equal(np.asarray(x), np.asarray(y))
+
+
+class KnowledgeDocumentModel(Base):
+    """SQLAlchemy model for source documents whose chunks are knowledge items."""
+    
+    __tablename__ = "knowledge_documents"
+    
+    # Primary key
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    
+    # Source identity (same key as the ingestion ledger, e.g. "pdf:reglamento.pdf")
+    source_key: Mapped[str] = mapped_column(String(500), nullable=False, unique=True)
+    
+    # Document fields
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
+    content_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    category: Mapped[str] = mapped_column(String(100), nullable=False)
+    target_audience: Mapped[str] = mapped_column(String(50), nullable=False)
+    author_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), nullable=False, index=True)
+    file_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    chunk_count: Mapped[int] = mapped_column(Integer, default=0)
+    document_metadata: Mapped[Optional[dict]] = mapped_column("metadata", JSON, nullable=True)
+    
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
 
 class KnowledgeItemModel(Base):
@@ -41,11 +107,10 @@ class KnowledgeItemModel(Base):
     author_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), nullable=False, index=True)
     tags: Mapped[Optional[List[str]]] = mapped_column(JSON, nullable=True)
     
-    # Embedding vector - use pgvector for PostgreSQL, JSON for SQLite
-    if VECTOR_AVAILABLE:
-        embedding: Mapped[Optional[List[float]]] = mapped_column(Vector(1536), nullable=True)
-    else:
-        embedding: Mapped[Optional[List[float]]] = mapped_column(JSON, nullable=True)
+    # Embedding vector as packed floats (similarity is computed in-process by the vector index)
+    embedding: Mapped[Optional[np.ndarray]] = mapped_column(EmbeddingArray(), nullable=True)
+    # Model that produced the embedding; a different configured model makes it stale
+    embedding_model: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -58,17 +123,93 @@ class KnowledgeItemModel(Base):
     unhelpful_count: Mapped[int] = mapped_column(Integer, default=0)
     version: Mapped[int] = mapped_column(Integer, default=1)
     
+    # Source document this item is a chunk of (None for items authored directly)
+    document_id: Mapped[Optional[UUID]] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("knowledge_documents.id", ondelete="CASCADE"), nullable=True, index=True
+    )
+    chunk_index: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    
+    # When the related-items list was last computed; None queues the item for a refresh
+    related_computed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True, index=True
+    )
+    
     # Indexes for performance
     __table_args__ = (
-        Index("idx_knowledge_items_content_gin", "content"),  # For full-text search
-        Index("idx_knowledge_items_title_gin", "title"),     # For title search
         Index("idx_knowledge_items_category_status", "category", "status"),
         Index("idx_knowledge_items_target_audience_status", "target_audience", "status"),
         Index("idx_knowledge_items_created_at", "created_at"),
         Index("idx_knowledge_items_view_count", "view_count"),
         # Vector index will be added via migration for PostgreSQL
+        # Full-text indexes are created below per dialect
+    )
+
+
+# Name of the SQLite FTS5 mirror of knowledge_items
+FTS_TABLE = "knowledge_items_fts"
+
+# PostgreSQL: generated, weighted tsvector (title A, content B) with a GIN index
+for _statement in (
+    "ALTER TABLE knowledge_items ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    f"setweight(to_tsvector('{settings.TEXT_SEARCH_LANGUAGE}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{settings.TEXT_SEARCH_LANGUAGE}', coalesce(content, '')), 'B')"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS idx_knowledge_items_search_vector "
+    "ON knowledge_items USING GIN (search_vector)",
+):
+    event.listen(
+        KnowledgeItemModel.__table__, "after_create",
+        DDL(_statement).execute_if(dialect="postgresql")
+    )
+
+# SQLite: external-content FTS5 table kept in sync by triggers
+SQLITE_FTS_TRIGGERS = (
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON knowledge_items BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.rowid, new.title, new.content); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON knowledge_items BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content) "
+    "VALUES ('delete', old.rowid, old.title, old.content); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, content ON knowledge_items BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content) "
+    "VALUES ('delete', old.rowid, old.title, old.content); "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.rowid, new.title, new.content); END",
+)
+for _statement in (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, content, content='knowledge_items', content_rowid='rowid', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    *SQLITE_FTS_TRIGGERS,
+):
+    event.listen(
+        KnowledgeItemModel.__table__, "after_create",
+        DDL(_statement).execute_if(dialect="sqlite")
     )
 
+event.listen(
+    KnowledgeItemModel.__table__, "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect="sqlite")
+)
+
+
+def restore_sqlite_fts(connection) -> None:
+    """Re-create the FTS5 triggers and re-index every row after ``knowledge_items`` was rebuilt.
+
+    SQLite has no ALTER for most column and constraint changes, so migrations
+    copy the table into a new one: that drops its triggers and renumbers the
+    rowids the FTS5 mirror points at.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+    ).first()
+    if exists is None:
+        return  # FTS5 unavailable: text search falls back to LIKE
+    for statement in SQLITE_FTS_TRIGGERS:
+        connection.execute(text(statement))
+    connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
 
 class CategoryModel(Base):
     """SQLAlchemy model for categories."""
@@ -125,6 +266,53 @@ class SearchQueryModel(Base):
     )
 
 
+class IngestionJobModel(Base):
+    """SQLAlchemy model for background document ingestion jobs."""
+    
+    __tablename__ = "ingestion_jobs"
+    
+    # Primary key
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    
+    # Job definition
+    job_type: Mapped[str] = mapped_column(String(50), nullable=False, default="pdf_batch")
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="queued", index=True)
+    submitted_by: Mapped[UUID] = mapped_column(UUID(as_uuid=True), nullable=False, index=True)
+    options: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    
+    # Per-file state: filename, path, status, progress, result, error
+    files: Mapped[List[dict]] = mapped_column(JSON, nullable=False, default=list)
+    total_files: Mapped[int] = mapped_column(Integer, default=0)
+    processed_files: Mapped[int] = mapped_column(Integer, default=0)
+    progress: Mapped[float] = mapped_column(Float, default=0.0)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    cancel_requested: Mapped[bool] = mapped_column(Boolean, default=False)
+    
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class IngestionLedgerModel(Base):
+    """SQLAlchemy model for the content-hash ingestion ledger."""
+    
+    __tablename__ = "ingestion_ledger"
+    
+    # Source identity (e.g. "pdf:reglamento.pdf")
+    source_key: Mapped[str] = mapped_column(String(500), primary_key=True)
+    
+    # Hashes of the last ingestion: whole file and each chunk, in order
+    file_hash: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    chunk_hashes: Mapped[List[str]] = mapped_column(JSON, nullable=False, default=list)
+    item_ids: Mapped[List[str]] = mapped_column(JSON, nullable=False, default=list)
+    attributes: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
 class FeedbackModel(Base):
     """SQLAlchemy model for user feedback."""
     
@@ -149,6 +337,23 @@ class FeedbackModel(Base):
     )
 
 
+class KnowledgeItemNeighborModel(Base):
+    """SQLAlchemy model for the precomputed nearest neighbours of a knowledge item."""
+    
+    __tablename__ = "knowledge_item_neighbors"
+    
+    # Primary key: the neighbours of an item are one index range scan, in rank order
+    item_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("knowledge_items.id", ondelete="CASCADE"), primary_key=True
+    )
+    rank: Mapped[int] = mapped_column(Integer, primary_key=True)
+    
+    neighbor_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("knowledge_items.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    score: Mapped[float] = mapped_column(Float, nullable=False)
+
+
 class KnowledgeItemVersionModel(Base):
     """SQLAlchemy model for knowledge item versions."""
     
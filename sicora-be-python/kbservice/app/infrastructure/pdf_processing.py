@@ -5,10 +5,16 @@ Extrae texto, metadatos y procesa documentos para la base de conocimiento.
 
 import os
 import re
+import asyncio
+import hashlib
 import logging
+import multiprocessing
+import shutil
+import weakref
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
-import hashlib
+from uuid import UUID, uuid4
 from datetime import datetime
 
 # PDF Processing
@@ -17,7 +23,6 @@ import pdfplumber
 import fitz  # PyMuPDF
 import pytesseract
 from PIL import Image
-import io
 
 # Text Processing
 import chardet
@@ -27,8 +32,33 @@ import magic
 # FastAPI
 from fastapi import UploadFile
 
+from app.config import settings
+from app.infrastructure.config.database import AsyncSessionLocal
+from app.infrastructure.adapters.ingestion_jobs import IngestionJobQueue, ProgressCallback
+from app.infrastructure.adapters.ingestion_ledger import hash_file
+from app.infrastructure.adapters.text_chunker import get_text_chunker
+from app.infrastructure.adapters.ocr_cache import OCRPageCache, choose_ocr_dpi, ocr_cache_key
+from app.infrastructure.adapters.vector_index import get_vector_index
+from app.infrastructure.adapters.embedding_cache import get_embedding_cache
+from app.infrastructure.adapters.search_cache import get_search_result_cache
+from app.infrastructure.repositories.kb_repositories_impl import (
+    SQLAlchemyKnowledgeItemRepository,
+    SQLAlchemyIngestionLedgerRepository,
+    SQLAlchemyKnowledgeDocumentRepository
+)
+from app.infrastructure.services.kb_services_impl import create_embedding_service
+from app.application.use_cases.kb_use_cases import IngestDocumentUseCase
+from app.application.dtos.kb_dtos import DocumentIngestionDTO
+
 logger = logging.getLogger(__name__)
 
+# Métodos de extracción ordenados del más barato al más costoso
+EXTRACTION_METHODS_BY_COST = ("pymupdf", "pypdf2", "pdfplumber")
+
+# Marcadores de glifos sin mapeo a Unicode (fuentes embebidas sin ToUnicode)
+_GARBAGE_PATTERN = re.compile(r"\(cid:\d+\)|\ufffd")
+_LETTER_PATTERN = re.compile(r"[^\W\d_]")
+
 
 class PDFProcessingError(Exception):
     """Excepción para errores de procesamiento de PDF."""
@@ -103,60 +133,46 @@ class PDFProcessor:
             return ""
     
     def extract_text_with_ocr(self, file_path: str) -> str:
-        """Extraer texto usando OCR para PDFs escaneados."""
+        """Extraer texto usando OCR para PDFs escaneados (en serie; el motor lo reparte por páginas)."""
         try:
-            doc = fitz.open(file_path)
-            text = ""
-            
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                pix = page.get_pixmap()
-                img_data = pix.tobytes("png")
-                img = Image.open(io.BytesIO(img_data))
-                
-                # OCR con tesseract
-                page_text = pytesseract.image_to_string(
-                    img, 
-                    lang='spa',  # Español
-                    config='--psm 6'
-                )
-                text += page_text + "\n"
-            
-            doc.close()
-            return text.strip()
+            page_count = inspect_pdf(file_path)
+            pages = ocr_page_range(file_path, 0, page_count)
+            return "\n".join(text.strip() for text, _ in pages).strip()
         except Exception as e:
             logger.error(f"Error con OCR: {e}")
             return ""
     
     def extract_text(self, file_path: str) -> Tuple[str, str]:
         """
-        Extraer texto de PDF usando múltiples métodos.
+        Extraer texto de PDF probando primero el método más barato.
+        
+        Solo se recurre al siguiente método si el texto no supera la
+        heurística de calidad; si ninguno la supera se usa el más largo.
         
         Returns:
             Tuple[str, str]: (texto_extraído, método_usado)
         """
-        if not self.is_pdf_file(file_path):
-            raise PDFProcessingError(f"El archivo {file_path} no es un PDF válido")
-        
-        # Intentar múltiples métodos de extracción
-        methods = [
-            ("pdfplumber", self.extract_text_pdfplumber),
-            ("pymupdf", self.extract_text_pymupdf),
-            ("pypdf2", self.extract_text_pypdf2)
-        ]
+        page_count = inspect_pdf(file_path)
+        methods = {
+            "pymupdf": self.extract_text_pymupdf,
+            "pypdf2": self.extract_text_pypdf2,
+            "pdfplumber": self.extract_text_pdfplumber
+        }
         
         best_text = ""
         method_used = "none"
         
-        for method_name, method_func in methods:
+        for method_name in EXTRACTION_METHODS_BY_COST:
             try:
-                text = method_func(file_path)
-                if len(text) > len(best_text):
-                    best_text = text
-                    method_used = method_name
+                text = methods[method_name](file_path)
             except Exception as e:
                 logger.warning(f"Método {method_name} falló: {e}")
                 continue
+            if is_acceptable_extraction(text, page_count):
+                return text, method_name
+            if len(text) > len(best_text):
+                best_text = text
+                method_used = method_name
         
         # Si no se extrajo texto suficiente y OCR está habilitado
         if len(best_text) < 100 and self.use_ocr:
@@ -204,11 +220,7 @@ class PDFProcessor:
     
     def _calculate_file_hash(self, file_path: str) -> str:
         """Calcular hash SHA256 del archivo."""
-        hash_sha256 = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
-        return hash_sha256.hexdigest()
+        return hash_file(file_path)
     
     def clean_text(self, text: str) -> str:
         """Limpiar y normalizar el texto extraído."""
@@ -242,43 +254,9 @@ class PDFProcessor:
         except Exception:
             return "es"  # Default a español
     
-    def segment_text(self, text: str, max_chunk_size: int = 2000) -> List[str]:
-        """Segmentar texto en chunks más pequeños para procesamiento."""
-        if len(text) <= max_chunk_size:
-            return [text]
-        
-        # Intentar segmentar por párrafos primero
-        paragraphs = text.split('\n\n')
-        chunks = []
-        current_chunk = ""
-        
-        for paragraph in paragraphs:
-            if len(current_chunk) + len(paragraph) <= max_chunk_size:
-                current_chunk += paragraph + "\n\n"
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                
-                # Si el párrafo es muy largo, dividirlo por oraciones
-                if len(paragraph) > max_chunk_size:
-                    sentences = re.split(r'[.!?]+', paragraph)
-                    temp_chunk = ""
-                    for sentence in sentences:
-                        if len(temp_chunk) + len(sentence) <= max_chunk_size:
-                            temp_chunk += sentence + ". "
-                        else:
-                            if temp_chunk:
-                                chunks.append(temp_chunk.strip())
-                            temp_chunk = sentence + ". "
-                    if temp_chunk:
-                        current_chunk = temp_chunk
-                else:
-                    current_chunk = paragraph + "\n\n"
-        
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-        
-        return chunks
+    def segment_text(self, text: str) -> List[str]:
+        """Segmentar texto en chunks acotados por tokens, con solapamiento entre chunks."""
+        return get_text_chunker().chunk(text)
     
     def auto_categorize(self, text: str, filename: str) -> Tuple[str, str]:
         """Auto-categorizar documento basado en contenido y nombre."""
@@ -299,38 +277,47 @@ class PDFProcessor:
         else:
             return "article", "general"
     
+    def analyze_text(self, text: str, filename: str) -> Tuple[str, str, str, str, List[str]]:
+        """Limpiar, auto-categorizar, detectar idioma y segmentar el texto extraído."""
+        cleaned_text = self.clean_text(text)
+        auto_type, auto_category = self.auto_categorize(cleaned_text, filename)
+        language = self.detect_language(cleaned_text)
+        text_chunks = self.segment_text(cleaned_text)
+        return cleaned_text, auto_type, auto_category, language, text_chunks
+    
     async def process_pdf_file(
         self,
         file_path: str,
         content_type: Optional[str] = None,
         category: Optional[str] = None,
-        target_audience: str = "all"
+        target_audience: str = "all",
+        report_progress: Optional[ProgressCallback] = None
     ) -> Dict[str, Any]:
         """
         Procesar un archivo PDF completo.
         
+        Args:
+            report_progress: Recibe el avance (0-1) de la extracción; solo el OCR lo reporta
+        
         Returns:
             Dict con la información procesada lista para KBService
         """
         try:
-            # Extraer texto y metadatos
-            text, method_used = self.extract_text(file_path)
-            metadata = self.extract_metadata(file_path)
+            # Extraer texto y metadatos fuera del event loop
+            engine = get_pdf_ingestion_engine()
+            text, method_used = await engine.extract_text(
+                file_path, use_ocr=self.use_ocr, report_progress=report_progress
+            )
+            metadata = await engine.run(self.extract_metadata, file_path)
             
-            # Limpiar texto
-            cleaned_text = self.clean_text(text)
+            # Limpiar, categorizar, detectar idioma y segmentar (CPU) en el pool
+            cleaned_text, auto_type, auto_category, language, text_chunks = await engine.run(
+                self.analyze_text, text, metadata["file_name"]
+            )
             
             # Auto-categorizar si no se especifica
-            if not content_type or not category:
-                auto_type, auto_category = self.auto_categorize(cleaned_text, metadata["file_name"])
-                content_type = content_type or auto_type
-                category = category or auto_category
-            
-            # Detectar idioma
-            language = self.detect_language(cleaned_text)
-            
-            # Segmentar texto si es muy largo
-            text_chunks = self.segment_text(cleaned_text)
+            content_type = content_type or auto_type
+            category = category or auto_category
             
             result = {
                 "title": metadata.get("title") or Path(file_path).stem,
@@ -345,7 +332,7 @@ class PDFProcessor:
                     "text_length": len(cleaned_text),
                     "chunks_count": len(text_chunks)
                 },
-                "chunks": text_chunks if len(text_chunks) > 1 else None,
+                "chunks": text_chunks,
                 "processing_status": "success"
             }
             
@@ -361,6 +348,415 @@ class PDFProcessor:
             }
 
 
+def inspect_pdf(file_path: str) -> int:
+    """Validar que el archivo es un PDF y devolver su número de páginas."""
+    if not PDFProcessor().is_pdf_file(file_path):
+        raise PDFProcessingError(f"El archivo {file_path} no es un PDF válido")
+    try:
+        with fitz.open(file_path) as doc:
+            return doc.page_count
+    except Exception as e:
+        logger.warning(f"PyMuPDF no pudo abrir {file_path}, contando páginas con PyPDF2: {e}")
+        with open(file_path, 'rb') as file:
+            return len(PyPDF2.PdfReader(file).pages)
+
+
+def extract_page_range(file_path: str, method: str, start: int, stop: int) -> List[str]:
+    """Extraer el texto de las páginas [start, stop) con un método (se ejecuta en el pool)."""
+    if method == "pymupdf":
+        with fitz.open(file_path) as doc:
+            return [doc.load_page(number).get_text() for number in range(start, stop)]
+    if method == "pypdf2":
+        with open(file_path, 'rb') as file:
+            reader = PyPDF2.PdfReader(file)
+            return [reader.pages[number].extract_text() or "" for number in range(start, stop)]
+    if method == "pdfplumber":
+        with pdfplumber.open(file_path) as pdf:
+            return [pdf.pages[number].extract_text() or "" for number in range(start, stop)]
+    raise ValueError(f"Método de extracción desconocido: {method}")
+
+
+def _page_fingerprint(doc, page) -> str:
+    """Hash del contenido de una página: su content stream, sus imágenes y su geometría."""
+    digest = hashlib.sha256(f"{page.rect}:{page.rotation}".encode())
+    digest.update(page.read_contents())
+    for image in page.get_images(full=True):
+        digest.update(doc.xref_stream_raw(image[0]) or b"")
+    return digest.hexdigest()
+
+
+def _native_image_dpi(page) -> Optional[float]:
+    """Resolución de la imagen más grande de la página (la del escaneo), si tiene imágenes."""
+    best = None
+    for info in page.get_image_info():
+        placed_width = info["bbox"][2] - info["bbox"][0]
+        if placed_width > 0 and (best is None or info["width"] > best["width"]):
+            best = {**info, "placed_width": placed_width}
+    if best is None:
+        return None
+    return best["width"] / (best["placed_width"] / 72)
+
+
+def ocr_page_range(file_path: str, start: int, stop: int) -> List[Tuple[str, str]]:
+    """
+    OCR de las páginas [start, stop) (se ejecuta en el pool).
+    
+    Las páginas que ya tienen capa de texto aceptable no se rasterizan, y el
+    texto OCR de cada página se cachea por hash de la página.
+    
+    Returns:
+        List[Tuple[str, str]]: (texto, origen) por página; origen es "text", "cache" u "ocr"
+    """
+    cache = OCRPageCache(settings.PDF_OCR_CACHE_DIR) if settings.PDF_OCR_CACHE_DIR else None
+    pages = []
+    with fitz.open(file_path) as doc:
+        for number in range(start, stop):
+            page = doc.load_page(number)
+            text_layer = page.get_text()
+            if is_acceptable_extraction(text_layer, 1):
+                pages.append((text_layer, "text"))
+                continue
+            
+            dpi = choose_ocr_dpi(
+                _native_image_dpi(page),
+                settings.PDF_OCR_MIN_DPI,
+                settings.PDF_OCR_MAX_DPI,
+                settings.PDF_OCR_DEFAULT_DPI
+            )
+            key = ocr_cache_key(_page_fingerprint(doc, page), dpi, settings.PDF_OCR_LANGUAGE)
+            cached = cache.get(key) if cache else None
+            if cached is not None:
+                pages.append((cached, "cache"))
+                continue
+            
+            # Escala de grises y sin PNG intermedio: tesseract no usa el color
+            pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False)
+            image = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+            page_text = pytesseract.image_to_string(image, lang=settings.PDF_OCR_LANGUAGE, config='--psm 6')
+            if cache:
+                cache.set(key, page_text)
+            pages.append((page_text, "ocr"))
+    return pages
+
+
+def is_acceptable_extraction(text: str, page_count: int, min_chars_per_page: Optional[int] = None) -> bool:
+    """
+    Heurística de calidad del texto extraído.
+    
+    El texto es aceptable si tiene suficientes caracteres por página, está
+    compuesto mayoritariamente por letras y casi no contiene glifos sin mapear.
+    """
+    if min_chars_per_page is None:
+        min_chars_per_page = settings.PDF_MIN_CHARS_PER_PAGE
+    
+    stripped = text.strip()
+    if not stripped or len(stripped) < min_chars_per_page * max(page_count, 1):
+        return False
+    
+    letters = len(_LETTER_PATTERN.findall(stripped))
+    garbage = len(_GARBAGE_PATTERN.findall(stripped))
+    return letters / len(stripped) >= 0.5 and garbage / len(stripped) < 0.01
+
+
+class PDFIngestionEngine:
+    """
+    Motor de extracción de PDF sobre un ProcessPoolExecutor.
+    
+    La extracción (CPU y librerías bloqueantes) nunca corre en el event loop.
+    Los documentos grandes se reparten por rangos de páginas entre procesos.
+    """
+    
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        pages_per_task: int = 10,
+        parallel_page_threshold: int = 20,
+        ocr_pages_per_task: int = 2
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.pages_per_task = pages_per_task
+        self.parallel_page_threshold = parallel_page_threshold
+        self.ocr_pages_per_task = ocr_pages_per_task
+        self._executor: Optional[ProcessPoolExecutor] = None
+    
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """Pool de procesos, creado en el primer uso."""
+        if self._executor is None:
+            # spawn: el proceso padre tiene hilos (event loop, drivers) y fork no es seguro
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+    
+    async def run(self, func, *args):
+        """Ejecutar una función (picklable) en el pool de procesos."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+    
+    async def extract_text(
+        self,
+        file_path: str,
+        use_ocr: bool = False,
+        report_progress: Optional[ProgressCallback] = None
+    ) -> Tuple[str, str]:
+        """
+        Extraer texto probando primero el método más barato.
+        
+        El OCR, si está habilitado, solo se usa cuando ningún extractor da
+        texto aceptable, y solo para las páginas sin capa de texto.
+        
+        Returns:
+            Tuple[str, str]: (texto_extraído, método_usado)
+        """
+        page_count = await self.run(inspect_pdf, file_path)
+        
+        best_text = ""
+        method_used = "none"
+        
+        for method_name in EXTRACTION_METHODS_BY_COST:
+            try:
+                pages = await self.extract_pages(file_path, method_name, page_count)
+            except Exception as e:
+                logger.warning(f"Método {method_name} falló: {e}")
+                continue
+            
+            text = "\n".join(page.strip() for page in pages).strip()
+            if is_acceptable_extraction(text, page_count):
+                return text, method_name
+            if len(text) > len(best_text):
+                best_text = text
+                method_used = method_name
+        
+        # Ningún extractor dio texto aceptable: OCR de las páginas escaneadas
+        if use_ocr:
+            logger.info("Texto insuficiente, intentando con OCR...")
+            ocr_text = await self.ocr_pages(file_path, page_count, report_progress)
+            if len(ocr_text) > len(best_text):
+                best_text = ocr_text
+                method_used = "ocr"
+        
+        if not best_text.strip():
+            raise PDFProcessingError("No se pudo extraer texto del PDF")
+        
+        return best_text, method_used
+    
+    async def ocr_pages(
+        self,
+        file_path: str,
+        page_count: int,
+        report_progress: Optional[ProgressCallback] = None
+    ) -> str:
+        """OCR de todas las páginas repartidas entre procesos, reportando el avance por página."""
+        async def ocr_range(start: int, stop: int) -> Tuple[int, List[Tuple[str, str]]]:
+            return start, await self.run(ocr_page_range, file_path, start, stop)
+        
+        tasks = [
+            asyncio.ensure_future(ocr_range(start, min(start + self.ocr_pages_per_task, page_count)))
+            for start in range(0, page_count, self.ocr_pages_per_task)
+        ]
+        parts: Dict[int, List[Tuple[str, str]]] = {}
+        sources: Dict[str, int] = {}
+        pages_done = 0
+        reported = 0.0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                start, pages = await next_done
+                parts[start] = pages
+                pages_done += len(pages)
+                for _, source in pages:
+                    sources[source] = sources.get(source, 0) + 1
+                
+                fraction = pages_done / page_count
+                # Cada reporte es una escritura del job: como mucho cada 5%
+                if report_progress and (fraction - reported >= 0.05 or pages_done == page_count):
+                    reported = fraction
+                    await report_progress(fraction)
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        logger.info(f"OCR de {file_path}: páginas por origen {sources}")
+        return "\n".join(
+            text.strip() for start in sorted(parts) for text, _ in parts[start]
+        ).strip()
+    
+    async def extract_pages(self, file_path: str, method: str, page_count: int) -> List[str]:
+        """Extraer todas las páginas con un método, en paralelo si el documento es grande."""
+        if page_count < self.parallel_page_threshold:
+            return await self.run(extract_page_range, file_path, method, 0, page_count)
+        
+        ranges = [
+            (start, min(start + self.pages_per_task, page_count))
+            for start in range(0, page_count, self.pages_per_task)
+        ]
+        parts = await asyncio.gather(*(
+            self.run(extract_page_range, file_path, method, start, stop)
+            for start, stop in ranges
+        ))
+        return [page for part in parts for page in part]
+    
+    def shutdown(self) -> None:
+        """Detener el pool de procesos."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_pdf_ingestion_engine: Optional[PDFIngestionEngine] = None
+
+
+def get_pdf_ingestion_engine() -> PDFIngestionEngine:
+    """Obtener el motor de ingesta compartido por el proceso."""
+    global _pdf_ingestion_engine
+    if _pdf_ingestion_engine is None:
+        _pdf_ingestion_engine = PDFIngestionEngine(
+            max_workers=settings.PDF_INGESTION_WORKERS or None,
+            pages_per_task=settings.PDF_PAGES_PER_TASK,
+            parallel_page_threshold=settings.PDF_PARALLEL_PAGE_THRESHOLD,
+            ocr_pages_per_task=settings.PDF_OCR_PAGES_PER_TASK
+        )
+    return _pdf_ingestion_engine
+
+
+# Un lock por clave del ledger: dos archivos con el mismo nombre se ingieren uno tras otro
+_source_key_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def pdf_source_key(filename: str, author_id: str) -> str:
+    """Clave del ledger de ingesta para un PDF: el mismo autor subiendo el mismo nombre es una nueva versión."""
+    return f"pdf:{author_id}:{Path(filename).name}"
+
+
+def _source_key_lock(source_key: str) -> asyncio.Lock:
+    """Obtener el lock que serializa la ingesta de una clave del ledger."""
+    lock = _source_key_locks.get(source_key)
+    if lock is None:
+        lock = asyncio.Lock()
+        _source_key_locks[source_key] = lock
+    return lock
+
+
+def create_ingest_document_use_case(session) -> IngestDocumentUseCase:
+    """Crear el caso de uso de ingesta con los adaptadores compartidos del proceso."""
+    item_repo = SQLAlchemyKnowledgeItemRepository(session, get_vector_index())
+    return IngestDocumentUseCase(
+        item_repo,
+        SQLAlchemyIngestionLedgerRepository(session),
+        SQLAlchemyKnowledgeDocumentRepository(session, item_repo),
+        create_embedding_service(get_embedding_cache()),
+        get_search_result_cache()
+    )
+
+
+async def process_pdf_job_file(
+    file_path: str,
+    options: Dict[str, Any],
+    report_progress: ProgressCallback
+) -> Dict[str, Any]:
+    """Procesar un PDF de un job en segundo plano e ingerirlo en la base de conocimiento.
+    
+    Un archivo idéntico (mismo hash) ya ingerido con los mismos atributos se
+    omite sin extraer texto; si cambió, solo se generan embeddings para los
+    chunks nuevos o modificados.
+    """
+    if not options.get("author_id"):
+        raise PDFProcessingError("El job no indica el autor de los documentos")
+    
+    filename = Path(file_path).name
+    source_key = pdf_source_key(filename, options["author_id"])
+    async with _source_key_lock(source_key):
+        return await _ingest_pdf_job_file(file_path, filename, source_key, options, report_progress)
+
+
+async def _ingest_pdf_job_file(
+    file_path: str,
+    filename: str,
+    source_key: str,
+    options: Dict[str, Any],
+    report_progress: ProgressCallback
+) -> Dict[str, Any]:
+    """Extraer e ingerir un PDF de un job; se llama con el lock de su clave tomado."""
+    requested_attributes = {
+        key: options[key]
+        for key in ("content_type", "category", "target_audience")
+        if options.get(key)
+    }
+    # Cambiar la configuración del chunker obliga a re-segmentar
+    requested_attributes["chunking"] = get_text_chunker().signature
+    file_hash = await asyncio.to_thread(hash_file, file_path)
+    
+    async with AsyncSessionLocal() as session:
+        use_case = create_ingest_document_use_case(session)
+        if await use_case.is_unchanged(source_key, file_hash, requested_attributes):
+            logger.info(f"PDF sin cambios, se omite: {filename}")
+            return {"title": Path(filename).stem, "ingestion": "unchanged", "created": 0, "removed": 0}
+    
+    async def report_extraction_progress(fraction: float) -> None:
+        # La extracción ocupa la primera mitad del avance del archivo
+        await report_progress(0.5 * fraction)
+    
+    processor = PDFProcessor(use_ocr=options.get("use_ocr", False))
+    result = await processor.process_pdf_file(
+        file_path,
+        content_type=options.get("content_type"),
+        category=options.get("category"),
+        target_audience=options.get("target_audience", "all"),
+        report_progress=report_extraction_progress
+    )
+    if result.get("processing_status") != "success":
+        raise PDFProcessingError(result.get("error_message", "Error desconocido"))
+    await report_progress(0.5)
+    
+    dto = DocumentIngestionDTO(
+        source_key=source_key,
+        file_hash=file_hash,
+        title=result["title"][:200] or Path(filename).stem,
+        chunks=result["chunks"] or [result["content"]],
+        content_type=result["content_type"],
+        category=result["category"],
+        target_audience=result["target_audience"],
+        chunking=requested_attributes["chunking"],
+        metadata=result["metadata"]
+    )
+    async with AsyncSessionLocal() as session:
+        ingestion = await create_ingest_document_use_case(session).execute(dto, UUID(options["author_id"]))
+        await session.commit()
+    
+    return {
+        "title": result["title"],
+        "content_type": result["content_type"],
+        "category": result["category"],
+        "text_length": result["metadata"]["text_length"],
+        "pages": result["metadata"].get("pages", 0),
+        "extraction_method": result["metadata"]["extraction_method"],
+        "ingestion": ingestion.status,
+        "created": ingestion.created,
+        "reused": ingestion.reused,
+        "removed": ingestion.removed,
+        "item_ids": [str(item_id) for item_id in ingestion.item_ids],
+        "document_id": str(ingestion.document_id)
+    }
+
+
+_pdf_job_queue: Optional[IngestionJobQueue] = None
+
+
+def get_pdf_job_queue() -> IngestionJobQueue:
+    """Obtener la cola de jobs de PDF compartida por el proceso."""
+    global _pdf_job_queue
+    if _pdf_job_queue is None:
+        _pdf_job_queue = IngestionJobQueue(
+            AsyncSessionLocal,
+            process_pdf_job_file,
+            job_dir=settings.PDF_JOB_DIR,
+            workers=settings.PDF_JOB_WORKERS,
+            files_per_job=settings.PDF_JOB_FILES_CONCURRENCY
+        )
+    return _pdf_job_queue
+
+
 class PDFUploadHandler:
     """Manejador para uploads de PDF via FastAPI."""
     
@@ -382,8 +778,10 @@ class PDFUploadHandler:
         if not file.content_type or "pdf" not in file.content_type.lower():
             raise PDFProcessingError("Solo se permiten archivos PDF")
         
-        # Guardar archivo temporalmente
-        temp_file_path = self.upload_dir / f"temp_{file.filename}"
+        # Guardar archivo temporalmente en un directorio único (uploads concurrentes)
+        temp_dir = self.upload_dir / f"temp_{uuid4().hex}"
+        temp_dir.mkdir()
+        temp_file_path = temp_dir / Path(file.filename or "documento.pdf").name
         
         try:
             # Escribir archivo
@@ -403,14 +801,16 @@ class PDFUploadHandler:
             
         finally:
             # Limpiar archivo temporal
-            if temp_file_path.exists():
-                temp_file_path.unlink()
+            shutil.rmtree(temp_dir, ignore_errors=True)
     
     def cleanup_temp_files(self):
         """Limpiar archivos temporales."""
         for file_path in self.upload_dir.glob("temp_*"):
             try:
-                file_path.unlink()
+                if file_path.is_dir():
+                    shutil.rmtree(file_path)
+                else:
+                    file_path.unlink()
             except Exception as e:
                 logger.warning(f"Error limpiando archivo temporal {file_path}: {e}")
 
@@ -0,0 +1,101 @@
+"""Background refresh of the precomputed related-items graph.
+
+Runs periodically inside the service and can also be run by hand, e.g. to
+rebuild every list after changing RELATED_ITEMS_TOP_K::
+
+    python -m app.infrastructure.related_items_refresh [--full] [--limit N]
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import Optional
+
+from app.config import settings
+from app.infrastructure.config.database import AsyncSessionLocal
+from app.infrastructure.adapters.vector_index import get_vector_index
+from app.infrastructure.repositories.kb_repositories_impl import SQLAlchemyKnowledgeItemRepository
+from app.application.use_cases.kb_use_cases import RefreshRelatedItemsUseCase
+from app.application.dtos.kb_dtos import RelatedItemsRefreshResultDTO
+
+logger = logging.getLogger(__name__)
+
+
+async def run_related_items_refresh(full: bool = False, max_items: Optional[int] = None) -> RelatedItemsRefreshResultDTO:
+    """Recompute queued related-items lists, committing after every batch."""
+    async with AsyncSessionLocal() as session:
+        use_case = RefreshRelatedItemsUseCase(
+            SQLAlchemyKnowledgeItemRepository(session, get_vector_index()),
+            top_k=settings.RELATED_ITEMS_TOP_K,
+            threshold=settings.RELATED_ITEMS_THRESHOLD,
+            reverse_candidates=settings.RELATED_ITEMS_REVERSE_CANDIDATES,
+            batch_size=settings.RELATED_ITEMS_BATCH_SIZE
+        )
+        result = await use_case.execute(full=full, max_items=max_items, on_batch_done=session.commit)
+        await session.commit()
+
+    if result.refreshed:
+        logger.info(f"Related items: {result.refreshed} lists refreshed, {result.requeued} requeued")
+    return result
+
+
+class RelatedItemsRefresher:
+    """Periodically refreshes the related-items lists queued by writes."""
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the refresh loop is running."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the refresh loop on the running event loop."""
+        if self.interval_seconds > 0 and not self.is_running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the refresh loop; queued items are picked up on the next start."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        """Refresh, then sleep for the interval."""
+        while True:
+            try:
+                await run_related_items_refresh()
+            except Exception as e:
+                # Another worker refreshing the same item, database hiccups: retried next round
+                logger.warning(f"Related items refresh failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+
+_related_items_refresher: Optional[RelatedItemsRefresher] = None
+
+
+def get_related_items_refresher() -> RelatedItemsRefresher:
+    """Get the process-wide related-items refresher."""
+    global _related_items_refresher
+    if _related_items_refresher is None:
+        _related_items_refresher = RelatedItemsRefresher(settings.RELATED_ITEMS_REFRESH_SECONDS)
+    return _related_items_refresher
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Recompute precomputed related knowledge items")
+    parser.add_argument("--full", action="store_true", help="Recompute every list, not only queued ones")
+    parser.add_argument("--limit", type=int, help="Stop after this many lists")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=settings.LOG_LEVEL)
+    result = asyncio.run(run_related_items_refresh(args.full, args.limit))
+    print(result.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,15 @@
 from .kb_repositories_impl import (
     SQLAlchemyKnowledgeItemRepository,
     SQLAlchemyCategoryRepository,
-    SQLAlchemySearchQueryRepository
+    SQLAlchemySearchQueryRepository,
+    SQLAlchemyIngestionLedgerRepository,
+    SQLAlchemyKnowledgeDocumentRepository
 )
 
 __all__ = [
     "SQLAlchemyKnowledgeItemRepository",
     "SQLAlchemyCategoryRepository",
-    "SQLAlchemySearchQueryRepository"
+    "SQLAlchemySearchQueryRepository",
+    "SQLAlchemyIngestionLedgerRepository",
+    "SQLAlchemyKnowledgeDocumentRepository"
 ]
@@ -1,30 +1,54 @@
 """SQLAlchemy repository implementations for Knowledge Base Service."""
 
-from typing import List, Optional, Dict, Any
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc, and_, or_, text
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, insert, update, delete, func, desc, and_, or_, text, inspect, values, column
+from sqlalchemy.orm import selectinload, defer
 
 from app.domain.entities.kb_entities import (
-    KnowledgeItem, Category, SearchQuery, UserRole, ContentType, ContentStatus, TargetAudience, Feedback
+    KnowledgeItem, KnowledgeItemSummary, IngestionLedgerEntry, KnowledgeDocument, Category, SearchQuery, UserRole, ContentType, ContentStatus, TargetAudience, Feedback
 )
 from app.domain.value_objects.kb_value_objects import (
-    KnowledgeItemId, Title, Content, CategoryName, TagName, Vector, SearchScore
+    KnowledgeItemId, Title, Content, CategoryName, TagName, Vector, VectorMatrix, SearchScore
 )
+from app.domain.services.kb_domain_services import PopularityCounter, SearchResultCache
 from app.domain.repositories.kb_repositories import (
-    KnowledgeItemRepository, CategoryRepository, SearchQueryRepository, FeedbackRepository
+    KnowledgeItemRepository, CategoryRepository, SearchQueryRepository, FeedbackRepository,
+    IngestionLedgerRepository, KnowledgeDocumentRepository
 )
 from app.infrastructure.models.kb_models import (
-    KnowledgeItemModel, CategoryModel, SearchQueryModel, QueryAnalyticsModel, FeedbackModel
+    KnowledgeItemModel, CategoryModel, SearchQueryModel, QueryAnalyticsModel, FeedbackModel,
+    IngestionLedgerModel, KnowledgeDocumentModel, KnowledgeItemNeighborModel
 )
+from app.infrastructure.adapters.vector_index import VectorIndex
+from app.infrastructure.adapters.text_search import TextSearchEngine, create_text_search_engine
+from app.infrastructure.adapters.search_query_writer import BufferedSearchQueryWriter
+from app.infrastructure.adapters.kb_backup import NDJSONBackupWriter, NDJSONBackupReader, backup_path
+from app.infrastructure.config.database import run_after_commit
+from app.config import settings
 
 
 class SQLAlchemyKnowledgeItemRepository(KnowledgeItemRepository):
     """SQLAlchemy implementation of KnowledgeItemRepository."""
     
-    def __init__(self, session: AsyncSession):
+    MAX_REPORTED_RESTORE_ERRORS = 100
+    
+    def __init__(
+        self,
+        session: AsyncSession,
+        vector_index: Optional[VectorIndex] = None,
+        text_search_engine: Optional[TextSearchEngine] = None,
+        popularity_counter: Optional[PopularityCounter] = None,
+        result_cache: Optional[SearchResultCache] = None
+    ):
         self.session = session
+        self.vector_index = vector_index
+        self.text_search_engine = text_search_engine
+        self.popularity_counter = popularity_counter
+        self.result_cache = result_cache
     
     async def create(self, knowledge_item: KnowledgeItem) -> KnowledgeItem:
         """Create a new knowledge item."""
@@ -38,18 +62,22 @@ class SQLAlchemyKnowledgeItemRepository(KnowledgeItemRepository):
             author_id=knowledge_item.author_id,
             status=knowledge_item.status.value,
             tags=[tag.value for tag in knowledge_item.tags],
-            embedding=knowledge_item.embedding.values if knowledge_item.embedding else None,
+            embedding=knowledge_item.embedding.array if knowledge_item.embedding else None,
+            embedding_model=self._embedding_model_of(knowledge_item),
             created_at=knowledge_item.created_at,
             updated_at=knowledge_item.updated_at,
             published_at=knowledge_item.published_at,
             view_count=knowledge_item.view_count,
             helpful_count=knowledge_item.helpful_count,
             unhelpful_count=knowledge_item.unhelpful_count,
-            version=knowledge_item.version
+            version=knowledge_item.version,
+            document_id=knowledge_item.document_id,
+            chunk_index=knowledge_item.chunk_index
         )
         
         self.session.add(model)
         await self.session.flush()
+        self._index_model(model)
         
         return self._to_entity(model)
     
@@ -70,6 +98,11 @@ class SQLAlchemyKnowledgeItemRepository(KnowledgeItemRepository):
         model = result.scalar_one_or_none()
         
         if model:
+            new_embedding = knowledge_item.embedding.array if knowledge_item.embedding else None
+            related_changed = (
+                model.status != knowledge_item.status.value
+                or not KnowledgeItemModel.embedding.type.compare_values(model.embedding, new_embedding)
+            )
             model.title = knowledge_item.title.value
             model.content = knowledge_item.content.value
             model.content_type = knowledge_item.content_type.value
@@ -77,15 +110,23 @@ class SQLAlchemyKnowledgeItemRepository(KnowledgeItemRepository):
             model.target_audience = knowledge_item.target_audience.value
             model.status = knowledge_item.status.value
             model.tags = [tag.value for tag in knowledge_item.tags]
-            model.embedding = knowledge_item.embedding.values if knowledge_item.embedding else None
+            model.embedding = new_embedding
+            model.embedding_model = self._embedding_model_of(knowledge_item)
             model.updated_at = knowledge_item.updated_at
             model.published_at = knowledge_item.published_at
-            model.view_count = knowledge_item.view_count
-            model.helpful_count = knowledge_item.helpful_count
-            model.unhelpful_count = knowledge_item.unhelpful_count
+            if self.popularity_counter is None:
+                # Otherwise counters only move by atomic increments, which a stale copy would undo
+                model.view_count = knowledge_item.view_count
+                model.helpful_count = knowledge_item.helpful_count
+                model.unhelpful_count = knowledge_item.unhelpful_count
             model.version = knowledge_item.version
+            model.document_id = knowledge_item.document_id
+            model.chunk_index = knowledge_item.chunk_index
             
             await self.session.flush()
+            self._index_model(model)
+            if related_changed:
+                await self.mark_related_items_stale([model.id])
             return self._to_entity(model)
         
         return knowledge_item
@@ -97,8 +138,17 @@ class SQLAlchemyKnowledgeItemRepository(KnowledgeItemRepository):
         model = result.scalar_one_or_none()
         
         if model:
+            # Items listing this one get a new list; neighbour rows go either way
+            await self.mark_related_items_stale([model.id])
+            await self.session.execute(delete(KnowledgeItemNeighborModel).where(or_(
+                KnowledgeItemNeighborModel.item_id == model.id,
+                KnowledgeItemNeighborModel.neighbor_id == model.id
+            )))
             await self.session.delete(model)
             await self.session.flush()
+            if self.vector_index is not None:
+                item_id = model.id
+                run_after_commit(self.session, lambda: self.vector_index.remove(item_id))
             return True
         return False
     
@@ -109,20 +159,7 @@ class SQLAlchemyKnowledgeItemRepository(KnowledgeItemRepository):
         filters: Optional[Dict[str, Any]] = None
     ) -> List[KnowledgeItem]:
         """List all knowledge items with optional filters."""
-        stmt = select(KnowledgeItemModel)
-        
-        # Apply filters
-        if filters:
-            if "status" in filters:
-                stmt = stmt.where(KnowledgeItemModel.status == filters["status"])
-            if "category" in filters:
-                stmt = stmt.where(KnowledgeItemModel.category == filters["category"])
-            if "target_audience" in filters:
-                stmt = stmt.where(KnowledgeItemModel.target_audience == filters["target_audience"])
-            if "content_type" in filters:
-                stmt = stmt.where(KnowledgeItemModel.content_type == filters["content_type"])
-            if "author_id" in filters:
-                stmt = stmt.where(KnowledgeItemModel.author_id == filters["author_id"])
+        stmt = self._apply_listing_filters(select(KnowledgeItemModel), filters)
         
         # Order by update date descending
         stmt = stmt.order_by(desc(KnowledgeItemModel.updated_at))
@@ -135,6 +172,37 @@ class SQLAlchemyKnowledgeItemRepository(KnowledgeItemRepository):
         
         return [self._to_entity(model) for model in models]
     
+    async def list_summaries(
+        self, 
+        skip: int = 0, 
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        snippet_length: int = 200
+    ) -> List[KnowledgeItemSummary]:
+        """List knowledge item summaries, truncating content in the database."""
+        # One extra character tells whether the content was cut
+        stmt = select(
+            KnowledgeItemModel.id,
+            KnowledgeItemModel.title,
+            func.substr(KnowledgeItemModel.content, 1, snippet_length + 1).label("content_head"),
+            KnowledgeItemModel.content_type,
+            KnowledgeItemModel.category,
+            KnowledgeItemModel.target_audience,
+            KnowledgeItemModel.status,
+            KnowledgeItemModel.tags,
+            KnowledgeItemModel.created_at,
+            KnowledgeItemModel.updated_at,
+            KnowledgeItemModel.view_count,
+            KnowledgeItemModel.helpful_count,
+            KnowledgeItemModel.document_id,
+            KnowledgeItemModel.chunk_index
+        )
+        stmt = self._apply_listing_filters(stmt, filters)
+        stmt = stmt.order_by(desc(KnowledgeItemModel.updated_at)).offset(skip).limit(limit)
+        
+        result = await self.session.execute(stmt)
+        return [self._to_summary(row, snippet_length) for row in result]
+    
     async def list_by_category(
         self, 
         category: CategoryName, 
@@ -194,35 +262,31 @@ class SQLAlchemyKnowledgeItemRepository(KnowledgeItemRepository):
         filters: Optional[Dict[str, Any]] = None
     ) -> List[KnowledgeItem]:
         """Search knowledge items by text content."""
-        # Simple text search using LIKE (in production, use full-text search)
-        search_term = f"%{query.lower()}%"
-        
-        stmt = select(KnowledgeItemModel).where(
-            or_(
-                func.lower(KnowledgeItemModel.title).like(search_term),
-                func.lower(KnowledgeItemModel.content).like(search_term)
-            )
-        )
-        
-        # Apply filters
-        if filters:
-            if "status" in filters:
-                stmt = stmt.where(KnowledgeItemModel.status == filters["status"])
-            if "category" in filters:
-                stmt = stmt.where(KnowledgeItemModel.category == filters["category"])
-            if "target_audience" in filters:
-                stmt = stmt.where(KnowledgeItemModel.target_audience == filters["target_audience"])
-        
-        # Order by relevance (title matches first, then content matches)
-        stmt = stmt.order_by(
-            func.lower(KnowledgeItemModel.title).like(search_term).desc(),
-            desc(KnowledgeItemModel.view_count)
-        ).offset(skip).limit(limit)
-        
-        result = await self.session.execute(stmt)
-        models = result.scalars().all()
-        
-        return [self._to_entity(model) for model in models]
+        results = await self.search_by_text_ranked(query, skip, limit, filters)
+        return [item for item, _, _ in results]
+    
+    async def search_by_text_ranked(
+        self, 
+        query: str, 
+        skip: int = 0, 
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[tuple[KnowledgeItem, SearchScore, Optional[str]]]:
+        """Search knowledge items by text, returning relevance scores and highlighted snippets."""
+        if self.text_search_engine is None:
+            self.text_search_engine = create_text_search_engine(self.session.bind.dialect.name)
+        
+        hits = await self.text_search_engine.search(self.session, query, skip, limit, filters)
+        if not hits:
+            return []
+        
+        models = await self._load_search_hits([hit.item_id for hit in hits])
+        
+        return [
+            (self._to_entity(models[hit.item_id]), SearchScore(min(1.0, max(0.0, hit.score))), hit.snippet)
+            for hit in hits
+            if hit.item_id in models
+        ]
     
     async def search_by_vector(
         self, 
@@ -232,9 +296,33 @@ class SQLAlchemyKnowledgeItemRepository(KnowledgeItemRepository):
         filters: Optional[Dict[str, Any]] = None
     ) -> List[tuple[KnowledgeItem, SearchScore]]:
         """Search knowledge items by vector similarity."""
-        # For SQLite, we'll implement a simple cosine similarity
-        # In production with PostgreSQL, use pgvector
-        stmt = select(KnowledgeItemModel).where(
+        hits = await self.find_similar_item_ids(vector, threshold, limit, filters)
+        if not hits:
+            return []
+        models = await self._load_search_hits([item_id for item_id, _ in hits])
+        
+        return [
+            (self._to_entity(models[item_id]), SearchScore(min(1.0, max(0.0, similarity))))
+            for item_id, similarity in hits
+            if item_id in models
+        ]
+    
+    async def find_similar_item_ids(
+        self,
+        vector: Vector,
+        threshold: float = 0.7,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[UUID, float]]:
+        """Find (id, cosine similarity) pairs of the most similar items, best first, without loading them."""
+        if self.vector_index is not None:
+            await self._ensure_vector_index_loaded()
+            return self.vector_index.search(
+                vector.unit_array(), threshold=threshold, limit=limit, filters=filters
+            )
+        
+        # Without an index, scan every embedded row in the database
+        stmt = select(KnowledgeItemModel.id, KnowledgeItemModel.embedding).where(
             KnowledgeItemModel.embedding.isnot(None)
         )
         
@@ -248,24 +336,234 @@ class SQLAlchemyKnowledgeItemRepository(KnowledgeItemRepository):
                 stmt = stmt.where(KnowledgeItemModel.target_audience == filters["target_audience"])
         
         result = await self.session.execute(stmt)
-        models = result.scalars().all()
+        rows = [row for row in result if row.embedding is not None and len(row.embedding)]
+        if not rows:
+            return []
         
-        # Calculate similarities
-        results = []
-        for model in models:
-            if model.embedding:
-                model_vector = Vector(model.embedding)
-                similarity = vector.cosine_similarity(model_vector)
-                
-                if similarity >= threshold:
-                    entity = self._to_entity(model)
-                    score = SearchScore(similarity)
-                    results.append((entity, score))
+        # Score every candidate with a single matrix-vector product
+        matrix = VectorMatrix([row.embedding for row in rows])
+        return [(rows[i].id, similarity) for i, similarity in matrix.top_k(vector, limit, threshold=threshold)]
+    
+    async def get_related_items(
+        self,
+        item_id: KnowledgeItemId,
+        limit: int = 5
+    ) -> Optional[List[tuple[KnowledgeItem, SearchScore]]]:
+        """Get the precomputed published neighbours of an item (None if never computed)."""
+        stmt = select(KnowledgeItemModel, KnowledgeItemNeighborModel.score).options(
+            defer(KnowledgeItemModel.embedding, raiseload=True)
+        ).join(
+            KnowledgeItemNeighborModel, KnowledgeItemNeighborModel.neighbor_id == KnowledgeItemModel.id
+        ).where(
+            KnowledgeItemNeighborModel.item_id == item_id.value,
+            KnowledgeItemModel.status == ContentStatus.PUBLISHED.value
+        ).order_by(KnowledgeItemNeighborModel.rank).limit(limit)
+        rows = (await self.session.execute(stmt)).all()
+        if rows:
+            return [(self._to_entity(model), SearchScore(min(1.0, max(0.0, score)))) for model, score in rows]
+        
+        # No neighbours: either none qualified or the list was never computed
+        computed_at = (await self.session.execute(
+            select(KnowledgeItemModel.related_computed_at).where(KnowledgeItemModel.id == item_id.value)
+        )).scalar_one_or_none()
+        return [] if computed_at is not None else None
+    
+    async def list_related_items_refresh_candidates(self, limit: int = 100) -> List[Tuple[UUID, Vector]]:
+        """List (id, embedding) of published items whose related-items list needs computing."""
+        stmt = select(KnowledgeItemModel.id, KnowledgeItemModel.embedding).where(
+            KnowledgeItemModel.related_computed_at.is_(None),
+            KnowledgeItemModel.status == ContentStatus.PUBLISHED.value,
+            KnowledgeItemModel.embedding.isnot(None)
+        ).order_by(KnowledgeItemModel.id).limit(limit)
+        result = await self.session.execute(stmt)
+        return [(row.id, Vector(row.embedding)) for row in result]
+    
+    async def get_stored_neighbors(self, item_ids: List[UUID]) -> Dict[UUID, List[Tuple[UUID, float]]]:
+        """Get the stored (neighbour id, score) lists of items that have any."""
+        if not item_ids:
+            return {}
+        stmt = select(
+            KnowledgeItemNeighborModel.item_id,
+            KnowledgeItemNeighborModel.neighbor_id,
+            KnowledgeItemNeighborModel.score
+        ).where(
+            KnowledgeItemNeighborModel.item_id.in_(item_ids)
+        ).order_by(KnowledgeItemNeighborModel.item_id, KnowledgeItemNeighborModel.rank)
+        neighbors: Dict[UUID, List[Tuple[UUID, float]]] = {}
+        for row in await self.session.execute(stmt):
+            neighbors.setdefault(row.item_id, []).append((row.neighbor_id, row.score))
+        return neighbors
+    
+    async def save_related_items(self, item_id: UUID, neighbors: List[Tuple[UUID, float]]) -> None:
+        """Replace an item's related-items list (best first) and mark it fresh."""
+        await self.session.execute(
+            delete(KnowledgeItemNeighborModel).where(KnowledgeItemNeighborModel.item_id == item_id)
+        )
+        if neighbors:
+            await self.session.execute(insert(KnowledgeItemNeighborModel), [
+                {"item_id": item_id, "rank": rank, "neighbor_id": neighbor_id, "score": score}
+                for rank, (neighbor_id, score) in enumerate(neighbors)
+            ])
+        await self.session.execute(
+            update(KnowledgeItemModel).where(KnowledgeItemModel.id == item_id).values(
+                related_computed_at=datetime.now(timezone.utc),
+                updated_at=KnowledgeItemModel.updated_at
+            ).execution_options(synchronize_session=False)
+        )
+    
+    async def mark_related_items_stale(
+        self,
+        item_ids: Optional[List[UUID]] = None,
+        include_referrers: bool = True
+    ) -> int:
+        """Queue items (all if None) for a related-items refresh, optionally with the items listing them."""
+        # Bookkeeping only: keep updated_at (and its onupdate default) untouched
+        stmt = update(KnowledgeItemModel).values(
+            related_computed_at=None,
+            updated_at=KnowledgeItemModel.updated_at
+        ).where(KnowledgeItemModel.related_computed_at.isnot(None))
+        if item_ids is not None:
+            if not item_ids:
+                return 0
+            condition = KnowledgeItemModel.id.in_(item_ids)
+            if include_referrers:
+                referrers = select(KnowledgeItemNeighborModel.item_id).where(
+                    KnowledgeItemNeighborModel.neighbor_id.in_(item_ids)
+                )
+                condition = or_(condition, KnowledgeItemModel.id.in_(referrers))
+            stmt = stmt.where(condition)
+        result = await self.session.execute(stmt.execution_options(synchronize_session=False))
+        return result.rowcount
+    
+    async def _load_search_hits(self, item_ids: List[UUID]) -> Dict[UUID, KnowledgeItemModel]:
+        """Load search hits by ID without their embeddings."""
+        stmt = select(KnowledgeItemModel).options(
+            defer(KnowledgeItemModel.embedding, raiseload=True)
+        ).where(KnowledgeItemModel.id.in_(item_ids))
+        result = await self.session.execute(stmt)
+        return {model.id: model for model in result.scalars().all()}
+    
+    async def _ensure_vector_index_loaded(self) -> None:
+        """Populate the vector index from the database when empty or stale."""
+        if self.vector_index.is_loaded:
+            return
+        
+        stmt = select(
+            KnowledgeItemModel.id,
+            KnowledgeItemModel.embedding,
+            KnowledgeItemModel.status,
+            KnowledgeItemModel.category,
+            KnowledgeItemModel.target_audience
+        ).where(KnowledgeItemModel.embedding.isnot(None))
+        result = await self.session.execute(stmt)
+        
+        self.vector_index.clear()
+        for row in result:
+            self.vector_index.upsert(row.id, row.embedding, {
+                "status": row.status,
+                "category": row.category,
+                "target_audience": row.target_audience
+            })
+        self.vector_index.mark_loaded()
+    
+    def _index_model(self, model: KnowledgeItemModel) -> None:
+        """Keep the vector index in sync with a written row once it commits."""
+        if self.vector_index is None:
+            return
+        item_id, embedding = model.id, model.embedding
+        metadata = {
+            "status": model.status,
+            "category": model.category,
+            "target_audience": model.target_audience
+        }
+        
+        def apply() -> None:
+            if not self.vector_index.is_loaded:
+                return
+            if embedding is None:
+                self.vector_index.remove(item_id)
+            else:
+                self.vector_index.upsert(item_id, embedding, metadata)
+        
+        run_after_commit(self.session, apply)
+    
+    @staticmethod
+    def _embedding_model_of(knowledge_item: KnowledgeItem) -> Optional[str]:
+        """Model recorded for an item's embedding; new embeddings come from the configured model."""
+        if knowledge_item.embedding is None:
+            return None
+        return knowledge_item.embedding_model or settings.EMBEDDING_MODEL
+    
+    async def list_embedding_backfill_candidates(
+        self,
+        model_name: str,
+        after_id: Optional[UUID] = None,
+        limit: int = 100
+    ) -> List[Tuple[UUID, str, str]]:
+        """List items without an embedding from model_name, in ID order after after_id."""
+        stmt = select(
+            KnowledgeItemModel.id, KnowledgeItemModel.title, KnowledgeItemModel.content
+        ).where(or_(
+            KnowledgeItemModel.embedding.is_(None),
+            KnowledgeItemModel.embedding_model.is_(None),
+            KnowledgeItemModel.embedding_model != model_name
+        ))
+        if after_id is not None:
+            stmt = stmt.where(KnowledgeItemModel.id > after_id)
+        stmt = stmt.order_by(KnowledgeItemModel.id).limit(limit)
         
-        # Sort by similarity score
-        results.sort(key=lambda x: x[1].value, reverse=True)
+        result = await self.session.execute(stmt)
+        return [(row.id, row.title, row.content) for row in result]
+    
+    async def bulk_update_embeddings(self, embeddings: Dict[UUID, Vector], model_name: str) -> int:
+        """Write many embeddings with one statement."""
+        if not embeddings:
+            return 0
+        now = datetime.utcnow()
+        
+        if self.session.bind.dialect.name == "postgresql":
+            new_embeddings = values(
+                column("id", KnowledgeItemModel.id.type),
+                column("embedding", KnowledgeItemModel.embedding.type),
+                name="new_embeddings"
+            ).data([(item_id, vector.array) for item_id, vector in embeddings.items()])
+            stmt = update(KnowledgeItemModel).where(
+                KnowledgeItemModel.id == new_embeddings.c.id
+            ).values(
+                embedding=new_embeddings.c.embedding,
+                embedding_model=model_name,
+                updated_at=now
+            ).execution_options(synchronize_session=False)
+            updated = (await self.session.execute(stmt)).rowcount
+        else:
+            # No column aliases on VALUES elsewhere (SQLite): one executemany UPDATE by primary key
+            await self.session.execute(update(KnowledgeItemModel), [
+                {"id": item_id, "embedding": vector.array, "embedding_model": model_name, "updated_at": now}
+                for item_id, vector in embeddings.items()
+            ])
+            updated = len(embeddings)
+        
+        if self.vector_index is not None and self.vector_index.is_loaded:
+            stmt = select(
+                KnowledgeItemModel.id,
+                KnowledgeItemModel.status,
+                KnowledgeItemModel.category,
+                KnowledgeItemModel.target_audience
+            ).where(KnowledgeItemModel.id.in_(list(embeddings)))
+            rows = (await self.session.execute(stmt)).all()
+            
+            def apply() -> None:
+                for row in rows:
+                    self.vector_index.upsert(row.id, embeddings[row.id].array, {
+                        "status": row.status,
+                        "category": row.category,
+                        "target_audience": row.target_audience
+                    })
+            
+            run_after_commit(self.session, apply)
         
-        return results[:limit]
+        await self.mark_related_items_stale(list(embeddings))
+        return updated
     
     async def count_total(self, filters: Optional[Dict[str, Any]] = None) -> int:
         """Count total number of knowledge items."""
@@ -284,15 +582,37 @@ class SQLAlchemyKnowledgeItemRepository(KnowledgeItemRepository):
         return result.scalar() or 0
     
     async def get_popular_items(self, limit: int = 10) -> List[KnowledgeItem]:
-        """Get most popular knowledge items by view count."""
+        """Get most popular knowledge items by view count, including views not yet persisted."""
         stmt = select(KnowledgeItemModel).where(
             KnowledgeItemModel.status == ContentStatus.PUBLISHED.value
         ).order_by(desc(KnowledgeItemModel.view_count)).limit(limit)
         
         result = await self.session.execute(stmt)
-        models = result.scalars().all()
-        
-        return [self._to_entity(model) for model in models]
+        models = list(result.scalars().all())
+        if self.popularity_counter is None:
+            return [self._to_entity(model) for model in models]
+
+        # Items climbing fast may not be in the persisted top yet
+        listed = {model.id for model in models}
+        climbing = [
+            item_id for item_id in await self.popularity_counter.most_viewed_pending(limit)
+            if item_id not in listed
+        ]
+        if climbing:
+            result = await self.session.execute(select(KnowledgeItemModel).where(
+                KnowledgeItemModel.id.in_(climbing),
+                KnowledgeItemModel.status == ContentStatus.PUBLISHED.value
+            ))
+            models.extend(result.scalars().all())
+
+        items = [self._to_entity(model) for model in models]
+        pending = await self.popularity_counter.pending([item.id.value for item in items])
+        for item in items:
+            counts = pending.get(item.id.value)
+            if counts:
+                item.add_counts(counts["views"], counts["helpful"], counts["unhelpful"])
+        items.sort(key=lambda item: item.view_count, reverse=True)
+        return items[:limit]
     
     async def get_recent_items(self, limit: int = 10) -> List[KnowledgeItem]:
         """Get most recently updated knowledge items."""
@@ -306,55 +626,28 @@ class SQLAlchemyKnowledgeItemRepository(KnowledgeItemRepository):
         return [self._to_entity(model) for model in models]
     
     async def create_backup(self, include_embeddings: bool = False) -> str:
-        """Create a backup of the knowledge base."""
-        import json
-        from datetime import datetime
-        
-        # TODO: Implement actual backup functionality
-        # This is a placeholder implementation
-        
-        backup_id = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        
-        # Get all knowledge items
-        stmt = select(KnowledgeItemModel)
-        result = await self.session.execute(stmt)
-        models = result.scalars().all()
-        
-        # Prepare backup data
-        backup_data = {
-            "backup_id": backup_id,
-            "created_at": datetime.utcnow().isoformat(),
-            "include_embeddings": include_embeddings,
-            "items": []
-        }
-        
-        for model in models:
-            item_data = {
-                "id": str(model.id),
-                "title": model.title,
-                "content": model.content,
-                "content_type": model.content_type,
-                "category": model.category,
-                "target_audience": model.target_audience,
-                "author_id": str(model.author_id),
-                "status": model.status,
-                "tags": model.tags,
-                "created_at": model.created_at.isoformat() if model.created_at else None,
-                "updated_at": model.updated_at.isoformat() if model.updated_at else None,
-                "published_at": model.published_at.isoformat() if model.published_at else None,
-                "view_count": model.view_count,
-                "helpful_count": model.helpful_count,
-                "unhelpful_count": model.unhelpful_count,
-                "version": model.version
-            }
-            
-            if include_embeddings and model.embedding:
-                item_data["embedding"] = model.embedding
-            
-            backup_data["items"].append(item_data)
+        """Stream the knowledge base into a compressed NDJSON backup file."""
+        backup_id = f"backup_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}"
+        columns = [
+            column for column in KnowledgeItemModel.__table__.columns
+            if (include_embeddings or column.name != "embedding") and column.name != "related_computed_at"
+        ]
+        stmt = select(*columns).order_by(KnowledgeItemModel.id).execution_options(
+            yield_per=settings.BACKUP_BATCH_SIZE
+        )
         
-        # TODO: Save backup to actual storage (file system, S3, etc.)
-        # For now, just return the backup ID
+        writer = await asyncio.to_thread(
+            NDJSONBackupWriter, backup_path(backup_id), backup_id, include_embeddings
+        )
+        try:
+            # Server-side cursor: only one batch of rows is held in memory
+            result = await self.session.stream(stmt)
+            async for rows in result.mappings().partitions():
+                await asyncio.to_thread(writer.write_items, rows)
+            await asyncio.to_thread(writer.close)
+        except BaseException:
+            await asyncio.to_thread(writer.abort)
+            raise
         
         return backup_id
     
@@ -363,29 +656,180 @@ class SQLAlchemyKnowledgeItemRepository(KnowledgeItemRepository):
         backup_id: str, 
         overwrite_existing: bool = False
     ) -> Dict[str, Any]:
-        """Restore knowledge base from backup."""
-        # TODO: Implement actual restore functionality
-        # This is a placeholder implementation
+        """Restore knowledge base from backup with batched upserts.
         
-        # Mock restoration result
+        Items whose ID already exists are conflicts: they are overwritten when
+        ``overwrite_existing`` is set and skipped otherwise. Existing embeddings
+        are kept when the backup does not include them. Once the restore
+        commits, the vector index is reloaded and cached searches are dropped.
+        """
         result = {
             "items_count": 0,
+            "inserted": 0,
+            "updated": 0,
             "conflicts": 0,
-            "errors": []
+            "errors": [],
+            "error_count": 0
         }
         
-        # TODO: Load backup data from storage
-        # TODO: Validate backup integrity
-        # TODO: Process each item in backup
-        # TODO: Handle conflicts based on overwrite_existing flag
-        # TODO: Track restoration progress and errors
+        reader = await asyncio.to_thread(NDJSONBackupReader, backup_path(backup_id))
+        try:
+            batches = reader.iter_batches(settings.BACKUP_BATCH_SIZE)
+            while True:
+                batch = await asyncio.to_thread(next, batches, None)
+                if batch is None:
+                    break
+                await self._restore_batch(batch, overwrite_existing, result)
+        finally:
+            await asyncio.to_thread(reader.close)
+        
+        if result["items_count"]:
+            if self.vector_index is not None:
+                # Reloaded from the database on the next vector search
+                self.after_commit(self.vector_index.clear)
+            if self.result_cache is not None:
+                self.after_commit(self.result_cache.invalidate)
         
         return result
+    
+    def after_commit(self, callback: Callable[[], Awaitable[Any]]) -> None:
+        """Run callback once the session's transaction commits; it is dropped on rollback."""
+        run_after_commit(self.session, callback)
+    
+    async def _restore_batch(
+        self,
+        records: List[Dict[str, Any]],
+        overwrite_existing: bool,
+        result: Dict[str, Any]
+    ) -> None:
+        """Insert new items of a backup batch and resolve conflicts with existing ones."""
+        rows: Dict[UUID, Dict[str, Any]] = {}
+        for record in records:
+            try:
+                row = self._backup_record_to_row(record)
+            except (KeyError, TypeError, ValueError) as e:
+                result["error_count"] += 1
+                if len(result["errors"]) < self.MAX_REPORTED_RESTORE_ERRORS:
+                    result["errors"].append(f"Item {record.get('id')}: {e}")
+                continue
+            rows[row["id"]] = row
+        if not rows:
+            return
+        
+        # Documents are not part of the backup: unlink chunks whose document is gone
+        document_ids = {row["document_id"] for row in rows.values() if row["document_id"]}
+        if document_ids:
+            known_documents = set((await self.session.execute(
+                select(KnowledgeDocumentModel.id).where(KnowledgeDocumentModel.id.in_(list(document_ids)))
+            )).scalars().all())
+            for row in rows.values():
+                if row["document_id"] not in known_documents:
+                    row["document_id"] = None
+        
+        existing_stmt = select(KnowledgeItemModel.id).where(KnowledgeItemModel.id.in_(list(rows)))
+        existing = set((await self.session.execute(existing_stmt)).scalars().all())
+        
+        new_rows = [row for item_id, row in rows.items() if item_id not in existing]
+        conflicting_rows = [row for item_id, row in rows.items() if item_id in existing]
+        
+        restored_ids = []
+        if new_rows:
+            await self.session.execute(insert(KnowledgeItemModel), new_rows)
+            restored_ids.extend(row["id"] for row in new_rows)
+            result["inserted"] += len(new_rows)
+        
+        result["conflicts"] += len(conflicting_rows)
+        if conflicting_rows and overwrite_existing:
+            await self.session.execute(update(KnowledgeItemModel), conflicting_rows)
+            restored_ids.extend(row["id"] for row in conflicting_rows)
+            result["updated"] += len(conflicting_rows)
+        
+        await self.mark_related_items_stale(restored_ids)
+        
+        result["items_count"] = result["inserted"] + result["updated"]
+    
+    @staticmethod
+    def _backup_record_to_row(record: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate a backup record and convert it to column values."""
+        def parse_datetime(value: Optional[str]) -> Optional[datetime]:
+            return datetime.fromisoformat(value) if value else None
+        
+        row = {
+            "id": UUID(record["id"]),
+            "title": Title(record["title"]).value,
+            "content": Content(record["content"]).value,
+            "content_type": ContentType(record["content_type"]).value,
+            "category": CategoryName(record["category"]).value,
+            "target_audience": TargetAudience(record["target_audience"]).value,
+            "author_id": UUID(record["author_id"]),
+            "status": ContentStatus(record["status"]).value,
+            "tags": record.get("tags") or [],
+            "created_at": parse_datetime(record.get("created_at")),
+            "updated_at": parse_datetime(record.get("updated_at")),
+            "published_at": parse_datetime(record.get("published_at")),
+            "view_count": record.get("view_count") or 0,
+            "helpful_count": record.get("helpful_count") or 0,
+            "unhelpful_count": record.get("unhelpful_count") or 0,
+            "version": record.get("version") or 1,
+            "document_id": UUID(record["document_id"]) if record.get("document_id") else None,
+            "chunk_index": record.get("chunk_index")
+        }
+        if "embedding" in record:
+            row["embedding"] = record["embedding"]
+            row["embedding_model"] = record.get("embedding_model")
+        # Let the database default timestamps missing from the backup
+        for column in ("created_at", "updated_at"):
+            if row[column] is None:
+                del row[column]
+        return row
 
+    @staticmethod
+    def _apply_listing_filters(stmt, filters: Optional[Dict[str, Any]]):
+        """Apply the listing filters to a knowledge item query."""
+        if filters:
+            if "status" in filters:
+                stmt = stmt.where(KnowledgeItemModel.status == filters["status"])
+            if "category" in filters:
+                stmt = stmt.where(KnowledgeItemModel.category == filters["category"])
+            if "target_audience" in filters:
+                stmt = stmt.where(KnowledgeItemModel.target_audience == filters["target_audience"])
+            if "content_type" in filters:
+                stmt = stmt.where(KnowledgeItemModel.content_type == filters["content_type"])
+            if "author_id" in filters:
+                stmt = stmt.where(KnowledgeItemModel.author_id == filters["author_id"])
+            if "document_id" in filters:
+                stmt = stmt.where(KnowledgeItemModel.document_id == filters["document_id"])
+        return stmt
+    
+    def _to_summary(self, row, snippet_length: int) -> KnowledgeItemSummary:
+        """Convert a projected row to a summary read model."""
+        head = row.content_head or ""
+        return KnowledgeItemSummary(
+            id=row.id,
+            title=row.title,
+            content_snippet=head if len(head) <= snippet_length else head[:snippet_length] + "...",
+            content_type=ContentType(row.content_type),
+            category=row.category,
+            target_audience=TargetAudience(row.target_audience),
+            status=ContentStatus(row.status),
+            tags=list(row.tags or []),
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            view_count=row.view_count,
+            helpful_count=row.helpful_count,
+            document_id=row.document_id,
+            chunk_index=row.chunk_index
+        )
+    
     def _to_entity(self, model: KnowledgeItemModel) -> KnowledgeItem:
         """Convert SQLAlchemy model to domain entity."""
         tags = [TagName(tag) for tag in model.tags] if model.tags else []
-        embedding = Vector(model.embedding) if model.embedding else None
+        # Search hits are loaded with the embedding deferred
+        embedding_loaded = "embedding" not in inspect(model).unloaded
+        embedding = (
+            Vector(model.embedding)
+            if embedding_loaded and model.embedding is not None and len(model.embedding) else None
+        )
         
         return KnowledgeItem(
             id=KnowledgeItemId(model.id),
@@ -404,7 +848,10 @@ class SQLAlchemyKnowledgeItemRepository(KnowledgeItemRepository):
             view_count=model.view_count,
             helpful_count=model.helpful_count,
             unhelpful_count=model.unhelpful_count,
-            version=model.version
+            version=model.version,
+            document_id=model.document_id,
+            chunk_index=model.chunk_index,
+            embedding_model=model.embedding_model
         )
 
 
@@ -539,8 +986,9 @@ class SQLAlchemyCategoryRepository(CategoryRepository):
 class SQLAlchemySearchQueryRepository(SearchQueryRepository):
     """SQLAlchemy implementation of SearchQueryRepository."""
     
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, query_writer: Optional[BufferedSearchQueryWriter] = None):
         self.session = session
+        self.query_writer = query_writer
     
     async def create(self, search_query: SearchQuery) -> SearchQuery:
         """Create a new search query record."""
@@ -575,6 +1023,7 @@ class SQLAlchemySearchQueryRepository(SearchQueryRepository):
         limit: int = 100
     ) -> List[SearchQuery]:
         """List search queries by user."""
+        await self._flush_buffered_queries()
         stmt = select(SearchQueryModel).where(
             SearchQueryModel.user_id == user_id
         ).order_by(desc(SearchQueryModel.created_at)).offset(skip).limit(limit)
@@ -590,6 +1039,7 @@ class SQLAlchemySearchQueryRepository(SearchQueryRepository):
         limit: int = 10
     ) -> List[tuple[str, int]]:
         """Get most frequent search queries."""
+        await self._flush_buffered_queries()
         stmt = select(
             SearchQueryModel.query_text,
             func.count(SearchQueryModel.query_text).label('count')
@@ -609,6 +1059,7 @@ class SQLAlchemySearchQueryRepository(SearchQueryRepository):
         end_date: Optional[str] = None
     ) -> Dict[str, Any]:
         """Get search query statistics."""
+        await self._flush_buffered_queries()
         stmt = select(SearchQueryModel)
         
         if start_date:
@@ -646,6 +1097,11 @@ class SQLAlchemySearchQueryRepository(SearchQueryRepository):
             "queries_by_role": queries_by_role
         }
     
+    async def _flush_buffered_queries(self) -> None:
+        """Make queued search queries visible to analytics reads."""
+        if self.query_writer is not None:
+            await self.query_writer.flush()
+    
     def _to_entity(self, model: SearchQueryModel) -> SearchQuery:
         """Convert SQLAlchemy model to domain entity."""
         return SearchQuery(
@@ -753,3 +1209,133 @@ class SQLAlchemyFeedbackRepository(FeedbackRepository):
             comment=model.comment,
             created_at=model.created_at
         )
+
+
+class SQLAlchemyIngestionLedgerRepository(IngestionLedgerRepository):
+    """SQLAlchemy implementation of IngestionLedgerRepository."""
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def get(self, source_key: str) -> Optional[IngestionLedgerEntry]:
+        """Get the last ingestion recorded for a source."""
+        model = await self.session.get(IngestionLedgerModel, source_key)
+        return self._to_entity(model) if model else None
+    
+    async def save(self, entry: IngestionLedgerEntry) -> IngestionLedgerEntry:
+        """Record (insert or replace) the ingestion of a source."""
+        model = await self.session.get(IngestionLedgerModel, entry.source_key)
+        if model is None:
+            model = IngestionLedgerModel(source_key=entry.source_key)
+            self.session.add(model)
+        
+        model.file_hash = entry.file_hash
+        model.chunk_hashes = list(entry.chunk_hashes)
+        model.item_ids = [str(item_id) for item_id in entry.item_ids]
+        model.attributes = dict(entry.attributes)
+        model.updated_at = datetime.utcnow()
+        
+        await self.session.flush()
+        return self._to_entity(model)
+    
+    async def delete(self, source_key: str) -> bool:
+        """Forget a source so its next ingestion starts from scratch."""
+        model = await self.session.get(IngestionLedgerModel, source_key)
+        if model is None:
+            return False
+        await self.session.delete(model)
+        await self.session.flush()
+        return True
+    
+    def _to_entity(self, model: IngestionLedgerModel) -> IngestionLedgerEntry:
+        """Convert SQLAlchemy model to domain entity."""
+        return IngestionLedgerEntry(
+            source_key=model.source_key,
+            file_hash=model.file_hash,
+            chunk_hashes=list(model.chunk_hashes or []),
+            item_ids=list(model.item_ids or []),
+            attributes=dict(model.attributes or {}),
+            updated_at=model.updated_at
+        )
+
+
+class SQLAlchemyKnowledgeDocumentRepository(KnowledgeDocumentRepository):
+    """SQLAlchemy implementation of KnowledgeDocumentRepository.
+    
+    Chunks are deleted through the item repository so their vector index
+    entries, related-items lists and cached searches are updated as well.
+    """
+    
+    def __init__(self, session: AsyncSession, item_repository: SQLAlchemyKnowledgeItemRepository):
+        self.session = session
+        self.item_repository = item_repository
+    
+    async def get_by_id(self, document_id: UUID) -> Optional[KnowledgeDocument]:
+        """Get a document by ID."""
+        model = await self.session.get(KnowledgeDocumentModel, document_id)
+        return self._to_entity(model) if model else None
+    
+    async def get_by_source_key(self, source_key: str) -> Optional[KnowledgeDocument]:
+        """Get the document ingested from a source."""
+        result = await self.session.execute(
+            select(KnowledgeDocumentModel).where(KnowledgeDocumentModel.source_key == source_key)
+        )
+        model = result.scalar_one_or_none()
+        return self._to_entity(model) if model else None
+    
+    async def save(self, document: KnowledgeDocument) -> KnowledgeDocument:
+        """Insert or update a document by its source key."""
+        result = await self.session.execute(
+            select(KnowledgeDocumentModel).where(KnowledgeDocumentModel.source_key == document.source_key)
+        )
+        model = result.scalar_one_or_none()
+        if model is None:
+            model = KnowledgeDocumentModel(id=document.id, source_key=document.source_key)
+            self.session.add(model)
+        
+        model.title = document.title
+        model.content_type = document.content_type.value
+        model.category = document.category
+        model.target_audience = document.target_audience.value
+        model.author_id = document.author_id
+        model.file_hash = document.file_hash
+        model.chunk_count = document.chunk_count
+        model.document_metadata = dict(document.metadata)
+        model.updated_at = datetime.utcnow()
+        
+        await self.session.flush()
+        return self._to_entity(model)
+    
+    async def delete(self, document_id: UUID) -> bool:
+        """Delete a document together with its chunks."""
+        model = await self.session.get(KnowledgeDocumentModel, document_id)
+        if model is None:
+            return False
+        # Deleted explicitly so backends without enforced foreign keys (SQLite) drop the chunks too
+        chunk_ids = (await self.session.execute(
+            select(KnowledgeItemModel.id).where(KnowledgeItemModel.document_id == document_id)
+        )).scalars().all()
+        for chunk_id in chunk_ids:
+            await self.item_repository.delete(KnowledgeItemId(chunk_id))
+        await self.session.delete(model)
+        await self.session.flush()
+        if chunk_ids and self.item_repository.result_cache is not None:
+            self.item_repository.after_commit(self.item_repository.result_cache.invalidate)
+        return True
+    
+    def _to_entity(self, model: KnowledgeDocumentModel) -> KnowledgeDocument:
+        """Convert SQLAlchemy model to domain entity."""
+        return KnowledgeDocument(
+            id=model.id,
+            source_key=model.source_key,
+            title=model.title,
+            content_type=ContentType(model.content_type),
+            category=model.category,
+            target_audience=TargetAudience(model.target_audience),
+            author_id=model.author_id,
+            file_hash=model.file_hash,
+            chunk_count=model.chunk_count or 0,
+            metadata=dict(model.document_metadata or {}),
+            created_at=model.created_at,
+            updated_at=model.updated_at
+        )
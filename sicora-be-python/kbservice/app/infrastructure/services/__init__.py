@@ -2,12 +2,16 @@
 
 from .kb_services_impl import (
     OpenAIEmbeddingService,
+    LocalEmbeddingService,
+    create_embedding_service,
     HybridSearchService,
     HTTPChatbotIntegrationService
 )
 
 __all__ = [
     "OpenAIEmbeddingService",
+    "LocalEmbeddingService",
+    "create_embedding_service",
     "HybridSearchService",
     "HTTPChatbotIntegrationService"
 ]
@@ -6,6 +6,7 @@ from typing import List, Optional, Dict, Any
 from uuid import UUID
 import hashlib
 import asyncio
+import time
 
 from app.config import settings
 from app.domain.entities.kb_entities import KnowledgeItem, UserRole
@@ -13,15 +14,19 @@ from app.domain.value_objects.kb_value_objects import Vector, SearchScore
 from app.domain.services.kb_domain_services import (
     EmbeddingService, SearchService, ChatbotIntegrationService
 )
+from app.domain.services.search_fusion import FusionRanker, create_fusion_ranker
 from app.domain.repositories.kb_repositories import KnowledgeItemRepository
 from app.domain.exceptions.kb_exceptions import EmbeddingError, SearchError
+from app.infrastructure.adapters.embedding_cache import EmbeddingCache
+from app.infrastructure.adapters.local_embeddings import EmbeddingBatcher, get_local_embedding_batcher
 
 
 class OpenAIEmbeddingService(EmbeddingService):
     """OpenAI embedding service implementation using OpenAI v1.x API."""
     
-    def __init__(self):
+    def __init__(self, cache: Optional[EmbeddingCache] = None):
         self.client = None
+        self.cache = cache
         if settings.OPENAI_API_KEY:
             self.client = AsyncOpenAI(
                 api_key=settings.OPENAI_API_KEY,
@@ -42,6 +47,11 @@ class OpenAIEmbeddingService(EmbeddingService):
             if not clean_text:
                 raise EmbeddingError("Empty text provided for embedding")
             
+            if self.cache is not None:
+                cached = (await self.cache.get_many(settings.EMBEDDING_MODEL, [clean_text]))[0]
+                if cached is not None:
+                    return Vector(cached)
+            
             response = await self.client.embeddings.create(
                 model=settings.EMBEDDING_MODEL,
                 input=clean_text,
@@ -57,6 +67,9 @@ class OpenAIEmbeddingService(EmbeddingService):
                     f"expected: {settings.EMBEDDING_DIMENSION}"
                 )
             
+            if self.cache is not None:
+                await self.cache.set_many(settings.EMBEDDING_MODEL, [clean_text], [embedding_values])
+            
             return Vector(embedding_values)
             
         except Exception as e:
@@ -83,12 +96,20 @@ class OpenAIEmbeddingService(EmbeddingService):
                 else:
                     clean_texts.append("default text")  # Fallback for empty text
             
+            # Only texts missing from the cache go to the API (each distinct text once)
+            cached = [None] * len(clean_texts)
+            if self.cache is not None:
+                cached = await self.cache.get_many(settings.EMBEDDING_MODEL, clean_texts)
+            pending_texts = list(dict.fromkeys(
+                text for text, values in zip(clean_texts, cached) if values is None
+            ))
+            
             # Process in batches to avoid API limits
             batch_size = getattr(settings, 'OPENAI_BATCH_SIZE', 100)
-            all_embeddings = []
+            generated: Dict[str, List[float]] = {}
             
-            for i in range(0, len(clean_texts), batch_size):
-                batch_texts = clean_texts[i:i + batch_size]
+            for i in range(0, len(pending_texts), batch_size):
+                batch_texts = pending_texts[i:i + batch_size]
                 
                 response = await self.client.embeddings.create(
                     model=settings.EMBEDDING_MODEL,
@@ -107,14 +128,21 @@ class OpenAIEmbeddingService(EmbeddingService):
                             f"expected: {settings.EMBEDDING_DIMENSION}"
                         )
                     
-                    batch_embeddings.append(Vector(embedding_values))
+                    batch_embeddings.append(embedding_values)
                 
-                all_embeddings.extend(batch_embeddings)
+                generated.update(zip(batch_texts, batch_embeddings))
+                if self.cache is not None:
+                    await self.cache.set_many(settings.EMBEDDING_MODEL, batch_texts, batch_embeddings)
                 
                 # Add small delay to respect rate limits
-                if i + batch_size < len(clean_texts):
+                if i + batch_size < len(pending_texts):
                     await asyncio.sleep(0.1)
             
+            all_embeddings = [
+                Vector(values if values is not None else generated[text])
+                for text, values in zip(clean_texts, cached)
+            ]
+            
             return all_embeddings
             
         except Exception as e:
@@ -144,16 +172,87 @@ class OpenAIEmbeddingService(EmbeddingService):
         return Vector(values[:settings.EMBEDDING_DIMENSION])
 
 
+class LocalEmbeddingService(EmbeddingService):
+    """Offline embedding service running a local model on CPU (no API key or network needed)."""
+    
+    def __init__(self, cache: Optional[EmbeddingCache] = None, batcher: Optional[EmbeddingBatcher] = None):
+        self.cache = cache
+        self.batcher = batcher or get_local_embedding_batcher()
+    
+    async def generate_embedding(self, text: str) -> Vector:
+        """Generate embedding vector for text with the local model."""
+        clean_text = text.replace("\n", " ").strip()[:settings.MAX_CONTENT_LENGTH]
+        if not clean_text:
+            raise EmbeddingError("Empty text provided for embedding")
+        return (await self._embed([clean_text]))[0]
+    
+    async def generate_embeddings_batch(self, texts: List[str]) -> List[Vector]:
+        """Generate embedding vectors for multiple texts in one local batch."""
+        if not texts:
+            return []
+        clean_texts = [
+            text.replace("\n", " ").strip()[:settings.MAX_CONTENT_LENGTH] or "default text"
+            for text in texts
+        ]
+        return await self._embed(clean_texts)
+    
+    async def _embed(self, clean_texts: List[str]) -> List[Vector]:
+        """Embed texts, encoding only those missing from the cache (each distinct text once)."""
+        try:
+            # Cache keys carry the dimension: resizing a local model changes its vectors
+            model = self.batcher.encoder.name
+            cached = [None] * len(clean_texts)
+            if self.cache is not None:
+                cached = await self.cache.get_many(model, clean_texts)
+            pending_texts = list(dict.fromkeys(
+                text for text, values in zip(clean_texts, cached) if values is None
+            ))
+            
+            generated: Dict[str, List[float]] = {}
+            if pending_texts:
+                matrix = await self.batcher.encode(pending_texts)
+                generated = {text: row.tolist() for text, row in zip(pending_texts, matrix)}
+                if self.cache is not None:
+                    await self.cache.set_many(model, pending_texts, [generated[text] for text in pending_texts])
+            
+            return [
+                Vector(values if values is not None else generated[text])
+                for text, values in zip(clean_texts, cached)
+            ]
+        except EmbeddingError:
+            raise
+        except Exception as e:
+            raise EmbeddingError(f"Failed to generate local embeddings: {str(e)}")
+
+
+def create_embedding_service(cache: Optional[EmbeddingCache] = None, provider: str = None) -> EmbeddingService:
+    """Create the embedding service of the configured provider ("openai" or "local")."""
+    provider = (provider or settings.EMBEDDING_PROVIDER).lower()
+    if provider == "local":
+        return LocalEmbeddingService(cache)
+    return OpenAIEmbeddingService(cache)
+
+
 class HybridSearchService(SearchService):
     """Hybrid search service combining text and semantic search."""
     
     def __init__(
         self, 
         knowledge_item_repo: KnowledgeItemRepository,
-        embedding_service: EmbeddingService
+        embedding_service: EmbeddingService,
+        fusion_ranker: Optional[FusionRanker] = None
     ):
         self.knowledge_item_repo = knowledge_item_repo
         self.embedding_service = embedding_service
+        self.fusion_ranker = fusion_ranker or create_fusion_ranker(
+            settings.SEARCH_FUSION_STRATEGY,
+            rrf_k=settings.SEARCH_RRF_K,
+            text_weight=settings.SEARCH_FUSION_TEXT_WEIGHT,
+            semantic_weight=settings.SEARCH_FUSION_SEMANTIC_WEIGHT
+        )
+        self._snippets: Dict[UUID, str] = {}  # Highlighted snippets from the last text search
+        self._stage_timings: Dict[str, float] = {}
+        self._degraded_stages: List[str] = []
     
     async def hybrid_search(
         self,
@@ -162,39 +261,89 @@ class HybridSearchService(SearchService):
         filters: Optional[Dict[str, Any]] = None,
         limit: int = 20
     ) -> List[tuple[KnowledgeItem, SearchScore]]:
-        """Perform hybrid search combining text and semantic search."""
+        """Perform hybrid search combining text and semantic search.
+        
+        The query embedding is requested while the database text search runs.
+        If the embedding or vector stage exceeds its budget, text-only results
+        are returned and the stage is reported as degraded.
+        """
+        started = time.perf_counter()
+        self._reset_search_report()
         try:
             # Prepare filters with role-based restrictions
             search_filters = filters or {}
             if user_role != UserRole.ADMIN:
                 search_filters["status"] = "published"
             
-            # Perform text search
-            text_results = await self.knowledge_item_repo.search_by_text(
-                query=query,
-                skip=0,
-                limit=limit * 2,  # Get more results for combining
-                filters=search_filters
-            )
-            
-            # Perform semantic search
-            query_embedding = await self.embedding_service.generate_embedding(query)
-            semantic_results = await self.knowledge_item_repo.search_by_vector(
-                vector=query_embedding,
-                threshold=settings.VECTOR_SIMILARITY_THRESHOLD,
-                limit=limit * 2,
-                filters=search_filters
-            )
+            # Fan out: text search (database) and query embedding (remote API)
+            text_task = asyncio.create_task(self._run_stage(
+                "text",
+                self.knowledge_item_repo.search_by_text_ranked(
+                    query=query,
+                    skip=0,
+                    limit=limit * 2,  # Get more results for combining
+                    filters=search_filters
+                ),
+                settings.SEARCH_TEXT_TIMEOUT_SECONDS
+            ))
+            embedding_task = asyncio.create_task(self._run_stage(
+                "embedding",
+                self.embedding_service.generate_embedding(query),
+                settings.SEARCH_EMBEDDING_TIMEOUT_SECONDS
+            ))
+            
+            try:
+                ranked_text_results = await text_task
+            except asyncio.TimeoutError:
+                embedding_task.cancel()
+                raise SearchError("Text search stage timed out")
+            except BaseException:
+                embedding_task.cancel()
+                raise
             
-            # Combine and rank results
-            combined_results = self._combine_search_results(
-                text_results, semantic_results, query, user_role
+            semantic_results = []
+            try:
+                query_embedding = await embedding_task
+            except asyncio.TimeoutError:
+                self._degraded_stages.append("embedding")
+                query_embedding = None
+            
+            # Vector search shares the database session, so it runs after the text stage
+            if query_embedding is not None:
+                try:
+                    semantic_results = await self._run_stage(
+                        "vector",
+                        self.knowledge_item_repo.search_by_vector(
+                            vector=query_embedding,
+                            threshold=settings.VECTOR_SIMILARITY_THRESHOLD,
+                            limit=limit * 2,
+                            filters=search_filters
+                        ),
+                        settings.SEARCH_VECTOR_TIMEOUT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    self._degraded_stages.append("vector")
+            
+            # Fuse both rankings over accessible items only
+            combine_started = time.perf_counter()
+            text_results = []
+            for item, score, snippet in ranked_text_results:
+                if item.is_accessible_by(user_role):
+                    text_results.append((item, score))
+                    if snippet:
+                        self._snippets[item.id.value] = snippet
+            combined_results = self.fusion_ranker.fuse(
+                text_results,
+                [(item, score) for item, score in semantic_results if item.is_accessible_by(user_role)]
             )
+            self._stage_timings["combine"] = self._elapsed_ms(combine_started)
             
             return combined_results[:limit]
             
         except Exception as e:
             raise SearchError(f"Hybrid search failed: {str(e)}")
+        finally:
+            self._stage_timings["total"] = self._elapsed_ms(started)
     
     async def semantic_search(
         self,
@@ -204,9 +353,13 @@ class HybridSearchService(SearchService):
         limit: int = 20
     ) -> List[tuple[KnowledgeItem, SearchScore]]:
         """Perform semantic search using embeddings."""
+        started = time.perf_counter()
+        self._reset_search_report()
         try:
             # Generate query embedding
-            query_embedding = await self.embedding_service.generate_embedding(query)
+            query_embedding = await self._run_stage(
+                "embedding", self.embedding_service.generate_embedding(query)
+            )
             
             # Prepare filters
             filters = {}
@@ -214,12 +367,12 @@ class HybridSearchService(SearchService):
                 filters["status"] = "published"
             
             # Perform vector search
-            results = await self.knowledge_item_repo.search_by_vector(
+            results = await self._run_stage("vector", self.knowledge_item_repo.search_by_vector(
                 vector=query_embedding,
                 threshold=threshold,
                 limit=limit,
                 filters=filters
-            )
+            ))
             
             # Filter by user role access
             accessible_results = []
@@ -231,6 +384,8 @@ class HybridSearchService(SearchService):
             
         except Exception as e:
             raise SearchError(f"Semantic search failed: {str(e)}")
+        finally:
+            self._stage_timings["total"] = self._elapsed_ms(started)
     
     async def text_search(
         self,
@@ -240,54 +395,50 @@ class HybridSearchService(SearchService):
         limit: int = 20
     ) -> List[tuple[KnowledgeItem, SearchScore]]:
         """Perform traditional text search."""
+        started = time.perf_counter()
+        self._reset_search_report()
         try:
             # Prepare filters
             search_filters = filters or {}
             if user_role != UserRole.ADMIN:
                 search_filters["status"] = "published"
             
-            # Perform text search
-            results = await self.knowledge_item_repo.search_by_text(
+            # Perform ranked full-text search
+            results = await self._run_stage("text", self.knowledge_item_repo.search_by_text_ranked(
                 query=query,
                 skip=0,
                 limit=limit,
                 filters=search_filters
-            )
+            ))
             
-            # Calculate simple text relevance scores
             scored_results = []
-            query_lower = query.lower()
-            
-            for item in results:
+            for item, score, snippet in results:
                 if item.is_accessible_by(user_role):
-                    # Simple scoring based on query term frequency
-                    title_score = query_lower.count(item.title.value.lower()) * 2
-                    content_score = query_lower.count(item.content.value.lower())
-                    
-                    # Normalize score
-                    total_score = min(1.0, (title_score + content_score) / 10.0)
-                    if total_score == 0:
-                        total_score = 0.1  # Minimum score for matches
-                    
-                    scored_results.append((item, SearchScore(total_score)))
-            
-            # Sort by score
-            scored_results.sort(key=lambda x: x[1].value, reverse=True)
+                    scored_results.append((item, score))
+                    if snippet:
+                        self._snippets[item.id.value] = snippet
             
             return scored_results
             
         except Exception as e:
             raise SearchError(f"Text search failed: {str(e)}")
+        finally:
+            self._stage_timings["total"] = self._elapsed_ms(started)
     
     async def get_related_items(
         self,
         item_id: UUID,
         limit: int = 5
     ) -> List[KnowledgeItem]:
-        """Get related knowledge items."""
+        """Get related knowledge items (precomputed neighbours, or a live vector search until computed)."""
         try:
-            # Get the source item
             from app.domain.value_objects.kb_value_objects import KnowledgeItemId
+            if limit <= settings.RELATED_ITEMS_TOP_K:
+                precomputed = await self.knowledge_item_repo.get_related_items(KnowledgeItemId(item_id), limit)
+                if precomputed is not None:
+                    return [item for item, _ in precomputed]
+            
+            # Get the source item
             source_item = await self.knowledge_item_repo.get_by_id(KnowledgeItemId(item_id))
             
             if not source_item or not source_item.embedding:
@@ -296,7 +447,7 @@ class HybridSearchService(SearchService):
             # Find similar items by vector similarity
             similar_results = await self.knowledge_item_repo.search_by_vector(
                 vector=source_item.embedding,
-                threshold=0.6,
+                threshold=settings.RELATED_ITEMS_THRESHOLD,
                 limit=limit + 1,  # +1 to exclude the source item
                 filters={"status": "published"}
             )
@@ -312,59 +463,34 @@ class HybridSearchService(SearchService):
         except Exception as e:
             raise SearchError(f"Failed to get related items: {str(e)}")
     
-    def _combine_search_results(
-        self,
-        text_results: List[KnowledgeItem],
-        semantic_results: List[tuple[KnowledgeItem, SearchScore]],
-        query: str,
-        user_role: UserRole
-    ) -> List[tuple[KnowledgeItem, SearchScore]]:
-        """Combine and score results from text and semantic search."""
-        # Create item score map
-        item_scores = {}
-        
-        # Add semantic scores (higher weight)
-        for item, score in semantic_results:
-            if item.is_accessible_by(user_role):
-                item_scores[item.id.value] = score.value * 0.7
-        
-        # Add text scores (lower weight)
-        query_lower = query.lower()
-        for item in text_results:
-            if item.is_accessible_by(user_role):
-                # Calculate text relevance
-                title_matches = item.title.value.lower().count(query_lower)
-                content_matches = item.content.value.lower().count(query_lower)
-                text_score = min(1.0, (title_matches * 2 + content_matches) / 10.0)
-                
-                # Combine with existing semantic score or use text score
-                if item.id.value in item_scores:
-                    item_scores[item.id.value] += text_score * 0.3
-                else:
-                    item_scores[item.id.value] = text_score * 0.5
-        
-        # Create final results
-        final_results = []
-        processed_ids = set()
-        
-        # Add items from semantic results
-        for item, _ in semantic_results:
-            if item.id.value in item_scores and item.id.value not in processed_ids:
-                final_score = SearchScore(min(1.0, item_scores[item.id.value]))
-                final_results.append((item, final_score))
-                processed_ids.add(item.id.value)
-        
-        # Add items from text results that weren't in semantic results
-        for item in text_results:
-            if item.id.value in item_scores and item.id.value not in processed_ids:
-                final_score = SearchScore(min(1.0, item_scores[item.id.value]))
-                final_results.append((item, final_score))
-                processed_ids.add(item.id.value)
-        
-        # Sort by combined score
-        final_results.sort(key=lambda x: x[1].value, reverse=True)
-        
-        return final_results
+    def get_snippet(self, item: KnowledgeItem, length: int = 200) -> str:
+        """Get the highlighted full-text snippet for an item, or a plain prefix."""
+        return self._snippets.get(item.id.value) or item.content.get_snippet(length)
+    
+    def get_search_report(self) -> Dict[str, Any]:
+        """Get per-stage latency (ms) and degraded stages of the last search."""
+        return {
+            "timings_ms": dict(self._stage_timings),
+            "degraded_stages": list(self._degraded_stages)
+        }
+    
+    def _reset_search_report(self) -> None:
+        """Clear the report of the previous search."""
+        self._stage_timings = {}
+        self._degraded_stages = []
+    
+    async def _run_stage(self, name: str, awaitable, timeout: Optional[float] = None):
+        """Await a search stage within its time budget, recording its latency."""
+        started = time.perf_counter()
+        try:
+            return await asyncio.wait_for(awaitable, timeout=timeout)
+        finally:
+            self._stage_timings[name] = self._elapsed_ms(started)
+    
+    @staticmethod
+    def _elapsed_ms(started: float) -> float:
+        """Milliseconds elapsed since a perf_counter() reading."""
+        return round((time.perf_counter() - started) * 1000, 2)
 
 
 class HTTPChatbotIntegrationService(ChatbotIntegrationService):
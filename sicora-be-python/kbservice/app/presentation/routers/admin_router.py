@@ -16,6 +16,10 @@ from app.dependencies import (
     get_query_analytics_service
 )
 from app.infrastructure.services.kb_services_impl import QueryAnalyticsService
+from app.infrastructure.adapters.embedding_cache import get_embedding_cache
+from app.infrastructure.adapters.search_cache import get_search_result_cache
+from app.infrastructure.adapters.search_query_writer import get_search_query_writer
+from app.infrastructure.adapters.popularity_counters import get_popularity_counter
 
 router = APIRouter()
 
@@ -37,6 +41,18 @@ async def get_admin_metrics(
     """Get administration metrics."""
     # Basic implementation - can be enhanced later
     try:
+        resource_usage = {}
+        embedding_cache = get_embedding_cache()
+        if embedding_cache is not None:
+            resource_usage["embedding_cache"] = embedding_cache.stats()
+        search_result_cache = get_search_result_cache()
+        if search_result_cache is not None:
+            resource_usage["search_result_cache"] = search_result_cache.stats()
+        resource_usage["search_query_log"] = get_search_query_writer().stats()
+        popularity_counter = get_popularity_counter()
+        if popularity_counter is not None:
+            resource_usage["popularity_counters"] = popularity_counter.stats()
+        
         return AdminMetricsResponse(
             period="daily",
             total_queries=0,
@@ -44,7 +60,7 @@ async def get_admin_metrics(
             search_accuracy=0.0,
             error_rate=0.0,
             user_satisfaction=0.0,
-            resource_usage={},
+            resource_usage=resource_usage,
             timestamp=datetime.now(timezone.utc)
         )
     except Exception as e:
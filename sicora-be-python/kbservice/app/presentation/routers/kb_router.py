@@ -197,6 +197,7 @@ async def list_knowledge_items(
     content_type: Optional[ContentType] = Query(None, description="Filter by content type"),
     content_status: Optional[ContentStatus] = Query(None, description="Filter by status (admin only)"),
     target_audience: Optional[TargetAudience] = Query(None, description="Filter by target audience"),
+    document_id: Optional[UUID] = Query(None, description="Filter by source document (its chunks)"),
     current_user: Dict[str, Any] = Depends(get_current_user),
     list_use_case: ListKnowledgeItemsUseCase = Depends(get_list_knowledge_items_use_case)
 ):
@@ -209,6 +210,7 @@ async def list_knowledge_items(
     - **content_type**: Filter by content type (article, faq, guide, etc.)
     - **status**: Filter by status (admin only)
     - **target_audience**: Filter by target audience
+    - **document_id**: Filter by source document (its chunks)
     """
     try:
         user_role = UserRole(current_user["role"])
@@ -221,6 +223,8 @@ async def list_knowledge_items(
             filters["content_type"] = content_type.value
         if target_audience:
             filters["target_audience"] = target_audience.value
+        if document_id:
+            filters["document_id"] = document_id
         if content_status and user_role == UserRole.ADMIN:
             filters["status"] = content_status.value
 
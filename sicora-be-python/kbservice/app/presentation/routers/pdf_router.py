@@ -4,13 +4,15 @@ from typing import Optional, List, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from fastapi import status as http_status
 
-from app.dependencies import get_current_user, get_kb_use_cases
-from app.infrastructure.pdf_processing import pdf_upload_handler, PDFProcessingError
-from app.presentation.schemas.kb_schemas import KnowledgeItemResponse
+from app.dependencies import get_current_user
+from app.config import settings
+from app.infrastructure.pdf_processing import pdf_upload_handler, get_pdf_job_queue, PDFProcessingError
+from app.presentation.schemas.kb_schemas import KnowledgeItemResponse, IngestionJobResponse
 from app.domain.entities.kb_entities import ContentType, TargetAudience, ContentStatus
 from app.application.use_cases.kb_use_cases import CreateKnowledgeItemUseCase
 from app.application.dtos.kb_dtos import KnowledgeItemCreateDTO
 import uuid
+from uuid import UUID
 from datetime import datetime
 
 router = APIRouter()
@@ -120,83 +122,102 @@ async def upload_pdf_document(
         )
 
 
-@router.post("/batch-upload-pdf")
+@router.post("/batch-upload-pdf", status_code=http_status.HTTP_202_ACCEPTED)
 async def batch_upload_pdf_documents(
     files: List[UploadFile] = File(..., description="Lista de archivos PDF"),
     content_type: Optional[ContentType] = Form(None, description="Tipo de contenido para todos"),
     category: Optional[str] = Form(None, description="Categoría para todos"),
     target_audience: Optional[TargetAudience] = Form(TargetAudience.ALL, description="Audiencia objetivo"),
     auto_categorize: bool = Form(True, description="Auto-categorizar cada documento"),
+    use_ocr: bool = Form(False, description="Usar OCR para PDFs escaneados"),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
-    Subir y procesar múltiples documentos PDF en batch.
+    Encolar múltiples documentos PDF para procesamiento en segundo plano.
     
-    Procesa cada PDF individualmente y retorna un resumen
-    de los resultados exitosos y fallidos.
+    Retorna inmediatamente el ID del job; el progreso por archivo y los
+    resultados se consultan en `GET /jobs/{job_id}` y el job se puede
+    cancelar con `POST /jobs/{job_id}/cancel`.
     """
-    try:
-        # Validar usuario
-        user_role = current_user.get("role", "").lower()
-        if user_role not in ["admin", "instructor", "coordinador"]:
-            raise HTTPException(
-                status_code=http_status.HTTP_403_FORBIDDEN,
-                detail="Solo administradores e instructores pueden subir documentos"
-            )
-        
-        # Validar número de archivos
-        if len(files) > 10:
+    # Validar usuario
+    user_role = current_user.get("role", "").lower()
+    if user_role not in ["admin", "instructor", "coordinador"]:
+        raise HTTPException(
+            status_code=http_status.HTTP_403_FORBIDDEN,
+            detail="Solo administradores e instructores pueden subir documentos"
+        )
+    
+    # Validar número de archivos
+    if len(files) > settings.PDF_JOB_MAX_FILES:
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail=f"Máximo {settings.PDF_JOB_MAX_FILES} archivos por batch"
+        )
+    
+    for file in files:
+        if not file.content_type or "pdf" not in file.content_type.lower():
             raise HTTPException(
                 status_code=http_status.HTTP_400_BAD_REQUEST,
-                detail="Máximo 10 archivos por batch"
+                detail=f"Solo se permiten archivos PDF: {file.filename}"
             )
-        
-        results = {
-            "successful": [],
-            "failed": [],
-            "total_processed": len(files)
-        }
-        
-        for file in files:
-            try:
-                result = await pdf_upload_handler.handle_upload(
-                    file=file,
-                    content_type=content_type.value if content_type else None,
-                    category=category,
-                    target_audience=target_audience.value if target_audience else "all"
-                )
-                
-                if result.get("processing_status") == "success":
-                    results["successful"].append({
-                        "filename": file.filename,
-                        "title": result["title"],
-                        "content_type": result["content_type"],
-                        "category": result["category"],
-                        "text_length": result["metadata"]["text_length"],
-                        "pages": result["metadata"]["pages"]
-                    })
-                else:
-                    results["failed"].append({
-                        "filename": file.filename,
-                        "error": result.get("error_message", "Error desconocido")
-                    })
-                    
-            except Exception as e:
-                results["failed"].append({
-                    "filename": file.filename,
-                    "error": str(e)
-                })
-        
-        return {
-            "message": f"Procesamiento completado: {len(results['successful'])} exitosos, {len(results['failed'])} fallidos",
-            "results": results
-        }
-        
+    
+    try:
+        job_queue = get_pdf_job_queue()
+        job_id = await job_queue.submit(
+            files=[(file.filename, await file.read()) for file in files],
+            options={
+                "content_type": content_type.value if content_type else None,
+                "category": category,
+                "target_audience": target_audience.value if target_audience else "all",
+                "use_ocr": use_ocr,
+                "author_id": str(current_user["user_id"])
+            },
+            submitted_by=current_user["user_id"]
+        )
     except Exception as e:
         raise HTTPException(
             status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error en procesamiento batch: {str(e)}"
+            detail=f"Error encolando el procesamiento batch: {str(e)}"
+        )
+    
+    return {
+        "message": f"{len(files)} archivos encolados para procesamiento",
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/api/v1/pdf/jobs/{job_id}"
+    }
+
+
+async def _get_authorized_job(job_id: UUID, current_user: Dict[str, Any]) -> Dict[str, Any]:
+    """Obtener un job visible para el usuario (su autor o un administrador)."""
+    job = await get_pdf_job_queue().get(job_id)
+    if job is None or (
+        current_user.get("role") != "admin" and job["submitted_by"] != current_user["user_id"]
+    ):
+        raise HTTPException(
+            status_code=http_status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} no encontrado"
         )
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=IngestionJobResponse)
+async def get_pdf_job(
+    job_id: UUID,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Consultar el estado, el progreso por archivo y los resultados de un job."""
+    return await _get_authorized_job(job_id, current_user)
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=IngestionJobResponse)
+async def cancel_pdf_job(
+    job_id: UUID,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Cancelar un job; el archivo en curso se interrumpe y los pendientes no se procesan."""
+    await _get_authorized_job(job_id, current_user)
+    return await get_pdf_job_queue().cancel(job_id)
 
 
 @router.get("/pdf-processing-info")
@@ -228,7 +249,11 @@ async def get_pdf_processing_info():
             },
             {
                 "name": "ocr",
-                "description": "Para documentos escaneados (requiere configuración)",
+                "description": (
+                    "Para documentos escaneados (requiere configuración): páginas en paralelo, "
+                    "DPI según la resolución del escaneo, omite páginas con capa de texto y "
+                    "cachea el resultado por página"
+                ),
                 "best_for": ["documentos escaneados", "imágenes con texto"]
             }
         ],
@@ -243,9 +268,14 @@ async def get_pdf_processing_info():
         },
         "text_processing": {
             "cleaning": "Automática",
-            "segmentation": "Automática para documentos > 2000 caracteres",
+            "segmentation": (
+                f"Chunks de hasta {settings.CHUNK_MAX_TOKENS} tokens con {settings.CHUNK_OVERLAP_TOKENS} "
+                "de solapamiento; cada chunk es un item con embedding propio ligado a su documento"
+            ),
+            "extraction_strategy": "Método más barato primero; los siguientes solo si falla la heurística de calidad",
             "language_detection": "Automática (español por defecto)",
             "max_file_size": "50MB",
-            "batch_limit": 10
+            "batch_limit": settings.PDF_JOB_MAX_FILES,
+            "batch_processing": "En segundo plano: POST /batch-upload-pdf retorna un job_id"
         }
     }
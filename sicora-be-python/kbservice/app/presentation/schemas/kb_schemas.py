@@ -105,6 +105,8 @@ class KnowledgeItemResponse(BaseModel):
     helpful_count: int
     unhelpful_count: int
     version: int
+    document_id: Optional[UUID] = None
+    chunk_index: Optional[int] = None
     
     class Config:
         from_attributes = True
@@ -144,6 +146,8 @@ class KnowledgeItemList(BaseModel):
     updated_at: datetime
     view_count: int
     helpful_count: int
+    document_id: Optional[UUID] = None
+    chunk_index: Optional[int] = None
     
     class Config:
         from_attributes = True
@@ -229,6 +233,8 @@ class SearchResponse(BaseModel):
     query: str
     filters: Dict[str, Any]
     suggestions: List[str] = Field(default=[], description="Query suggestions")
+    timings_ms: Dict[str, float] = Field(default={}, description="Per-stage search latency in milliseconds")
+    degraded_stages: List[str] = Field(default=[], description="Stages skipped after exceeding their time budget")
     
     class Config:
         from_attributes = True
@@ -241,7 +247,9 @@ class SearchResponse(BaseModel):
                 "suggestions": [
                     "¿Cómo justifico una falta?",
                     "¿Cuál es el porcentaje mínimo de asistencia?"
-                ]
+                ],
+                "timings_ms": {"text": 12.4, "embedding": 180.2, "vector": 3.1, "combine": 0.2, "total": 196.0},
+                "degraded_stages": []
             }
         }
 
@@ -520,3 +528,31 @@ class RestoreResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class IngestionJobFileStatus(BaseModel):
+    """Schema for the status of one file in an ingestion job."""
+    filename: str
+    status: str
+    progress: float
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+class IngestionJobResponse(BaseModel):
+    """Schema for ingestion job status response."""
+    id: UUID
+    job_type: str
+    status: str
+    progress: float
+    total_files: int
+    processed_files: int
+    files: List[IngestionJobFileStatus]
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
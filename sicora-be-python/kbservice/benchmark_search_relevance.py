@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Benchmark offline de relevancia para la búsqueda híbrida del KBService
+Carga las FAQs críticas de SupportContentGenerator en una base SQLite en memoria
+y mide calidad (MRR, recall@k) y latencia de cada estrategia de fusión.
+
+Uso:
+    python benchmark_search_relevance.py [--strategies rrf weighted] [--runs 20] [--k 3]
+
+Sin OPENAI_API_KEY se usan embeddings simulados: la parte semántica es ruido y
+las diferencias entre estrategias reflejan sobre todo cómo toleran ese ruido.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List, Dict, Any, Tuple
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.domain.entities.kb_entities import (
+    KnowledgeItem, ContentType, ContentStatus, TargetAudience, UserRole
+)
+from app.domain.value_objects.kb_value_objects import Title, Content, CategoryName
+from app.domain.services.search_fusion import create_fusion_ranker
+from app.infrastructure.config.database import Base
+from app.infrastructure.repositories.kb_repositories_impl import SQLAlchemyKnowledgeItemRepository
+from app.infrastructure.services.kb_services_impl import OpenAIEmbeddingService, HybridSearchService
+from app.config import settings
+from generate_implementable_content import SupportContentGenerator
+
+# Consultas de usuarios reales (parafraseadas) y la pregunta FAQ que debe responderlas
+RELEVANCE_JUDGEMENTS: List[Tuple[str, str]] = [
+    ("marcar asistencia", "¿Cómo marco mi asistencia en SICORA?"),
+    ("cómo registro que asistí a clase", "¿Cómo marco mi asistencia en SICORA?"),
+    ("llegué tarde a clase", "¿Qué pasa si llego tarde a clase?"),
+    ("justificar una tardanza", "¿Qué pasa si llego tarde a clase?"),
+    ("consultar horario de clases", "¿Dónde puedo consultar mi horario de clases?"),
+    ("ver mi horario de la semana", "¿Dónde puedo consultar mi horario de clases?"),
+    ("reservar laboratorio de sistemas", "¿Cómo reservo un ambiente de formación? (Instructores)"),
+    ("reserva de ambiente", "¿Cómo reservo un ambiente de formación? (Instructores)"),
+    ("cambiar contraseña", "¿Cómo cambio mi contraseña en SICORA?"),
+    ("requisitos de la nueva contraseña", "¿Cómo cambio mi contraseña en SICORA?"),
+    ("olvidé mi contraseña", "Olvidé mi contraseña, ¿qué hago?"),
+    ("no me llega el correo de recuperación", "Olvidé mi contraseña, ¿qué hago?"),
+]
+
+
+def build_items() -> List[KnowledgeItem]:
+    """Convertir las FAQs sembradas en entidades de conocimiento."""
+    items = []
+    for faq in SupportContentGenerator()._generate_critical_faqs():
+        items.append(KnowledgeItem(
+            title=Title(faq["question"]),
+            content=Content(f"{faq['short_answer']}\n{faq['detailed_answer'].strip()}"),
+            content_type=ContentType.FAQ,
+            category=CategoryName(faq["category"]),
+            target_audience=TargetAudience.ALL,
+            author_id=uuid4(),
+            status=ContentStatus.PUBLISHED
+        ))
+    return items
+
+
+async def evaluate_strategy(
+    service: HybridSearchService,
+    k: int,
+    runs: int
+) -> Dict[str, Any]:
+    """Calcular MRR, recall@k y latencias de una estrategia."""
+    reciprocal_ranks = []
+    hits_at_k = 0
+    latencies = []
+
+    for query, expected_title in RELEVANCE_JUDGEMENTS:
+        for run in range(runs):
+            started = time.perf_counter()
+            results = await service.hybrid_search(query, UserRole.ADMIN, limit=10)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        titles = [item.title.value for item, _ in results]
+        rank = titles.index(expected_title) + 1 if expected_title in titles else None
+        reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+        hits_at_k += 1 if rank and rank <= k else 0
+
+    latencies.sort()
+    return {
+        "mrr": statistics.mean(reciprocal_ranks),
+        f"recall@{k}": hits_at_k / len(RELEVANCE_JUDGEMENTS),
+        "latency_p50_ms": latencies[len(latencies) // 2],
+        "latency_p95_ms": latencies[int(len(latencies) * 0.95) - 1]
+    }
+
+
+async def run_benchmark(strategies: List[str], runs: int, k: int) -> Dict[str, Dict[str, Any]]:
+    """Sembrar la base en memoria y evaluar cada estrategia."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_factory() as session:
+            repo = SQLAlchemyKnowledgeItemRepository(session)
+            embedding_service = OpenAIEmbeddingService()
+
+            items = build_items()
+            embeddings = await embedding_service.generate_embeddings_batch(
+                [f"{item.title.value}\n{item.content.value}" for item in items]
+            )
+            for item, embedding in zip(items, embeddings):
+                item.update_embedding(embedding)
+                await repo.create(item)
+
+            report = {}
+            for strategy in strategies:
+                ranker = create_fusion_ranker(
+                    strategy,
+                    rrf_k=settings.SEARCH_RRF_K,
+                    text_weight=settings.SEARCH_FUSION_TEXT_WEIGHT,
+                    semantic_weight=settings.SEARCH_FUSION_SEMANTIC_WEIGHT
+                )
+                service = HybridSearchService(repo, embedding_service, ranker)
+                report[strategy] = await evaluate_strategy(service, k, runs)
+            return report
+    finally:
+        await engine.dispose()
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description="Benchmark de relevancia de búsqueda híbrida")
+    parser.add_argument("--strategies", nargs="+", default=["rrf", "weighted"])
+    parser.add_argument("--runs", type=int, default=20, help="Repeticiones por consulta para latencia")
+    parser.add_argument("--k", type=int, default=3, help="Corte para recall@k")
+    args = parser.parse_args()
+
+    print("📊 Benchmark de relevancia - búsqueda híbrida")
+    print(f"   {len(RELEVANCE_JUDGEMENTS)} consultas, {args.runs} repeticiones")
+    if not settings.OPENAI_API_KEY:
+        print("⚠️ Sin OPENAI_API_KEY: embeddings simulados")
+
+    report = asyncio.run(run_benchmark(args.strategies, args.runs, args.k))
+
+    print(f"\n{'estrategia':<12}{'MRR':>8}{f'R@{args.k}':>8}{'p50 ms':>10}{'p95 ms':>10}")
+    for strategy, metrics in report.items():
+        print(
+            f"{strategy:<12}{metrics['mrr']:>8.3f}{metrics[f'recall@{args.k}']:>8.2f}"
+            f"{metrics['latency_p50_ms']:>10.2f}{metrics['latency_p95_ms']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
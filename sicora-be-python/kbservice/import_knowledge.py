@@ -12,6 +12,9 @@ from typing import List, Dict, Any
 import uuid
 from datetime import datetime
 
+from app.domain.services.ingestion_ledger import hash_record, hash_text, plan_ingestion
+from app.infrastructure.adapters.ingestion_ledger import SQLiteIngestionLedger
+
 # Simular las clases que tendríamos en el KBService real
 class MockKnowledgeItem:
     """Mock del modelo KnowledgeItem para la demo."""
@@ -33,10 +36,15 @@ class MockKnowledgeItem:
 class KnowledgeBaseImporter:
     """Importador de contenido para la base de conocimiento."""
     
-    def __init__(self):
+    def __init__(self, ledger_path: str = "kb_import_ledger.db"):
         self.processed_items = []
         self.skipped_items = []
+        self.unchanged_items = []
+        self.updated_items = []
+        self.removed_item_ids = []
         self.errors = []
+        # Ledger de hashes: los items sin cambios desde la última importación se omiten
+        self.ledger = SQLiteIngestionLedger.open(ledger_path)
         
     async def import_from_json(self, json_file: str) -> Dict[str, Any]:
         """Importar contenido desde archivo JSON."""
@@ -61,6 +69,9 @@ class KnowledgeBaseImporter:
                     })
                     print(f"❌ Error procesando item {i + 1}: {e}")
             
+            # Registrar en el ledger solo lo que se importó
+            self.ledger.commit()
+            
             # Generar reporte
             return self._generate_import_report()
             
@@ -83,8 +94,29 @@ class KnowledgeBaseImporter:
             })
             return
         
+        # Comparar con el ledger: omitir si no cambió, conservar el ID (y su
+        # embedding) si solo cambió la clasificación
+        source_key = self._source_key(item_data)
+        attributes = {
+            'content_type': item_data['content_type'],
+            'category': item_data['category'],
+            'target_audience': item_data.get('target_audience', 'general'),
+            'tags': sorted(item_data.get('tags', []))
+        }
+        plan = plan_ingestion(
+            source_key,
+            hash_record({**attributes, 'title': item_data['title'], 'content': item_data['content']}),
+            [hash_text(f"{item_data['title']} {item_data['content']}")],
+            self.ledger.get(source_key),
+            attributes
+        )
+        if plan.unchanged:
+            self.unchanged_items.append(item_data['title'])
+            return
+        
         # Crear item de conocimiento
         knowledge_item = MockKnowledgeItem(
+            id=plan.reused.get(0, str(uuid.uuid4())),
             title=item_data['title'],
             content=item_data['content'],
             content_type=item_data['content_type'],
@@ -101,8 +133,20 @@ class KnowledgeBaseImporter:
         # Simular guardado en base de datos
         # En el KBService real, aquí usarías el repository pattern
         await self._save_knowledge_item(knowledge_item)
+        for stale_id in plan.stale_item_ids:
+            await self._delete_knowledge_item(stale_id)
+        self.ledger.save(plan.to_entry([knowledge_item.id], attributes))
         
         self.processed_items.append(knowledge_item)
+        if plan.reused:
+            self.updated_items.append(knowledge_item)
+        self.removed_item_ids.extend(plan.stale_item_ids)
+    
+    def _source_key(self, item_data: Dict[str, Any]) -> str:
+        """Clave del ledger para un item: su ID si lo trae, o su origen y título."""
+        if item_data.get('id'):
+            return f"json:{item_data['id']}"
+        return f"json:{item_data.get('source_file', '')}:{item_data['title']}"
     
     def _validate_item(self, item_data: Dict[str, Any]) -> bool:
         """Validar que el item tenga los campos requeridos."""
@@ -128,6 +172,12 @@ class KnowledgeBaseImporter:
         # Por ahora, solo simular un pequeño delay
         await asyncio.sleep(0.001)
     
+    async def _delete_knowledge_item(self, item_id: str) -> None:
+        """Simular el borrado de un item reemplazado por una nueva versión."""
+        
+        # En el KBService real: await self.knowledge_repository.delete(item_id)
+        await asyncio.sleep(0.001)
+    
     def _generate_import_report(self) -> Dict[str, Any]:
         """Generar reporte de importación."""
         
@@ -153,6 +203,9 @@ class KnowledgeBaseImporter:
             'success': True,
             'summary': {
                 'total_processed': len(self.processed_items),
+                'total_updated': len(self.updated_items),
+                'total_unchanged': len(self.unchanged_items),
+                'total_removed': len(self.removed_item_ids),
                 'total_skipped': len(self.skipped_items),
                 'total_errors': len(self.errors)
             },
@@ -234,6 +287,9 @@ async def main():
     stats = result['statistics']
     
     print(f"✅ Items procesados: {summary['total_processed']}")
+    print(f"🔁 Items actualizados sin re-embedding: {summary['total_updated']}")
+    print(f"⏭️  Items sin cambios (omitidos por hash): {summary['total_unchanged']}")
+    print(f"🗑️  Versiones anteriores eliminadas: {summary['total_removed']}")
     print(f"⚠️  Items omitidos: {summary['total_skipped']}")
     print(f"❌ Errores: {summary['total_errors']}")
     
@@ -265,6 +321,7 @@ async def main():
     # Exportar muestra
     sample_file = 'knowledge_base_sample.json'
     importer.export_sample_content(sample_file)
+    importer.ledger.close()
     
     print(f"\n🎉 IMPORTACIÓN COMPLETADA")
     print("="*30)
@@ -11,6 +11,10 @@ from datetime import datetime
 from pathlib import Path
 import logging
 
+from app.domain.entities.kb_entities import IngestionLedgerEntry
+from app.domain.services.ingestion_ledger import hash_record
+from app.infrastructure.adapters.ingestion_ledger import SQLiteIngestionLedger
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -21,12 +25,16 @@ class KBFAQImporter:
     def __init__(self, db_path: str = "kb.db"):
         self.db_path = db_path
         self.conn = None
+        self.ledger = None
+        self.unchanged_count = 0
     
     def connect_db(self):
         """Conectar a la base de datos."""
         try:
             self.conn = sqlite3.connect(self.db_path)
             self.conn.row_factory = sqlite3.Row
+            # El ledger vive en la misma base y se confirma con el mismo commit
+            self.ledger = SQLiteIngestionLedger(self.conn)
             logger.info(f"Conectado a la base de datos: {self.db_path}")
             return True
         except Exception as e:
@@ -111,7 +119,7 @@ class KBFAQImporter:
             return []
     
     def import_faq(self, faq_data: dict):
-        """Importar una FAQ individual."""
+        """Importar una FAQ individual (se omite si su hash coincide con el del ledger)."""
         try:
             cursor = self.conn.cursor()
             
@@ -119,6 +127,15 @@ class KBFAQImporter:
             cursor.execute("SELECT id FROM kb_faqs WHERE id = ?", (faq_data['id'],))
             exists = cursor.fetchone()
             
+            # Omitir si la FAQ existe y no cambió desde la última importación
+            source_key = f"faq:{faq_data['id']}"
+            faq_hash = hash_record(faq_data)
+            previous = self.ledger.get(source_key)
+            if exists and previous is not None and previous.file_hash == faq_hash:
+                self.unchanged_count += 1
+                logger.info(f"FAQ sin cambios: {faq_data['id']}")
+                return True
+            
             # Preparar datos
             target_audience_str = json.dumps(faq_data.get('target_audience', []))
             tags_str = json.dumps(faq_data.get('tags', []))
@@ -175,6 +192,11 @@ class KBFAQImporter:
                 ))
                 logger.info(f"FAQ creada: {faq_data['id']}")
             
+            self.ledger.save(IngestionLedgerEntry(
+                source_key=source_key,
+                file_hash=faq_hash,
+                item_ids=[faq_data['id']]
+            ))
             return True
             
         except Exception as e:
@@ -369,6 +391,7 @@ def main():
         
         print(f"\n📊 REPORTE DE IMPORTACIÓN:")
         print(f"✅ FAQs importadas exitosamente: {success_count}/{len(faqs)}")
+        print(f"⏭️ FAQs sin cambios (omitidas por hash): {importer.unchanged_count}")
         print(f"📋 Total de FAQs en sistema: {report.get('total_faqs', 0)}")
         print(f"📂 Categorías: {report.get('total_categories', 0)}")
         print(f"🏷️ Tags: {report.get('total_tags', 0)}")
@@ -8,6 +8,10 @@ import logging
 from datetime import datetime, timezone
 
 from app.infrastructure.config.database import engine, get_db_session, check_database_health
+from app.infrastructure.adapters.search_query_writer import get_search_query_writer
+from app.infrastructure.adapters.popularity_counters import get_popularity_counter
+from app.infrastructure.pdf_processing import get_pdf_ingestion_engine, get_pdf_job_queue
+from app.infrastructure.related_items_refresh import get_related_items_refresher
 from app.presentation.routers import kb_router, search_router
 from app.presentation.routers.admin_router import router as admin_kb_router
 from app.presentation.routers.pdf_router import router as pdf_router
@@ -28,9 +32,18 @@ async def lifespan(app: FastAPI):
     """Application lifespan context manager."""
     # Startup
     logger.info("Starting KbService application")
+    await get_pdf_job_queue().start()
+    get_related_items_refresher().start()
     yield
     # Shutdown
     logger.info("Shutting down KbService application")
+    await get_related_items_refresher().stop()
+    await get_search_query_writer().stop()
+    popularity_counter = get_popularity_counter()
+    if popularity_counter is not None:
+        await popularity_counter.stop()
+    await get_pdf_job_queue().stop()
+    get_pdf_ingestion_engine().shutdown()
     await engine.dispose()
 
 
@@ -1,8 +1,10 @@
 """Pytest configuration for KbService tests."""
 
 import pytest
+import pytest_asyncio
 import asyncio
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Awaitable, Callable, Optional
+from uuid import uuid4
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from httpx import AsyncClient
 
@@ -12,9 +14,11 @@ import os
 # Add the parent directory to the path so we can import from the root
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from main import app
+from app.domain.entities.kb_entities import KnowledgeItem, ContentType, ContentStatus, TargetAudience
+from app.domain.value_objects.kb_value_objects import Title, Content, CategoryName, Vector
 from app.infrastructure.models.kb_models import Base
 from app.infrastructure.config.database import get_db_session
+from app.infrastructure.repositories.kb_repositories_impl import SQLAlchemyKnowledgeItemRepository
 from app.config import settings
 
 
@@ -60,6 +64,8 @@ async def test_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
 @pytest.fixture
 async def test_client(test_session) -> AsyncGenerator[AsyncClient, None]:
     """Create test HTTP client."""
+    # Imported here so unit tests do not need the application's PDF dependencies
+    from main import app
     
     async def override_get_db():
         yield test_session
@@ -72,6 +78,64 @@ async def test_client(test_session) -> AsyncGenerator[AsyncClient, None]:
     app.dependency_overrides.clear()
 
 
+@pytest_asyncio.fixture
+async def create_session_factory(tmp_path) -> AsyncGenerator[Callable[..., Awaitable[async_sessionmaker]], None]:
+    """Factory of session factories, each over a fresh database file with every table created.
+    
+    Unlike an in-memory database, every session gets its own connection, as
+    in production, so commits, rollbacks and after-commit hooks behave alike.
+    """
+    engines = []
+    
+    async def create(name: str = "kb.db") -> async_sessionmaker:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}")
+        engines.append(engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    
+    yield create
+    
+    for engine in engines:
+        await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def session_factory(create_session_factory) -> async_sessionmaker:
+    """Session factory over a fresh database file."""
+    return await create_session_factory()
+
+
+@pytest_asyncio.fixture
+async def item_repo(session_factory) -> AsyncGenerator[SQLAlchemyKnowledgeItemRepository, None]:
+    """Knowledge item repository on an open session of a fresh database file."""
+    async with session_factory() as session:
+        yield SQLAlchemyKnowledgeItemRepository(session)
+
+
+@pytest.fixture
+def create_item() -> Callable[..., KnowledgeItem]:
+    """Factory of published FAQ knowledge items; keyword arguments override any other field."""
+    
+    def create(title: str, content: Optional[str] = None, embedding=None, **fields) -> KnowledgeItem:
+        values = {
+            "content_type": ContentType.FAQ,
+            "category": CategoryName("asistencia"),
+            "target_audience": TargetAudience.ALL,
+            "author_id": uuid4(),
+            "status": ContentStatus.PUBLISHED,
+            "embedding": Vector([float(value) for value in embedding]) if embedding is not None else None,
+        }
+        values.update(fields)
+        return KnowledgeItem(
+            title=Title(title),
+            content=Content(content or f"Contenido de prueba para {title}"),
+            **values
+        )
+    
+    return create
+
+
 @pytest.fixture
 def sample_knowledge_item():
     """Sample knowledge item data for testing."""
@@ -0,0 +1,104 @@
+"""Tests for the bulk embedding backfill."""
+
+import pytest
+from typing import List
+from sqlalchemy import select
+
+from app.application.use_cases.kb_use_cases import BackfillEmbeddingsUseCase
+from app.domain.exceptions.kb_exceptions import EmbeddingError
+from app.domain.services.kb_domain_services import EmbeddingService
+from app.domain.value_objects.kb_value_objects import Vector
+from app.infrastructure.adapters.backfill_checkpoint import JSONCheckpointStore
+from app.infrastructure.models.kb_models import KnowledgeItemModel
+
+
+class FlakyEmbeddingService(EmbeddingService):
+    """Embedding service that fails a given number of batch calls before succeeding."""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.batches: List[List[str]] = []
+
+    async def generate_embedding(self, text: str) -> Vector:
+        return (await self.generate_embeddings_batch([text]))[0]
+
+    async def generate_embeddings_batch(self, texts: List[str]) -> List[Vector]:
+        if self.failures:
+            self.failures -= 1
+            raise EmbeddingError("Rate limit exceeded")
+        self.batches.append(texts)
+        return [Vector([float(len(text)), 1.0, 0.5]) for text in texts]
+
+
+class TestBackfillEmbeddingsUseCase:
+    """Test cases for BackfillEmbeddingsUseCase."""
+
+    @pytest.mark.asyncio
+    async def test_missing_and_stale_embeddings_are_written(self, item_repo, create_item):
+        """Test that only items without a current-model embedding are embedded."""
+        # Arrange
+        for number in range(5):
+            await item_repo.create(create_item(f"Sin embedding {number}"))
+        await item_repo.create(create_item("Modelo anterior", embedding=[1.0, 0.0, 0.0], embedding_model="old-model"))
+        await item_repo.create(create_item("Al día", embedding=[1.0, 0.0, 0.0], embedding_model="new-model"))
+        service = FlakyEmbeddingService()
+        use_case = BackfillEmbeddingsUseCase(item_repo, service, "new-model", batch_size=2, concurrency=2)
+        checkpoints = []
+
+        async def on_batch_written(checkpoint):
+            checkpoints.append(checkpoint)
+
+        # Act
+        result = await use_case.execute(on_batch_written=on_batch_written)
+
+        # Assert
+        assert (result.processed, result.updated, result.failed) == (6, 6, 0)
+        assert sum(len(batch) for batch in service.batches) == 6
+        assert not any("Al día" in text for batch in service.batches for text in batch)
+        models = (await item_repo.session.execute(select(KnowledgeItemModel.embedding_model))).scalars().all()
+        assert set(models) == {"new-model"}
+        assert checkpoints[-1] == result.checkpoint
+        assert await item_repo.list_embedding_backfill_candidates("new-model") == []
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_batches_are_retried_with_backoff(self, item_repo, create_item):
+        """Test that transient failures are retried and permanent ones do not advance the checkpoint."""
+        # Arrange
+        for number in range(4):
+            await item_repo.create(create_item(f"Item {number}"))
+        retried = BackfillEmbeddingsUseCase(
+            item_repo, FlakyEmbeddingService(failures=2), "new-model",
+            batch_size=2, concurrency=1, max_retries=3, backoff_seconds=0.001
+        )
+        exhausted = BackfillEmbeddingsUseCase(
+            item_repo, FlakyEmbeddingService(failures=10), "newer-model",
+            batch_size=2, concurrency=1, max_retries=1, backoff_seconds=0.001
+        )
+
+        # Act
+        ok = await retried.execute()
+        failed = await exhausted.execute()
+
+        # Assert
+        assert (ok.updated, ok.failed) == (4, 0)
+        assert (failed.updated, failed.failed) == (0, 4)
+        assert failed.checkpoint is None
+
+
+class TestJSONCheckpointStore:
+    """Test cases for JSONCheckpointStore."""
+
+    def test_save_load_and_clear(self, tmp_path):
+        """Test that checkpoints survive a new store and can be cleared."""
+        # Arrange
+        path = str(tmp_path / "checkpoint.json")
+        JSONCheckpointStore(path).save("text-embedding-3-small", "item-42")
+
+        # Act
+        store = JSONCheckpointStore(path)
+        loaded = store.load("text-embedding-3-small")
+        store.clear("text-embedding-3-small")
+
+        # Assert
+        assert loaded == "item-42"
+        assert store.load("text-embedding-3-small") is None
@@ -0,0 +1,57 @@
+"""Tests for the two-tier embedding cache."""
+
+import pytest
+
+from app.infrastructure.adapters.embedding_cache import EmbeddingCache, SQLiteEmbeddingStore
+
+
+class TestEmbeddingCache:
+    """Test cases for EmbeddingCache."""
+
+    def test_key_uses_model_and_normalized_text(self):
+        """Test that keys ignore case/whitespace but not the model."""
+        # Act
+        key = EmbeddingCache.make_key("model-a", "  ¿Cómo   justifico una FALTA? ")
+
+        # Assert
+        assert key == EmbeddingCache.make_key("model-a", "¿cómo justifico una falta?")
+        assert key != EmbeddingCache.make_key("model-b", "¿cómo justifico una falta?")
+
+    @pytest.mark.asyncio
+    async def test_lru_evicts_and_counts_hits(self):
+        """Test LRU eviction and hit/miss metrics."""
+        # Arrange
+        cache = EmbeddingCache(max_entries=2)
+        await cache.set_many("model", ["a", "b"], [[1.0, 0.0], [0.0, 1.0]])
+        await cache.get_many("model", ["a"])  # "a" becomes most recently used
+
+        # Act
+        await cache.set_many("model", ["c"], [[0.5, 0.5]])
+        results = await cache.get_many("model", ["a", "b", "c"])
+
+        # Assert
+        assert results == [[1.0, 0.0], None, [0.5, 0.5]]
+        stats = cache.stats()
+        assert stats["memory_hits"] == 3
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(0.75)
+
+    @pytest.mark.asyncio
+    async def test_sqlite_store_survives_new_cache(self, tmp_path):
+        """Test that the persistent tier serves entries after the LRU is gone."""
+        # Arrange
+        path = str(tmp_path / "embeddings.db")
+        await EmbeddingCache(SQLiteEmbeddingStore(path, ttl_seconds=60)).set_many(
+            "model", ["pregunta frecuente"], [[0.25, -0.5, 1.0]]
+        )
+        cache = EmbeddingCache(SQLiteEmbeddingStore(path, ttl_seconds=60))
+
+        # Act
+        first = await cache.get_many("model", ["Pregunta  frecuente"])
+        second = await cache.get_many("model", ["pregunta frecuente"])
+
+        # Assert
+        assert first == [[0.25, -0.5, 1.0]]
+        assert second == first
+        assert cache.stats()["store_hits"] == 1
+        assert cache.stats()["memory_hits"] == 1
@@ -0,0 +1,54 @@
+"""Tests for packed binary embedding storage."""
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+
+from app.domain.value_objects.kb_value_objects import Vector
+from app.infrastructure.models.kb_models import EmbeddingArray, KnowledgeItemModel
+from app.infrastructure.repositories.kb_repositories_impl import SQLAlchemyKnowledgeItemRepository
+
+
+class TestEmbeddingStorage:
+    """Test cases for EmbeddingArray and array-backed vectors."""
+
+    def test_bytes_round_trip_without_copy(self):
+        """Test that float32 and float16 rows decode to read-only views of the stored bytes."""
+        # Arrange
+        values = [0.25, -0.5, 1.0]
+
+        # Act
+        packed32 = EmbeddingArray("float32").process_bind_param(values, None)
+        packed16 = EmbeddingArray("float16").process_bind_param(np.asarray(values), None)
+        decoded = EmbeddingArray("float32").process_result_value(packed32, None)
+
+        # Assert
+        assert len(packed32) == 4 + 3 * 4
+        assert len(packed16) == 4 + 3 * 2
+        assert decoded.dtype == np.float32 and decoded.tolist() == values
+        assert not decoded.flags.writeable
+        assert np.shares_memory(Vector(decoded).array, decoded)
+        # Rows keep their own precision whatever the column is configured to write
+        assert EmbeddingArray("float32").process_result_value(packed16, None).dtype == np.float16
+
+    @pytest.mark.asyncio
+    async def test_repository_round_trip(self, session_factory, create_item):
+        """Test that embeddings written by the repository come back equal as vectors."""
+        # Arrange
+        async with session_factory() as session:
+            item = await SQLAlchemyKnowledgeItemRepository(session).create(
+                create_item("Horario de atención", embedding=[0.5, 0.25, 0.125])
+            )
+            await session.commit()
+
+        # Act
+        async with session_factory() as session:
+            stored = await SQLAlchemyKnowledgeItemRepository(session).get_by_id(item.id)
+            raw = (await session.execute(
+                select(KnowledgeItemModel.__table__.c.embedding).where(KnowledgeItemModel.id == item.id.value)
+            )).scalar_one()
+
+        # Assert
+        assert stored.embedding == Vector([0.5, 0.25, 0.125])
+        assert stored.embedding.array.dtype == np.float32
+        assert isinstance(raw, np.ndarray)
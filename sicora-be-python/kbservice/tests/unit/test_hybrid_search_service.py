@@ -1,7 +1,8 @@
 """Tests for Hybrid Search Service."""
 
+import asyncio
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 from app.infrastructure.services.kb_services_impl import HybridSearchService
@@ -10,6 +11,7 @@ from app.domain.value_objects.kb_value_objects import (
     KnowledgeItemId, Title, Content, Vector, SearchScore
 )
 from app.domain.exceptions.kb_exceptions import SearchError
+from app.config import settings
 
 
 class TestHybridSearchService:
@@ -55,7 +57,7 @@ class TestHybridSearchService:
         )
         
         # Mock repository responses
-        self.mock_repo.search_by_text.return_value = [text_item]
+        self.mock_repo.search_by_text_ranked.return_value = [(text_item, SearchScore(0.5), None)]
         self.mock_repo.search_by_vector.return_value = [
             (semantic_item, SearchScore(0.8))
         ]
@@ -73,7 +75,7 @@ class TestHybridSearchService:
         assert all(isinstance(score, SearchScore) for _, score in results)
         
         # Verify service calls
-        self.mock_repo.search_by_text.assert_called_once()
+        self.mock_repo.search_by_text_ranked.assert_called_once()
         self.mock_repo.search_by_vector.assert_called_once()
         self.mock_embedding_service.generate_embedding.assert_called_once_with(query)
     
@@ -86,7 +88,7 @@ class TestHybridSearchService:
         filters = {"category": "academic"}
         
         # Mock responses
-        self.mock_repo.search_by_text.return_value = []
+        self.mock_repo.search_by_text_ranked.return_value = []
         self.mock_repo.search_by_vector.return_value = []
         self.mock_embedding_service.generate_embedding.return_value = Vector([0.1] * 1536)
         
@@ -95,7 +97,7 @@ class TestHybridSearchService:
         
         # Assert
         # Verify filters were passed correctly
-        text_call_args = self.mock_repo.search_by_text.call_args
+        text_call_args = self.mock_repo.search_by_text_ranked.call_args
         vector_call_args = self.mock_repo.search_by_vector.call_args
         
         assert text_call_args[1]["filters"]["category"] == "academic"
@@ -106,13 +108,13 @@ class TestHybridSearchService:
         """Test that admin gets different filters than students."""
         # Arrange
         query = "test query"
-        self.mock_repo.search_by_text.return_value = []
+        self.mock_repo.search_by_text_ranked.return_value = []
         self.mock_repo.search_by_vector.return_value = []
         self.mock_embedding_service.generate_embedding.return_value = Vector([0.1] * 1536)
         
         # Test with student role
         await self.service.hybrid_search(query, UserRole.STUDENT, limit=5)
-        student_text_filters = self.mock_repo.search_by_text.call_args[1]["filters"]
+        student_text_filters = self.mock_repo.search_by_text_ranked.call_args[1]["filters"]
         student_vector_filters = self.mock_repo.search_by_vector.call_args[1]["filters"]
         
         # Reset mocks
@@ -120,7 +122,7 @@ class TestHybridSearchService:
         
         # Test with admin role
         await self.service.hybrid_search(query, UserRole.ADMIN, limit=5)
-        admin_text_filters = self.mock_repo.search_by_text.call_args[1]["filters"]
+        admin_text_filters = self.mock_repo.search_by_text_ranked.call_args[1]["filters"]
         admin_vector_filters = self.mock_repo.search_by_vector.call_args[1]["filters"]
         
         # Assert
@@ -169,7 +171,9 @@ class TestHybridSearchService:
             "How to track student attendance effectively"
         )
         
-        self.mock_repo.search_by_text.return_value = [mock_item]
+        self.mock_repo.search_by_text_ranked.return_value = [
+            (mock_item, SearchScore(0.6), "How to track <mark>student</mark> <mark>attendance</mark>")
+        ]
         
         # Act
         results = await self.service.text_search(query, user_role, limit=10)
@@ -178,9 +182,59 @@ class TestHybridSearchService:
         assert len(results) == 1
         assert results[0][0] == mock_item
         assert isinstance(results[0][1], SearchScore)
-        assert 0 < results[0][1].value <= 1.0
+        assert results[0][1].value == 0.6
+        assert "<mark>student</mark>" in self.service.get_snippet(mock_item)
+        
+        self.mock_repo.search_by_text_ranked.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_hybrid_search_runs_text_and_embedding_concurrently(self):
+        """Test that the embedding request overlaps the text search."""
+        # Arrange
+        text_item = self.create_mock_knowledge_item("Registro de Asistencia", "Guía de asistencia")
+        
+        async def slow_text_search(**kwargs):
+            await asyncio.sleep(0.1)
+            return [(text_item, SearchScore(0.5), None)]
+        
+        async def slow_embedding(query):
+            await asyncio.sleep(0.1)
+            return Vector([0.2] * 1536)
+        
+        self.mock_repo.search_by_text_ranked.side_effect = slow_text_search
+        self.mock_embedding_service.generate_embedding.side_effect = slow_embedding
+        self.mock_repo.search_by_vector.return_value = []
+        
+        # Act
+        await self.service.hybrid_search("asistencia", UserRole.STUDENT, limit=10)
+        report = self.service.get_search_report()
+        
+        # Assert
+        assert report["timings_ms"]["text"] >= 100
+        assert report["timings_ms"]["embedding"] >= 100
+        assert report["timings_ms"]["total"] < 190
+        assert report["degraded_stages"] == []
+    
+    @pytest.mark.asyncio
+    async def test_hybrid_search_degrades_to_text_when_embedding_times_out(self):
+        """Test text-only results when the embedding stage misses its budget."""
+        # Arrange
+        text_item = self.create_mock_knowledge_item("Registro de Asistencia", "Guía de asistencia")
+        self.mock_repo.search_by_text_ranked.return_value = [(text_item, SearchScore(0.5), None)]
+        
+        async def hanging_embedding(query):
+            await asyncio.sleep(10)
+        
+        self.mock_embedding_service.generate_embedding.side_effect = hanging_embedding
         
-        self.mock_repo.search_by_text.assert_called_once()
+        # Act
+        with patch.object(settings, 'SEARCH_EMBEDDING_TIMEOUT_SECONDS', 0.05):
+            results = await self.service.hybrid_search("asistencia", UserRole.STUDENT, limit=10)
+        
+        # Assert
+        assert [item for item, _ in results] == [text_item]
+        assert self.service.get_search_report()["degraded_stages"] == ["embedding"]
+        self.mock_repo.search_by_vector.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_get_related_items_success(self):
@@ -196,8 +250,9 @@ class TestHybridSearchService:
             "Similar content to source"
         )
         
-        # Mock repository responses
+        # Mock repository responses (neighbours not precomputed yet)
         from app.domain.value_objects.kb_value_objects import KnowledgeItemId
+        self.mock_repo.get_related_items.return_value = None
         self.mock_repo.get_by_id.return_value = source_item
         self.mock_repo.search_by_vector.return_value = [
             (source_item, SearchScore(1.0)),  # Source item (should be excluded)
@@ -219,6 +274,7 @@ class TestHybridSearchService:
         """Test getting related items when source item doesn't exist."""
         # Arrange
         item_id = uuid4()
+        self.mock_repo.get_related_items.return_value = None
         self.mock_repo.get_by_id.return_value = None
         
         # Act
@@ -229,11 +285,27 @@ class TestHybridSearchService:
         self.mock_repo.get_by_id.assert_called_once()
         self.mock_repo.search_by_vector.assert_not_called()
     
+    @pytest.mark.asyncio
+    async def test_get_related_items_precomputed(self):
+        """Test that precomputed neighbours are served without a vector search."""
+        # Arrange
+        related_item = self.create_mock_knowledge_item("Related Item", "Similar content to source")
+        self.mock_repo.get_related_items.return_value = [(related_item, SearchScore(0.8))]
+        
+        # Act
+        results = await self.service.get_related_items(uuid4(), limit=5)
+        
+        # Assert
+        assert results == [related_item]
+        self.mock_repo.get_by_id.assert_not_called()
+        self.mock_repo.search_by_vector.assert_not_called()
+    
     @pytest.mark.asyncio
     async def test_search_error_handling(self):
         """Test error handling in search methods."""
         # Arrange
         self.mock_repo.search_by_text.side_effect = Exception("Database error")
+        self.mock_repo.search_by_text_ranked.side_effect = Exception("Database error")
         
         # Act & Assert
         with pytest.raises(SearchError):
@@ -255,8 +327,8 @@ class TestHybridSearchService:
         with pytest.raises(SearchError):
             await self.service.semantic_search("query", UserRole.STUDENT)
     
-    def test_combine_search_results(self):
-        """Test the combination of search results."""
+    def test_fusion_ranker_combines_search_results(self):
+        """Test the fusion of text and semantic results."""
         # Arrange
         text_item = self.create_mock_knowledge_item(
             "Asistencia de Estudiantes", 
@@ -266,22 +338,23 @@ class TestHybridSearchService:
             "Control Académico", 
             "Manual del sistema de control académico"
         )
+        shared_item = self.create_mock_knowledge_item(
+            "Registro de Asistencia", 
+            "Cómo registrar la asistencia diaria"
+        )
         
-        text_results = [text_item]
-        semantic_results = [(semantic_item, SearchScore(0.8))]
-        query = "asistencia estudiantes"
-        user_role = UserRole.STUDENT
+        text_results = [(text_item, SearchScore(0.9)), (shared_item, SearchScore(0.6))]
+        semantic_results = [(shared_item, SearchScore(0.85)), (semantic_item, SearchScore(0.8))]
         
         # Act
-        results = self.service._combine_search_results(
-            text_results, semantic_results, query, user_role
-        )
+        results = self.service.fusion_ranker.fuse(text_results, semantic_results)
         
         # Assert
-        assert len(results) == 2
+        assert len(results) == 3
         assert all(isinstance(item, KnowledgeItem) for item, _ in results)
         assert all(isinstance(score, SearchScore) for _, score in results)
         
-        # Results should be sorted by score (descending)
+        # Items found by both searches rank first; results are sorted by score
+        assert results[0][0] == shared_item
         scores = [score.value for _, score in results]
         assert scores == sorted(scores, reverse=True)
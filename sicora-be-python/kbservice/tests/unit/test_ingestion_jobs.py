@@ -0,0 +1,172 @@
+"""Tests for the background ingestion job queue."""
+
+import asyncio
+import pytest
+from pathlib import Path
+from uuid import uuid4
+
+from app.infrastructure.adapters.ingestion_jobs import IngestionJobQueue, JobStatus
+from app.infrastructure.models.kb_models import IngestionJobModel
+
+
+class TestIngestionJobQueue:
+    """Test cases for IngestionJobQueue."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.user_id = uuid4()
+        self.files = [("guia.pdf", b"%PDF-1.4 guia"), ("reglamento.pdf", b"%PDF-1.4 reglamento")]
+
+    async def wait_until_finished(self, queue, job_id):
+        """Poll a job until it reaches a final status."""
+        for _ in range(200):
+            job = await queue.get(job_id)
+            if job["finished_at"] is not None:
+                return job
+            await asyncio.sleep(0.01)
+        raise AssertionError(f"Job {job_id} did not finish")
+
+    @pytest.mark.asyncio
+    async def test_job_completes_with_per_file_results(self, session_factory, tmp_path):
+        """Test that a submitted job processes every file and records results."""
+        async def handler(path, options, report_progress):
+            await report_progress(0.5)
+            return {"name": Path(path).name, "use_ocr": options["use_ocr"]}
+
+        # Arrange
+        queue = IngestionJobQueue(session_factory, handler, str(tmp_path / "jobs"))
+        await queue.start()
+
+        # Act
+        job_id = await queue.submit(self.files, {"use_ocr": False}, self.user_id)
+        job = await self.wait_until_finished(queue, job_id)
+        await queue.stop()
+
+        # Assert
+        assert job["status"] == JobStatus.COMPLETED.value
+        assert job["progress"] == 1.0
+        assert job["processed_files"] == 2
+        assert [file["result"] for file in job["files"]] == [
+            {"name": "guia.pdf", "use_ocr": False},
+            {"name": "reglamento.pdf", "use_ocr": False}
+        ]
+        assert not (tmp_path / "jobs" / str(job_id)).exists()
+
+    @pytest.mark.asyncio
+    async def test_failed_file_does_not_fail_the_job(self, session_factory, tmp_path):
+        """Test that a failing file is reported while the rest still complete."""
+        async def handler(path, options, report_progress):
+            if "reglamento" in path:
+                raise ValueError("PDF corrupto")
+            return {"ok": True}
+
+        # Arrange
+        queue = IngestionJobQueue(session_factory, handler, str(tmp_path / "jobs"))
+        await queue.start()
+
+        # Act
+        job_id = await queue.submit(self.files, {}, self.user_id)
+        job = await self.wait_until_finished(queue, job_id)
+        await queue.stop()
+
+        # Assert
+        assert job["status"] == JobStatus.COMPLETED.value
+        assert [file["status"] for file in job["files"]] == ["completed", "failed"]
+        assert job["files"][1]["error"] == "PDF corrupto"
+
+    @pytest.mark.asyncio
+    async def test_cancel_interrupts_running_files(self, session_factory, tmp_path):
+        """Test that cancelling a running job stops its files."""
+        started = asyncio.Event()
+
+        async def handler(path, options, report_progress):
+            started.set()
+            await asyncio.sleep(60)
+            return {}
+
+        # Arrange
+        queue = IngestionJobQueue(session_factory, handler, str(tmp_path / "jobs"))
+        await queue.start()
+        job_id = await queue.submit(self.files, {}, self.user_id)
+        await asyncio.wait_for(started.wait(), timeout=2)
+
+        # Act
+        await queue.cancel(job_id)
+        job = await self.wait_until_finished(queue, job_id)
+        await queue.stop()
+
+        # Assert
+        assert job["status"] == JobStatus.CANCELLED.value
+        assert job["cancel_requested"] is True
+        assert {file["status"] for file in job["files"]} == {JobStatus.CANCELLED.value}
+
+    @pytest.mark.asyncio
+    async def test_cancel_while_file_is_starting_skips_the_handler(self, session_factory, tmp_path):
+        """Test that a cancel landing while a file is being marked running is not missed."""
+        calls = []
+
+        async def handler(path, options, report_progress):
+            calls.append(path)
+            return {}
+
+        # Arrange
+        queue = IngestionJobQueue(session_factory, handler, str(tmp_path / "jobs"))
+        update = queue._update
+        updates = 0
+
+        async def update_then_cancel(job_id, mutate):
+            nonlocal updates
+            state = await update(job_id, mutate)
+            updates += 1
+            if updates == 2:
+                # The file was just marked running: cancel before the handler starts
+                await queue.cancel(job_id)
+            return state
+
+        queue._update = update_then_cancel
+        await queue.start()
+
+        # Act
+        job_id = await queue.submit(self.files[:1], {}, self.user_id)
+        job = await self.wait_until_finished(queue, job_id)
+        await queue.stop()
+
+        # Assert
+        assert calls == []
+        assert job["status"] == JobStatus.CANCELLED.value
+        assert job["files"][0]["status"] == JobStatus.CANCELLED.value
+
+    @pytest.mark.asyncio
+    async def test_start_resumes_interrupted_jobs(self, session_factory, tmp_path):
+        """Test that jobs left running are resumed, skipping files already finished."""
+        processed = []
+
+        async def handler(path, options, report_progress):
+            processed.append(Path(path).name)
+            return {}
+
+        # Arrange
+        queue = IngestionJobQueue(session_factory, handler, str(tmp_path / "jobs"))
+        files = IngestionJobQueue._store_files(tmp_path / "interrupted", self.files)
+        files[0].update(status=JobStatus.COMPLETED.value, progress=1.0)
+        job_id = uuid4()
+        async with session_factory() as session:
+            session.add(IngestionJobModel(
+                id=job_id,
+                status=JobStatus.RUNNING.value,
+                submitted_by=self.user_id,
+                files=files,
+                total_files=2,
+                processed_files=1
+            ))
+            await session.commit()
+
+        # Act
+        resumed = await queue.start()
+        job = await self.wait_until_finished(queue, job_id)
+        await queue.stop()
+
+        # Assert
+        assert resumed == 1
+        assert processed == ["reglamento.pdf"]
+        assert job["status"] == JobStatus.COMPLETED.value
@@ -0,0 +1,243 @@
+"""Tests for content-hash incremental ingestion."""
+
+import sqlite3
+import pytest
+from typing import List
+from uuid import uuid4
+
+from app.application.dtos.kb_dtos import DocumentIngestionDTO
+from app.application.use_cases.kb_use_cases import IngestDocumentUseCase
+from app.domain.entities.kb_entities import ContentType, IngestionLedgerEntry
+from app.domain.services.ingestion_ledger import hash_text, is_source_unchanged, plan_ingestion
+from app.domain.services.kb_domain_services import EmbeddingService
+from app.domain.value_objects.kb_value_objects import KnowledgeItemId, Vector
+from app.infrastructure.adapters.ingestion_ledger import SQLiteIngestionLedger
+from app.infrastructure.adapters.search_cache import VersionedSearchResultCache
+from app.infrastructure.adapters.vector_index import FlatVectorIndex
+from app.infrastructure.config.database import wait_for_after_commit_tasks
+from app.infrastructure.repositories.kb_repositories_impl import (
+    SQLAlchemyIngestionLedgerRepository,
+    SQLAlchemyKnowledgeDocumentRepository
+)
+
+
+class CountingEmbeddingService(EmbeddingService):
+    """Embedding service that records every text it embeds."""
+
+    def __init__(self):
+        self.embedded: List[str] = []
+
+    async def generate_embedding(self, text: str) -> Vector:
+        return (await self.generate_embeddings_batch([text]))[0]
+
+    async def generate_embeddings_batch(self, texts: List[str]) -> List[Vector]:
+        self.embedded.extend(texts)
+        return [Vector([float(len(text)), 1.0, 0.5]) for text in texts]
+
+
+class TestPlanIngestion:
+    """Test cases for plan_ingestion."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.previous = IngestionLedgerEntry(
+            source_key="pdf:reglamento.pdf",
+            file_hash="old",
+            chunk_hashes=["a", "b", "c"],
+            item_ids=["item-a", "item-b", "item-c"],
+            attributes={"category": "reglamentos"}
+        )
+
+    def test_moved_chunks_keep_their_items(self):
+        """Test that chunk matching is by hash, not position."""
+        # Act
+        plan = plan_ingestion("pdf:reglamento.pdf", "new", ["c", "a", "d"], self.previous)
+
+        # Assert
+        assert plan.reused == {0: "item-c", 1: "item-a"}
+        assert plan.to_embed == [2]
+        assert plan.stale_item_ids == ["item-b"]
+        assert not plan.unchanged
+
+    def test_source_unchanged_only_compares_requested_attributes(self):
+        """Test the pre-extraction skip check."""
+        # Act & Assert
+        assert is_source_unchanged(self.previous, "old")
+        assert is_source_unchanged(self.previous, "old", {"category": "reglamentos"})
+        assert not is_source_unchanged(self.previous, "old", {"category": "guias"})
+        assert not is_source_unchanged(self.previous, "new")
+        assert not is_source_unchanged(None, "old")
+
+
+class TestIngestDocumentUseCase:
+    """Test cases for IngestDocumentUseCase."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.author_id = uuid4()
+        self.embedding_service = CountingEmbeddingService()
+
+    def create_dto(self, chunks: List[str], file_hash: str, category: str = "reglamentos") -> DocumentIngestionDTO:
+        """Create an ingestion DTO for testing."""
+        return DocumentIngestionDTO(
+            source_key="pdf:reglamento.pdf",
+            file_hash=file_hash,
+            title="Reglamento del aprendiz",
+            chunks=chunks,
+            content_type=ContentType.POLICY,
+            category=category
+        )
+
+    @pytest.fixture
+    def use_case(self, item_repo):
+        """Ingestion use case over a fresh database file."""
+        session = item_repo.session
+        return IngestDocumentUseCase(
+            item_repo,
+            SQLAlchemyIngestionLedgerRepository(session),
+            SQLAlchemyKnowledgeDocumentRepository(session, item_repo),
+            self.embedding_service
+        )
+
+    @pytest.mark.asyncio
+    async def test_unchanged_document_is_not_embedded_again(self, use_case, item_repo):
+        """Test that re-ingesting identical chunks writes and embeds nothing."""
+        # Arrange
+        first = await use_case.execute(self.create_dto(["Artículo 1.", "Artículo 2."], "v1"), self.author_id)
+        self.embedding_service.embedded.clear()
+
+        # Act
+        skip = await use_case.is_unchanged("pdf:reglamento.pdf", "v1", {"category": "reglamentos"})
+        second = await use_case.execute(self.create_dto(["Artículo 1.", "Artículo 2."], "v1"), self.author_id)
+
+        # Assert
+        assert first.created == 2
+        assert skip is True
+        assert second.status == "unchanged"
+        assert second.item_ids == first.item_ids
+        assert self.embedding_service.embedded == []
+
+    @pytest.mark.asyncio
+    async def test_changed_document_re_embeds_only_changed_chunks(self, use_case, item_repo):
+        """Test that only new chunks are embedded and dropped chunks are deleted."""
+        # Arrange
+        first = await use_case.execute(
+            self.create_dto(["Artículo 1.", "Artículo 2.", "Artículo 3."], "v1"), self.author_id
+        )
+        self.embedding_service.embedded.clear()
+
+        # Act
+        second = await use_case.execute(
+            self.create_dto(["Artículo 1.", "Artículo 2 reformado."], "v2"), self.author_id
+        )
+
+        # Assert
+        assert (second.created, second.reused, second.removed) == (1, 1, 2)
+        assert self.embedding_service.embedded == ["Reglamento del aprendiz Artículo 2 reformado."]
+        assert second.item_ids[0] == first.item_ids[0]
+        assert await item_repo.get_by_id(KnowledgeItemId(first.item_ids[2])) is None
+        kept = await item_repo.get_by_id(KnowledgeItemId(first.item_ids[0]))
+        assert kept.title.value == "Reglamento del aprendiz (1/2)"
+        assert (kept.document_id, kept.chunk_index) == (first.document_id, 0)
+        chunks = await item_repo.list_summaries(filters={"document_id": second.document_id})
+        assert sorted(chunk.chunk_index for chunk in chunks) == [0, 1]
+        document = await use_case.document_repo.get_by_source_key("pdf:reglamento.pdf")
+        assert (document.id, document.chunk_count, document.file_hash) == (first.document_id, 2, "v2")
+        ledger = await use_case.ledger_repo.get("pdf:reglamento.pdf")
+        assert ledger.chunk_hashes[1] == hash_text("Reglamento del aprendiz Artículo 2 reformado.")
+
+    @pytest.mark.asyncio
+    async def test_reclassified_document_keeps_embeddings(self, use_case, item_repo):
+        """Test that changing only the category relabels items without embedding."""
+        # Arrange
+        first = await use_case.execute(self.create_dto(["Artículo 1."], "v1"), self.author_id)
+        self.embedding_service.embedded.clear()
+
+        # Act
+        second = await use_case.execute(self.create_dto(["Artículo 1."], "v1", category="normas"), self.author_id)
+
+        # Assert
+        assert second.status == "ingested"
+        assert (second.created, second.reused) == (0, 1)
+        assert self.embedding_service.embedded == []
+        item = await item_repo.get_by_id(KnowledgeItemId(first.item_ids[0]))
+        assert item.category.value == "normas"
+        assert item.embedding is not None
+
+    @pytest.mark.asyncio
+    async def test_another_authors_items_are_never_removed(self, use_case, item_repo):
+        """Test that a new version from a different author leaves the original items in place."""
+        # Arrange
+        first = await use_case.execute(
+            self.create_dto(["Artículo 1.", "Artículo 2."], "v1"), self.author_id
+        )
+        other_author_id = uuid4()
+
+        # Act
+        second = await use_case.execute(self.create_dto(["Artículo 1."], "v2"), other_author_id)
+
+        # Assert
+        assert (second.created, second.reused, second.removed) == (1, 0, 0)
+        assert second.item_ids[0] not in first.item_ids
+        for item_id in first.item_ids:
+            item = await item_repo.get_by_id(KnowledgeItemId(item_id))
+            assert item.author_id == self.author_id
+
+    @pytest.mark.asyncio
+    async def test_search_cache_is_invalidated_on_commit(self, use_case, item_repo):
+        """Test that cached searches survive until the ingestion commits."""
+        # Arrange
+        use_case.result_cache = VersionedSearchResultCache(max_entries=10, ttl_seconds=60)
+        await use_case.result_cache.set("key", "response")
+
+        # Act
+        await use_case.execute(self.create_dto(["Artículo 1."], "v1"), self.author_id)
+        before_commit = await use_case.result_cache.get("key")
+        await item_repo.session.commit()
+        await wait_for_after_commit_tasks()
+
+        # Assert
+        assert before_commit == "response"
+        assert await use_case.result_cache.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_deleted_document_removes_its_chunks_from_the_index_on_commit(self, use_case, item_repo):
+        """Test that deleting a document goes through the item repository for every chunk."""
+        # Arrange
+        item_repo.vector_index = FlatVectorIndex(dimension=3, refresh_seconds=60)
+        item_repo.vector_index.mark_loaded()
+        first = await use_case.execute(self.create_dto(["Artículo 1.", "Artículo 2."], "v1"), self.author_id)
+        await item_repo.session.commit()
+        indexed = len(item_repo.vector_index)
+
+        # Act
+        deleted = await use_case.document_repo.delete(first.document_id)
+        before_commit = len(item_repo.vector_index)
+        await item_repo.session.commit()
+
+        # Assert
+        assert deleted is True
+        assert (indexed, before_commit, len(item_repo.vector_index)) == (2, 2, 0)
+        for item_id in first.item_ids:
+            assert await item_repo.get_by_id(KnowledgeItemId(item_id)) is None
+
+
+class TestSQLiteIngestionLedger:
+    """Test cases for the standalone ledger used by import scripts."""
+
+    def test_save_and_get_round_trip(self):
+        """Test that entries are stored and replaced by source key."""
+        # Arrange
+        ledger = SQLiteIngestionLedger(sqlite3.connect(":memory:"))
+
+        # Act
+        ledger.save(IngestionLedgerEntry("faq:asistencia-qr", "h1", item_ids=["asistencia-qr"]))
+        ledger.save(IngestionLedgerEntry("faq:asistencia-qr", "h2", item_ids=["asistencia-qr"]))
+        entry = ledger.get("faq:asistencia-qr")
+
+        # Assert
+        assert entry.file_hash == "h2"
+        assert entry.item_ids == ["asistencia-qr"]
+        assert ledger.get("faq:otra") is None
+        assert ledger.delete("faq:asistencia-qr")
+        ledger.close()
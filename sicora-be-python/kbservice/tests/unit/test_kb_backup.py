@@ -0,0 +1,123 @@
+"""Tests for streaming knowledge base backup and restore."""
+
+import gzip
+import json
+import pytest
+import pytest_asyncio
+
+from app.config import settings
+from app.domain.entities.kb_entities import KnowledgeItem, ContentType, ContentStatus, TargetAudience
+from app.domain.exceptions.kb_exceptions import BackupError
+from app.domain.value_objects.kb_value_objects import Title, Content, CategoryName, Vector
+from app.infrastructure.adapters.kb_backup import backup_path, encode_embedding, decode_embedding
+from app.infrastructure.adapters.search_cache import VersionedSearchResultCache
+from app.infrastructure.config.database import wait_for_after_commit_tasks
+from app.infrastructure.repositories.kb_repositories_impl import SQLAlchemyKnowledgeItemRepository
+
+
+class TestKnowledgeBaseBackup:
+    """Test cases for NDJSON backup and restore."""
+
+    @pytest.fixture(autouse=True)
+    def backup_dir(self, tmp_path, monkeypatch):
+        """Write backups to a temporary directory."""
+        monkeypatch.setattr(settings, "BACKUP_DIR", str(tmp_path))
+        monkeypatch.setattr(settings, "BACKUP_BATCH_SIZE", 2)
+
+    @pytest_asyncio.fixture
+    async def target(self, create_session_factory):
+        """Repository of a second, empty database to restore into."""
+        session_factory = await create_session_factory("target.db")
+        async with session_factory() as session:
+            yield SQLAlchemyKnowledgeItemRepository(session)
+
+    def test_embedding_blocks_round_trip_as_float32(self):
+        """Test that embeddings are stored as compact float32 blocks."""
+        # Act
+        block = encode_embedding([0.5, -0.25, 1.0])
+
+        # Assert
+        assert decode_embedding(block) == [0.5, -0.25, 1.0]
+        assert len(block) == 16
+
+    def test_backup_path_rejects_traversal(self):
+        """Test that backup IDs cannot point outside the backup directory."""
+        with pytest.raises(BackupError):
+            backup_path("../etc/passwd")
+
+    @pytest.mark.asyncio
+    async def test_backup_and_restore_with_embeddings(self, item_repo, target, create_item):
+        """Test a full streaming round trip into an empty database."""
+        # Arrange
+        for index in range(5):
+            await item_repo.create(create_item(f"Pregunta {index}", embedding=[0.5, float(index), 1.0]))
+
+        # Act
+        backup_id = await item_repo.create_backup(include_embeddings=True)
+        result = await target.restore_from_backup(backup_id)
+
+        # Assert
+        assert result["inserted"] == 5 and result["conflicts"] == 0 and result["errors"] == []
+        restored = await target.list_all()
+        assert sorted(item.title.value for item in restored) == [f"Pregunta {i}" for i in range(5)]
+        assert all(item.embedding.values[0] == 0.5 for item in restored)
+
+    @pytest.mark.asyncio
+    async def test_restore_conflicts_skip_or_overwrite(self, item_repo, target, create_item):
+        """Test conflict handling and that missing embeddings keep existing ones."""
+        # Arrange
+        item = await item_repo.create(create_item("Original", embedding=[0.1, 0.2]))
+        await target.create(KnowledgeItem(
+            id=item.id, title=Title("Local"), content=Content("Local"),
+            content_type=ContentType.FAQ, category=CategoryName("asistencia"),
+            target_audience=TargetAudience.ALL, author_id=item.author_id,
+            status=ContentStatus.PUBLISHED, embedding=Vector([0.3, 0.4])
+        ))
+        backup_id = await item_repo.create_backup(include_embeddings=False)
+
+        # Act
+        skipped = await target.restore_from_backup(backup_id)
+        overwritten = await target.restore_from_backup(backup_id, overwrite_existing=True)
+
+        # Assert
+        assert (skipped["conflicts"], skipped["updated"]) == (1, 0)
+        assert (overwritten["conflicts"], overwritten["updated"]) == (1, 1)
+        restored = await target.get_by_id(item.id)
+        assert restored.title.value == "Original"
+        assert restored.embedding.values == pytest.approx([0.3, 0.4])
+
+    @pytest.mark.asyncio
+    async def test_restore_invalidates_cached_searches_on_commit(self, item_repo, target, create_item):
+        """Test that cached search responses are dropped once a restore commits."""
+        # Arrange
+        target.result_cache = VersionedSearchResultCache(max_entries=10, ttl_seconds=60)
+        await target.result_cache.set("key", "response")
+        await item_repo.create(create_item("Pregunta"))
+        backup_id = await item_repo.create_backup()
+
+        # Act
+        await target.restore_from_backup(backup_id)
+        before_commit = await target.result_cache.get("key")
+        await target.session.commit()
+        await wait_for_after_commit_tasks()
+
+        # Assert
+        assert before_commit == "response"
+        assert await target.result_cache.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_restore_rejects_truncated_backup(self, item_repo, target, create_item):
+        """Test that a backup without its footer is reported as corrupt."""
+        # Arrange
+        await item_repo.create(create_item("Pregunta"))
+        backup_id = await item_repo.create_backup()
+        path = backup_path(backup_id)
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            lines = file.readlines()
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            file.writelines(lines[:-1])
+
+        # Act / Assert
+        assert json.loads(lines[-1])["items_count"] == 1
+        with pytest.raises(BackupError):
+            await target.restore_from_backup(backup_id)
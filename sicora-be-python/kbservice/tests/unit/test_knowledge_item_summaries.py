@@ -0,0 +1,64 @@
+"""Tests for projection-based knowledge item listings."""
+
+import pytest
+
+from app.application.use_cases.kb_use_cases import ListKnowledgeItemsUseCase
+from app.domain.entities.kb_entities import ContentType, ContentStatus, TargetAudience, UserRole
+from app.domain.value_objects.kb_value_objects import TagName, Vector
+
+TAGS = [TagName("asistencia")]
+
+
+class TestKnowledgeItemSummaries:
+    """Test cases for summary read models."""
+
+    @pytest.mark.asyncio
+    async def test_list_summaries_truncates_content_like_entities(self, item_repo, create_item):
+        """Test that server-side snippets match Content.get_snippet."""
+        # Arrange
+        long_item = await item_repo.create(create_item("Reglamento", "a" * 250, tags=TAGS))
+        short_item = await item_repo.create(create_item("Horario", "Consulta el horario.", tags=TAGS))
+
+        # Act
+        summaries = await item_repo.list_summaries(filters={"category": "asistencia"}, snippet_length=200)
+
+        # Assert
+        by_id = {summary.id: summary for summary in summaries}
+        assert by_id[long_item.id.value].content_snippet == long_item.content.get_snippet(200)
+        assert by_id[short_item.id.value].content_snippet == "Consulta el horario."
+        assert by_id[short_item.id.value].tags == ["asistencia"]
+        assert by_id[short_item.id.value].content_type == ContentType.FAQ
+
+    @pytest.mark.asyncio
+    async def test_list_use_case_filters_by_status_and_audience(self, item_repo, create_item):
+        """Test that the list use case returns only accessible published summaries."""
+        # Arrange
+        visible = await item_repo.create(create_item("Asistencia", "Marca tu asistencia."))
+        await item_repo.create(create_item("Borrador", "Sin publicar.", status=ContentStatus.DRAFT))
+        await item_repo.create(create_item(
+            "Reservas", "Solo instructores.", target_audience=TargetAudience.INSTRUCTOR
+        ))
+        use_case = ListKnowledgeItemsUseCase(item_repo)
+
+        # Act
+        result = await use_case.execute(UserRole.STUDENT)
+
+        # Assert
+        assert [dto.id for dto in result] == [visible.id.value]
+        assert result[0].content_snippet == "Marca tu asistencia."
+
+    @pytest.mark.asyncio
+    async def test_vector_search_hits_are_loaded_without_embeddings(self, item_repo, create_item):
+        """Test that search hits skip the embedding column."""
+        # Arrange
+        item = await item_repo.create(create_item("Asistencia", "Marca tu asistencia.", embedding=[0.1, 0.2, 0.3]))
+        item_repo.session.expunge_all()
+
+        # Act
+        results = await item_repo.search_by_vector(Vector([0.1, 0.2, 0.3]), threshold=0.5)
+        reloaded = await item_repo.get_by_id(item.id)
+
+        # Assert
+        assert [hit.id for hit, _ in results] == [item.id]
+        assert results[0][0].embedding is None
+        assert reloaded.embedding is not None
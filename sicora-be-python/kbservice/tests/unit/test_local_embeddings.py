@@ -0,0 +1,76 @@
+"""Tests for the offline embedding provider."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.infrastructure.adapters.embedding_cache import EmbeddingCache
+from app.infrastructure.adapters.local_embeddings import EmbeddingBatcher, HashedTfidfEncoder
+from app.infrastructure.services.kb_services_impl import LocalEmbeddingService
+
+
+class CountingEncoder(HashedTfidfEncoder):
+    """Hashed encoder that records the batches it receives."""
+
+    def __init__(self, dimension: int):
+        super().__init__(dimension)
+        self.calls = []
+
+    def encode(self, texts):
+        self.calls.append(list(texts))
+        return super().encode(texts)
+
+
+class TestLocalEmbeddings:
+    """Test cases for local encoders and LocalEmbeddingService."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.encoder = CountingEncoder(dimension=256)
+
+    def test_hashed_encoder_ranks_related_text_closer(self):
+        """Test that shared terms (ignoring accents and inflection) give higher cosine similarity."""
+        # Act
+        query, related, unrelated = self.encoder.encode([
+            "¿Cómo solicito la matrícula del curso?",
+            "Pasos para la matricula en un curso técnico",
+            "Horario de la cafetería del centro"
+        ])
+
+        # Assert
+        assert query.shape == (256,)
+        assert np.linalg.norm(query) == pytest.approx(1.0, abs=1e-5)
+        assert float(query @ related) > float(query @ unrelated)
+        np.testing.assert_array_equal(self.encoder.encode(["¿Cómo solicito la matrícula del curso?"])[0], query)
+
+    @pytest.mark.asyncio
+    async def test_batcher_coalesces_concurrent_requests(self):
+        """Test that requests arriving together share one encoder call."""
+        # Arrange
+        batcher = EmbeddingBatcher(self.encoder, batch_size=64, max_wait_ms=50)
+
+        # Act
+        results = await asyncio.gather(*(batcher.encode([f"texto {i}"]) for i in range(5)))
+
+        # Assert
+        assert len(self.encoder.calls) == 1
+        assert sorted(self.encoder.calls[0]) == sorted(f"texto {i}" for i in range(5))
+        for i, matrix in enumerate(results):
+            np.testing.assert_array_equal(matrix[0], self.encoder.encode([f"texto {i}"])[0])
+
+    @pytest.mark.asyncio
+    async def test_service_embeds_once_per_distinct_text(self):
+        """Test that the service returns configured-dimension vectors and reuses the cache."""
+        # Arrange
+        service = LocalEmbeddingService(EmbeddingCache(), EmbeddingBatcher(self.encoder, max_wait_ms=1))
+
+        # Act
+        first = await service.generate_embeddings_batch(["uno", "dos", "uno"])
+        second = await service.generate_embedding("dos")
+
+        # Assert
+        assert [vector.dimension for vector in first] == [256, 256, 256]
+        assert first[0] == first[2]
+        assert second == first[1]
+        assert self.encoder.calls == [["uno", "dos"]]
@@ -0,0 +1,33 @@
+"""Tests for the per-page OCR cache and resolution selection."""
+
+from app.infrastructure.adapters.ocr_cache import OCRPageCache, choose_ocr_dpi, ocr_cache_key
+
+
+class TestOCRPageCache:
+    """Test cases for OCRPageCache."""
+
+    def test_round_trip_and_miss(self, tmp_path):
+        """Test that stored page text is returned and unknown keys miss."""
+        # Arrange
+        cache = OCRPageCache(str(tmp_path / "ocr"))
+        key = ocr_cache_key("page-hash", 300, "spa")
+
+        # Act
+        cache.set(key, "Reglamento del aprendiz")
+
+        # Assert
+        assert cache.get(key) == "Reglamento del aprendiz"
+        assert cache.get(ocr_cache_key("page-hash", 200, "spa")) is None
+        assert not list((tmp_path / "ocr").rglob("*.tmp"))
+
+
+class TestChooseOCRDpi:
+    """Test cases for choose_ocr_dpi."""
+
+    def test_native_resolution_is_clamped(self):
+        """Test that scans use their own resolution within the allowed range."""
+        # Act & Assert
+        assert choose_ocr_dpi(240.4, 150, 300, 200) == 240
+        assert choose_ocr_dpi(72, 150, 300, 200) == 150
+        assert choose_ocr_dpi(600, 150, 300, 200) == 300
+        assert choose_ocr_dpi(None, 150, 300, 200) == 200
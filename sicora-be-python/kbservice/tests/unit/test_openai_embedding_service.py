@@ -4,6 +4,7 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from app.infrastructure.services.kb_services_impl import OpenAIEmbeddingService
 from app.domain.exceptions.kb_exceptions import EmbeddingError
+from app.infrastructure.adapters.embedding_cache import EmbeddingCache
 from app.config import settings
 
 
@@ -180,6 +181,63 @@ class TestOpenAIEmbeddingService:
             assert all(v == 0.2 for v in results[1].values)
             mock_client.embeddings.create.assert_called_once()
     
+    @pytest.mark.asyncio
+    @patch('app.infrastructure.services.kb_services_impl.AsyncOpenAI')
+    async def test_generate_embedding_uses_cache(self, mock_openai_class):
+        """Test that repeated texts are served from the embedding cache."""
+        # Arrange
+        mock_client = AsyncMock()
+        mock_openai_class.return_value = mock_client
+        
+        mock_response = MagicMock()
+        mock_response.data = [MagicMock()]
+        mock_response.data[0].embedding = [0.5] * settings.EMBEDDING_DIMENSION
+        mock_client.embeddings.create.return_value = mock_response
+        
+        with patch.object(settings, 'OPENAI_API_KEY', 'test-key'):
+            cache = EmbeddingCache()
+            service = OpenAIEmbeddingService(cache)
+            
+            # Act
+            first = await service.generate_embedding("¿Cómo justifico una falta?")
+            second = await service.generate_embedding("¿cómo justifico  una falta?")
+            
+            # Assert
+            assert first.values == second.values
+            mock_client.embeddings.create.assert_called_once()
+            assert cache.stats()["memory_hits"] == 1
+    
+    @pytest.mark.asyncio
+    @patch('app.infrastructure.services.kb_services_impl.AsyncOpenAI')
+    async def test_generate_embeddings_batch_only_requests_misses(self, mock_openai_class):
+        """Test that batch generation only sends uncached, distinct texts to the API."""
+        # Arrange
+        mock_client = AsyncMock()
+        mock_openai_class.return_value = mock_client
+        
+        mock_response = MagicMock()
+        mock_response.data = [MagicMock()]
+        mock_response.data[0].embedding = [0.2] * settings.EMBEDDING_DIMENSION
+        mock_client.embeddings.create.return_value = mock_response
+        
+        with patch.object(settings, 'OPENAI_API_KEY', 'test-key'):
+            cache = EmbeddingCache()
+            await cache.set_many(
+                settings.EMBEDDING_MODEL, ["Text 1"], [[0.1] * settings.EMBEDDING_DIMENSION]
+            )
+            service = OpenAIEmbeddingService(cache)
+            
+            # Act
+            results = await service.generate_embeddings_batch(["Text 1", "Text 2", "Text 2"])
+            
+            # Assert
+            assert len(results) == 3
+            assert results[0].values[0] == pytest.approx(0.1)
+            assert results[1].values[0] == pytest.approx(0.2)
+            assert results[2].values[0] == pytest.approx(0.2)
+            mock_client.embeddings.create.assert_called_once()
+            assert mock_client.embeddings.create.call_args[1]["input"] == ["Text 2"]
+    
     @pytest.mark.asyncio
     async def test_generate_embedding_long_text_truncation(self):
         """Test that long text is properly truncated."""
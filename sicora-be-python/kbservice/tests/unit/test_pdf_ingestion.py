@@ -0,0 +1,110 @@
+"""Tests for the process-pool PDF ingestion engine."""
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from app.infrastructure.pdf_processing import (
+    PDFIngestionEngine, PDFProcessingError, is_acceptable_extraction, pdf_source_key
+)
+
+
+def create_pdf(path, pages):
+    """Write a PDF with one text block per page."""
+    doc = fitz.open()
+    for text in pages:
+        page = doc.new_page()
+        page.insert_text((72, 72), text)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+class TestPDFIngestionEngine:
+    """Test cases for PDFIngestionEngine."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.engine = PDFIngestionEngine(
+            max_workers=2, pages_per_task=2, parallel_page_threshold=3, ocr_pages_per_task=2
+        )
+
+    def teardown_method(self):
+        """Tear down test fixtures."""
+        self.engine.shutdown()
+
+    def test_source_key_is_scoped_to_the_uploader(self):
+        """Test that the same file name from two authors maps to two ledger entries."""
+        # Act
+        key = pdf_source_key("/tmp/jobs/000/reglamento.pdf", "autor-1")
+
+        # Assert
+        assert key == "pdf:autor-1:reglamento.pdf"
+        assert key != pdf_source_key("reglamento.pdf", "autor-2")
+
+    def test_quality_heuristic(self):
+        """Test that sparse or unmapped-glyph text is rejected."""
+        # Arrange
+        good = "El aprendiz debe registrar su asistencia en cada sesión de formación. " * 3
+        garbage = "(cid:12)(cid:40)(cid:7) " * 20
+
+        # Act / Assert
+        assert is_acceptable_extraction(good, page_count=1, min_chars_per_page=80)
+        assert not is_acceptable_extraction(good, page_count=10, min_chars_per_page=80)
+        assert not is_acceptable_extraction(garbage, page_count=1, min_chars_per_page=80)
+
+    @pytest.mark.asyncio
+    async def test_large_document_pages_are_extracted_in_order(self, tmp_path):
+        """Test that page ranges extracted in parallel keep page order."""
+        # Arrange
+        pages = [f"Pagina {number} del reglamento del aprendiz" for number in range(5)]
+        path = create_pdf(tmp_path / "reglamento.pdf", pages)
+
+        # Act
+        extracted = await self.engine.extract_pages(path, "pymupdf", len(pages))
+
+        # Assert
+        assert [page.strip() for page in extracted] == pages
+
+    @pytest.mark.asyncio
+    async def test_extract_text_uses_cheapest_method_when_acceptable(self, tmp_path):
+        """Test that the first extractor wins when its text passes the heuristic."""
+        # Arrange
+        path = create_pdf(tmp_path / "guia.pdf", ["Guia de asistencia para aprendices del SENA"])
+
+        # Act
+        text, method = await self.engine.extract_text(path)
+
+        # Assert
+        assert method in ("pymupdf", "pypdf2", "pdfplumber")
+        assert "asistencia" in text
+
+    @pytest.mark.asyncio
+    async def test_extract_text_rejects_non_pdf(self, tmp_path):
+        """Test that non-PDF files are rejected."""
+        # Arrange
+        path = tmp_path / "notas.txt"
+        path.write_text("no es un pdf")
+
+        # Act / Assert
+        with pytest.raises(PDFProcessingError):
+            await self.engine.extract_text(str(path))
+
+    @pytest.mark.asyncio
+    async def test_ocr_keeps_text_layer_pages_and_reports_progress(self, tmp_path):
+        """Test that pages with a text layer are not rasterized and progress reaches 1."""
+        # Arrange
+        pages = [f"Pagina {number}: el aprendiz debe registrar su asistencia en cada sesion de formacion." for number in range(5)]
+        path = create_pdf(tmp_path / "reglamento.pdf", pages)
+        progress = []
+
+        async def report_progress(fraction):
+            progress.append(fraction)
+
+        # Act
+        text = await self.engine.ocr_pages(path, len(pages), report_progress)
+
+        # Assert
+        assert text.split("\n") == pages
+        assert progress == sorted(progress)
+        assert progress[-1] == 1.0
@@ -0,0 +1,67 @@
+"""Tests for write-behind popularity counters."""
+
+import pytest
+from uuid import uuid4
+
+from app.application.use_cases.kb_use_cases import GetKnowledgeItemUseCase
+from app.domain.entities.kb_entities import UserRole
+from app.infrastructure.adapters.popularity_counters import MemoryCounterStore, WriteBehindPopularityCounter
+from app.infrastructure.repositories.kb_repositories_impl import SQLAlchemyKnowledgeItemRepository
+
+
+class TestWriteBehindPopularityCounter:
+    """Test cases for WriteBehindPopularityCounter."""
+
+    @pytest.mark.asyncio
+    async def test_memory_store_aggregates_until_taken(self):
+        """Test that increments for the same item are summed and taken once."""
+        # Arrange
+        store = MemoryCounterStore()
+        item_id = uuid4()
+
+        # Act
+        await store.add({item_id: {"views": 1}})
+        await store.add({item_id: {"views": 2, "helpful": 1}})
+        taken = await store.take()
+
+        # Assert
+        assert taken == {item_id: {"views": 3, "helpful": 1, "unhelpful": 0}}
+        assert await store.take() == {}
+
+    @pytest.mark.asyncio
+    async def test_views_are_written_in_one_flush_and_ranked_before(self, session_factory, create_item):
+        """Test that views skip the database until a flush, yet already count for popularity."""
+        counter = WriteBehindPopularityCounter(session_factory, flush_interval_ms=60000)
+        try:
+            # Arrange
+            async with session_factory() as session:
+                repo = SQLAlchemyKnowledgeItemRepository(session)
+                popular = await repo.create(create_item("Popular", view_count=5))
+                rising = await repo.create(create_item("En ascenso", view_count=0))
+                await session.commit()
+
+            # Act
+            async with session_factory() as session:
+                use_case = GetKnowledgeItemUseCase(
+                    SQLAlchemyKnowledgeItemRepository(session, popularity_counter=counter), counter
+                )
+                for _ in range(7):
+                    response = await use_case.execute(rising.id.value, UserRole.STUDENT)
+            async with session_factory() as session:
+                repo = SQLAlchemyKnowledgeItemRepository(session, popularity_counter=counter)
+                persisted = await SQLAlchemyKnowledgeItemRepository(session).get_by_id(rising.id)
+                ranked_before = await repo.get_popular_items(limit=1)
+            written = await counter.flush()
+            async with session_factory() as session:
+                stored = await SQLAlchemyKnowledgeItemRepository(session).get_by_id(rising.id)
+
+            # Assert
+            assert response.view_count == 1
+            assert persisted.view_count == 0
+            assert [item.title.value for item in ranked_before] == ["En ascenso"]
+            assert ranked_before[0].view_count == 7
+            assert written == 1
+            assert stored.view_count == 7
+            assert await counter.pending([rising.id.value, popular.id.value]) == {}
+        finally:
+            await counter.stop()
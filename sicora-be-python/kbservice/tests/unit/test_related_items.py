@@ -0,0 +1,60 @@
+"""Tests for the precomputed related-items graph."""
+
+import pytest
+
+from app.application.use_cases.kb_use_cases import RefreshRelatedItemsUseCase
+from app.domain.value_objects.kb_value_objects import Vector
+
+
+class TestRefreshRelatedItemsUseCase:
+    """Test cases for RefreshRelatedItemsUseCase and the related-items repository methods."""
+
+    @staticmethod
+    async def related_titles(repo, item):
+        """Titles of an item's stored related items, best first."""
+        related = await repo.get_related_items(item.id, limit=5)
+        return None if related is None else [related_item.title.value for related_item, _ in related]
+
+    @pytest.mark.asyncio
+    async def test_neighbours_are_stored_best_first(self, item_repo, create_item):
+        """Test that a refresh stores the closest published items above the threshold."""
+        # Arrange
+        source = await item_repo.create(create_item("Origen", embedding=[1.0, 0.0, 0.0]))
+        await item_repo.create(create_item("Cercano", embedding=[0.9, 0.1, 0.0]))
+        await item_repo.create(create_item("Medio", embedding=[0.7, 0.7, 0.0]))
+        await item_repo.create(create_item("Lejano", embedding=[0.0, 0.0, 1.0]))
+        use_case = RefreshRelatedItemsUseCase(item_repo, top_k=2, threshold=0.5)
+        assert await self.related_titles(item_repo, source) is None
+
+        # Act
+        result = await use_case.execute()
+
+        # Assert
+        assert result.refreshed == 4
+        assert await self.related_titles(item_repo, source) == ["Cercano", "Medio"]
+        assert (await use_case.execute()).refreshed == 0
+
+    @pytest.mark.asyncio
+    async def test_changed_embedding_refreshes_affected_lists_only(self, item_repo, create_item):
+        """Test that re-embedding an item requeues it and its referrers, and lists it gains a place in."""
+        # Arrange
+        a = await item_repo.create(create_item("A", embedding=[1.0, 0.0, 0.0]))
+        b = await item_repo.create(create_item("B", embedding=[0.9, 0.2, 0.0]))
+        c = await item_repo.create(create_item("C", embedding=[0.0, 1.0, 0.0]))
+        d = await item_repo.create(create_item("D", embedding=[0.1, 0.9, 0.1]))
+        use_case = RefreshRelatedItemsUseCase(item_repo, top_k=1, threshold=0.5)
+        await use_case.execute()
+        assert await self.related_titles(item_repo, a) == ["B"]
+        assert await self.related_titles(item_repo, c) == ["D"]
+
+        # Act: B moves next to C; A loses its neighbour, C gains a closer one
+        b.update_embedding(Vector([0.0, 1.0, -0.05]))
+        await item_repo.update(b)
+        result = await use_case.execute()
+
+        # Assert
+        assert await self.related_titles(item_repo, a) == []
+        assert await self.related_titles(item_repo, b) == ["C"]
+        assert await self.related_titles(item_repo, c) == ["B"]
+        assert await self.related_titles(item_repo, d) == ["C"]
+        assert result.refreshed == 3  # B, its referrer A, and C which gained B
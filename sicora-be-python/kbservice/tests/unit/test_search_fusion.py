@@ -0,0 +1,73 @@
+"""Tests for hybrid search rank fusion."""
+
+import pytest
+
+from app.domain.value_objects.kb_value_objects import SearchScore
+from app.domain.services.search_fusion import (
+    ReciprocalRankFusionRanker, WeightedScoreFusionRanker, create_fusion_ranker
+)
+
+
+class TestReciprocalRankFusionRanker:
+    """Test cases for reciprocal rank fusion."""
+
+    @pytest.fixture(autouse=True)
+    def items(self, create_item):
+        """Create the items to rank."""
+        self.a, self.b, self.c = create_item("A"), create_item("B"), create_item("C")
+
+    def test_uses_ranks_not_scores(self):
+        """Test that only positions matter, so score scales need no calibration."""
+        # Arrange
+        ranker = ReciprocalRankFusionRanker(k=60, text_weight=0.5, semantic_weight=0.5)
+
+        # Act
+        low_scores = ranker.fuse([(self.a, SearchScore(0.01))], [(self.b, SearchScore(0.9))])
+        high_scores = ranker.fuse([(self.a, SearchScore(0.99))], [(self.b, SearchScore(0.1))])
+
+        # Assert
+        assert [score.value for _, score in low_scores] == [score.value for _, score in high_scores]
+
+    def test_items_in_both_lists_rank_first(self):
+        """Test RRF ordering and normalization."""
+        # Arrange
+        ranker = ReciprocalRankFusionRanker(k=60, text_weight=0.5, semantic_weight=0.5)
+        text = [(self.a, SearchScore(0.9)), (self.c, SearchScore(0.5))]
+        semantic = [(self.b, SearchScore(0.9)), (self.c, SearchScore(0.8))]
+
+        # Act
+        results = ranker.fuse(text, semantic)
+
+        # Assert
+        assert [item for item, _ in results] == [self.c, self.a, self.b]
+        assert results[0][1].value == pytest.approx(61 / 62)
+        assert results[1][1].value == pytest.approx(0.5)
+
+
+class TestWeightedScoreFusionRanker:
+    """Test cases for weighted score fusion."""
+
+    def test_weighted_sum_of_scores(self, create_item):
+        """Test that precomputed scores are combined with the configured weights."""
+        # Arrange
+        a, b = create_item("A"), create_item("B")
+        ranker = WeightedScoreFusionRanker(text_weight=0.25, semantic_weight=0.75)
+
+        # Act
+        results = ranker.fuse(
+            [(a, SearchScore(1.0)), (b, SearchScore(0.4))],
+            [(b, SearchScore(0.8))]
+        )
+
+        # Assert
+        assert [item for item, _ in results] == [b, a]
+        assert results[0][1].value == pytest.approx(0.25 * 0.4 + 0.75 * 0.8)
+        assert results[1][1].value == pytest.approx(0.25)
+
+    def test_factory_rejects_unknown_strategy(self):
+        """Test strategy selection."""
+        # Act & Assert
+        assert isinstance(create_fusion_ranker("weighted"), WeightedScoreFusionRanker)
+        assert isinstance(create_fusion_ranker("RRF"), ReciprocalRankFusionRanker)
+        with pytest.raises(ValueError):
+            create_fusion_ranker("legacy")
@@ -0,0 +1,120 @@
+"""Tests for buffered search query logging."""
+
+import asyncio
+from contextlib import asynccontextmanager
+import pytest
+from uuid import uuid4
+
+from app.domain.entities.kb_entities import SearchQuery, UserRole
+from app.infrastructure.adapters.search_query_writer import BufferedSearchQueryWriter
+from app.infrastructure.repositories.kb_repositories_impl import SQLAlchemySearchQueryRepository
+
+
+class TestBufferedSearchQueryWriter:
+    """Test cases for BufferedSearchQueryWriter."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.user_id = uuid4()
+
+    def create_query(self, text: str = "asistencia") -> SearchQuery:
+        """Create a search query for testing."""
+        return SearchQuery(
+            query_text=text,
+            user_id=self.user_id,
+            user_role=UserRole.STUDENT,
+            filters={"category": "asistencia"}
+        )
+
+    @pytest.mark.asyncio
+    async def test_full_batch_is_written_in_background(self, session_factory):
+        """Test that reaching the batch size triggers a bulk insert."""
+        # Arrange
+        writer = BufferedSearchQueryWriter(session_factory, batch_size=3, flush_interval_ms=60000)
+
+        # Act
+        for text in ("horario", "asistencia", "horario"):
+            assert writer.log(self.create_query(text))
+        for _ in range(50):
+            if writer.written == 3:
+                break
+            await asyncio.sleep(0.01)
+        await writer.stop()
+
+        # Assert
+        assert writer.stats() == {
+            "backlog": 0, "enqueued": 3, "written": 3, "dropped": 0, "failed": 0
+        }
+        async with session_factory() as session:
+            repo = SQLAlchemySearchQueryRepository(session)
+            frequent = await repo.get_frequent_queries(limit=5)
+        assert frequent[0] == ("horario", 2)
+
+    @pytest.mark.asyncio
+    async def test_backlog_limit_drops_and_counts(self, session_factory):
+        """Test that queries beyond the backlog are dropped, not buffered."""
+        # Arrange
+        writer = BufferedSearchQueryWriter(
+            session_factory, batch_size=10, flush_interval_ms=60000, max_backlog=2
+        )
+
+        # Act
+        accepted = [writer.log(self.create_query()) for _ in range(4)]
+        await writer.stop()
+
+        # Assert
+        assert accepted == [True, True, False, False]
+        assert writer.stats()["dropped"] == 2
+        assert writer.stats()["written"] == 2
+
+    @pytest.mark.asyncio
+    async def test_repository_reads_flush_pending_queries(self, session_factory):
+        """Test that analytics reads see queries still in the buffer."""
+        # Arrange
+        writer = BufferedSearchQueryWriter(session_factory, batch_size=100, flush_interval_ms=60000)
+        filters = {"category": "asistencia"}
+        writer.log(SearchQuery("asistencia", self.user_id, UserRole.STUDENT, filters=filters))
+        filters["status"] = "published"
+
+        # Act
+        async with session_factory() as session:
+            repo = SQLAlchemySearchQueryRepository(session, writer)
+            stats = await repo.get_query_stats()
+            history = await repo.list_by_user(self.user_id)
+        await writer.stop()
+
+        # Assert
+        assert stats["total_queries"] == 1
+        assert len(history) == 1
+        assert history[0].filters == {"category": "asistencia"}
+
+    @pytest.mark.asyncio
+    async def test_stop_during_slow_write_keeps_the_batch(self, session_factory):
+        """Test that stopping while a batch is being written does not lose it."""
+        # Arrange
+        write_started = asyncio.Event()
+
+        @asynccontextmanager
+        async def slow_session_factory():
+            write_started.set()
+            await asyncio.sleep(0.05)
+            async with session_factory() as session:
+                yield session
+
+        writer = BufferedSearchQueryWriter(slow_session_factory, batch_size=2, flush_interval_ms=60000)
+        writer.log(self.create_query("horario"))
+        writer.log(self.create_query("asistencia"))
+        await asyncio.wait_for(write_started.wait(), timeout=1)
+
+        # Act
+        writer.log(self.create_query("horario"))
+        await writer.stop()
+
+        # Assert
+        assert writer.stats() == {
+            "backlog": 0, "enqueued": 3, "written": 3, "dropped": 0, "failed": 0
+        }
+        async with session_factory() as session:
+            repo = SQLAlchemySearchQueryRepository(session)
+            frequent = await repo.get_frequent_queries(limit=5)
+        assert frequent == [("horario", 2), ("asistencia", 1)]
@@ -0,0 +1,141 @@
+"""Tests for the versioned search result cache."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from app.application.dtos.kb_dtos import SearchRequestDTO
+from app.application.use_cases.kb_use_cases import (
+    SearchKnowledgeUseCase, DeleteKnowledgeItemUseCase
+)
+from app.domain.entities.kb_entities import UserRole
+from app.domain.services.kb_domain_services import SearchResultCache
+from app.infrastructure.adapters.search_cache import VersionedSearchResultCache
+
+
+class TestVersionedSearchResultCache:
+    """Test cases for VersionedSearchResultCache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.cache = VersionedSearchResultCache(max_entries=10, ttl_seconds=60)
+
+    def test_key_normalizes_query_and_orders_filters(self):
+        """Test that equivalent requests share a key and different roles do not."""
+        # Act
+        key = SearchResultCache.make_key(
+            "  ¿Cómo JUSTIFICO  una falta? ", UserRole.STUDENT, {"b": 1, "a": 2}, 20
+        )
+
+        # Assert
+        assert key == SearchResultCache.make_key(
+            "¿cómo justifico una falta?", UserRole.STUDENT, {"a": 2, "b": 1}, 20
+        )
+        assert key != SearchResultCache.make_key(
+            "¿cómo justifico una falta?", UserRole.ADMIN, {"a": 2, "b": 1}, 20
+        )
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_entries(self):
+        """Test that bumping the knowledge base version invalidates cached responses."""
+        # Arrange
+        await self.cache.set("key", "response")
+
+        # Act
+        before = await self.cache.get("key")
+        await self.cache.invalidate()
+        after = await self.cache.get("key")
+
+        # Assert
+        assert before == "response"
+        assert after is None
+        assert self.cache.stats()["hits"] == 1
+
+
+class TestSearchKnowledgeUseCaseCache:
+    """Test cases for search use case caching."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.search_service = MagicMock()
+        self.search_service.hybrid_search = AsyncMock(return_value=[])
+        self.search_service.get_search_report.return_value = {
+            "timings_ms": {"total": 5.0}, "degraded_stages": []
+        }
+        self.personalization_service = MagicMock()
+        self.personalization_service.generate_response_suggestions.return_value = []
+        self.cache = VersionedSearchResultCache()
+        self.use_case = SearchKnowledgeUseCase(
+            AsyncMock(), AsyncMock(), self.search_service, self.personalization_service, self.cache
+        )
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_is_served_from_cache(self):
+        """Test that only the first identical query runs the search."""
+        # Act
+        first = await self.use_case.execute(
+            SearchRequestDTO(query="Asistencia QR"), uuid4(), UserRole.STUDENT
+        )
+        second = await self.use_case.execute(
+            SearchRequestDTO(query="asistencia  qr"), uuid4(), UserRole.STUDENT
+        )
+
+        # Assert
+        self.search_service.hybrid_search.assert_called_once()
+        assert second.query == first.query
+        assert "cache" in second.timings_ms
+        assert self.use_case.search_query_repo.create.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_delete_invalidates_cached_results(self):
+        """Test that deleting an item forces the next search to run again."""
+        # Arrange
+        repo = AsyncMock()
+        repo.delete.return_value = True
+        on_commit = []
+        repo.after_commit = MagicMock(side_effect=on_commit.append)
+        delete_use_case = DeleteKnowledgeItemUseCase(repo, self.cache)
+        await self.use_case.execute(SearchRequestDTO(query="reglamento"), uuid4(), UserRole.STUDENT)
+
+        # Act
+        await delete_use_case.execute(uuid4(), uuid4())
+        await self.use_case.execute(SearchRequestDTO(query="reglamento"), uuid4(), UserRole.STUDENT)
+        for callback in on_commit:
+            await callback()
+        await self.use_case.execute(SearchRequestDTO(query="reglamento"), uuid4(), UserRole.STUDENT)
+
+        # Assert
+        assert self.search_service.hybrid_search.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_response_computed_before_a_commit_is_not_cached(self):
+        """Test that a search overlapping a knowledge base write is not stored under the new version."""
+        # Arrange
+        async def search_then_commit(**kwargs):
+            await self.cache.invalidate()
+            return []
+        self.search_service.hybrid_search = AsyncMock(side_effect=search_then_commit)
+
+        # Act
+        await self.use_case.execute(SearchRequestDTO(query="matricula"), uuid4(), UserRole.STUDENT)
+        self.search_service.hybrid_search = AsyncMock(return_value=[])
+        await self.use_case.execute(SearchRequestDTO(query="matricula"), uuid4(), UserRole.STUDENT)
+
+        # Assert
+        self.search_service.hybrid_search.assert_called_once()
+        assert self.cache.stats()["entries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_degraded_responses_are_not_cached(self):
+        """Test that text-only fallback results are recomputed next time."""
+        # Arrange
+        self.search_service.get_search_report.return_value = {
+            "timings_ms": {"total": 5.0}, "degraded_stages": ["embedding"]
+        }
+
+        # Act
+        await self.use_case.execute(SearchRequestDTO(query="horario"), uuid4(), UserRole.STUDENT)
+        await self.use_case.execute(SearchRequestDTO(query="horario"), uuid4(), UserRole.STUDENT)
+
+        # Assert
+        assert self.search_service.hybrid_search.call_count == 2
@@ -0,0 +1,76 @@
+"""Tests for running the Alembic migrations against a populated SQLite database."""
+
+import json
+import sqlite3
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+command = pytest.importorskip("alembic.command")
+from alembic.config import Config
+
+from app.config import settings
+
+KBSERVICE_DIR = Path(__file__).resolve().parents[2]
+# Last revision before any migration that copies knowledge_items on SQLite
+POPULATED_REVISION = "fulltext_search"
+
+
+class TestSQLiteMigrations:
+    """Test cases for keeping the FTS5 mirror usable across table rebuilds."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.config = Config()
+        self.config.set_main_option("script_location", str(KBSERVICE_DIR / "alembic"))
+
+    def insert_item(self, connection: sqlite3.Connection, title: str, content: str, embedding=None) -> None:
+        """Insert a knowledge item with the columns every revision has."""
+        connection.execute(
+            "INSERT INTO knowledge_items (id, title, content, content_type, category, target_audience, status, "
+            "author_id, tags, embedding, view_count, helpful_count, unhelpful_count, version) "
+            "VALUES (?, ?, ?, 'faq', 'asistencia', 'all', 'published', ?, '[]', ?, 0, 0, 0, 1)",
+            (uuid4().hex, title, content, uuid4().hex, embedding)
+        )
+
+    def match(self, connection: sqlite3.Connection, query: str) -> list:
+        """Get the titles of the items whose text matches an FTS5 query."""
+        return sorted(title for (title,) in connection.execute(
+            "SELECT knowledge_items.title FROM knowledge_items_fts "
+            "JOIN knowledge_items ON knowledge_items.rowid = knowledge_items_fts.rowid "
+            "WHERE knowledge_items_fts MATCH ?",
+            (query,)
+        ))
+
+    def test_fts_matches_survive_upgrade_and_downgrade(self, tmp_path, monkeypatch):
+        """Test that text search finds existing and new rows after migrations rebuild the table."""
+        # Arrange
+        database_path = tmp_path / "kb.db"
+        monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite+aiosqlite:///{database_path}")
+        command.upgrade(self.config, POPULATED_REVISION)
+        with sqlite3.connect(database_path) as connection:
+            embedding = json.dumps([0.1, 0.2, 0.3])
+            self.insert_item(connection, "Horario de formación", "La jornada empieza a las siete.", embedding)
+            self.insert_item(connection, "Borrador", "Texto que se elimina antes de migrar.", embedding)
+            self.insert_item(connection, "Justificar una falta", "Se presenta la excusa firmada al instructor.", embedding)
+            # Leaves a gap in the rowids, which the table copy renumbers
+            connection.execute("DELETE FROM knowledge_items WHERE title = 'Borrador'")
+
+        # Act
+        command.upgrade(self.config, "head")
+        with sqlite3.connect(database_path) as connection:
+            upgraded = self.match(connection, "excusa")
+            self.insert_item(connection, "Permisos", "La excusa médica se adjunta al permiso.")
+            after_insert = self.match(connection, "excusa")
+        command.downgrade(self.config, POPULATED_REVISION)
+        with sqlite3.connect(database_path) as connection:
+            downgraded = self.match(connection, "excusa")
+            connection.execute("UPDATE knowledge_items SET content = 'Sin excusa.' WHERE title = 'Horario de formación'")
+            after_update = self.match(connection, "excusa")
+
+        # Assert
+        assert upgraded == ["Justificar una falta"]
+        assert after_insert == ["Justificar una falta", "Permisos"]
+        assert downgraded == ["Justificar una falta", "Permisos"]
+        assert after_update == ["Horario de formación", "Justificar una falta", "Permisos"]
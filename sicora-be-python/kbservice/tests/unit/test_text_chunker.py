@@ -0,0 +1,71 @@
+"""Tests for the token-aware streaming text chunker."""
+
+import pytest
+
+from app.infrastructure.adapters.text_chunker import RegexTokenCounter, TextChunker
+
+
+class TestTextChunker:
+    """Test cases for TextChunker."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.counter = RegexTokenCounter()
+        self.chunker = TextChunker(max_tokens=12, overlap_tokens=6, token_counter=self.counter)
+
+    def test_chunks_respect_token_bound_and_overlap(self):
+        """Test that chunks stay under the limit and repeat the previous tail."""
+        # Arrange
+        text = " ".join(f"Oración número {n} del reglamento." for n in range(1, 9))
+
+        # Act
+        chunks = self.chunker.chunk(text)
+
+        # Assert
+        assert len(chunks) > 1
+        assert all(self.counter.count(chunk) <= 12 for chunk in chunks)
+        for previous, current in zip(chunks, chunks[1:]):
+            assert current.startswith(previous.split(". ")[-1])
+
+    def test_streams_across_texts_without_losing_content(self):
+        """Test that sentences from several pages are all chunked, in order."""
+        # Arrange
+        chunker = TextChunker(max_tokens=12, overlap_tokens=0, token_counter=self.counter)
+        pages = ["Primera página corta.", "Segunda página.", "Tercera página con más texto aquí."]
+
+        # Act
+        chunks = list(chunker.iter_chunks(iter(pages)))
+
+        # Assert
+        assert " ".join(" ".join(chunks).split()) == " ".join(pages)
+
+    def test_long_sentence_is_split_and_decimals_kept(self):
+        """Test that over-long sentences are cut by tokens and '3.5' is not a sentence end."""
+        # Arrange
+        long_sentence = " ".join(["palabra"] * 30) + "."
+
+        # Act
+        long_chunks = self.chunker.chunk(long_sentence)
+        decimal_chunks = self.chunker.chunk("La nota mínima es 3.5 en la escala.")
+
+        # Assert
+        assert all(self.counter.count(chunk) <= 12 for chunk in long_chunks)
+        assert len(long_chunks) >= 3
+        assert decimal_chunks == ["La nota mínima es 3.5 en la escala."]
+
+    def test_paragraph_starts_new_chunk_once_half_full(self):
+        """Test that paragraph breaks are preferred chunk boundaries."""
+        # Arrange
+        chunker = TextChunker(max_tokens=20, overlap_tokens=0, token_counter=self.counter)
+        text = "Uno dos tres cuatro cinco seis siete ocho nueve diez.\n\nOtro párrafo breve."
+
+        # Act
+        chunks = chunker.chunk(text)
+
+        # Assert
+        assert chunks == ["Uno dos tres cuatro cinco seis siete ocho nueve diez.", "Otro párrafo breve."]
+
+    def test_invalid_overlap_is_rejected(self):
+        """Test that the overlap must be smaller than a chunk."""
+        with pytest.raises(ValueError):
+            TextChunker(max_tokens=10, overlap_tokens=10)
@@ -0,0 +1,65 @@
+"""Tests for full-text search engines."""
+
+import pytest
+
+from app.domain.entities.kb_entities import ContentStatus
+from app.domain.value_objects.kb_value_objects import Title, Content
+from app.infrastructure.adapters.text_search import SQLiteFTS5SearchEngine
+
+
+class TestSQLiteFTS5SearchEngine:
+    """Test cases for the SQLite FTS5 engine used in development and tests."""
+
+    def test_build_match_expression(self):
+        """Test that free text becomes an OR of quoted terms without stop words."""
+        # Act
+        match = SQLiteFTS5SearchEngine.build_match_expression('¿Cómo justifico una "falta" de asistencia?')
+
+        # Assert
+        assert match == '"justifico" OR "falta" OR "asistencia"'
+        assert SQLiteFTS5SearchEngine.build_match_expression("de la") == ""
+
+    @pytest.mark.asyncio
+    async def test_ranked_search_scores_and_highlights(self, item_repo, create_item):
+        """Test ranking, accent-insensitive matching, filters and snippets."""
+        # Arrange
+        title_match = await item_repo.create(create_item(
+            "Justificación de inasistencias", "Pasos para presentar una excusa médica."
+        ))
+        content_match = await item_repo.create(create_item(
+            "Reglamento del aprendiz", "Las inasistencias sin justificacion afectan la evaluacion."
+        ))
+        await item_repo.create(create_item(
+            "Inasistencias en borrador", "Inasistencias pendientes de revisión.", status=ContentStatus.DRAFT
+        ))
+        await item_repo.create(create_item("Horarios", "Consulta de horarios de formación."))
+
+        # Act
+        results = await item_repo.search_by_text_ranked(
+            "justificación inasistencias", limit=10, filters={"status": "published"}
+        )
+
+        # Assert
+        assert [item.id for item, _, _ in results] == [title_match.id, content_match.id]
+        assert all(0.0 < score.value < 1.0 for _, score, _ in results)
+        assert results[0][1].value >= results[1][1].value
+        assert "<mark>inasistencias</mark>" in results[1][2]
+
+    @pytest.mark.asyncio
+    async def test_index_follows_updates_and_deletes(self, item_repo, create_item):
+        """Test that the FTS5 mirror tracks writes through triggers."""
+        # Arrange
+        item = await item_repo.create(create_item("Certificados", "Solicitud de certificados."))
+        item.update_content(title=Title("Constancias"), content=Content("Solicitud de constancias."))
+        await item_repo.update(item)
+
+        # Act
+        old_term = await item_repo.search_by_text("certificados")
+        new_term = await item_repo.search_by_text("constancias")
+        await item_repo.delete(item.id)
+        after_delete = await item_repo.search_by_text("constancias")
+
+        # Assert
+        assert old_term == []
+        assert [found.id for found in new_term] == [item.id]
+        assert after_delete == []
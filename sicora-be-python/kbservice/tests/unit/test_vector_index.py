@@ -0,0 +1,152 @@
+"""Tests for in-memory vector indexes."""
+
+import pytest
+import numpy as np
+from uuid import uuid4
+
+from app.infrastructure.adapters.vector_index import FlatVectorIndex, IVFVectorIndex
+from app.infrastructure.repositories.kb_repositories_impl import SQLAlchemyKnowledgeItemRepository
+
+
+DIMENSION = 16
+
+
+def random_vectors(count: int, seed: int = 0) -> np.ndarray:
+    """Create reproducible random vectors."""
+    return np.random.default_rng(seed).normal(size=(count, DIMENSION)).astype(np.float32)
+
+
+def metadata(status: str = "published", category: str = "asistencia") -> dict:
+    """Build index metadata."""
+    return {"status": status, "category": category, "target_audience": "all"}
+
+
+class TestFlatVectorIndex:
+    """Test cases for the exact flat index."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.index = FlatVectorIndex(dimension=DIMENSION, refresh_seconds=60)
+
+    def test_search_returns_exact_neighbours_sorted(self):
+        """Test that search matches a brute-force cosine ranking."""
+        # Arrange
+        vectors = random_vectors(50)
+        ids = [uuid4() for _ in range(50)]
+        for item_id, values in zip(ids, vectors):
+            self.index.upsert(item_id, values.tolist(), metadata())
+        query = vectors[7]
+
+        # Act
+        results = self.index.search(query.tolist(), threshold=-1.0, limit=5)
+
+        # Assert
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5]
+        assert [item_id for item_id, _ in results] == [ids[i] for i in expected]
+        assert results[0][0] == ids[7]
+        assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+
+    def test_search_applies_threshold_and_filters(self):
+        """Test threshold and metadata filtering."""
+        # Arrange
+        published_id, draft_id = uuid4(), uuid4()
+        values = [1.0] + [0.0] * (DIMENSION - 1)
+        self.index.upsert(published_id, values, metadata(status="published"))
+        self.index.upsert(draft_id, values, metadata(status="draft"))
+
+        # Act
+        published = self.index.search(values, threshold=0.9, filters={"status": "published"})
+        unknown = self.index.search(values, filters={"category": "inexistente"})
+
+        # Assert
+        assert [item_id for item_id, _ in published] == [published_id]
+        assert unknown == []
+
+    def test_upsert_replaces_and_remove_deletes(self):
+        """Test that updates replace vectors and removals keep the index consistent."""
+        # Arrange
+        first, second, third = uuid4(), uuid4(), uuid4()
+        axis = lambda i: [1.0 if j == i else 0.0 for j in range(DIMENSION)]
+        self.index.upsert(first, axis(0), metadata())
+        self.index.upsert(second, axis(1), metadata())
+        self.index.upsert(third, axis(2), metadata())
+
+        # Act
+        self.index.upsert(first, axis(3), metadata())
+        removed = self.index.remove(second)
+
+        # Assert
+        assert removed is True
+        assert len(self.index) == 2
+        assert self.index.search(axis(3), threshold=0.9)[0][0] == first
+        assert self.index.search(axis(2), threshold=0.9)[0][0] == third
+        assert self.index.search(axis(1), threshold=0.9) == []
+
+    def test_ignores_vectors_with_wrong_dimension(self):
+        """Test that malformed vectors are not indexed."""
+        # Act
+        self.index.upsert(uuid4(), [1.0, 2.0], metadata())
+
+        # Assert
+        assert len(self.index) == 0
+
+
+class TestIVFVectorIndex:
+    """Test cases for the inverted-file index."""
+
+    def test_recall_against_flat_index(self):
+        """Test that the IVF index finds the same top results as exact search."""
+        # Arrange
+        centers = random_vectors(20, seed=1) * 5
+        rng = np.random.default_rng(2)
+        vectors = np.repeat(centers, 50, axis=0) + rng.normal(size=(1000, DIMENSION)).astype(np.float32)
+        ivf = IVFVectorIndex(dimension=DIMENSION, refresh_seconds=60, min_train_size=200, nprobe=8)
+        flat = FlatVectorIndex(dimension=DIMENSION, refresh_seconds=60)
+        for values in vectors:
+            item_id = uuid4()
+            ivf.upsert(item_id, values.tolist(), metadata())
+            flat.upsert(item_id, values.tolist(), metadata())
+
+        # Act
+        hits = 0
+        for query in vectors[::50]:
+            expected = {item_id for item_id, _ in flat.search(query.tolist(), threshold=-1.0, limit=10)}
+            found = {item_id for item_id, _ in ivf.search(query.tolist(), threshold=-1.0, limit=10)}
+            hits += len(expected & found)
+
+        # Assert
+        assert ivf._centroids is not None
+        assert hits / (20 * 10) >= 0.9
+
+
+class TestRepositoryIndexSync:
+    """Test cases for keeping the index in step with committed rows."""
+
+    @pytest.mark.asyncio
+    async def test_index_changes_apply_on_commit_only(self, session_factory, create_item):
+        """Test that a rolled-back create leaves no index entry and a committed one does."""
+        # Arrange
+        index = FlatVectorIndex(dimension=DIMENSION, refresh_seconds=60)
+        index.mark_loaded()
+
+        # Act
+        async with session_factory() as session:
+            await SQLAlchemyKnowledgeItemRepository(session, index).create(
+                create_item("Descartado", embedding=random_vectors(1)[0])
+            )
+            pending = len(index)
+            await session.rollback()
+        rolled_back = len(index)
+        async with session_factory() as session:
+            kept = await SQLAlchemyKnowledgeItemRepository(session, index).create(
+                create_item("Guardado", embedding=random_vectors(1)[0])
+            )
+            await session.commit()
+
+        # Assert
+        assert pending == 0
+        assert rolled_back == 0
+        assert [item_id for item_id, _ in index.search(
+            kept.embedding.array, threshold=-1.0, limit=5
+        )] == [kept.id.value]
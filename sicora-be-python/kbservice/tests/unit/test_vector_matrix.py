@@ -0,0 +1,61 @@
+"""Tests for vectorized similarity value objects."""
+
+import pytest
+import numpy as np
+
+from app.domain.value_objects.kb_value_objects import Vector, VectorMatrix
+
+
+class TestVectorMatrix:
+    """Test cases for VectorMatrix."""
+
+    def test_similarities_match_pairwise_cosine(self):
+        """Test that batch similarities equal pairwise cosine similarity."""
+        # Arrange
+        rng = np.random.default_rng(0)
+        vectors = [Vector(row.tolist()) for row in rng.normal(size=(20, 8))]
+        query = Vector(rng.normal(size=8).tolist())
+        matrix = VectorMatrix(vectors)
+
+        # Act
+        scores = query.cosine_similarities(matrix)
+
+        # Assert
+        assert scores.dtype == np.float32
+        assert scores.shape == (20,)
+        for vector, score in zip(vectors, scores):
+            assert score == pytest.approx(query.cosine_similarity(vector), abs=1e-5)
+
+    def test_top_k_filters_by_threshold_and_sorts(self):
+        """Test top-k selection."""
+        # Arrange
+        matrix = VectorMatrix([[1.0, 0.0], [0.6, 0.8], [0.0, 1.0], [-1.0, 0.0]])
+
+        # Act
+        hits = matrix.top_k([1.0, 0.0], k=2, threshold=0.0)
+
+        # Assert
+        assert [index for index, _ in hits] == [0, 1]
+        assert hits[0][1] == pytest.approx(1.0)
+        assert hits[1][1] == pytest.approx(0.6)
+
+    def test_zero_vector_and_empty_matrix(self):
+        """Test degenerate inputs."""
+        # Arrange
+        matrix = VectorMatrix([[0.0, 0.0], [1.0, 0.0]])
+
+        # Act & Assert
+        assert matrix.similarities([1.0, 0.0]).tolist() == [0.0, 1.0]
+        assert VectorMatrix([], dimension=2).top_k([1.0, 0.0], k=5) == []
+        assert Vector([0.0, 0.0]).cosine_similarity(Vector([1.0, 0.0])) == 0.0
+
+    def test_dimension_mismatch_raises(self):
+        """Test that mismatched dimensions are rejected."""
+        # Arrange
+        matrix = VectorMatrix([[1.0, 0.0, 0.0]])
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            matrix.similarities([1.0, 0.0])
+        with pytest.raises(ValueError):
+            Vector([1.0, 0.0]).cosine_similarity(Vector([1.0, 0.0, 0.0]))